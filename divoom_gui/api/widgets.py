@@ -45,11 +45,15 @@ class WidgetsApi(ApiBase):
             return False
 
     def get_weather(self) -> dict:
-        from divoom_lib.weather_provider import get_weather
+        from divoom_lib.weather_provider import close_shared_session, get_weather
         from divoom_lib.models import WeatherType
 
         async def _gather():
-            info = await get_weather()
+            try:
+                info = await get_weather()
+            finally:
+                # asyncio.run() discards this loop: release the pooled session with it.
+                await close_shared_session()
             return {
                 "temperature_c": info.temperature_c,
                 "weather_type": info.weather_type,
@@ -0,0 +1,242 @@
+"""BlueZ AcquireWrite / AcquireNotify fast path for BLE bulk transfers (Linux).
+
+On BlueZ every bleak ``write_gatt_char`` is a D-Bus round trip through
+bluetoothd, which caps 0x8B uploads and hot updates well below what the link
+carries. BlueZ can instead hand a characteristic to the caller as a file
+descriptor: ``AcquireWrite`` returns a ``SOCK_SEQPACKET`` socket where each
+datagram goes out as one ATT write-without-response, and ``AcquireNotify``
+one where each notification arrives as a datagram. `FastPath` owns those
+sockets for one `BLETransport`:
+
+- Writes. While the characteristic is acquired BlueZ rejects ``WriteValue``
+  (bleak's write) with NotPermitted, so the write fd is held only for a bulk
+  transfer (`bulk_window`, entered by ``DivoomConnection.bulk_transfer``).
+  Inside it, pre-framed bulk packets acquire the fd lazily, and any write
+  without response rides on a held fd. A write that needs a response
+  releases the fd first and goes through bleak. Outside a bulk window,
+  control traffic never touches the fd.
+- Notifications. Acquired once at connect in place of ``StartNotify`` and
+  read on the event loop; the datagrams feed the transport's usual
+  ``notification_handler``.
+
+Opt-in: set ``DIVOOM_BLE_ACQUIRE=1`` (or ``transport.fast_path.enabled``).
+Anything that can't be acquired (another backend, an older BlueZ, a
+characteristic without the ``WriteAcquired`` / ``NotifyAcquired`` property, a
+D-Bus error) falls back to bleak for the rest of the connection. The socket
+layer (`AcquiredWriter`, `AcquiredNotifier`) takes any connected datagram
+socket, which is how the tests run it over a ``socketpair``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import sys
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, Awaitable, Callable, Optional
+
+ENV_VAR = "DIVOOM_BLE_ACQUIRE"
+ATT_HEADER_SIZE = 3
+MAX_ATT_VALUE = 512
+ACQUIRE_TIMEOUT_S = 5.0
+
+_BLUEZ_SERVICE = "org.bluez"
+_GATT_CHARACTERISTIC = "org.bluez.GattCharacteristic1"
+
+logger = logging.getLogger("divoom_lib.ble_acquire")
+
+# (client, characteristic uuid, "AcquireWrite" | "AcquireNotify") -> (socket, mtu) or None
+Acquirer = Callable[[Any, str, str], Awaitable[Optional[tuple[socket.socket, int]]]]
+
+
+def enabled() -> bool:
+    """True when the fast path is switched on for this process (Linux only)."""
+    return sys.platform.startswith("linux") and os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+async def acquire(client: Any, uuid: str, member: str) -> Optional[tuple[socket.socket, int]]:
+    """Call ``member`` on ``uuid``'s BlueZ characteristic over bleak's own D-Bus
+    connection: the acquired non-blocking socket and the ATT MTU, or None when
+    this client/characteristic can't be acquired."""
+    bus = getattr(getattr(client, "_backend", None), "_bus", None)
+    services = getattr(client, "services", None)
+    if bus is None or services is None:
+        return None
+    char = services.get_characteristic(uuid)
+    obj = getattr(char, "obj", None)
+    flag = "WriteAcquired" if member == "AcquireWrite" else "NotifyAcquired"
+    if not isinstance(obj, tuple) or flag not in obj[1]:
+        return None
+    from dbus_fast import Message, MessageType
+
+    reply = await asyncio.wait_for(bus.call(Message(
+        destination=_BLUEZ_SERVICE, path=obj[0], interface=_GATT_CHARACTERISTIC,
+        member=member, signature="a{sv}", body=[{}])), ACQUIRE_TIMEOUT_S)
+    if reply.message_type == MessageType.ERROR:
+        logger.info("%s on %s refused: %s %s", member, uuid, reply.error_name, reply.body)
+        return None
+    sock = socket.socket(fileno=reply.unix_fds[0])
+    sock.setblocking(False)
+    return sock, int(reply.body[1])
+
+
+class AcquiredWriter:
+    """An acquired write characteristic: one datagram per ATT write."""
+
+    def __init__(self, sock: socket.socket, mtu: int) -> None:
+        self.sock = sock
+        self.mtu = mtu
+        self.closed = False
+
+    @property
+    def payload_size(self) -> int:
+        """Largest value one write carries (ATT MTU minus its 3-byte header)."""
+        return max(1, min(self.mtu - ATT_HEADER_SIZE, MAX_ATT_VALUE))
+
+    async def write(self, data) -> None:
+        """Send ``data``, split into ``payload_size`` datagrams. Raises
+        ``ConnectionError`` once BlueZ has closed the fd (link dropped)."""
+        if self.closed:
+            raise ConnectionError("acquired write fd is closed")
+        loop = asyncio.get_running_loop()
+        view = memoryview(data)
+        size = self.payload_size
+        try:
+            for i in range(0, len(view), size):
+                await loop.sock_sendall(self.sock, view[i:i + size])
+        except OSError as e:
+            self.close()
+            raise ConnectionError(f"acquired write fd failed: {e}") from e
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.sock.close()
+
+
+class AcquiredNotifier:
+    """An acquired notify characteristic, read on the event loop."""
+
+    def __init__(self, sock: socket.socket, mtu: int,
+                 callback: Callable[[Any, bytearray], None], sender: Any = None) -> None:
+        self.sock = sock
+        self.mtu = mtu
+        self.closed = False
+        self._callback = callback
+        self._sender = sender
+        self._task = asyncio.create_task(self._rx_loop())
+
+    async def _rx_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                data = await loop.sock_recv(self.sock, max(self.mtu, MAX_ATT_VALUE))
+                if not data:
+                    logger.info("acquired notify fd closed by BlueZ")
+                    break
+                self._callback(self._sender, bytearray(data))
+        except OSError as e:
+            logger.warning("acquired notify fd read failed: %s", e)
+        finally:
+            self.closed = True
+
+    def close(self) -> None:
+        self._task.cancel()
+        self.closed = True
+        self.sock.close()
+
+
+class FastPath:
+    """Acquired-fd state for one `BLETransport` (see the module docstring)."""
+
+    def __init__(self, transport: Any, acquirer: Acquirer = acquire) -> None:
+        self.transport = transport
+        self.enabled = enabled()
+        self.writer: AcquiredWriter | None = None
+        self.notifier: AcquiredNotifier | None = None
+        self._acquirer = acquirer
+        self._bulk = 0
+        self._unsupported: set[str] = set()
+        self.fd_writes = 0
+
+    async def _acquire(self, member: str, uuid: str):
+        if not self.enabled or member in self._unsupported:
+            return None
+        try:
+            got = await self._acquirer(self.transport.client, uuid, member)
+        except Exception as e:  # noqa: BLE001 - any failure means "use bleak"
+            logger.info("%s on %s failed: %s", member, uuid, e)
+            got = None
+        if got is None:
+            self._unsupported.add(member)
+        return got
+
+    @asynccontextmanager
+    async def bulk(self):
+        """A bulk transfer: bulk packets may take the write fd until it ends."""
+        self._bulk += 1
+        try:
+            yield
+        finally:
+            self._bulk -= 1
+            if not self._bulk:
+                self.release_write()
+
+    async def write(self, frame, write_with_response: bool, bulk: bool = False) -> bool:
+        """Send ``frame`` over the write fd. False means the caller writes it
+        through bleak (fast path off or unavailable, a write that needs a
+        response, or a failed fd write)."""
+        if write_with_response:
+            self.release_write()
+            return False
+        if self.writer is None and bulk and self._bulk:
+            got = await self._acquire("AcquireWrite", self.transport.WRITE_CHARACTERISTIC_UUID)
+            if got is not None:
+                self.writer = AcquiredWriter(*got)
+                logger.debug("acquired write fd for bulk transfer (mtu %d)", got[1])
+        if self.writer is None:
+            return False
+        try:
+            await self.writer.write(frame)
+        except ConnectionError as e:
+            logger.warning("%s; falling back to bleak writes", e)
+            self.writer = None
+            return False
+        self.fd_writes += 1
+        return True
+
+    def release_write(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def start_notify(self, callback: Callable[[Any, bytearray], None]) -> bool:
+        """Subscribe through AcquireNotify; False means use bleak's start_notify."""
+        uuid = self.transport.NOTIFY_CHARACTERISTIC_UUID
+        got = await self._acquire("AcquireNotify", uuid)
+        if got is None:
+            return False
+        self.notifier = AcquiredNotifier(*got, callback=callback, sender=uuid)
+        logger.info("acquired notify fd for %s (mtu %d)", uuid, got[1])
+        return True
+
+    def stop_notify(self) -> bool:
+        """Release an acquired notify fd; False if notifications weren't acquired."""
+        if self.notifier is None:
+            return False
+        self.notifier.close()
+        self.notifier = None
+        return True
+
+    def reset(self) -> None:
+        """Drop every fd (link lost or closed); the next connection re-probes."""
+        self.release_write()
+        self.stop_notify()
+        self._unsupported.clear()
+
+
+def bulk_window(transport: Any):
+    """``transport``'s bulk window, or a no-op for transports without a fast path."""
+    fast_path = getattr(transport, "fast_path", None)
+    return fast_path.bulk() if isinstance(fast_path, FastPath) else nullcontext()
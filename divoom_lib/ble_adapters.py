@@ -0,0 +1,136 @@
+"""Sharding BLE devices across several host adapters (Linux / BlueZ).
+
+A wall used to put every panel on the default controller, so connection
+slots and airtime on that one radio capped how far it scaled. An
+`AdapterPool` spreads devices over a set of adapters (``hci0``, ``hci1``,
+...): each key (a device MAC) is assigned to the least-loaded adapter and
+stays there while it works; a key whose device dropped is rebalanced onto
+the least-loaded adapter, preferring a different one on a tie. Each adapter
+also has its own limits for connect attempts (`connecting`) and bulk streams
+(`streaming`), so one controller's handshakes and uploads don't starve the
+others.
+
+The assignment is applied by setting ``device.adapter`` (``Divoom.adapter``,
+passed to ``BleakClient(adapter=...)`` on the next connect), and
+``ble_connection.ensure_connected`` serializes handshakes per adapter rather
+than globally. Adapter selection is a BlueZ feature: elsewhere
+`available_adapters` returns ``[]`` and callers keep the single-adapter path.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Hashable, Iterable
+
+DEFAULT_CONNECT_LIMIT = 2   # ensure_connected runs in flight per adapter
+DEFAULT_STREAM_LIMIT = 2    # concurrent image / 0x8B uploads per adapter
+
+_SYSFS_BLUETOOTH = Path("/sys/class/bluetooth")
+
+
+def available_adapters() -> list[str]:
+    """BlueZ controllers present on this host (``["hci0", "hci1"]``), sorted;
+    ``[]`` off Linux or when none are visible."""
+    if not sys.platform.startswith("linux") or not _SYSFS_BLUETOOTH.is_dir():
+        return []
+    names = [p.name for p in _SYSFS_BLUETOOTH.iterdir()
+             if p.name.startswith("hci") and p.name[3:].isdigit()]
+    return sorted(names, key=lambda n: int(n[3:]))
+
+
+class StreamLease:
+    """A per-adapter stream slot held by one upload (`AdapterPool.streaming`)."""
+
+    def __init__(self, stream: asyncio.Semaphore) -> None:
+        self._stream = stream
+        self.held = False
+
+    async def reclaim(self) -> None:
+        """Take the slot (again); no-op while held."""
+        if not self.held:
+            await self._stream.acquire()
+            self.held = True
+
+    def lend(self) -> None:
+        """Hand the slot back while the upload waits (a wall slot parked at its
+        commit barrier); no-op while lent."""
+        if self.held:
+            self.held = False
+            self._stream.release()
+
+    async def turn(self) -> None:
+        """Between packets: let the uploads queued on this adapter send theirs
+        first, so more uploads than slots advance together (round-robin)."""
+        self.lend()
+        await self.reclaim()
+
+
+class AdapterPool:
+    """Assignment of device keys to adapters, with per-adapter limits."""
+
+    def __init__(self, adapters: Iterable[str], *,
+                 connect_limit: int = DEFAULT_CONNECT_LIMIT,
+                 stream_limit: int = DEFAULT_STREAM_LIMIT) -> None:
+        self.adapters = list(dict.fromkeys(adapters))
+        if not self.adapters:
+            raise ValueError("AdapterPool needs at least one adapter")
+        self._assigned: dict[Hashable, str] = {}
+        self._connect = {a: asyncio.Semaphore(max(1, connect_limit)) for a in self.adapters}
+        self._stream = {a: asyncio.Semaphore(max(1, stream_limit)) for a in self.adapters}
+        self.rebalances = 0
+
+    def load(self) -> dict[str, int]:
+        """Number of keys currently assigned to each adapter."""
+        counts = dict.fromkeys(self.adapters, 0)
+        for adapter in self._assigned.values():
+            counts[adapter] += 1
+        return counts
+
+    def _least_loaded(self, avoid: str | None = None) -> str:
+        counts = self.load()
+        return min(self.adapters, key=lambda a: (counts[a], a == avoid, self.adapters.index(a)))
+
+    def assign(self, key: Hashable) -> str:
+        """The adapter for ``key``: its current one, else the least loaded."""
+        adapter = self._assigned.get(key)
+        if adapter is None:
+            adapter = self._assigned[key] = self._least_loaded()
+        return adapter
+
+    def rebalance(self, key: Hashable) -> str:
+        """Re-place ``key`` after its device dropped: the least-loaded adapter
+        once its own slot is freed, moving off the old one on a tie."""
+        previous = self._assigned.pop(key, None)
+        adapter = self._assigned[key] = self._least_loaded(avoid=previous)
+        if previous is not None and adapter != previous:
+            self.rebalances += 1
+        return adapter
+
+    def release(self, key: Hashable) -> None:
+        self._assigned.pop(key, None)
+
+    def place(self, key: Hashable, device) -> str:
+        """`assign` ``key`` and point ``device`` at that adapter."""
+        adapter = self.assign(key)
+        device.adapter = adapter
+        return adapter
+
+    @asynccontextmanager
+    async def connecting(self, key: Hashable):
+        async with self._connect[self.assign(key)]:
+            yield
+
+    @asynccontextmanager
+    async def streaming(self, key: Hashable):
+        """Hold one of ``key``'s adapter stream slots; yields the `StreamLease`."""
+        lease = StreamLease(self._stream[self.assign(key)])
+        await lease.reclaim()
+        try:
+            yield lease
+        finally:
+            lease.lend()
+
+    def stats(self) -> dict:
+        return {"load": self.load(), "rebalances": self.rebalances}
@@ -127,15 +127,19 @@ WALL_CONNECT_CONCURRENCY = 2    # P3: how many wall slots may connect at once
 # Lazily per running loop so the daemon's device loop and each test's fresh
 # loop get their own lock (an import-time asyncio.Lock would bind to the first
 # loop that awaited it and then raise "bound to a different event loop").
+# With several host adapters (ble_adapters) each controller gets its own lock:
+# handshakes on different radios don't contend.
 _connect_locks: "dict[int, asyncio.Lock]" = {}
+_adapter_locks: "dict[tuple[int, str], asyncio.Lock]" = {}
 
 
-def _connect_lock() -> asyncio.Lock:
+def _connect_lock(adapter: "str | None" = None) -> asyncio.Lock:
     loop = asyncio.get_running_loop()
-    lock = _connect_locks.get(id(loop))
+    locks, key = (_connect_locks, id(loop)) if adapter is None else (_adapter_locks, (id(loop), adapter))
+    lock = locks.get(key)
     if lock is None:
         lock = asyncio.Lock()
-        _connect_locks[id(loop)] = lock
+        locks[key] = lock
     return lock
 
 
@@ -145,6 +149,8 @@ def forget_loop(loop) -> None:
     handed a stale Lock bound to the dead loop → "bound to a different event loop"."""
     if loop is not None:
         _connect_locks.pop(id(loop), None)
+        for key in [k for k in _adapter_locks if k[0] == id(loop)]:
+            del _adapter_locks[key]
 
 
 async def ensure_connected(
@@ -175,11 +181,12 @@ async def ensure_connected(
 
     last = FailureReason.UNKNOWN
     detail = ""
+    adapter = getattr(device, "adapter", None)
     for attempt in range(attempts):
         try:
             # P3: only the fragile handshake is serialized; verify + backoff
             # run outside the lock so other devices aren't blocked by our waits.
-            async with _connect_lock():
+            async with _connect_lock(adapter if isinstance(adapter, str) else None):
                 await asyncio.wait_for(device.connect(), timeout=attempt_timeout)
             if not getattr(device, "is_connected", False):
                 # The OS lied (CoreBluetooth race) — treat as a drop and retry.
@@ -219,6 +226,7 @@ async def connect_devices(
     items,
     *,
     concurrency: int = WALL_CONNECT_CONCURRENCY,
+    adapters=None,
     **kw,
 ) -> "dict[object, ConnectResult]":
     """BLE Hardening P3: connect many devices with BOUNDED concurrency, returning
@@ -226,13 +234,24 @@ async def connect_devices(
     why (instead of a bare ``gather`` connect-storm that fails opaquely). ``items``
     is an iterable of ``(key, device)``. The semaphore bounds how many
     ``ensure_connected`` coroutines run at once; the global connect lock inside
-    ``ensure_connected`` still serializes the actual handshakes underneath."""
+    ``ensure_connected`` still serializes the actual handshakes underneath.
+
+    With ``adapters`` (a ``ble_adapters.AdapterPool``) each device is placed
+    on an adapter first and the pool's per-adapter limit replaces the global
+    ``concurrency`` bound; a device that fails is rebalanced for its retry."""
     sem = asyncio.Semaphore(max(1, concurrency))
     results: "dict[object, ConnectResult]" = {}
 
     async def _one(key, dev):
-        async with sem:
+        if adapters is None:
+            async with sem:
+                results[key] = await ensure_connected(dev, **kw)
+            return
+        adapters.place(key, dev)
+        async with adapters.connecting(key):
             results[key] = await ensure_connected(dev, **kw)
+        if not results[key].ok:
+            dev.adapter = adapters.rebalance(key)
 
     await asyncio.gather(*(_one(k, d) for k, d in items))
     return results
@@ -1,14 +1,18 @@
 """Inbound-notification parsing + response correlation for BLETransport.
 
 Split out of ble_transport.py (R53.11): the GATT notification callback, the
-iOS-LE / basic-protocol frame parsers, and the response-wait helpers. These share
-the ``notification_queue`` + the ``_expected_response_command`` scalar, now
-serialized by ``_response_lock`` so a concurrent waiter can't drain another op's
-frames or clobber the scalar mid-flight (cross-talk). Mixed into BLETransport;
-relies on its attributes (``logger``, ``notification_queue``,
-``_expected_response_command``, ``_response_lock``, ``message_buf``,
+iOS-LE / basic-protocol frame parsers, and the response-wait helpers. Every
+inbound frame is first offered to the ``responses`` correlation table (see
+response_table.py), so request/response reads for different command ids run
+concurrently. Frames nobody is waiting on fall through to the
+``notification_queue`` + ``_expected_response_command`` scalar path, still
+serialized by ``_response_lock`` so a concurrent waiter can't drain another
+op's frames or clobber the scalar mid-flight (cross-talk). Mixed into
+BLETransport; relies on its attributes (``logger``, ``notification_queue``,
+``_expected_response_command``, ``_response_lock``, ``responses``,
 ``use_ios_le_protocol``, ``_listen_commands``, ``is_connected``) and its
-``send_command()``.
+``send_command()``. Basic-protocol RX goes through a shared incremental
+`FrameParser`; ``message_buf`` is a view of its unconsumed bytes.
 """
 from __future__ import annotations
 
@@ -16,6 +20,8 @@ import asyncio
 import logging
 
 from . import models, framing
+from .frame_parser import FrameParser
+from .response_table import ResponseTable
 
 
 class BleNotifyMixin:
@@ -57,6 +63,8 @@ class BleNotifyMixin:
             if is_listened:
                 self.notification_queue.put_nowait(response_payload)
                 return True
+            if self._deliver_to_waiter(command_identifier, response_data):
+                return True
             if is_expected_response or is_generic_ack:
                 # NB: clearing the scalar on the generic 0x33 ACK is LOAD-BEARING
                 # for the protocol autoprobe (ble_probe sends a 0x46 probe, and 0x46
@@ -75,17 +83,33 @@ class BleNotifyMixin:
             self.logger.warning(f"Unrecognized notification data (not iOS LE Protocol format): {data.hex()}")
         return False
 
+    @property
+    def message_buf(self) -> bytearray:
+        """Unconsumed basic-protocol RX bytes (the parser's parked tail)."""
+        return self._rx_parser.buffer
+
+    @message_buf.setter
+    def message_buf(self, val: bytearray) -> None:
+        self._rx_parser = FrameParser(val, ios_le=False)
+
     def _handle_basic_protocol_notification(self, new_data: bytearray) -> bool:
-        self.message_buf.extend(new_data)
-        if models.MESSAGE_START_BYTE not in self.message_buf:
+        if models.MESSAGE_START_BYTE not in new_data \
+                and models.MESSAGE_START_BYTE not in self.message_buf:
             self.logger.debug("No start byte found in buffer, clearing.")
             self.message_buf.clear()
             return False
-        msgs, self.message_buf = framing.parse_basic_protocol_frames(self.message_buf)
-        for response_payload in msgs:
-            self.notification_queue.put_nowait(response_payload)
+        listen = getattr(self, "_listen_commands", ())
+        for frame in self._rx_parser.feed(new_data):
+            cmd = frame.get('command_id')
+            if cmd in listen or not self._deliver_to_waiter(cmd, frame.get('payload')):
+                self.notification_queue.put_nowait(frame)
         return True
 
+    def _deliver_to_waiter(self, command_id: int | None, payload: bytes) -> bool:
+        """Resolve a pending `responses` read for ``command_id`` (True if consumed)."""
+        table = getattr(self, "responses", None)
+        return isinstance(table, ResponseTable) and table.deliver(command_id, payload)
+
     async def wait_for_any_response(self, command_ids: list[int],
                                     timeout: float = 10.0) -> tuple[int, bytes] | None:
         """Wait for the first inbound frame whose command id is in
@@ -144,6 +168,11 @@ class BleNotifyMixin:
             return None
 
         command_id = models.COMMANDS.get(command, command) if isinstance(command, str) else command
+        table = getattr(self, "responses", None)
+        if isinstance(table, ResponseTable):
+            # Correlated by command id: no drain, no scalar, no lock.
+            return await table.request(
+                command_id, lambda: self.send_command(command, args, write_with_response=True), timeout)
 
         # Hold the response lock across drain→set-scalar→send→wait so a concurrent
         # caller can't drain our frames or overwrite _expected_response_command
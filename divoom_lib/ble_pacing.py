@@ -0,0 +1,246 @@
+"""Adaptive BLE write pacing, learned per device (MAC).
+
+The BLE write path used to be paced for the slowest device we own: a 50 ms
+minimum gap between writes (`BLETransport.send_payload` / `send_frame`), a
+50 ms sleep between the sub-chunks of a long message (`_write_basic_frame`),
+and write-with-response plus a 10 ms sleep for every 0x8B animation chunk
+(`Animation.stream_animation_8b`). A Tivoo Max or a Pixoo keeps up with far
+less than a Timoo needs, so every device paid the Timoo price.
+
+`PacingTuner` starts from those proven values and adjusts them from what the
+link actually does:
+
+  - every ``CLEAN_WRITES_TO_SPEED_UP`` consecutive clean writes shrink the
+    inter-write gap by ``SPEED_UP`` and halve the extra 0x8B chunk delay. A
+    write is clean when it succeeded and its latency stayed within
+    ``LATENCY_SLOW_FACTOR`` of the running average; a slower one means the
+    link is queueing and restarts the count;
+  - the gap never drops more than one step below ``gap_floor_s``, the gap a
+    0x8B stream last completed at without retransmits (the device's own
+    verdict on that pace). Each clean stream lowers the floor to the current
+    gap, a stream that needed retransmits raises it to the backed-off gap;
+  - a failed write, or a 0x8B stream the device had to request retransmits
+    for, doubles them (``BACK_OFF``);
+  - after ``CLEAN_STREAMS_TO_DROP_RESPONSE`` clean 0x8B streams the stream
+    switches to write-without-response; a stream that then needs retransmits
+    switches back and pins write-with-response for that device.
+
+Everything stays within ``[MIN_WRITE_GAP_S, MAX_WRITE_GAP_S]`` and
+``[0, MAX_STREAM_DELAY_S]``. Learned profiles persist as JSON next to the
+capabilities registry (``pacing.json`` beside ``devices.json``; override with
+``DIVOOM_CONTROL_PACING``; an empty value disables persistence, so every
+transport starts from the defaults). Saves are debounced by ``SAVE_DELAY_S``
+and written in a worker thread, never on the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from .models.capabilities import REGISTRY_PATH
+from .utils.atomic_io import atomic_write_text
+
+logger = logging.getLogger("divoom_lib.ble_pacing")
+
+# Starting point = the hard-coded values every device used before autotuning.
+DEFAULT_WRITE_GAP_S = 0.05
+DEFAULT_STREAM_DELAY_S = 0.01
+MIN_WRITE_GAP_S = 0.005
+MAX_WRITE_GAP_S = 0.10
+MAX_STREAM_DELAY_S = 0.05
+
+CLEAN_WRITES_TO_SPEED_UP = 16
+CLEAN_STREAMS_TO_DROP_RESPONSE = 2
+SPEED_UP = 0.8
+BACK_OFF = 2.0
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_SLOW_FACTOR = 2.0
+SAVE_DELAY_S = 2.0
+
+_PROFILE_FIELDS = ("write_gap_s", "gap_floor_s", "stream_delay_s", "stream_write_with_response",
+                   "response_pinned", "latency_ms", "writes", "failures",
+                   "retransmits", "streams")
+
+
+class PacingStore:
+    """MAC -> learned pacing profile, persisted as one JSON object.
+
+    Same shape as `models.DeviceRegistry`: lazily loaded, case-insensitive
+    MACs, a corrupt file is logged and treated as empty. ``path=None`` keeps
+    profiles in memory only.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._entries: dict[str, dict] = {}
+        self._loaded = False
+        self._lock = threading.Lock()  # tuners save from worker threads
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            if isinstance(data, dict):
+                self._entries = {k.lower(): v for k, v in data.items() if isinstance(v, dict)}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("%s: %s is corrupt (%s); starting empty.", type(self).__name__, self.path, e)
+            self._entries = {}
+
+    def get(self, mac: str) -> dict | None:
+        self._ensure_loaded()
+        entry = self._entries.get(mac.lower())
+        return dict(entry) if entry is not None else None
+
+    def put(self, mac: str, profile: dict) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[mac.lower()] = dict(profile)
+            if self.path is None:
+                return
+            try:
+                atomic_write_text(self.path, json.dumps(dict(sorted(self._entries.items())),
+                                                        indent=2) + "\n")
+            except OSError as e:
+                logger.warning("%s: could not save %s: %s", type(self).__name__, self.path, e)
+
+
+_default_store: PacingStore | None = None
+
+
+def default_store() -> PacingStore | None:
+    """Process-wide store: ``pacing.json`` next to the capabilities registry,
+    or None when ``DIVOOM_CONTROL_PACING`` is set empty."""
+    global _default_store
+    env = os.environ.get("DIVOOM_CONTROL_PACING")
+    if env == "":
+        return None
+    if _default_store is None:
+        _default_store = PacingStore(Path(env) if env else REGISTRY_PATH.parent / "pacing.json")
+    return _default_store
+
+
+class PacingTuner:
+    """Write pacing for one device, adjusted from observed writes and streams."""
+
+    def __init__(self, mac: str | None = None, store: PacingStore | None = None) -> None:
+        self.mac = mac
+        self.store = store
+        self.write_gap_s = DEFAULT_WRITE_GAP_S
+        self.gap_floor_s = DEFAULT_WRITE_GAP_S
+        self.stream_delay_s = DEFAULT_STREAM_DELAY_S
+        self.stream_write_with_response = True
+        self.response_pinned = False
+        self.latency_ms = 0.0
+        self.writes = 0
+        self.failures = 0
+        self.retransmits = 0
+        self.streams = 0
+        self._clean_writes = 0
+        self._clean_streams = 0
+        self._save_pending = False
+        saved = store.get(mac) if store is not None and mac else None
+        if saved:
+            self._apply(saved)
+
+    @classmethod
+    def for_mac(cls, mac: str | None) -> "PacingTuner":
+        """Tuner for ``mac`` seeded from (and saving to) the default store."""
+        return cls(mac, default_store())
+
+    def observe_write(self, latency_s: float, ok: bool) -> None:
+        """Record one transport write (``latency_s`` from lock to completion)."""
+        latency_ms = latency_s * 1000.0
+        slow = (self.writes >= CLEAN_WRITES_TO_SPEED_UP
+                and latency_ms > LATENCY_SLOW_FACTOR * self.latency_ms)
+        self.writes += 1
+        self.latency_ms += LATENCY_EWMA_ALPHA * (latency_ms - self.latency_ms)
+        if not ok:
+            self.failures += 1
+            self._back_off()
+            return
+        if slow:
+            self._clean_writes = 0
+            return
+        self._clean_writes += 1
+        if self._clean_writes >= CLEAN_WRITES_TO_SPEED_UP:
+            self._clean_writes = 0
+            self.write_gap_s = min(self.write_gap_s, max(
+                MIN_WRITE_GAP_S, self.gap_floor_s * SPEED_UP, self.write_gap_s * SPEED_UP))
+            self.stream_delay_s = self.stream_delay_s / 2 if self.stream_delay_s > 0.001 else 0.0
+
+    def observe_stream(self, retransmits: int, ok: bool) -> None:
+        """Record the outcome of one 0x8B stream and persist the profile."""
+        self.streams += 1
+        self.retransmits += retransmits
+        if ok and retransmits == 0:
+            self.gap_floor_s = min(self.gap_floor_s, self.write_gap_s)
+            self._clean_streams += 1
+            if (self.stream_write_with_response and not self.response_pinned
+                    and self._clean_streams >= CLEAN_STREAMS_TO_DROP_RESPONSE):
+                self.stream_write_with_response = False
+                self._clean_streams = 0
+        else:
+            self._clean_streams = 0
+            self._back_off()
+            self.gap_floor_s = max(self.gap_floor_s, self.write_gap_s)
+            if not self.stream_write_with_response:
+                self.stream_write_with_response = True
+                self.response_pinned = True
+                logger.info("pacing %s: stream needed retransmits without write-response; "
+                            "pinning write-with-response", self.mac)
+        self.save_soon()
+
+    def profile(self) -> dict:
+        """The persisted / reported view of this tuner."""
+        return {name: getattr(self, name) for name in _PROFILE_FIELDS}
+
+    def save(self) -> None:
+        if self.store is not None and self.mac:
+            self.store.put(self.mac, self.profile())
+
+    def save_soon(self) -> None:
+        """`save` after ``SAVE_DELAY_S`` in a worker thread, once per burst of
+        calls; immediately when no event loop is running."""
+        if self.store is None or not self.mac:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        if not self._save_pending:
+            self._save_pending = True
+            loop.call_later(SAVE_DELAY_S, self._save_in_worker, loop)
+
+    def _save_in_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._save_pending = False
+        loop.run_in_executor(None, self.save)
+
+    def _back_off(self) -> None:
+        self._clean_writes = 0
+        self.write_gap_s = min(MAX_WRITE_GAP_S, max(self.write_gap_s * BACK_OFF, MIN_WRITE_GAP_S * 2))
+        self.stream_delay_s = min(MAX_STREAM_DELAY_S, max(self.stream_delay_s * BACK_OFF, 0.005))
+
+    def _apply(self, saved: dict) -> None:
+        """Load a saved profile, clamping anything out of bounds."""
+        try:
+            self.write_gap_s = min(MAX_WRITE_GAP_S, max(MIN_WRITE_GAP_S, float(saved["write_gap_s"])))
+            self.gap_floor_s = min(MAX_WRITE_GAP_S, max(MIN_WRITE_GAP_S, float(
+                saved.get("gap_floor_s", max(self.write_gap_s, DEFAULT_WRITE_GAP_S)))))
+            self.write_gap_s = max(self.write_gap_s, self.gap_floor_s * SPEED_UP)
+            self.stream_delay_s = min(MAX_STREAM_DELAY_S, max(0.0, float(saved["stream_delay_s"])))
+            self.stream_write_with_response = bool(saved["stream_write_with_response"])
+            self.response_pinned = bool(saved.get("response_pinned", False))
+            self.latency_ms = float(saved.get("latency_ms", 0.0))
+            for name in ("writes", "failures", "retransmits", "streams"):
+                setattr(self, name, int(saved.get(name, 0)))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("pacing %s: ignoring malformed saved profile (%s)", self.mac, e)
@@ -14,14 +14,15 @@ _PROBE_CMD = 0x46
 _PROBE_TIMEOUT = 1.5
 
 
-async def autoprobe_protocol(t: Any) -> None:
+async def autoprobe_protocol(t: Any) -> bool:
     """Detect + set ``t.use_ios_le_protocol`` by probing both framings.
 
     No-op if the framing is already known. On success sets the framing and
     clears ``_expected_response_command``; if neither answers, defaults to Basic.
+    Returns False only in that default case (the framing is a guess).
     """
     if t.use_ios_le_protocol is not None:
-        return
+        return True
 
     t.logger.info("use_ios_le_protocol not set. Probing BLE protocol format...")
     payload = [_PROBE_CMD]
@@ -42,14 +43,15 @@ async def autoprobe_protocol(t: Any) -> None:
     t._expected_response_command = _PROBE_CMD
     if await _try(t._send_ios_le_payload, "iOS-LE Protocol"):
         t._expected_response_command = None
-        return
+        return True
 
     t.use_ios_le_protocol = False
     t._expected_response_command = _PROBE_CMD
     if await _try(t._send_basic_protocol_payload, "Basic Protocol"):
         t._expected_response_command = None
-        return
+        return True
 
     t.logger.info("Both BLE protocol probes failed. Defaulting to BLE Basic Protocol.")
     t.use_ios_le_protocol = False
     t._expected_response_command = None
+    return False
@@ -0,0 +1,185 @@
+"""Persistent per-device BLE connection profile.
+
+With ``use_ios_le_protocol`` unset, every `BLETransport.connect` waited a
+fixed 1 s for the link to settle and then ran the iOS-LE vs Basic framing
+autoprobe (`ble_probe`: a 0x46 query in each framing, 1.5 s timeout apiece),
+so a reconnect storm cost seconds per device. A verified connect now records
+what it learned — characteristic UUIDs in use, framing, escape flag, write
+chunk size / MTU, device name — and the next connect to that MAC applies it
+up front and proves it with a single 0x46 read instead of settle + probe.
+
+Only when that verification read goes unanswered does the connect fall back
+to the full path: characteristic discovery on the live client
+(`utils.discovery`), the settle wait and the autoprobe; the profile is then
+rewritten from the result. A profile only applies to the configuration it
+was learned under (the configured UUIDs are its key), and only while the
+framing is unknown: never when the caller pinned it, nor on a reconnect of
+a transport that already knows it. Profiles persist next to ``pacing.json`` as
+``profiles.json`` (override with ``DIVOOM_CONTROL_PROFILES``; an empty value
+disables them). ``BLETransport.connect_report`` says which path the last
+connect took and how long it took.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from .ble_pacing import PacingStore
+from .models.capabilities import REGISTRY_PATH
+
+PROFILE_VERSION = 1
+VERIFY_CMD = 0x46
+VERIFY_TIMEOUT = 1.5
+SETTLE_S = 1.0
+
+
+class ProfileStore(PacingStore):
+    """MAC -> connection profile; same JSON store as the pacing profiles."""
+
+
+_default_store: ProfileStore | None = None
+
+
+def default_store() -> ProfileStore | None:
+    """Process-wide store: ``profiles.json`` next to the capabilities registry,
+    or None when ``DIVOOM_CONTROL_PROFILES`` is set empty."""
+    global _default_store
+    env = os.environ.get("DIVOOM_CONTROL_PROFILES")
+    if env == "":
+        return None
+    if _default_store is None:
+        _default_store = ProfileStore(Path(env) if env else REGISTRY_PATH.parent / "profiles.json")
+    return _default_store
+
+
+@dataclass
+class ConnectionProfile:
+    configured: list[str]          # the UUIDs the transport was configured with
+    write_uuid: str
+    notify_uuid: str
+    read_uuid: str
+    use_ios_le_protocol: bool
+    escape_payload: bool
+    chunk_size: int | None = None
+    mtu: int | None = None
+    device_name: str | None = None
+    version: int = PROFILE_VERSION
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConnectionProfile | None":
+        """None for a malformed or older-format entry (it gets relearned)."""
+        if data.get("version") != PROFILE_VERSION:
+            return None
+        try:
+            profile = cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+        except TypeError:
+            return None
+        if not isinstance(profile.use_ios_le_protocol, bool) or not all(
+                isinstance(u, str) for u in (profile.write_uuid, profile.notify_uuid, profile.read_uuid)):
+            return None
+        return profile
+
+
+def _configured(t: Any) -> list[str]:
+    return list(t._configured_uuids)
+
+
+def _mtu(t: Any) -> int | None:
+    mtu = getattr(t.client, "mtu_size", None)
+    return mtu if isinstance(mtu, int) else None
+
+
+def load(t: Any) -> ConnectionProfile | None:
+    """Apply the saved profile for ``t.mac`` to transport ``t`` and return it,
+    or None when there is none, it doesn't match, or the framing is pinned."""
+    store = t.profile_store
+    if store is None or not t.mac or t.use_ios_le_protocol is not None:
+        return None  # pinned by the caller, or already known this session
+    saved = store.get(t.mac)
+    profile = ConnectionProfile.from_dict(saved) if saved else None
+    if profile is None or profile.configured != _configured(t):
+        return None
+    t.WRITE_CHARACTERISTIC_UUID = profile.write_uuid
+    t.NOTIFY_CHARACTERISTIC_UUID = profile.notify_uuid
+    t.READ_CHARACTERISTIC_UUID = profile.read_uuid
+    t.use_ios_le_protocol = profile.use_ios_le_protocol
+    t.escapePayload = profile.escape_payload
+    if not t.device_name and profile.device_name:
+        t.device_name = profile.device_name
+    return profile
+
+
+def save(t: Any) -> None:
+    store = t.profile_store
+    if store is None or not t.mac or t.use_ios_le_protocol is None:
+        return
+    store.put(t.mac, asdict(ConnectionProfile(
+        configured=_configured(t),
+        write_uuid=t.WRITE_CHARACTERISTIC_UUID,
+        notify_uuid=t.NOTIFY_CHARACTERISTIC_UUID,
+        read_uuid=t.READ_CHARACTERISTIC_UUID,
+        use_ios_le_protocol=bool(t.use_ios_le_protocol),
+        escape_payload=bool(t.escapePayload),
+        chunk_size=t.write_chunk_size,
+        mtu=_mtu(t),
+        device_name=t.device_name,
+    )))
+
+
+async def verify(t: Any) -> bool:
+    """One 0x46 round-trip in the applied framing. Writes directly like the
+    autoprobe does: connect() can run under the write lock (reconnect path)."""
+    send = t._send_ios_le_payload if t.use_ios_le_protocol else t._send_basic_protocol_payload
+    try:
+        return await t.responses.request(
+            VERIFY_CMD, lambda: send([VERIFY_CMD], write_with_response=True), VERIFY_TIMEOUT) is not None
+    except Exception as e:  # a failed verify write just means "fall back"
+        t.logger.debug("profile verify on %s raised: %s", t.mac, e)
+        return False
+
+
+async def rediscover(t: Any) -> None:
+    """Full discovery after a stale profile: re-pick the characteristics from
+    the live GATT table (keeping the current ones if still present), move the
+    notify subscription if needed, and forget the cached framing."""
+    from .utils.discovery import discover_characteristics, pick_char_uuid
+
+    try:
+        write_chars, notify_chars, read_chars = await discover_characteristics(t.client)
+    except Exception as e:
+        t.logger.debug("characteristic discovery on %s failed: %s", t.mac, e)
+        write_chars = notify_chars = read_chars = []
+    t.WRITE_CHARACTERISTIC_UUID = pick_char_uuid(t.WRITE_CHARACTERISTIC_UUID, write_chars) or t.WRITE_CHARACTERISTIC_UUID
+    t.READ_CHARACTERISTIC_UUID = pick_char_uuid(t.READ_CHARACTERISTIC_UUID, read_chars) or t.READ_CHARACTERISTIC_UUID
+    notify_uuid = pick_char_uuid(t.NOTIFY_CHARACTERISTIC_UUID, notify_chars) or t.NOTIFY_CHARACTERISTIC_UUID
+    if notify_uuid != t.NOTIFY_CHARACTERISTIC_UUID:
+        await t.resubscribe(notify_uuid)
+    t.use_ios_le_protocol = None
+    t.escapePayload = t._configured_escape
+
+
+async def settle_and_probe(t: Any, profile: ConnectionProfile | None, started: float) -> None:
+    """Finish a connect: verify the applied ``profile``, or (without one, or
+    when it fails) settle and autoprobe; then save and record the report."""
+    from .ble_probe import autoprobe_protocol
+
+    if profile is not None and await verify(t):
+        source = "profile"
+    else:
+        if profile is not None:
+            t.logger.info("Saved BLE profile for %s did not verify; running full discovery.", t.mac)
+            await rediscover(t)
+            source = "rediscovered"
+        else:
+            source = "probed" if t.use_ios_le_protocol is None else "known"
+        await asyncio.sleep(SETTLE_S)
+        if not await autoprobe_protocol(t):
+            source = "default"  # nothing answered: don't persist a guess
+    if source in ("profile", "probed", "rediscovered"):
+        save(t)
+    t.connect_report = {"source": source,
+                        "connect_ms": round((time.monotonic() - started) * 1000.0, 1)}
@@ -9,7 +9,11 @@ from .divoom import BleakClient
 from bleak.exc import BleakError
 
 from . import models, framing
+from . import ble_acquire, ble_profile
 from .ble_notify import BleNotifyMixin
+from .ble_pacing import PacingTuner
+from .ble_write import BleWriteMixin
+from .response_table import ResponseTable
 from .transport_interface import DeviceTransport
 from .exceptions import (
     DeviceAddressMissingError,
@@ -17,7 +21,7 @@ from .exceptions import (
     DeviceConnectionError,
 )
 
-class BLETransport(BleNotifyMixin, DeviceTransport):
+class BLETransport(BleNotifyMixin, BleWriteMixin, DeviceTransport):
     """
     Bluetooth Low Energy (BLE) transport client for Divoom devices.
     Implements the DeviceTransport interface.
@@ -29,6 +33,7 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
     NOTIFY_TIMEOUT = 6.0
     STOP_NOTIFY_TIMEOUT = 3.0
     DISCONNECT_TIMEOUT = 5.0
+    # ATT write sizing (ATT_*, MAX_WRITE_CHUNK_SIZE) lives in BleWriteMixin.
     def __init__(self, cfg: models.DivoomConfig, logger: logging.Logger, divoom: Any = None) -> None:
         self.mac = cfg.mac
         self.device_name = cfg.device_name
@@ -41,15 +46,22 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
         self.SPP_CHARACTERISTIC_UUID = cfg.spp_characteristic_uuid if cfg.spp_characteristic_uuid else models.DEFAULT_SPP_CHARACTERISTIC_UUID
         self.escapePayload = cfg.escapePayload
         self.use_ios_le_protocol = cfg.use_ios_le_protocol
+        self.adapter = getattr(cfg, "adapter", None)
+        self._client_adapter = self.adapter
+        # What the caller configured, before a saved connection profile (see
+        # ble_profile.py) or the autoprobe replaced it for this session.
+        self._configured_uuids = (self.WRITE_CHARACTERISTIC_UUID, self.NOTIFY_CHARACTERISTIC_UUID,
+                                  self.READ_CHARACTERISTIC_UUID)
+        self._configured_escape = cfg.escapePayload
+        self.profile_store = ble_profile.default_store()
+        self.connect_report: dict | None = None
+        # Opt-in BlueZ AcquireWrite/AcquireNotify fds (see ble_acquire.py).
+        self.fast_path = ble_acquire.FastPath(self)
 
         if cfg.client:
             self.client = cfg.client
         elif self.mac:
-            from .divoom import BleakClient
-            # BLE Hardening P2: subscribe to the OS-level disconnect signal so a
-            # drop flips our health state IMMEDIATELY instead of being inferred
-            # from the next failed write (macOS CoreBluetooth's is_connected lags).
-            self.client = BleakClient(self.mac, disconnected_callback=self._on_os_disconnect)
+            self.client = self._new_client()
         else:
             self.client = None
 
@@ -62,9 +74,13 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
         # lock makes the invariant explicit so a future off-queue caller can't
         # silently corrupt an in-flight wait. See send_command_and_wait_for_response.
         self._response_lock = asyncio.Lock()
+        # Per-command response futures for send_command_and_wait_for_response;
+        # reads for different command ids need neither the lock nor the scalar.
+        self.responses = ResponseTable()
         self.message_buf = bytearray()
         self._write_lock = asyncio.Lock()
         self._last_write_time = 0.0
+        self._pacing: PacingTuner | None = None
         # Track whether we've already subscribed to notifications on the
         # current OS-level GATT session. macOS CoreBluetooth raises
         # "Characteristic notifications already started" if start_notify
@@ -99,11 +115,23 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
         into a dead link."""
         return self.is_connected and not self._connection_likely_broken
 
+    def _new_client(self):
+        from .divoom import BleakClient
+        # BLE Hardening P2: subscribe to the OS-level disconnect signal so a
+        # drop flips our health state IMMEDIATELY instead of being inferred
+        # from the next failed write (macOS CoreBluetooth's is_connected lags).
+        # ``adapter`` picks the BlueZ controller (see ble_adapters); only pass
+        # it when set so other backends see the exact old call.
+        self._client_adapter = self.adapter
+        kwargs = {"adapter": self.adapter} if self.adapter else {}
+        return BleakClient(self.mac, disconnected_callback=self._on_os_disconnect, **kwargs)
+
     def _on_os_disconnect(self, _client) -> None:
         """bleak fires this on the OS event loop when the link drops. Flag the
         link broken so is_alive() reports the truth before the next write."""
         self._connection_likely_broken = True
         self._notifications_started = False
+        self.fast_path.reset()
         self.logger.warning("OS-level BLE disconnect for %s", self.mac)
 
     async def connect(self) -> None:
@@ -112,6 +140,8 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
             raise DeviceAddressMissingError("No MAC address provided or discovered. Cannot connect.")
 
         is_mock = (self.client and "MockBleakClient" in self.client.__class__.__name__) or os.environ.get("DIVOOM_MOCK_BLE") in ("1", "true", "yes")
+        started = time.monotonic()
+        profile = ble_profile.load(self) if not self.is_connected else None
 
         # Resolve device name if not set
         if not is_mock and not self.device_name:
@@ -151,9 +181,9 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
             # (single↔wall switch). See divoom_lib/ble_registry.
             from . import ble_registry
             await ble_registry.evict(self.mac, self)
-            if not self.client or getattr(self.client, "address", None) != self.mac:
-                from .divoom import BleakClient
-                self.client = BleakClient(self.mac, disconnected_callback=self._on_os_disconnect)
+            if (not self.client or getattr(self.client, "address", None) != self.mac
+                    or self._client_adapter != self.adapter):
+                self.client = self._new_client()
 
         if not self.client.is_connected:
             try:
@@ -186,26 +216,47 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
                     "skipping start_notify (macOS CoreBluetooth 'already started' guard)."
                 )
             else:
-                cb = self._divoom.notification_handler if (self._divoom and hasattr(self._divoom, "notification_handler")) else self.notification_handler
-                # R53: bound start_notify too — a wedged GATT subscribe otherwise
-                # hangs connect() (and any write-lock-holding reconnect) forever.
-                try:
-                    await asyncio.wait_for(
-                        self.client.start_notify(self.NOTIFY_CHARACTERISTIC_UUID, cb),
-                        timeout=self.NOTIFY_TIMEOUT)
-                except asyncio.TimeoutError:
-                    raise DeviceConnectionError(
-                        f"start_notify timed out after {self.NOTIFY_TIMEOUT}s on {self.mac}")
-                self._notifications_started = True
-                self.logger.info(f"Enabled notifications for {self.NOTIFY_CHARACTERISTIC_UUID}")
+                await self._start_notify()
         else:
             self.logger.warning("No notify characteristic UUID set. Cannot enable notifications.")
 
-        await asyncio.sleep(1.0)
+        # Verify a saved connection profile, else settle + auto-probe the BLE
+        # framing (iOS-LE vs Basic) — see ble_profile / ble_probe.
+        await ble_profile.settle_and_probe(self, profile, started)
 
-        # Dynamic auto-probe of the BLE framing (iOS-LE vs Basic) — see ble_probe.
-        from .ble_probe import autoprobe_protocol
-        await autoprobe_protocol(self)
+    async def _start_notify(self) -> None:
+        cb = self._divoom.notification_handler if (self._divoom and hasattr(self._divoom, "notification_handler")) else self.notification_handler
+        if await self.fast_path.start_notify(cb):
+            self._notifications_started = True
+            return
+        # R53: bound start_notify too — a wedged GATT subscribe otherwise
+        # hangs connect() (and any write-lock-holding reconnect) forever.
+        try:
+            await asyncio.wait_for(
+                self.client.start_notify(self.NOTIFY_CHARACTERISTIC_UUID, cb),
+                timeout=self.NOTIFY_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise DeviceConnectionError(
+                f"start_notify timed out after {self.NOTIFY_TIMEOUT}s on {self.mac}")
+        self._notifications_started = True
+        self.logger.info(f"Enabled notifications for {self.NOTIFY_CHARACTERISTIC_UUID}")
+
+    async def resubscribe(self, notify_uuid: str) -> None:
+        """Move the notify subscription to ``notify_uuid`` (stale profile)."""
+        if self._notifications_started:
+            await self._stop_notify()
+            self._notifications_started = False
+        self.NOTIFY_CHARACTERISTIC_UUID = notify_uuid
+        await self._start_notify()
+
+    async def _stop_notify(self) -> None:
+        if self.fast_path.stop_notify():
+            return
+        try:
+            await asyncio.wait_for(self.client.stop_notify(self.NOTIFY_CHARACTERISTIC_UUID),
+                                   timeout=self.STOP_NOTIFY_TIMEOUT)
+        except Exception as e:
+            self.logger.debug("stop_notify on %s failed (continuing): %s", self.mac, e)
 
     async def disconnect(self) -> None:
         from . import ble_registry
@@ -216,12 +267,7 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
             # stop_notify was ever called — leaking the subscription, which made
             # a later start_notify on a fresh client raise "already started").
             if self._notifications_started and self.NOTIFY_CHARACTERISTIC_UUID:
-                try:
-                    await asyncio.wait_for(
-                        self.client.stop_notify(self.NOTIFY_CHARACTERISTIC_UUID),
-                        timeout=self.STOP_NOTIFY_TIMEOUT)
-                except Exception as e:
-                    self.logger.debug("stop_notify on %s failed (continuing): %s", self.mac, e)
+                await self._stop_notify()
             try:
                 # R53: bound the disconnect so a wedged teardown can't hang.
                 await asyncio.wait_for(self.client.disconnect(), timeout=self.DISCONNECT_TIMEOUT)
@@ -231,6 +277,7 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
                                     self.mac, self.DISCONNECT_TIMEOUT)
             except Exception as e:
                 self.logger.error("Error disconnecting from %s: %s", self.mac, e)
+        self.fast_path.reset()
         # Reset the notification-subscription flag so a future connect()
         # can re-subscribe cleanly.
         self._notifications_started = False
@@ -243,17 +290,16 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
     # _handle_basic_protocol_notification / wait_for_any_response /
     # wait_for_response / send_command_and_wait_for_response live in BleNotifyMixin.
 
-    async def send_command(self, command: int | str, args: list | None = None, write_with_response: bool = False) -> bool:
-        if args is None:
-            args = []
+    async def send_command(self, command: int | str, args: framing.Payload | None = None, write_with_response: bool = False) -> bool:
         if isinstance(command, str):
             command_name = command
             command = models.COMMANDS[command]
         else:
             command_name = f"0x{command:02x}"
 
-        self.logger.debug(f"Sending command: {command_name} (0x{command:02x}) with args: {args}")
-        payload_bytes = [command] + args
+        self.logger.debug("Sending command: %s (0x%02x) with %d arg bytes",
+                          command_name, command, len(args) if args is not None else 0)
+        payload_bytes = framing.command_payload(command, args)
 
         try:
             return await self.send_payload(payload_bytes, write_with_response=write_with_response)
@@ -261,20 +307,49 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
             self.logger.error(f"Error calling send_payload for command {command_name}: {e}")
             return False
 
-    async def send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
+    @property
+    def pacing(self) -> PacingTuner:
+        """Learned write pacing for the current MAC (see ble_pacing.py)."""
+        if getattr(self, "_pacing", None) is None or self._pacing.mac != self.mac:
+            self._pacing = PacingTuner.for_mac(self.mac)
+        return self._pacing
+
+    async def send_payload(self, payload_bytes: framing.Payload, max_retries: int = 3, **kwargs) -> bool:
+        return await self._paced_write(
+            lambda: self._send_payload_locked(payload_bytes, max_retries, **kwargs))
+
+    async def _paced_write(self, write) -> bool:
+        """Run ``write()`` under the write lock, at least ``pacing.write_gap_s``
+        after the previous write, and feed its latency/outcome to the tuner."""
+        pacing = self.pacing
         async with self._write_lock:
-            now = time.time()
-            elapsed = now - self._last_write_time
-            if elapsed < 0.05:
-                await asyncio.sleep(0.05 - elapsed)
-            
+            elapsed = time.time() - self._last_write_time
+            if elapsed < pacing.write_gap_s:
+                await asyncio.sleep(pacing.write_gap_s - elapsed)
+            started = time.monotonic()
+            ok = False
             try:
-                res = await self._send_payload_locked(payload_bytes, max_retries, **kwargs)
-                return res
+                ok = await write()
+                return ok
             finally:
                 self._last_write_time = time.time()
+                pacing.observe_write(time.monotonic() - started, bool(ok))
 
-    async def _send_payload_locked(self, payload_bytes: list, max_retries: int = 3, retry_delay: float = 0.1, write_with_response: bool = False) -> bool:
+    @property
+    def wire_framing(self) -> framing.WireFraming:
+        """Framing `_send_payload_locked` applies right now (iOS-LE is never escaped)."""
+        ios_le = bool(self.use_ios_le_protocol)
+        return framing.WireFraming(ios_le=ios_le, escape=not ios_le and bool(self.escapePayload))
+
+    async def send_frame(self, frame: framing.BytesLike, max_retries: int = 3, write_with_response: bool = False) -> bool:
+        """Write one packet that is already framed for `wire_framing` (see
+        framing.frame_8b_transfer) with the same pacing, retry and reconnect
+        handling as `send_payload`, minus the encode."""
+        return await self._paced_write(
+            lambda: self._send_payload_locked(frame, max_retries, write_with_response=write_with_response,
+                                              prebuilt=True))
+
+    async def _send_payload_locked(self, payload_bytes: framing.Payload, max_retries: int = 3, retry_delay: float = 0.1, write_with_response: bool = False, prebuilt: bool = False) -> bool:
         for attempt in range(max_retries):
             backoff = retry_delay * (2 ** attempt)
             # Treat the connection as broken if EITHER:
@@ -312,22 +387,18 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
                             return False
                         continue
 
-            if self.use_ios_le_protocol:
+            if prebuilt:
+                send_func = self._write_frame
+            elif self.use_ios_le_protocol:
                 send_func = self._divoom._send_ios_le_payload if (self._divoom and hasattr(self._divoom, "_send_ios_le_payload")) else self._send_ios_le_payload
-                if await send_func(payload_bytes, write_with_response):
-                    self._connection_likely_broken = False  # success — clear
-                    return True
-                elif attempt == max_retries - 1:
-                    return False
-                await asyncio.sleep(backoff)
             else:
                 send_func = self._divoom._send_basic_protocol_payload if (self._divoom and hasattr(self._divoom, "_send_basic_protocol_payload")) else self._send_basic_protocol_payload
-                if await send_func(payload_bytes, write_with_response):
-                    self._connection_likely_broken = False  # success — clear
-                    return True
-                elif attempt == max_retries - 1:
-                    return False
-                await asyncio.sleep(backoff)
+            if await send_func(payload_bytes, write_with_response):
+                self._connection_likely_broken = False  # success — clear
+                return True
+            elif attempt == max_retries - 1:
+                return False
+            await asyncio.sleep(backoff)
         return False
 
     def _flag_connection_broken(self, exception: Exception) -> None:
@@ -345,8 +416,25 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
         if "disconnected" in err_str or "not connected" in err_str or "not connected to" in err_str:
             self._connection_likely_broken = True
 
-    async def _send_ios_le_payload(self, payload_bytes: list, write_with_response: bool) -> bool:
-        message_bytes = framing.encode_ios_le_payload(payload_bytes)
+    async def _write_frame(self, frame: framing.BytesLike, write_with_response: bool) -> bool:
+        if await self.fast_path.write(frame, write_with_response, bulk=True):
+            return True
+        if self.use_ios_le_protocol:
+            return await self._write_ios_le_frame(frame, write_with_response)
+        return await self._write_basic_frame(frame, write_with_response)
+
+    async def _send_ios_le_payload(self, payload_bytes: framing.Payload, write_with_response: bool) -> bool:
+        return await self._write_ios_le_frame(framing.encode_ios_le_payload(payload_bytes), write_with_response)
+
+    async def _write_ios_le_frame(self, message_bytes: framing.BytesLike, write_with_response: bool) -> bool:
+        if await self.fast_path.write(message_bytes, write_with_response):
+            return True
+        # iOS-LE frames used to go out whole whatever the link; once the MTU is
+        # known, a write without response longer than it would be cut by the
+        # stack, so split it (with response, the stack's long write carries it).
+        size = self.negotiated_write_size
+        if size is not None and len(message_bytes) > size and not write_with_response:
+            return await self._write_split(message_bytes, size, write_with_response)
         try:
             if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug("PAYLOAD OUT (iOS LE): %s", message_bytes.hex())
@@ -357,28 +445,19 @@ class BLETransport(BleNotifyMixin, DeviceTransport):
             self._flag_connection_broken(e)
             return False
 
-    async def _send_basic_protocol_payload(self, payload_bytes: list, write_with_response: bool) -> bool:
+    async def _send_basic_protocol_payload(self, payload_bytes: framing.Payload, write_with_response: bool) -> bool:
         full_message = framing.encode_basic_payload(payload_bytes, escape=self.escapePayload)
-        chunk_size = models.DEFAULT_CHUNK_SIZE
+        return await self._write_basic_frame(full_message, write_with_response)
 
-        if len(full_message) > chunk_size:
-            self.logger.debug(f"Message too long ({len(full_message)} bytes), splitting into chunks of {chunk_size} bytes.")
-            chunks = [full_message[i:i + chunk_size] for i in range(0, len(full_message), chunk_size)]
+    async def _write_basic_frame(self, full_message: framing.BytesLike, write_with_response: bool) -> bool:
+        if await self.fast_path.write(full_message, write_with_response):
+            return True
+        # A frame that fits the negotiated write size goes out whole, in one ATT
+        # write; only longer ones are split (and paced) across several.
+        chunk_size = self.write_chunk_size
 
-            success = True
-            for i, chunk in enumerate(chunks):
-                try:
-                    if self.logger.isEnabledFor(logging.DEBUG):
-                        self.logger.debug("PAYLOAD OUT (Chunk %d/%d): %s", i + 1, len(chunks), chunk.hex())
-                    chunk_response = write_with_response and (i == len(chunks) - 1)
-                    await self.client.write_gatt_char(self.WRITE_CHARACTERISTIC_UUID, chunk, response=chunk_response)
-                    await asyncio.sleep(0.05)
-                except Exception as e:
-                    self.logger.error(f"Error sending chunk {i+1}: {e}")
-                    self._flag_connection_broken(e)
-                    success = False
-                    break
-            return success
+        if len(full_message) > chunk_size:
+            return await self._write_split(full_message, chunk_size, write_with_response)
         else:
             try:
                 if self.logger.isEnabledFor(logging.DEBUG):
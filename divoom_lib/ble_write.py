@@ -0,0 +1,94 @@
+"""Outbound ATT write sizing, splitting and packing for BLETransport.
+
+Split out of ble_transport.py: the write size follows the negotiated ATT MTU
+(``MTU - 3``, capped at 512) with the proven 200-byte chunks as the fallback
+while the MTU is unknown. A frame longer than the write size is split across
+paced writes. Several short pre-framed packets headed out together
+(`DivoomConnection.send_frames`, e.g. the 0x49 fallback) are packed back to
+back into one write (`pack_for_write`), never splitting a packet that fits.
+The device parses its RX as a byte stream: it already reassembles frames
+split across writes, so frames sharing a write are reassembled too.
+
+Mixed into BLETransport; relies on its ``client``, ``logger``, ``pacing``,
+``WRITE_CHARACTERISTIC_UUID`` and ``_flag_connection_broken``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable
+
+from . import framing, models
+
+
+def pack_frames(frames: Iterable[framing.BytesLike], size: int) -> list[framing.BytesLike]:
+    """Group consecutive whole ``frames`` into writes of at most ``size``
+    bytes. A frame longer than ``size`` travels alone (the writer splits it)."""
+    packs: list[framing.BytesLike] = []
+    current = bytearray()
+    for frame in frames:
+        if current and len(current) + len(frame) > size:
+            packs.append(bytes(current))
+            current = bytearray()
+        if not current and len(frame) >= size:
+            packs.append(frame)
+            continue
+        current += frame
+    if current:
+        packs.append(bytes(current))
+    return packs
+
+
+class BleWriteMixin:
+    # ATT write sizing: a write carries MTU - 3 bytes (opcode + handle). 23 is
+    # the pre-exchange default MTU, which some backends report before (or
+    # instead of) the real negotiated value — treat it as "unknown" and keep the
+    # proven 200-byte chunks. 512 is the largest attribute value ATT allows.
+    ATT_HEADER_SIZE = 3
+    ATT_DEFAULT_MTU = 23
+    MAX_WRITE_CHUNK_SIZE = 512
+
+    @property
+    def negotiated_write_size(self) -> int | None:
+        """``MTU - 3`` capped at 512, or None while the MTU is unknown."""
+        try:
+            mtu = getattr(self.client, "mtu_size", None)
+        except Exception:  # some backends raise before services are resolved
+            mtu = None
+        if type(mtu) is not int or mtu <= self.ATT_DEFAULT_MTU:
+            return None
+        return min(mtu - self.ATT_HEADER_SIZE, self.MAX_WRITE_CHUNK_SIZE)
+
+    @property
+    def write_chunk_size(self) -> int:
+        """Bytes per GATT write: `negotiated_write_size`, or
+        `models.DEFAULT_CHUNK_SIZE` while the MTU is unknown."""
+        size = self.negotiated_write_size
+        return models.DEFAULT_CHUNK_SIZE if size is None else size
+
+    def pack_for_write(self, frames: Iterable[framing.BytesLike]) -> list[framing.BytesLike]:
+        """``frames`` (already framed for ``wire_framing``) grouped into
+        `write_chunk_size` writes; `DivoomConnection.send_frames` sends each
+        with ``send_frame``, paced and retried as one packet."""
+        return pack_frames(frames, self.write_chunk_size)
+
+    async def _write_split(self, message: framing.BytesLike, chunk_size: int,
+                           write_with_response: bool) -> bool:
+        """Write ``message`` as paced ``chunk_size`` pieces; only the last one
+        asks for a response."""
+        self.logger.debug(f"Message too long ({len(message)} bytes), splitting into chunks of {chunk_size} bytes.")
+        # memoryview slices: chunking a framed 0x8B packet shouldn't copy it.
+        view = memoryview(message)
+        chunks = [view[i:i + chunk_size] for i in range(0, len(message), chunk_size)]
+        for i, chunk in enumerate(chunks):
+            try:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("PAYLOAD OUT (Chunk %d/%d): %s", i + 1, len(chunks), chunk.hex())
+                chunk_response = write_with_response and (i == len(chunks) - 1)
+                await self.client.write_gatt_char(self.WRITE_CHARACTERISTIC_UUID, chunk, response=chunk_response)
+                await asyncio.sleep(self.pacing.write_gap_s)
+            except Exception as e:
+                self.logger.error(f"Error sending chunk {i+1}: {e}")
+                self._flag_connection_broken(e)
+                return False
+        return True
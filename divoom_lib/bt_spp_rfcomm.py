@@ -1,41 +1,30 @@
 """macOS IOBluetooth RFCOMM backend for the SPP transport.
 
 Split out of bt_spp_transport.py (R53.12): the PyObjC/IOBluetooth run-loop, SDP
-channel discovery, the blocking RFCOMM open + delegate, and the shared inbound
-framer (`_on_data`, used by both the IOBluetooth delegate and the pyserial read
-loop). `BTSppTransport` mixes this in; the methods rely on its instance attributes
-(`mac_address`, `channel_id`, `logger`, `_runloop*`, `_open_event`, `_close_event`,
-`_rx_queue`, `_rx_buf`, `_last_error`, `_device`, `_delegate`, `_channel`) and its
-`FRAMING_*` class constants.
-
-`BtSppNotification` lives here (not in bt_spp_transport) so this module needs no
-import back into bt_spp_transport — bt_spp_transport re-exports it for callers.
+channel discovery, the blocking RFCOMM open + delegate, and the inbound framer
+(`_on_data`, used by both the IOBluetooth delegate and the pyserial read loop,
+backed by the shared `frame_parser.FrameParser`). `BTSppTransport` mixes this
+in; the methods rely on its instance attributes (`mac_address`, `channel_id`,
+`logger`, `_runloop*`, `_open_event`, `_close_event`, `_rx_queue`, `_rx_buf`,
+`_last_error`, `_device`, `_delegate`, `_channel`).
+
+`BtSppNotification` (an alias of `frame_parser.RxFrame`) is bound here so this
+module needs no import back into bt_spp_transport — bt_spp_transport re-exports it.
 """
 from __future__ import annotations
 
 import queue
 import threading
-from dataclasses import dataclass, field
 
-from . import models
-from .framing import parse_basic_protocol_frames, parse_ios_le_notification
+from .frame_parser import FrameParser, RxFrame
 
 
-@dataclass
-class BtSppNotification:
-    command_id: int
-    payload: bytes
-    framing: str
-    packet_number: int = 0
-    raw: bytes = field(default=b"")
+# The SPP RX record IS the shared parser's frame record (same fields/ctor as the
+# old dataclass: command_id, payload, framing, packet_number=0, raw=b"").
+BtSppNotification = RxFrame
 
 
 class _SppRfcommMixin:
-    # Upper bound on a single iOS-LE frame length decoded from bytes 4-5. Real
-    # device notifications are tiny (acks, page lists); anything beyond this is a
-    # corrupt length field, not a real frame — used to resync the RX parser.
-    _MAX_IOS_LE_FRAME = 8192
-
     def _start_runloop(self) -> None:
         if self._runloop_thread is not None and self._runloop_thread.is_alive():
             return
@@ -153,41 +142,17 @@ class _SppRfcommMixin:
             self._last_error = f"exception in _open_blocking: {e!r}"
             self._open_event.set()
 
+    @property
+    def _rx_buf(self) -> bytearray:
+        """Unconsumed RX bytes (the shared parser's parked partial frame)."""
+        return self._rx_parser.buffer
+
+    @_rx_buf.setter
+    def _rx_buf(self, val: bytearray) -> None:
+        self._rx_parser = FrameParser(val, keep_raw=True)
+
     def _on_data(self, chunk: bytes) -> None:
-        self._rx_buf.extend(chunk)
-        while (
-            len(self._rx_buf) >= models.IOS_LE_MIN_DATA_LENGTH
-            and bytes(self._rx_buf[:4]) == bytes(models.IOS_LE_HEADER)
-        ):
-            length_field = int.from_bytes(self._rx_buf[4:6], "little")
-            frame_len = length_field + 7
-            # A corrupt length (line noise in bytes 4-5) would otherwise make us
-            # wait FOREVER for bytes that never arrive — stalling all RX behind it.
-            # Bound it: an impossibly long frame means the "header" is bogus, so
-            # resync by dropping one byte (same recovery as a parse failure).
-            if frame_len > self._MAX_IOS_LE_FRAME:
-                del self._rx_buf[0]
-                continue
-            if len(self._rx_buf) < frame_len:
-                break
-            parsed = parse_ios_le_notification(bytes(self._rx_buf[:frame_len]))
-            if parsed is None:
-                del self._rx_buf[0]
-                continue
-            raw = bytes(self._rx_buf[:frame_len])
-            del self._rx_buf[:frame_len]
-            self._rx_queue.put(BtSppNotification(
-                command_id=parsed["command_id"], payload=parsed["payload"],
-                framing=self.FRAMING_IOS_LE, packet_number=parsed["packet_number"], raw=raw
-            ))
-        if self._rx_buf and (
-            len(self._rx_buf) < 4
-            or bytes(self._rx_buf[:4]) != bytes(models.IOS_LE_HEADER)
-        ):
-            msgs, remaining = parse_basic_protocol_frames(bytearray(self._rx_buf))
-            self._rx_buf = bytearray(remaining)
-            for m in msgs:
-                self._rx_queue.put(BtSppNotification(
-                    command_id=m["command_id"], payload=bytes(m["payload"]),
-                    framing=self.FRAMING_BASIC, raw=b""
-                ))
+        # Shared incremental framer (frame_parser): iOS-LE + basic with resync,
+        # one buffer compaction per chunk instead of one per frame.
+        for frame in self._rx_parser.feed(chunk):
+            self._rx_queue.put(frame)
@@ -0,0 +1,159 @@
+"""asyncio-native Linux RFCOMM backend for the SPP transport.
+
+`BTSppTransport` is built for macOS: an IOBluetooth run-loop thread (or a
+pyserial read thread) frames inbound bytes into a ``queue.Queue`` and the RX
+loop pulls each frame back onto the event loop through a thread-pool
+``queue.get`` — two thread hops per frame. On Linux the kernel speaks RFCOMM
+directly, so `BTSppSocketTransport` opens an ``AF_BLUETOOTH`` /
+``BTPROTO_RFCOMM`` stream socket and drives it from the loop itself:
+``loop.sock_recv_into`` fills one reusable buffer, the shared
+`frame_parser.FrameParser` frames it in place, and each frame goes straight
+to the response table or ``notification_queue``. Writes are
+``loop.sock_sendall`` under an asyncio lock.
+
+It subclasses `BTSppTransport`, so ``DivoomConnection``'s SPP routing,
+framing, retries and response waits are unchanged; only the socket plumbing
+differs. ``connector`` (an async ``(address, channel) -> socket``) is
+injectable, which is how the tests run it over a ``socketpair``. Linux has no
+SDP lookup here: the RFCOMM channel comes from ``DEFAULT_RFCOMM_CHANNEL_IDS``
+(or ``channel_id``).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+import sys
+from typing import Awaitable, Callable, Optional
+
+from .bt_spp_transport import BTSppTransport, BtSppNotification, BtSppTransportError
+from .framing import BytesLike
+from .frame_parser import FrameParser
+
+RECV_BUFFER_SIZE = 4096
+
+Connector = Callable[[str, int], Awaitable[socket.socket]]
+
+
+def available() -> bool:
+    """True where the kernel RFCOMM socket API exists (Linux / BlueZ)."""
+    return (sys.platform.startswith("linux") and hasattr(socket, "AF_BLUETOOTH")
+            and hasattr(socket, "BTPROTO_RFCOMM"))
+
+
+async def open_rfcomm_socket(address: str, channel: int) -> socket.socket:
+    """A connected, non-blocking RFCOMM stream socket to ``address``."""
+    sock = socket.socket(socket.AF_BLUETOOTH, socket.SOCK_STREAM, socket.BTPROTO_RFCOMM)
+    sock.setblocking(False)
+    try:
+        await asyncio.get_running_loop().sock_connect(sock, (address, channel))
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+class BTSppSocketTransport(BTSppTransport):
+    """SPP over a kernel RFCOMM socket, read and written on the event loop."""
+
+    def __init__(
+        self,
+        mac_address: str,
+        channel_id: int | None = None,
+        device_kind: str = "default",
+        logger: logging.Logger | None = None,
+        device_name: str | None = None,
+        connector: Connector | None = None,
+    ) -> None:
+        super().__init__(mac_address, channel_id, device_kind, logger, device_name)
+        self._connector = connector or open_rfcomm_socket
+        self._sock: Optional[socket.socket] = None
+        self._recv_buf = bytearray(RECV_BUFFER_SIZE)
+        self._parser = FrameParser(keep_raw=True)
+        self._send_lock = asyncio.Lock()
+
+    @property
+    def address(self) -> str:
+        """``mac_address`` as BlueZ wants it (``resolve_classic_mac`` dashes it)."""
+        return self.mac_address.replace("-", ":").upper()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._sock is not None and not self._close_event.is_set()
+
+    @property
+    def is_alive(self) -> bool:
+        return self.is_connected and self._rx_task is not None and not self._rx_task.done()
+
+    @property
+    def mtu(self) -> int:
+        return RECV_BUFFER_SIZE if self._sock is not None else 0
+
+    async def connect(self) -> None:
+        if self.is_connected:
+            self.logger.debug("BTSppSocketTransport already connected")
+            return
+        self._close_event.clear()
+        self._parser.reset()
+        while not self.notification_queue.empty():
+            self.notification_queue.get_nowait()
+        try:
+            self._sock = await asyncio.wait_for(
+                self._connector(self.address, self.channel_id), self.OPEN_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            raise BtSppTransportError(
+                f"RFCOMM connect to {self.address} channel {self.channel_id} timed out")
+        except OSError as e:
+            raise BtSppTransportError(f"RFCOMM connect to {self.address} failed: {e}") from e
+        self.logger.info(f"BT Classic SPP socket open: {self.address} channel {self.channel_id}")
+        self._rx_task = asyncio.create_task(self._rx_loop())
+
+    async def disconnect(self) -> None:
+        self._close_event.set()
+        if self._rx_task:
+            self._rx_task.cancel()
+            try:
+                await self._rx_task
+            except asyncio.CancelledError:
+                pass
+            self._rx_task = None
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        self._parser.reset()
+
+    async def _write(self, frame: BytesLike, framing: str) -> None:
+        sock = self._sock
+        if sock is None:
+            raise BtSppTransportError("socket closed during write")
+        async with self._send_lock:
+            await asyncio.get_running_loop().sock_sendall(sock, frame)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("[BT-SPP-Socket] sent (%s): %s", framing, bytes(frame).hex())
+
+    async def read_notification(self, timeout: float = BTSppTransport.DEFAULT_READ_TIMEOUT_S) -> BtSppNotification:
+        """Next frame nobody was waiting for (frames are queued by the RX loop)."""
+        try:
+            return await asyncio.wait_for(self.notification_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"no notification within {timeout}s on {self.mac_address}")
+
+    async def _rx_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        view = memoryview(self._recv_buf)
+        try:
+            while self._sock is not None:
+                n = await loop.sock_recv_into(self._sock, view)
+                if n == 0:
+                    self.logger.warning("SPP socket to %s closed by the device", self.address)
+                    break
+                for frame in self._parser.feed(view[:n]):
+                    if not self._responses.deliver(frame.command_id, frame.payload):
+                        self.notification_queue.put_nowait(frame)
+        except OSError as e:
+            self.logger.warning("SPP socket read loop exiting on error: %s", e)
+        finally:
+            self._close_event.set()
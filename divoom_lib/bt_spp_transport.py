@@ -9,10 +9,13 @@ from typing import Optional, Any
 
 from . import models, framing
 from .transport_interface import DeviceTransport
-from .framing import encode_basic_payload, encode_ios_le_payload
+from .framing import (
+    BytesLike, Payload, WireFraming, command_payload, encode_basic_payload, encode_ios_le_payload,
+)
 # BtSppNotification + the IOBluetooth RFCOMM backend live in bt_spp_rfcomm (R53.12);
 # re-export BtSppNotification so existing `from .bt_spp_transport import ...` keeps working.
 from .bt_spp_rfcomm import _SppRfcommMixin, BtSppNotification
+from .response_table import ResponseTable
 
 DEFAULT_RFCOMM_CHANNEL_IDS: dict[str, int] = {
     "pixoo": 1,
@@ -72,6 +75,13 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
         self.notification_queue = asyncio.Queue()
         self._rx_task: Optional[asyncio.Task] = None
         self._expected_response_command = None
+        self._responses = ResponseTable()
+
+    @property
+    def responses(self) -> ResponseTable | None:
+        """Per-command response futures, fed by the RX loop (None while it
+        isn't running, so waits fall back to the notification queue)."""
+        return self._responses if self._rx_task is not None else None
 
     @property
     def is_connected(self) -> bool:
@@ -233,7 +243,7 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
 
     async def send(
         self,
-        payload: list[int],
+        payload: Payload,
         framing: str = FRAMING_BASIC,
         packet_number: int = 0,
     ) -> None:
@@ -246,7 +256,9 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
             frame = encode_ios_le_payload(payload, packet_number=packet_number)
         else:
             raise ValueError(f"unknown framing: {framing!r}")
+        await self._write(frame, framing)
 
+    async def _write(self, frame: BytesLike, framing: str) -> None:
         if self._serial_port and self._serial_port.is_open:
             def _do_serial_write():
                 with self._write_lock:
@@ -256,7 +268,8 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
                     self._serial_port.flush()
 
             await asyncio.to_thread(_do_serial_write)
-            self.logger.debug(f"[BT-SPP-Serial ] sent ({framing}): {frame.hex()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("[BT-SPP-Serial ] sent (%s): %s", framing, frame.hex())
             return
 
         def _do_write():
@@ -268,7 +281,8 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
                     raise BtSppTransportError(f"writeSync_length_ returned {rc}")
 
         await asyncio.to_thread(_do_write)
-        self.logger.debug(f"[BT-SPP ] sent ({framing}): {frame.hex()}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("[BT-SPP ] sent (%s): %s", framing, frame.hex())
 
     async def read_notification(
         self, timeout: float = DEFAULT_READ_TIMEOUT_S
@@ -285,12 +299,11 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
     async def _rx_loop(self) -> None:
         while self.is_connected:
             try:
+                # RxFrame reads like the old {'command_id', 'payload'} dict, so
+                # it's queued as-is (no per-frame re-copy).
                 notif = await self.read_notification(timeout=1.0)
-                response_payload = {
-                    'command_id': notif.command_id,
-                    'payload': bytearray(notif.payload)
-                }
-                self.notification_queue.put_nowait(response_payload)
+                if not self._responses.deliver(notif.get('command_id'), notif.get('payload')):
+                    self.notification_queue.put_nowait(notif)
             except asyncio.TimeoutError:
                 continue
             except asyncio.CancelledError:
@@ -300,15 +313,13 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
                 break
 
     # DeviceTransport methods mapping
-    async def send_command(self, command: int | str, args: list | None = None, write_with_response: bool = False) -> bool:
-        if args is None:
-            args = []
+    async def send_command(self, command: int | str, args: Payload | None = None, write_with_response: bool = False) -> bool:
         if isinstance(command, str):
             command = models.COMMANDS[command]
-        payload_bytes = [command] + args
+        payload_bytes = command_payload(command, args)
         return await self.send_payload(payload_bytes)
 
-    async def send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
+    async def send_payload(self, payload_bytes: Payload, max_retries: int = 3, **kwargs) -> bool:
         # max_retries was accepted but ignored — a single transient write failure
         # (busy channel, momentary EAGAIN) failed the whole op. Retry with a short
         # backoff; bail early once disconnected (no point retrying a dead link).
@@ -328,8 +339,33 @@ class BTSppTransport(_SppRfcommMixin, DeviceTransport):
                 await asyncio.sleep(0.1 * attempt)
         return False
 
+    @property
+    def wire_framing(self) -> WireFraming:
+        """`send_payload` always frames basic-protocol, unescaped."""
+        return WireFraming()
+
+    async def send_frame(self, frame: BytesLike, max_retries: int = 3, write_with_response: bool = False) -> bool:
+        """Write one packet already framed for `wire_framing` (see
+        framing.frame_8b_transfer), retrying like `send_payload`."""
+        if not self.is_connected:
+            return False
+        attempts = max(1, int(max_retries))
+        for attempt in range(1, attempts + 1):
+            try:
+                await self._write(bytes(frame), "prebuilt")  # IOBluetooth wants bytes
+                return True
+            except Exception as e:
+                if attempt >= attempts or not self.is_connected:
+                    self.logger.error("SPP send_frame failed after %d attempt(s): %s", attempt, e)
+                    return False
+                await asyncio.sleep(0.1 * attempt)
+        return False
+
     async def send_command_and_wait_for_response(self, command: int | str, args: list | None = None, timeout: float = 10.0) -> bytes | None:
         command_id = models.COMMANDS.get(command, command) if isinstance(command, str) else command
+        if self.responses is not None:
+            return await self.responses.request(
+                command_id, lambda: self.send_command(command, args), timeout)
         while not self.notification_queue.empty():
             self.notification_queue.get_nowait()
         self._expected_response_command = command_id
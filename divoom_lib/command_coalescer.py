@@ -0,0 +1,88 @@
+"""Last-value-wins coalescing of idempotent setter writes.
+
+Dragging the brightness or volume slider (or an agent looping
+``set_brightness``) issues dozens of writes, each paying the full BLE write
+gap, and only the last value matters. For commands in
+`models.COALESCABLE_COMMANDS`, `WriteCoalescer` keeps at most one queued
+write per key (command id plus its sub-mode bytes): a newer value replaces
+the queued one's args until the write claims the connection's write slot,
+and every caller that joined resolves with the result of the write that
+actually went out.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable
+
+from . import framing, models
+
+CoalesceKey = tuple[int, bytes]
+
+
+def coalesce_key(command_id: int, args: framing.Payload | None) -> CoalesceKey | None:
+    """Key for a coalescable write, or None if ``command_id`` must not coalesce."""
+    prefix = models.COALESCABLE_COMMANDS.get(command_id)
+    if prefix is None:
+        return None
+    args = args if args is not None else ()
+    if len(args) < prefix:
+        return None
+    return command_id, bytes(args[:prefix])
+
+
+class _Pending:
+    __slots__ = ("args", "task")
+
+    def __init__(self, args: framing.Payload | None) -> None:
+        self.args = args
+        self.task: asyncio.Future | None = None
+
+
+class WriteCoalescer:
+    """Queued coalescable writes for one connection, one per key."""
+
+    def __init__(self) -> None:
+        self._pending: dict[CoalesceKey, _Pending] = {}
+        self.submitted = 0
+        self.coalesced = 0
+
+    async def submit(self, key: CoalesceKey, args: framing.Payload | None,
+                     send: Callable[[Callable[[], framing.Payload | None]], Awaitable[bool]]) -> bool:
+        """Queue ``args`` under ``key`` and return the result of the write
+        that carries the winning value.
+
+        ``send(take)`` performs the write: it must claim the write slot first
+        and only then call ``take()``, which detaches the entry (later values
+        queue a fresh write) and returns the newest args. The write runs in
+        its own task, so a cancelled caller never strands the others.
+        """
+        self.submitted += 1
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.args = args
+            self.coalesced += 1
+        else:
+            pending = self._pending[key] = _Pending(args)
+
+            def take() -> framing.Payload | None:
+                if self._pending.get(key) is pending:
+                    del self._pending[key]
+                return pending.args
+
+            pending.task = asyncio.ensure_future(self._run(key, pending, send, take))
+        return await asyncio.shield(pending.task)
+
+    async def _run(self, key: CoalesceKey, pending: _Pending, send, take) -> bool:
+        try:
+            return await send(take)
+        finally:
+            if self._pending.get(key) is pending:  # send failed before take()
+                del self._pending[key]
+
+    @property
+    def queued(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        return {"submitted": self.submitted, "coalesced": self.coalesced,
+                "queued": self.queued}
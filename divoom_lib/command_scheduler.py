@@ -0,0 +1,169 @@
+"""Priority scheduling of device writes inside one `DivoomConnection`.
+
+Every write used to reach the transport in arrival order, so a brightness
+slider or a game key press issued during a 0x8B upload queued behind whatever
+chunks were already waiting. `CommandScheduler` hands out the connection's
+single write slot by priority instead:
+
+  - ``INTERACTIVE``: commands a person is waiting on
+    (`models.INTERACTIVE_COMMANDS`: brightness, volume, game keys);
+  - ``NORMAL``: everything else;
+  - ``BULK``: packets of a transfer registered with `bulk()` (the 0x8B
+    stream registers itself).
+
+A slot covers exactly one packet, so bulk transfers are preempted only at
+packet boundaries — never mid-frame. Waiters of equal priority keep FIFO
+order. Queueing delay (request to slot grant) is tracked per priority.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator
+
+from . import models
+
+
+class Priority(IntEnum):
+    """Write priority; lower values are served first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+# Priority of the current task's writes when none is given explicitly (set by
+# `CommandScheduler.bulk` / `priority`), and whether it already holds the slot.
+_task_priority: contextvars.ContextVar[Priority | None] = \
+    contextvars.ContextVar("divoom_write_priority", default=None)
+_holding_slot: contextvars.ContextVar[bool] = \
+    contextvars.ContextVar("divoom_holding_write_slot", default=False)
+
+
+def priority_for(command_id: int | None, priority: Priority | None = None) -> Priority:
+    """Resolve a write's priority: explicit, then the task's, then by command."""
+    if priority is not None:
+        return Priority(priority)
+    current = _task_priority.get()
+    if current is not None:
+        return current
+    if command_id in models.INTERACTIVE_COMMANDS:
+        return Priority.INTERACTIVE
+    return Priority.NORMAL
+
+
+class _DelayStats:
+    __slots__ = ("count", "total_s", "max_s")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def add(self, delay_s: float) -> None:
+        self.count += 1
+        self.total_s += delay_s
+        self.max_s = max(self.max_s, delay_s)
+
+    def as_dict(self) -> dict:
+        mean = self.total_s / self.count if self.count else 0.0
+        return {"count": self.count, "mean_ms": round(mean * 1000.0, 3),
+                "max_ms": round(self.max_s * 1000.0, 3)}
+
+
+class CommandScheduler:
+    """One write slot per connection, granted highest priority first."""
+
+    def __init__(self) -> None:
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._delays = {p: _DelayStats() for p in Priority}
+        self.bulk_active = 0
+        self.preemptions = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.NORMAL) -> AsyncIterator[None]:
+        """Hold the connection's write slot for one packet.
+
+        Re-entrant within a task: a write issued while the task already holds
+        the slot (e.g. from a reconnect inside a send) goes straight through.
+        """
+        if _holding_slot.get():
+            yield
+            return
+        await self._acquire(Priority(priority))
+        token = _holding_slot.set(True)
+        try:
+            yield
+        finally:
+            _holding_slot.reset(token)
+            self._release()
+
+    @asynccontextmanager
+    async def bulk(self) -> AsyncIterator[None]:
+        """Register the current task's transfer as preemptible: its writes run
+        at ``BULK`` priority, so queued interactive and normal commands are
+        sent between its packets."""
+        self.bulk_active += 1
+        token = _task_priority.set(Priority.BULK)
+        try:
+            yield
+        finally:
+            _task_priority.reset(token)
+            self.bulk_active -= 1
+
+    @asynccontextmanager
+    async def priority(self, priority: Priority) -> AsyncIterator[None]:
+        """Run the current task's writes at ``priority`` unless a call says otherwise."""
+        token = _task_priority.set(Priority(priority))
+        try:
+            yield
+        finally:
+            _task_priority.reset(token)
+
+    async def _acquire(self, priority: Priority) -> None:
+        requested = time.monotonic()
+        if not self._busy and not self._waiters:
+            self._busy = True
+        else:
+            fut = asyncio.get_running_loop().create_future()
+            entry = (int(priority), next(self._seq), fut)
+            heapq.heappush(self._waiters, entry)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    self._release()  # granted as we were cancelled: pass it on
+                elif entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                raise
+        self._delays[priority].add(time.monotonic() - requested)
+        if self.bulk_active and priority < Priority.BULK:
+            self.preemptions += 1
+
+    def _release(self) -> None:
+        while self._waiters:
+            _priority, _seq, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            fut.set_result(None)  # slot passes directly to the waiter
+            return
+        self._busy = False
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _p, _s, fut in self._waiters if not fut.done())
+
+    def stats(self) -> dict:
+        """Queueing delay per priority, plus bulk counters (``preemptions`` =
+        interactive/normal writes sent while a bulk transfer was running)."""
+        out = {p.name.lower(): self._delays[p].as_dict() for p in Priority}
+        out.update(queued=self.queued, bulk_active=self.bulk_active,
+                   preemptions=self.preemptions)
+        return out
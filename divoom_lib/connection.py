@@ -3,12 +3,17 @@
 import asyncio
 import logging
 import os
-from typing import Optional, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Any
 
-from . import models
+from . import models, framing
 from .transport_interface import DeviceTransport
 from .ble_transport import BLETransport
-from . import bt_spp_transport
+from . import ble_acquire, bt_spp_socket, bt_spp_transport
+from .push_state import PushState
+from .command_scheduler import CommandScheduler, Priority, priority_for
+from .command_coalescer import WriteCoalescer, coalesce_key
+from .response_table import ResponseTable
 
 class DivoomConnection(DeviceTransport):
     """
@@ -28,6 +33,12 @@ class DivoomConnection(DeviceTransport):
         # sequence here too, so two concurrent waiters on one device can't drain
         # each other's frames or clobber _expected_response_command.
         self._response_lock = asyncio.Lock()
+        # Skip-if-unchanged digest for Display.show_image; see push_state.py.
+        self.push_state = PushState()
+        # Priority-ordered write slot; see command_scheduler.py.
+        self.scheduler = CommandScheduler()
+        # Last-value-wins for queued idempotent setters; see command_coalescer.py.
+        self.coalescer = WriteCoalescer()
 
         # Instantiate BLETransport as the initial default
         self._active_transport = BLETransport(cfg, self.logger, divoom=self._divoom)
@@ -47,6 +58,7 @@ class DivoomConnection(DeviceTransport):
         return self._use_spp
 
     async def connect(self) -> None:
+        self.push_state.invalidate()
         mac = self.mac
         device_name = self.device_name
         is_mock = (self.client and "MockBleakClient" in self.client.__class__.__name__) or os.environ.get("DIVOOM_MOCK_BLE") in ("1", "true", "yes")
@@ -110,9 +122,12 @@ class DivoomConnection(DeviceTransport):
                     elif "tivoo" in name_lower:
                         device_kind = "tivoo"
                     
+                    # Linux: kernel RFCOMM socket driven by the loop (bt_spp_socket).
+                    spp_cls = (bt_spp_socket.BTSppSocketTransport if bt_spp_socket.available()
+                               else bt_spp_transport.BTSppTransport)
                     self.logger.info(f"Switching transport to BTSppTransport for {device_name}...")
                     await self._teardown_outgoing_transport()
-                    self._active_transport = bt_spp_transport.BTSppTransport(
+                    self._active_transport = spp_cls(
                         mac_address=classic_mac,
                         device_kind=device_kind,
                         logger=self.logger,
@@ -148,35 +163,92 @@ class DivoomConnection(DeviceTransport):
             self.logger.debug("outgoing transport teardown failed (continuing): %s", e)
 
     async def disconnect(self) -> None:
+        self.push_state.invalidate()
         await self._active_transport.disconnect()
 
     def notification_handler(self, sender: int, data: bytearray) -> None:
         if hasattr(self._active_transport, "notification_handler"):
             self._active_transport.notification_handler(sender, data)
 
-    async def send_command(self, command: int | str, args: list | None = None, write_with_response: bool = False) -> bool:
-        if args is None:
-            args = []
+    async def send_command(self, command: int | str, args: framing.Payload | None = None, write_with_response: bool = False, priority: Priority | None = None) -> bool:
         if isinstance(command, str):
             command_name = command
             command = models.COMMANDS[command]
         else:
             command_name = f"0x{command:02x}"
+        if command in models.DISPLAY_CHANGING_COMMANDS:
+            self.push_state.invalidate()
 
-        self.logger.debug(f"Sending command: {command_name} (0x{command:02x}) with args: {args}")
-        payload_bytes = [command] + args
+        # Lazy: this runs once per 0x8B chunk, so never format the args eagerly.
+        self.logger.debug("Sending command: %s (0x%02x) with %d arg bytes",
+                          command_name, command, len(args) if args is not None else 0)
+        priority = priority_for(command, priority)
 
-        try:
-            return await self._divoom._send_payload(payload_bytes, write_with_response=write_with_response)
-        except Exception as e:
-            self.logger.error(f"Error calling send_payload for command {command_name}: {e}")
-            return False
+        async def send(take) -> bool:
+            async with self.scheduler.slot(priority):
+                try:
+                    return await self._divoom._send_payload(
+                        framing.command_payload(command, take()), write_with_response=write_with_response)
+                except Exception as e:
+                    self.logger.error(f"Error calling send_payload for command {command_name}: {e}")
+                    return False
 
-    async def send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
-        return await self._active_transport.send_payload(payload_bytes, max_retries, **kwargs)
+        key = coalesce_key(command, args)
+        if key is not None:
+            return await self.coalescer.submit(key, args, send)
+        return await send(lambda: args)
+
+    async def send_payload(self, payload_bytes: framing.Payload, max_retries: int = 3, **kwargs) -> bool:
+        async with self.scheduler.slot(priority_for(None, kwargs.pop("priority", None))):
+            return await self._active_transport.send_payload(payload_bytes, max_retries, **kwargs)
+
+    @property
+    def wire_framing(self) -> framing.WireFraming | None:
+        """Active transport's outbound framing, or None if it can't take pre-framed packets."""
+        return getattr(self._active_transport, "wire_framing", None)
+
+    async def send_frame(self, frame: framing.BytesLike, max_retries: int = 3, **kwargs) -> bool:
+        async with self.scheduler.slot(priority_for(None, kwargs.pop("priority", None))):
+            return await self._active_transport.send_frame(frame, max_retries, **kwargs)
+
+    async def send_frames(self, frames: list, max_retries: int = 3, **kwargs) -> bool:
+        """Pre-framed packets in order; BLE packs several per ATT write (ble_write)."""
+        for frame in getattr(self._active_transport, "pack_for_write", list)(frames):
+            if not await self.send_frame(frame, max_retries, **kwargs):
+                return False
+        return True
+
+    @asynccontextmanager
+    async def bulk_transfer(self) -> AsyncIterator[None]:
+        """Run a multi-packet transfer as preemptible bulk traffic (queued commands go
+        out between its packets); scalar-path reads wait for it, correlated reads don't."""
+        async with self._response_lock, self.scheduler.bulk(), ble_acquire.bulk_window(self._active_transport):
+            yield
+
+    @property
+    def pacing(self) -> Any:
+        """Active transport's learned write pacing (BLE only), else None."""
+        return getattr(self._active_transport, "pacing", None)
+
+    @property
+    def write_chunk_size(self) -> int | None:
+        """Active transport's MTU-derived BLE write size, else None."""
+        return getattr(self._active_transport, "write_chunk_size", None)
+
+    @property
+    def connect_report(self) -> dict | None:
+        """How the active BLE transport's last connect went (ble_profile)."""
+        return getattr(self._active_transport, "connect_report", None)
 
     async def send_command_and_wait_for_response(self, command: int | str, args: list | None = None, timeout: float = 10.0) -> bytes | None:
         command_id = models.COMMANDS.get(command, command) if isinstance(command, str) else command
+        table = getattr(self._active_transport, "responses", None)
+        if isinstance(table, ResponseTable):
+            # The transport's notification handler resolves a future per command
+            # id, so reads for different ids overlap: no drain, scalar or lock.
+            return await table.request(
+                command_id, lambda: self._divoom.send_command(command, args, write_with_response=True),
+                timeout)
         if self._response_lock.locked():
             self.logger.warning(
                 "send_command_and_wait_for_response(0x%02x) contended — another "
@@ -218,6 +290,17 @@ class DivoomConnection(DeviceTransport):
             self._active_transport = val
             self._use_spp = True
 
+    @property
+    def adapter(self) -> str | None:
+        return getattr(self._active_transport, "adapter", None)
+
+    @adapter.setter
+    def adapter(self, val: str | None) -> None:
+        """Host BLE adapter for the next (re)connect; SPP ignores it."""
+        self.cfg.adapter = val
+        if not self._use_spp:
+            self._active_transport.adapter = val
+
     @property
     def mac(self) -> str | None:
         if self._use_spp:
@@ -381,7 +464,7 @@ class DivoomConnection(DeviceTransport):
             return self._active_transport._handle_basic_protocol_notification(new_data)
         return False
 
-    async def _send_basic_protocol_payload(self, payload_bytes: list, write_with_response: bool) -> bool:
+    async def _send_basic_protocol_payload(self, payload_bytes: framing.Payload, write_with_response: bool) -> bool:
         if self._use_spp:
             try:
                 await self._active_transport.send(payload_bytes, framing=self._active_transport.FRAMING_BASIC)
@@ -393,7 +476,7 @@ class DivoomConnection(DeviceTransport):
             return await self._active_transport._send_basic_protocol_payload(payload_bytes, write_with_response)
         return await self.send_payload(payload_bytes, write_with_response=write_with_response)
 
-    async def _send_ios_le_payload(self, payload_bytes: list, write_with_response: bool) -> bool:
+    async def _send_ios_le_payload(self, payload_bytes: framing.Payload, write_with_response: bool) -> bool:
         if self._use_spp:
             try:
                 await self._active_transport.send(payload_bytes, framing=self._active_transport.FRAMING_IOS_LE)
@@ -405,7 +488,7 @@ class DivoomConnection(DeviceTransport):
             return await self._active_transport._send_ios_le_payload(payload_bytes, write_with_response)
         return await self.send_payload(payload_bytes, write_with_response=write_with_response)
 
-    async def _send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
+    async def _send_payload(self, payload_bytes: framing.Payload, max_retries: int = 3, **kwargs) -> bool:
         if self._use_spp:
             return await self._send_basic_protocol_payload(payload_bytes, write_with_response=kwargs.get("write_with_response", False))
         return await self._active_transport.send_payload(payload_bytes, max_retries, **kwargs)
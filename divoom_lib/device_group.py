@@ -0,0 +1,176 @@
+"""
+device_group.py — Encode-once fan-out of the same content to many devices.
+
+`DivoomWall` splits one canvas across panels; a `DeviceGroup` shows the
+*same* image on every member (a shop window of Pixoos, a desk and a shelf
+Timoo). Calling ``display.show_image`` per device repeats `process_image`
+and `_build_animation_blob` for each one, although same-size devices get
+byte-identical output. `DeviceGroup.show_image` instead:
+
+  - buckets the members into encode classes: ``("lan", HTTP_GIF_SIZE)`` for
+    WiFi devices that take ``Draw/SendHttpGif`` frames, ``("ble", N)`` for
+    the 0x8B blob at screensize N (BLE and SPP frame the same blob),
+  - decodes and encodes once per class in a worker thread (through the
+    first member's ``_encode_blob``, so its blob cache still applies),
+  - streams the result to every member of the class concurrently, at most
+    ``concurrency`` pushes at a time, and
+  - returns ``{mac: bool}`` per device; ``push_result`` adds the errors,
+    the encode classes and the elapsed time.
+
+The broadcast setters (brightness, volume, channel, light, clock) fan out
+through the same limit and return the same per-device mapping.
+"""
+
+import asyncio
+import logging
+import time as clock
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+from divoom_lib.utils.image_processing import process_image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+
+class DeviceGroup:
+    """
+    Pushes identical content to a set of connected `Divoom` devices.
+
+    Usage::
+
+        from divoom_lib.device_group import DeviceGroup
+
+        group = DeviceGroup([pixoo_a, pixoo_b, timoo], concurrency=2)
+        await group.connect()
+        results = await group.show_image("assets/logo.gif")   # {mac: bool}
+        await group.set_brightness(60)
+    """
+
+    def __init__(self, devices: Iterable[Any], concurrency: int = DEFAULT_CONCURRENCY,
+                 logger: logging.Logger | None = None) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1; got {concurrency}")
+        self.devices = list(devices)
+        self.concurrency = concurrency
+        self.logger = logger or logging.getLogger(__name__)
+        self.push_result: Dict[str, Any] = {}  # last show_image: per-device errors + classes
+
+    @staticmethod
+    def _encode_class(divoom) -> tuple[str, int]:
+        lan = getattr(divoom, "lan", None)
+        if lan is not None and hasattr(lan, "send_http_gif") and getattr(lan, "is_reachable", True):
+            return "lan", lan.HTTP_GIF_SIZE
+        return "ble", divoom.display._get_screensize()
+
+    async def _fan_out(self, call: Callable[[Any], Awaitable[Any]],
+                       devices: list | None = None) -> Dict[str, Any]:
+        """Run ``call(divoom)`` for each device, ``concurrency`` at a time;
+        ``{mac: result or exception}``."""
+        gate = asyncio.Semaphore(self.concurrency)
+        devices = self.devices if devices is None else devices
+
+        async def _one(divoom):
+            async with gate:
+                return await call(divoom)
+
+        # return_exceptions: one device's failure must not abandon the others.
+        results = await asyncio.gather(*[_one(d) for d in devices], return_exceptions=True)
+        return {d.mac: res for d, res in zip(devices, results)}
+
+    def _report(self, name: str, results: Dict[str, Any],
+                ok: Callable[[Any], bool] = lambda res: res is True) -> Dict[str, bool]:
+        flags = {}
+        for mac, res in results.items():
+            flags[mac] = ok(res)
+            if not flags[mac]:
+                self.logger.error(f"{name} failed on {mac}: {res}")
+        return flags
+
+    async def connect(self) -> Dict[str, bool]:
+        """Connect every member; a failed connect is reported, not raised."""
+        results = await self._fan_out(lambda d: d.connect())
+        return self._report("connect", results, lambda res: not isinstance(res, BaseException))
+
+    async def disconnect(self) -> None:
+        await self._fan_out(lambda d: d.disconnect())
+
+    def _encode(self, lead, kind: str, size: int, file: str | list, time: int | None,
+                reuse_palette: bool) -> tuple:
+        """One class's payload. Blocking: runs in a worker."""
+        if kind == "lan":
+            if isinstance(file, list):
+                return file, None
+            frames, *_ = process_image(file, time=time, size=size)
+            return frames, None
+        return file, lead.display._encode_blob(file, time, size, reuse_palette)
+
+    async def show_image(self, file: str | list, time: int | None = None,
+                         reuse_palette: bool = False, force: bool = False) -> Dict[str, bool]:
+        """Show ``file`` (a path, or frames in the `process_image` layout) on
+        every member, encoding once per class; returns ``{mac: bool}``."""
+        started = clock.monotonic()
+        classes: Dict[tuple, list] = {}
+        for divoom in self.devices:
+            classes.setdefault(self._encode_class(divoom), []).append(divoom)
+        self.logger.info(f"Group push to {len(self.devices)} device(s) in "
+                         f"{len(classes)} encode class(es): {sorted(classes)}")
+
+        async def _encode(key, members):
+            return await asyncio.to_thread(self._encode, members[0], *key, file, time,
+                                           reuse_palette)
+
+        encodes = await asyncio.gather(*[_encode(k, m) for k, m in classes.items()],
+                                       return_exceptions=True)
+        payloads = {}
+        results: Dict[str, Any] = {}
+        for (key, members), payload in zip(classes.items(), encodes):
+            if isinstance(payload, BaseException):
+                results.update({d.mac: payload for d in members})
+            else:
+                payloads.update({d.mac: payload for d in members})
+
+        def _push(divoom):
+            source, encoded = payloads[divoom.mac]
+            return divoom.display.show_image(source, time=time, reuse_palette=reuse_palette,
+                                             force=force, encoded=encoded)
+
+        ready = [d for d in self.devices if d.mac in payloads]
+        results.update(await self._fan_out(_push, ready))
+        flags = self._report("show_image", {d.mac: results[d.mac] for d in self.devices})
+        self.push_result = {
+            "ok": all(flags.values()),
+            "errors": {mac: str(res) for mac, res in results.items() if res is not True},
+            "classes": {f"{kind}:{size}": [d.mac for d in members]
+                        for (kind, size), members in classes.items()},
+            "elapsed_s": round(clock.monotonic() - started, 4),
+        }
+        return flags
+
+    async def set_brightness(self, brightness: int) -> Dict[str, bool]:
+        """Brightness on every member, over LAN when available (as the wall does)."""
+        def _call(divoom):
+            if getattr(divoom, "lan", None):
+                return divoom.lan.set_brightness(brightness)
+            return divoom.device.set_brightness(brightness)
+        results = await self._fan_out(_call)
+        return self._report("set_brightness", results,
+                            lambda res: res is True or isinstance(res, dict))
+
+    async def set_volume(self, volume: int) -> Dict[str, bool]:
+        return self._report("set_volume",
+                            await self._fan_out(lambda d: d.music.set_volume(volume)))
+
+    async def switch_channel(self, channel: str) -> Dict[str, bool]:
+        results = await self._fan_out(lambda d: d.display.switch_channel(channel))
+        return self._report("switch_channel", results,
+                            lambda res: res is True or isinstance(res, dict))
+
+    async def set_light(self, color: str, brightness: int = 100) -> Dict[str, bool]:
+        results = await self._fan_out(
+            lambda d: d.display.show_light(color=color, brightness=brightness))
+        return self._report("set_light", results)
+
+    async def show_clock(self, clock: int = 0) -> Dict[str, bool]:
+        results = await self._fan_out(lambda d: d.display.show_clock(clock=clock))
+        return self._report("show_clock", results)
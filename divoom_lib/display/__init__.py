@@ -4,23 +4,29 @@ import time
 
 from .light import Light
 from .drawing import Drawing
-from .animation import Animation
+from .animation import Animation, send_animation_packets
 from .text import Text
 from .display_animation import DisplayAnimation
 from .display_text import DisplayText
 
-from ..utils.image_processing import process_image
+from ..utils.image_processing import fit_frame, process_image
 from ..utils.divoom_image_encode import (
     encode_animation,
 )
+from ..utils.divoom_quantize import reduce_colors
+from ..utils.blob_cache import BlobCache, default_blob_cache
+from ..push_state import PushState
+from ..lan_transport import LanTransportError
 from .. import models as constants
 from ..utils.converters import to_int_if_str, bool_to_byte
 from ..sender_protocol import CommandSender
 
+
 class Display:
     def __init__(self, communicator: CommandSender) -> None:
         self.communicator = communicator
         self.logger = communicator.logger
+        self.blob_cache: BlobCache | None = default_blob_cache()
 
     async def set_temperature_channel(self, celsius: bool = True, color: str = "#ffffff") -> bool:
         """Switch to TEMPRETURE display mode (APK canonical 0x45).
@@ -143,7 +149,9 @@ class Display:
         args = [0x03, int(number) + 1] + [0x00] * 8
         return await self.communicator.send_command("set light mode", args)
 
-    async def show_image(self, file: str, time: int | None = None) -> bool:
+    async def show_image(self, file: str | list, time: int | None = None,
+                         reuse_palette: bool = False, force: bool = False, sync=None,
+                         encoded: tuple | None = None) -> bool:
         """Show image or animation on the Divoom device.
 
         The device expects a palette-quantized + bit-packed protocol,
@@ -165,55 +173,153 @@ class Display:
         LED) from `DivoomConfig.screensize` and uses the 32×32 encoder
         which emits the two required pre-frames + palette flag 0x03 +
         2-byte color count.
+
+        ``reuse_palette`` encodes the 0x8B blob with cross-frame palette
+        reuse (RR=0x01 append frames where smaller); the 0x49 fallback
+        always uses full per-frame palettes.
+
+        Frames over the protocol's 256-color limit (photos at 32x32 and
+        up) are median-cut down to the smallest power-of-two palette
+        that keeps `divoom_quantize.DEFAULT_MIN_PSNR`; with
+        ``reuse_palette`` the palette is shared across all frames.
+
+        Encoded blobs are kept in ``self.blob_cache`` (see
+        `utils.blob_cache`), keyed by file content, screensize and the
+        encode options, so re-pushing an unchanged file skips decode,
+        resize and encode entirely. Set ``blob_cache`` to None to disable.
+
+        Skip-if-unchanged: when the encoded blob is identical to the last
+        one pushed successfully on this connection (``push_state``), the
+        push — channel switch included — is skipped and True returned.
+        Reconnects and channel switches reset that; ``force`` pushes anyway.
+
+        WiFi devices with a LAN transport get the file over
+        ``Draw/SendHttpGif`` instead (`_push_lan`): frames at the LAN grid,
+        streamed as pipelined POSTs. If the device can't be reached over
+        LAN the push falls back to the BLE path above.
+
+        ``file`` may also be a list of frames in the `process_image` layout
+        (what `DivoomWall` hands each panel), which skips the decode.
+        ``encoded``, the ``(blob, frames)`` `_encode_blob` returned for this
+        screensize, skips the encode too (`DeviceGroup` encodes once for many
+        devices). The encode itself runs in a worker thread. ``sync`` (a `wall_sync.SlotSync`)
+        holds the final packet, the one that starts playback, for a wall commit.
         """
-        await self.show_design()
+        lan = getattr(self.communicator, "lan", None)
+        if lan is not None and hasattr(lan, "send_http_gif") and await self._push_lan(lan, file, time, sync, force):
+            return True
         screensize = self._get_screensize()
+        blob, frames = encoded or await asyncio.to_thread(
+            self._encode_blob, file, time, screensize, reuse_palette)
+        state = getattr(self.communicator, "push_state", None)
+        digest = PushState.digest(blob) if blob and isinstance(state, PushState) else None
+        if digest is not None and not force and state.is_current(digest):
+            state.suppressed += 1
+            self.logger.debug("show_image: unchanged since the last push, skipped")
+            return True
+        await self.show_design()
+        pushed = await self._push_blob(blob, frames, file, time, screensize, reuse_palette, sync)
+        if pushed and digest is not None:
+            state.record(digest)
+        return pushed
+
+    async def _push_lan(self, lan, file: str | list, time: int | None, sync=None,
+                        force: bool = False) -> bool:
+        """Stream ``file`` with ``Draw/SendHttpGif``; False if LAN failed.
+        Decodes off-loop and honours ``push_state`` like the BLE path, keyed
+        on the frames (True without streaming when they are unchanged)."""
+        if not getattr(lan, "is_reachable", True):
+            self.logger.debug("show_image: LAN unreachable (backing off); using Bluetooth")
+            return False
+        if isinstance(file, list):
+            frames = file  # pre-split frames go out at their own grid
+        else:
+            frames, *_ = await asyncio.to_thread(process_image, file, time=time,
+                                                 size=lan.HTTP_GIF_SIZE)
+        if not frames:
+            return False
+        state = getattr(self.communicator, "push_state", None)
+        digest = PushState.digest_frames(frames) if isinstance(state, PushState) else None
+        if digest is not None and not force and state.is_current(digest):
+            state.suppressed += 1
+            self.logger.debug("show_image: unchanged since the last LAN push, skipped")
+            return True
+        try:
+            sent = await lan.send_http_gif(frames, size=frames[0][1], sync=sync)
+        except LanTransportError as e:
+            self.logger.warning(f"show_image: LAN push failed ({e}); using Bluetooth")
+            return False
+        self.logger.info(f"show_image: {sent['frames']} frame(s) via Draw/SendHttpGif "
+                         f"in {sent['elapsed_s']:.2f}s")
+        if digest is not None:
+            state.record(digest)
+        return True
+
+    def _encode_blob(self, file: str | list, time: int | None, screensize: int,
+                     reuse_palette: bool) -> tuple:
+        """Return ``(blob, frames)`` for a push; ``frames`` is None on a cache hit."""
+        cache = self.blob_cache
+        if cache is None:
+            key = None
+        elif isinstance(file, list):
+            key = cache.key_for_frames(file, screensize, reuse_palette)
+        else:
+            key = cache.key_for_file(file, screensize, time, reuse_palette)
+        blob = cache.get(key) if key is not None else None
+        if blob is not None:
+            return blob, None
+        frames = self._prepare_frames(file, time, screensize, reuse_palette)
+        if not frames:
+            return None, frames
+        # Route ALL pushes (single still AND multi-frame) through the
+        # 0x8B 3-phase protocol. This matches the futpib reference, whose
+        # `send_image` pushes a still PNG through the *same* animation path
+        # (`create_network_packets_from`) as a GIF — there is no separate
+        # single-frame command. The earlier code special-cased 1-frame into
+        # 0x49, which is why cover art (a single frame) did not render
+        # (R11 item 2a). Uses the proven streamer (chunk-index offset ids,
+        # 256-byte chunks, write-with-response + pacing). Falls back to 0x49.
+        #
+        # R35d: removed `screensize != 32` guard. The APK uses the same
+        # AA-format frame encoding for ALL sizes; the hass-divoom 32×32
+        # pre-frames and RR=0x03 are NOT in the APK. 0x8B now works for
+        # 32×32 devices too.
+        from .animation_8b import _build_animation_blob
+        blob = _build_animation_blob(frames, reuse_palette)
+        if blob and key is not None:
+            cache.put(key, blob)
+        return blob, frames
+
+    async def _push_blob(self, blob: bytes | None, frames: list | None, file: str | list,
+                         time: int | None, screensize: int, reuse_palette: bool,
+                         sync=None) -> bool:
+        """Stream ``blob`` via 0x8B, falling back to 0x49 packets from ``frames``."""
+        anim = getattr(self.communicator, "animation", None)
+        if blob and anim is not None:
+            self.logger.info(
+                f"show_image: streaming {'cached' if frames is None else len(frames)} "
+                f"frame(s) via 0x8B 3-phase ({len(blob)} bytes)"
+            )
+            if await anim.stream_animation_8b(blob, sync=sync):
+                return True
+            self.logger.warning("show_image: 0x8B stream failed, falling back to 0x49")
+        if frames is None:
+            frames = self._prepare_frames(file, time, screensize, reuse_palette)
+
+        # Fallback path: 0x49 chunked animation (packed per ATT write on BLE).
+        return await send_animation_packets(self.communicator, encode_animation(frames), sync)
+
+    def _prepare_frames(self, file: str | list, time: int | None, screensize: int,
+                        reuse_palette: bool) -> list:
+        """Decode ``file`` into device-sized frames the encoder accepts."""
         # Resize to the device pixel grid BEFORE encoding. Without this, a
         # full-resolution source (e.g. a gallery gif) overflows the 2-byte
         # per-frame length field → "int too big to convert" (R11 item 1b).
-        frames, frames_count, _w, _h = process_image(
-            file, time=time, size=screensize
-        )
-        if frames_count >= 1:
-            # Route ALL pushes (single still AND multi-frame) through the
-            # 0x8B 3-phase protocol. This matches the futpib reference, whose
-            # `send_image` pushes a still PNG through the *same* animation path
-            # (`create_network_packets_from`) as a GIF — there is no separate
-            # single-frame command. The earlier code special-cased 1-frame into
-            # 0x49, which is why cover art (a single frame) did not render
-            # (R11 item 2a). Uses the proven streamer (chunk-index offset ids,
-            # 256-byte chunks, write-with-response + pacing). Falls back to 0x49.
-            #
-            # R35d: removed `screensize != 32` guard. The APK uses the same
-            # AA-format frame encoding for ALL sizes; the hass-divoom 32×32
-            # pre-frames and RR=0x03 are NOT in the APK. 0x8B now works for
-            # 32×32 devices too.
-            from .animation_8b import _build_animation_blob
-            blob = _build_animation_blob(frames)
-            anim = getattr(self.communicator, "animation", None)
-            if blob and anim is not None:
-                self.logger.info(
-                    f"show_image: streaming {frames_count} frame(s) via 0x8B "
-                    f"3-phase ({len(blob)} bytes)"
-                )
-                if await anim.stream_animation_8b(blob):
-                    return True
-                self.logger.warning(
-                    "show_image: 0x8B stream failed, falling back to 0x49"
-                )
-
-        # Fallback path: 0x49 chunked animation.
-        blobs = encode_animation(frames)
-        # Honest bool: start False so an empty blob list (nothing sent) reports
-        # failure rather than returning None (the annotated return type is bool).
-        result: bool = False
-        for packet in blobs:
-            result = await self.communicator.send_command(
-                "set animation frame", list(packet)
-            )
-            if not result:
-                return False
-        return bool(result)
+        if isinstance(file, list):
+            frames = [fit_frame(f, screensize) for f in file]
+        else:
+            frames, _count, _w, _h = process_image(file, time=time, size=screensize)
+        return reduce_colors(frames, global_palette=reuse_palette)
 
     def _get_screensize(self) -> int:
         """Read the active device's screensize from the config.
@@ -11,7 +11,43 @@ from divoom_lib.models import (
     ABUD_CONTROL_DELETE, ABUD_CONTROL_PLAY_ARTWORK, ABUD_CONTROL_DELETE_ALL_BY_INDEX,
     AGUDI_CONTROL_WORD_SUCCESS, AGUDI_CONTROL_WORD_FAILURE
 )
+from divoom_lib import framing
+from divoom_lib.ble_pacing import PacingTuner
+from divoom_lib.command_scheduler import CommandScheduler
 from .animation_user import AnimationUserDefine
+from .animation_8b import _phase_data
+
+
+async def send_animation_packets(communicator, packets: list, sync=None) -> bool:
+    """Send 0x49 ``packets`` (see `encode_animation`) in order.
+
+    Connections that take pre-framed packets (``wire_framing`` +
+    ``send_frames``) get them framed in one pass, so BLE packs several whole
+    packets into each ATT write (ble_write.pack_frames) instead of one write
+    and one pacing gap per packet. ``sync`` holds the last packet, the one
+    that starts playback. False if nothing was sent or any write failed.
+    """
+    if not packets:
+        return False
+    command = COMMANDS["set animation frame"]
+    wire = getattr(communicator, "wire_framing", None)
+    if isinstance(wire, framing.WireFraming) and hasattr(communicator, "send_frames"):
+        frames = [framing.frame_command(command, bytes(p), wire) for p in packets]
+        if not await communicator.send_frames(frames[:-1]):
+            return False
+        if sync is not None:
+            await sync.hold()
+        ok = bool(await communicator.send_frame(frames[-1]))
+    else:
+        for i, packet in enumerate(packets):
+            if sync is not None:
+                await (sync.hold() if i == len(packets) - 1 else sync.turn())
+            ok = bool(await communicator.send_command("set animation frame", list(packet)))
+            if not ok:
+                return False
+    if sync is not None and ok:
+        sync.committed()
+    return ok
 
 class Animation(AnimationUserDefine):
     """
@@ -78,7 +114,7 @@ class Animation(AnimationUserDefine):
         if file_size is not None and file_offset_id is not None and file_data is not None:
             return list(file_size.to_bytes(4, byteorder='little')) + \
                    list(file_offset_id.to_bytes(2, byteorder='little')) + \
-                   file_data
+                   list(file_data)
         self.logger.error("Missing 'file_size', 'file_offset_id', or 'file_data' for Sending Data control word.")
         return None
 
@@ -113,7 +149,7 @@ class Animation(AnimationUserDefine):
 
         return await self.communicator.send_command(COMMANDS["app new send gif cmd"], args, write_with_response=write_with_response)
 
-    async def stream_animation_8b(self, blob: bytes) -> bool:
+    async def stream_animation_8b(self, blob: bytes, sync=None) -> bool:
         """Stream a pre-encoded animation frame blob via the 0x8B 3-phase
         protocol, matching the **futpib** reference exactly
         (``references/divoom-refs/futpib/src/lib.rs`` ``create_network_packets_from``
@@ -147,10 +183,23 @@ class Animation(AnimationUserDefine):
 
         Args:
             blob: concatenated per-frame bodies (see animation_8b._build_animation_blob).
+            sync: optional `wall_sync.SlotSync`; the final chunk (the one that
+                makes the device play) waits for ``sync.hold()``.
 
         Returns:
             True if all phases succeeded, else False.
         """
+        # Registered as preemptible bulk traffic (command_scheduler.py): GUI
+        # setters and game keys issued mid-upload go out between chunks.
+        scheduler = getattr(self.communicator, "scheduler", None)
+        if not isinstance(scheduler, CommandScheduler):
+            return await self._stream_8b(blob, sync)
+        async with self.communicator.bulk_transfer():
+            return await self._stream_8b(blob, sync)
+
+    async def _stream_8b(self, blob: bytes, sync=None) -> bool:
+        """`stream_animation_8b` proper: start, device-ready wait, chunk
+        stream, retransmit window."""
         file_size = len(blob)
         if file_size <= 0:
             return False
@@ -158,8 +207,14 @@ class Animation(AnimationUserDefine):
         is_lan = getattr(self.communicator, "lan", None) is not None
         is_spp = getattr(self.communicator, "use_spp", False)
         is_ble = not is_lan and not is_spp
-        write_with_response = is_ble
-        delay = 0.01 if is_ble else 0.0
+        # Per-device learned pacing (ble_pacing.py); fixed defaults otherwise.
+        pacing = getattr(self.communicator, "pacing", None) if is_ble else None
+        if not isinstance(pacing, PacingTuner):
+            pacing = None
+        write_with_response = pacing.stream_write_with_response if pacing else is_ble
+        delay = pacing.stream_delay_s if pacing else (0.01 if is_ble else 0.0)
+        retransmits = 0
+        ok = False
 
         # APK §2: set _expected_response_command BEFORE sending START so the
         # iOS LE notification handler routes the device's "[0] → ready" reply
@@ -184,6 +239,13 @@ class Animation(AnimationUserDefine):
         if _listening_8b:
             _listen.add(_cmd_8b)
 
+        chunk_size = 256  # MUST match futpib/APK (hVar.q(256)); chunk N → byte N*256
+        # Transports that can take finished packets get the whole transfer
+        # pre-framed in one pass; each chunk (and each retransmit) is then a slice.
+        wire = getattr(self.communicator, "wire_framing", None)
+        batch = framing.frame_8b_transfer(blob, chunk_size, wire) \
+            if not is_lan and isinstance(wire, framing.WireFraming) else None
+
         try:
             if not await self.app_new_send_gif_cmd(
                 control_word=ANSGC_CONTROL_START_SENDING, file_size=file_size
@@ -197,19 +259,18 @@ class Animation(AnimationUserDefine):
             if not (is_ble and await self._await_8b_device_ready(timeout=2.0)):
                 await asyncio.sleep(0.5)  # let the device allocate buffers
 
-            chunk_size = 256  # MUST match futpib/APK (hVar.q(256)); chunk N → byte N*256
+            view = memoryview(blob)
             offset_id = 0
             for i in range(0, file_size, chunk_size):
-                chunk = list(blob[i:i + chunk_size])
-                if not await self.app_new_send_gif_cmd(
-                    control_word=ANSGC_CONTROL_SENDING_DATA,
-                    file_size=file_size,
-                    file_offset_id=offset_id,
-                    file_data=chunk,
-                    write_with_response=write_with_response,
-                ):
+                final = i + chunk_size >= file_size
+                if sync is not None:
+                    await (sync.hold() if final else sync.turn())
+                if not await self._send_8b_chunk(view, file_size, offset_id,
+                                                 chunk_size, write_with_response, batch):
                     self.logger.error(f"0x8B data chunk {offset_id} failed")
                     return False
+                if final and sync is not None:
+                    sync.committed()
                 offset_id += 1
                 if delay > 0:
                     await asyncio.sleep(delay)
@@ -217,14 +278,19 @@ class Animation(AnimationUserDefine):
             # APK: the device may ask for dropped chunks to be re-sent; without
             # this, one lost chunk = a permanently failed upload.
             if is_ble:
-                await self._serve_8b_retransmits(blob, file_size, chunk_size,
-                                                 write_with_response)
+                if sync is not None:
+                    await sync.resume()  # the final chunk went out without the stream slot
+                retransmits = await self._serve_8b_retransmits(
+                    view, file_size, chunk_size, write_with_response, batch=batch) or 0
 
             # APK: no terminate packet (CW=2). Verified on 4 hardware devices
             # (Timoo, Ditoo, Tivoo Max, Pixoo) — animation renders correctly
             # without it.
+            ok = True
             return True
         finally:
+            if pacing is not None:
+                pacing.observe_stream(retransmits, ok)
             # ALWAYS clear the scalar we set before START. wait_for_response clears
             # it on a match mid-stream, but on the device-ready-timeout or
             # chunk-failure paths it would otherwise stay pinned to 0x8B and
@@ -235,6 +301,26 @@ class Animation(AnimationUserDefine):
             if _listening_8b:
                 _listen.discard(_cmd_8b)
 
+    async def _send_8b_chunk(self, view: memoryview, file_size: int, offset_id: int,
+                             chunk_size: int, write_with_response: bool,
+                             batch: framing.FramedBatch | None = None) -> bool:
+        """Send SendingData chunk ``offset_id`` of ``view`` as one bytes payload.
+
+        The hot path of every 0x8B upload: with a pre-framed ``batch``
+        (framing.frame_8b_transfer) the finished packet is written as a slice.
+        Otherwise the args are built with a single concatenation over a
+        memoryview slice (see animation_8b._phase_data) and go down the
+        bytes-native send path.
+        """
+        if batch is not None:
+            return await self.communicator.send_frame(
+                batch.frame(offset_id), write_with_response=write_with_response)
+        start = offset_id * chunk_size
+        args = _phase_data(file_size, offset_id, view[start:start + chunk_size])
+        return await self.communicator.send_command(
+            COMMANDS["app new send gif cmd"], args,
+            write_with_response=write_with_response)
+
     async def _await_8b_device_ready(self, timeout: float = 3.0) -> bool:
         """Wait for the device's 0x8b response with ``payload[0] == 0`` —
         APK semantics: "device requests the animation" (`bluetooth/s.java`,
@@ -259,26 +345,30 @@ class Animation(AnimationUserDefine):
                 return True
             # Anything else (stale frame, early retransmit) — keep waiting.
 
-    async def _serve_8b_retransmits(self, blob: bytes, file_size: int,
+    async def _serve_8b_retransmits(self, blob: bytes | memoryview, file_size: int,
                                     chunk_size: int, write_with_response: bool,
                                     quiet_timeout: float = 1.0,
-                                    max_requests: int = 256) -> None:
+                                    max_requests: int = 256,
+                                    batch: framing.FramedBatch | None = None) -> int:
         """Serve the device's 0x8b retransmit requests after the chunk stream —
         APK semantics: response ``[1][chunk_idx:2 LE]`` means "re-send chunk N"
         (`bluetooth/s.java` → ``DesignSendModel.resendBlueData(N)``). Stops when
         the device goes quiet for ``quiet_timeout`` (the normal end state) or
-        after ``max_requests`` (safety valve). Best-effort: never raises."""
+        after ``max_requests`` (safety valve). Best-effort: never raises.
+        With a pre-framed ``batch`` a retransmit is a re-send of its slice.
+        Returns the number of chunks re-sent (the pacing tuner's signal)."""
+        served = 0
         wait = getattr(self.communicator, "wait_for_response", None)
         if wait is None:
-            return
+            return served
         for _ in range(max_requests):
             try:
                 payload = await wait(COMMANDS["app new send gif cmd"],
                                      timeout=quiet_timeout)
             except Exception:
-                return
+                return served
             if payload is None:
-                return  # quiet — device has everything
+                return served  # quiet — device has everything
             if len(payload) >= 3 and payload[0] == 1:
                 idx = int.from_bytes(bytes(payload[1:3]), byteorder="little")
                 start = idx * chunk_size
@@ -286,14 +376,11 @@ class Animation(AnimationUserDefine):
                     self.logger.warning(f"0x8B retransmit request out of range: {idx}")
                     continue
                 self.logger.info(f"0x8B: device requested retransmit of chunk {idx}")
-                await self.app_new_send_gif_cmd(
-                    control_word=ANSGC_CONTROL_SENDING_DATA,
-                    file_size=file_size,
-                    file_offset_id=idx,
-                    file_data=list(blob[start:start + chunk_size]),
-                    write_with_response=write_with_response,
-                )
+                await self._send_8b_chunk(memoryview(blob), file_size, idx,
+                                          chunk_size, write_with_response, batch)
+                served += 1
             # payload[0] == 0 here would be a late start-ACK — ignore.
+        return served
 
     async def set_rhythm_gif(self, pos: int, total_length: int, gif_id: int, data: list) -> bool:
         """
@@ -36,13 +36,9 @@ from typing import List, Tuple
 
 from divoom_lib.sender_protocol import CommandSender
 from divoom_lib.models import COMMANDS
-from divoom_lib.utils.divoom_image_encode import (
-    encode_animation_frame,
-    Frame,
-)
-from divoom_lib.utils.divoom_image_encode_32 import (
-    encode_animation_frame_32,
-)
+from divoom_lib.native import image_encoder
+from divoom_lib.utils.divoom_image_encode import Frame
+from divoom_lib.utils.divoom_image_encode_delta import encode_animation_blob
 
 logger = logging.getLogger("divoom_lib")
 
@@ -55,22 +51,28 @@ CONTROL_TERMINATE_SENDING = 0x02
 SENDING_DATA_CHUNK_SIZE = 256
 
 
-def _build_animation_blob(frames: List[Frame]) -> bytes:
+def _build_animation_blob(frames: List[Frame], reuse_palette: bool = False) -> bytes:
     """Concatenate the per-frame bodies into a single blob.
 
     The 0x8B protocol's file_size = sum of all encoded frame bodies.
     Each body uses the per-frame wire format:
         AA LLLL(LE) TTTT(LE) RR=0x00 NN COLOR_DATA PIXEL_DATA
     (RR=0x00, 1-byte NN for ALL screen sizes — APK confirmed R35d)
-    Dispatches on (w, h) to pick the right encoder; 32×32 now uses
-    the same standard format as 16×16.
+    32×32 uses the same standard format as 16×16, so every size goes
+    through the dispatching encoder (C dylib, else NumPy, else pure
+    Python — all byte-identical); long GIFs and 64×64+ frames are where
+    the fast backends pay off.
+
+    ``reuse_palette`` keeps one running palette across the animation and
+    emits RR=0x01 append frames where they are smaller (see
+    utils.divoom_image_encode_delta) — fewer bytes and 0x8B chunks for GIFs
+    whose frames share their colors.
     """
+    if reuse_palette:
+        return encode_animation_blob(frames)
     out = bytearray()
     for (rgb, w, h, t) in frames:
-        if w == 32 and h == 32:
-            out += encode_animation_frame_32(rgb, w, h, t)
-        else:
-            out += encode_animation_frame(rgb, w, h, t)
+        out += image_encoder.encode_animation_frame(rgb, w, h, t)
     return bytes(out)
 
 
@@ -79,7 +81,7 @@ def _phase_start(file_size: int) -> bytes:
     return bytes([CONTROL_START_SENDING]) + file_size.to_bytes(4, "little")
 
 
-def _phase_data(file_size: int, offset_id: int, data: bytes) -> bytes:
+def _phase_data(file_size: int, offset_id: int, data: bytes | memoryview) -> bytes:
     """SendingData phase payload (7 + len(data) bytes).
 
     `offset_id` is the sequential chunk INDEX (0,1,2,...), not a byte offset —
@@ -98,8 +100,9 @@ def _phase_terminate() -> bytes:
     return bytes([CONTROL_TERMINATE_SENDING])
 
 
-def build_8b_phases(frames: List[Frame]) -> List[bytes]:
-    """Build the 3-phase SPP payloads for an animation.
+def build_8b_phases(frames: List[Frame], reuse_palette: bool = False) -> List[bytes]:
+    """Build the 3-phase SPP payloads for an animation (``reuse_palette``:
+    see `_build_animation_blob`).
 
     Returns:
         list of 3 byte strings — the raw args to pass to the 0x8B
@@ -108,7 +111,7 @@ def build_8b_phases(frames: List[Frame]) -> List[bytes]:
     """
     if not frames:
         return []
-    blob = _build_animation_blob(frames)
+    blob = _build_animation_blob(frames, reuse_palette)
     file_size = len(blob)
     phases: List[bytes] = [_phase_start(file_size)]
     # offset_id is the chunk INDEX (0,1,2,...), matching futpib + the live
@@ -151,7 +154,7 @@ class Animation8B:
         )
         for args in phases:
             ok = await self.communicator.send_command(
-                COMMANDS["app new send gif cmd"], list(args)
+                COMMANDS["app new send gif cmd"], args
             )
             if not ok:
                 self.logger.error(f"0x8B phase failed: args={args.hex()}")
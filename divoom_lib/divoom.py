@@ -9,6 +9,7 @@ from .transport import Transport, COMMAND_TRANSPORT_MAP
 
 
 from . import models
+from .framing import Payload
 from .connection import DivoomConnection
 from .models.capabilities import capabilities_for
 from .display.light import Light
@@ -53,28 +54,7 @@ class Divoom:
             if mac_addr is None and isinstance(config, str):
                 mac_addr = config
             
-            cfg = models.DivoomConfig(
-                mac=mac_addr,
-                logger=logger or kwargs.get('logger'),
-                write_characteristic_uuid=kwargs.get('write_characteristic_uuid', "49535343-8841-43f4-a8d4-ecbe34729bb3"),
-                notify_characteristic_uuid=kwargs.get('notify_characteristic_uuid', "49535343-1e4d-4bd9-ba61-23c647249616"),
-                read_characteristic_uuid=kwargs.get('read_characteristic_uuid', "49535343-1e4d-4bd9-ba61-23c647249616"),
-                spp_characteristic_uuid=kwargs.get('spp_characteristic_uuid'),
-                escapePayload=kwargs.get('escapePayload', False),
-                use_ios_le_protocol=kwargs.get('use_ios_le_protocol', None),
-                device_name=kwargs.get('device_name'),
-                client=kwargs.get('client'),
-                screensize=kwargs.get('screensize'),
-                device_type=kwargs.get('device_type'),
-            )
-
-        # Optional LAN transport (WiFi-capable devices only)
-        lan_ip = kwargs.get('lan_ip') or (cfg.lan_ip if hasattr(cfg, 'lan_ip') else None)
-        lan_token = kwargs.get('lan_token', 0)
-        self._lan = None
-        if lan_ip:
-            from .lan_transport import LanTransport
-            self._lan = LanTransport(device_ip=lan_ip, local_token=lan_token)
+            cfg = models.DivoomConfig.from_kwargs(mac_addr, logger, kwargs)
 
         self._mac = cfg.mac
         self._device_name = cfg.device_name
@@ -96,6 +76,15 @@ class Divoom:
         # Instantiate modular Connection Manager
         self._conn = DivoomConnection(self, cfg)
 
+        # Optional LAN transport (WiFi only); its screen changes drop push_state.
+        lan_ip = kwargs.get('lan_ip') or (cfg.lan_ip if hasattr(cfg, 'lan_ip') else None)
+        lan_token = kwargs.get('lan_token', 0)
+        self._lan = None
+        if lan_ip:
+            from .lan_transport import LanTransport
+            self._lan = LanTransport(device_ip=lan_ip, local_token=lan_token)
+            self._lan.push_state = self._conn.push_state
+
         # Register functional submodules
         self.light = Light(self)
         self.animation = Animation(self)
@@ -154,6 +143,15 @@ class Divoom:
             self._conn.mac = val
         self._mac = val
 
+    @property
+    def adapter(self) -> str | None:
+        """Host BLE adapter (BlueZ ``hci0``, ...) used on the next connect."""
+        return self._conn.adapter
+
+    @adapter.setter
+    def adapter(self, val: str | None) -> None:
+        self._conn.adapter = val
+
     @property
     def device_name(self) -> str | None:
         return self._conn.device_name if hasattr(self, '_conn') else self._device_name
@@ -192,13 +190,13 @@ class Divoom:
     def _handle_basic_protocol_notification(self, new_data: bytearray) -> bool:
         return self._conn._handle_basic_protocol_notification(new_data)
 
-    async def _send_basic_protocol_payload(self, payload_bytes: list, write_with_response: bool) -> bool:
+    async def _send_basic_protocol_payload(self, payload_bytes: Payload, write_with_response: bool) -> bool:
         return await self._conn._send_basic_protocol_payload(payload_bytes, write_with_response)
 
-    async def _send_ios_le_payload(self, payload_bytes: list, write_with_response: bool) -> bool:
+    async def _send_ios_le_payload(self, payload_bytes: Payload, write_with_response: bool) -> bool:
         return await self._conn._send_ios_le_payload(payload_bytes, write_with_response)
 
-    async def _send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
+    async def _send_payload(self, payload_bytes: Payload, max_retries: int = 3, **kwargs) -> bool:
         return await self._conn._send_payload(payload_bytes, max_retries=max_retries, **kwargs)
 
     async def _wait_for_response(self, command_id: int, timeout: float = 10.0) -> bytes | None:
@@ -319,7 +317,10 @@ class Divoom:
         4-badge panel in the sidebar.
 
         Returns a dict with keys ``ble``, ``lan``, ``cloud``, ``external``
-        and boolean/string values describing availability.
+        and boolean/string values describing availability, plus
+        ``ble_chunk_size`` (bytes per GATT write, from the negotiated MTU;
+        None when the active transport isn't BLE) and ``ble_connect`` (the
+        last connect's ``source`` — saved profile or probe — and ``connect_ms``).
 
         Usage::
 
@@ -328,6 +329,8 @@ class Divoom:
         """
         return {
             "ble":      self._conn.is_connected,
+            "ble_chunk_size": getattr(self._conn, "write_chunk_size", None),
+            "ble_connect": getattr(self._conn, "connect_report", None),
             "lan":      self._lan is not None,
             "lan_ip":   self._lan.device_ip if self._lan else None,
             "cloud":    False,   # set True after successful cloud auth
@@ -433,6 +436,8 @@ class Divoom:
 
     async def disconnect(self) -> None:
         await self._conn.disconnect()
+        if self._lan is not None:
+            await self._lan.close()
 
     def notification_handler(self, sender: int, data: bytearray) -> None:
         self._conn.notification_handler(sender, data)
@@ -446,12 +451,37 @@ class Divoom:
     async def send_command_and_wait_for_response(self, command: int | str, args: list | None = None, timeout: float = 10.0) -> bytes | None:
         return await self._conn.send_command_and_wait_for_response(command, args, timeout=timeout)
 
-    async def send_command(self, command: int | str, args: list | None = None, write_with_response: bool = False) -> bool:
-        return await self._conn.send_command(command, args, write_with_response=write_with_response)
+    async def send_command(self, command: int | str, args: Payload | None = None, write_with_response: bool = False, priority: Any = None) -> bool:
+        return await self._conn.send_command(command, args, write_with_response=write_with_response, priority=priority)
 
-    async def send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
+    async def send_payload(self, payload_bytes: Payload, max_retries: int = 3, **kwargs) -> bool:
         return await self._conn.send_payload(payload_bytes, max_retries=max_retries, **kwargs)
 
+    @property
+    def wire_framing(self) -> Any:
+        return self._conn.wire_framing
+
+    @property
+    def push_state(self) -> Any:
+        return self._conn.push_state
+
+    @property
+    def pacing(self) -> Any:
+        return self._conn.pacing
+
+    @property
+    def scheduler(self) -> Any:
+        return self._conn.scheduler
+
+    def bulk_transfer(self) -> Any:
+        return self._conn.bulk_transfer()
+
+    async def send_frame(self, frame: Any, max_retries: int = 3, **kwargs) -> bool:
+        return await self._conn.send_frame(frame, max_retries=max_retries, **kwargs)
+
+    async def send_frames(self, frames: list, max_retries: int = 3, **kwargs) -> bool:
+        return await self._conn.send_frames(frames, max_retries=max_retries, **kwargs)
+
     async def probe_write_characteristics_and_try_channel_switch(self, write_chars: list, notify_chars: list, read_chars: list, cached_data: dict, cache_dir: str, device_id: str, colors: list = None, cache_mod: Any = None):
         return await self._conn.probe_write_characteristics_and_try_channel_switch(
             write_chars, notify_chars, read_chars, cached_data, cache_dir, device_id, colors=colors, cache_mod=cache_mod
@@ -0,0 +1,170 @@
+"""Incremental RX frame parser shared by the BLE and SPP receive paths.
+
+`framing.parse_basic_protocol_frames` is the stateless reference parser: it
+``del buf[:n]``s after every frame and copies each message twice (``bytes`` then
+``bytearray``), so a burst of N frames sitting in one buffer costs O(N * len) —
+quadratic on retransmit storms (0x8B resend requests, hot-update file requests).
+
+`FrameParser` keeps one reusable ``bytearray`` and walks it with a read cursor.
+Frames are sliced straight out of a memoryview into lightweight ``__slots__``
+records (`RxFrame`) and the consumed prefix is dropped ONCE per `feed()`, so the
+cost is linear in the bytes received. Between `feed()` calls the buffer holds
+exactly the unconsumed bytes (a parked partial frame), which is what the
+transports expose as ``message_buf`` / ``_rx_buf``.
+
+Resync rules match the stateless parsers they replace:
+  * basic: skip to the next start byte; a length over `MAX_BASIC_FRAME` (or
+    too short to hold a command) drops one byte; a bad end byte / checksum
+    consumes the frame.
+  * iOS-LE: a length over `MAX_IOS_LE_FRAME` or a frame that fails
+    `parse_ios_le_notification` drops one byte.
+"""
+from __future__ import annotations
+
+from . import models
+from .framing import MAX_BASIC_FRAME, parse_ios_le_notification
+
+FRAMING_BASIC = "basic"
+FRAMING_IOS_LE = "ios_le"
+
+# Upper bound on a single iOS-LE frame length decoded from bytes 4-5. Real
+# device notifications are tiny (acks, page lists); anything beyond this is a
+# corrupt length field, not a real frame.
+MAX_IOS_LE_FRAME = 8192
+
+# The basic parser never looks at fewer bytes than the smallest real frame
+# (start + len:2 + cmd + checksum:2 + end), same as parse_basic_protocol_frames.
+_MIN_BASIC_FRAME = 7
+
+_IOS_LE_HEADER = bytes(models.IOS_LE_HEADER)
+
+
+class RxFrame:
+    """One decoded inbound frame.
+
+    Also readable as a mapping (``frame['command_id']``,
+    ``frame.get('payload')``) because every ``notification_queue`` consumer
+    was written against the dicts the old parser produced.
+    """
+    __slots__ = ("command_id", "payload", "framing", "packet_number", "raw")
+
+    def __init__(self, command_id: int, payload: bytes, framing: str,
+                 packet_number: int = 0, raw: bytes = b"") -> None:
+        self.command_id = command_id
+        self.payload = payload
+        self.framing = framing
+        self.packet_number = packet_number
+        self.raw = raw
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RxFrame):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self) -> str:
+        return (f"RxFrame(command_id=0x{self.command_id:02x}, payload={self.payload!r}, "
+                f"framing={self.framing!r}, packet_number={self.packet_number})")
+
+
+class FrameParser:
+    """Stateful, allocation-light parser for a byte stream of Divoom frames.
+
+    ``ios_le=False`` parses basic-protocol frames only (the BLE basic path — BLE
+    iOS-LE notifications arrive one per GATT packet and are routed separately).
+    ``keep_raw=True`` also records each iOS-LE frame's raw bytes (SPP parity
+    with the old ``BtSppNotification.raw``).
+    """
+    __slots__ = ("buffer", "ios_le", "keep_raw")
+
+    def __init__(self, buffer: bytearray | None = None, *, ios_le: bool = True,
+                 keep_raw: bool = False) -> None:
+        self.buffer = buffer if buffer is not None else bytearray()
+        self.ios_le = ios_le
+        self.keep_raw = keep_raw
+
+    def reset(self) -> None:
+        self.buffer.clear()
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[RxFrame]:
+        """Append ``data`` and return every complete frame now available."""
+        buf = self.buffer
+        buf += data
+        frames: list[RxFrame] = []
+        pos = 0
+        with memoryview(buf) as mv:
+            end = len(buf)
+            while pos < end:
+                if self.ios_le and buf.startswith(_IOS_LE_HEADER[:end - pos], pos):
+                    step = self._ios_le_at(buf, mv, pos, end, frames)
+                elif buf[pos] == models.MESSAGE_START_BYTE:
+                    step = self._basic_at(buf, mv, pos, end, frames)
+                else:
+                    step = self._next_candidate(buf, pos + 1, end) - pos
+                if step == 0:
+                    break  # a partial frame is parked at pos; wait for more bytes
+                pos += step
+        # One compaction per feed (not per frame): keep only the parked tail.
+        if pos >= len(buf):
+            buf.clear()
+        elif pos:
+            del buf[:pos]
+        return frames
+
+    def _next_candidate(self, buf: bytearray, pos: int, end: int) -> int:
+        """Index of the first byte at/after ``pos`` that could start a frame
+        (or ``end`` if there is none)."""
+        nxt = buf.find(models.MESSAGE_START_BYTE, pos)
+        if self.ios_le:
+            hdr = buf.find(_IOS_LE_HEADER[0], pos)
+            if hdr != -1 and (nxt == -1 or hdr < nxt):
+                nxt = hdr
+        return end if nxt == -1 else nxt
+
+    def _ios_le_at(self, buf: bytearray, mv: memoryview, pos: int, end: int,
+                   frames: list[RxFrame]) -> int:
+        avail = end - pos
+        if avail < models.IOS_LE_MIN_DATA_LENGTH:
+            return 0
+        frame_len = (buf[pos + 4] | (buf[pos + 5] << 8)) + 7
+        if frame_len > MAX_IOS_LE_FRAME:
+            return 1  # corrupt length — resync past this header byte
+        if avail < frame_len:
+            return 0
+        raw = mv[pos:pos + frame_len]
+        parsed = parse_ios_le_notification(raw)
+        if parsed is None:
+            return 1
+        frames.append(RxFrame(parsed["command_id"], parsed["payload"], FRAMING_IOS_LE,
+                              parsed["packet_number"], bytes(raw) if self.keep_raw else b""))
+        return frame_len
+
+    def _basic_at(self, buf: bytearray, mv: memoryview, pos: int, end: int,
+                  frames: list[RxFrame]) -> int:
+        avail = end - pos
+        if avail < _MIN_BASIC_FRAME:
+            return 0
+        total = 4 + (buf[pos + 1] | (buf[pos + 2] << 8))
+        if total > MAX_BASIC_FRAME or total < _MIN_BASIC_FRAME:
+            return 1  # corrupt length — resync past this start byte
+        if avail < total:
+            return 0
+        last = pos + total
+        if buf[last - 1] != models.MESSAGE_END_BYTE:
+            return total
+        received = buf[last - 3] | (buf[last - 2] << 8)
+        if received != sum(mv[pos + 1:last - 3]) & 0xFFFF:
+            return total
+        if total > 5 and buf[pos + 3] == models.ACK_PATTERN_BYTE_1 \
+                and buf[pos + 5] == models.ACK_PATTERN_BYTE_3:
+            frames.append(RxFrame(buf[pos + 4], bytes(mv[pos + 6:last - 3]), FRAMING_BASIC))
+        else:
+            frames.append(RxFrame(buf[pos + 3], bytes(mv[pos + 4:last - 3]), FRAMING_BASIC))
+        return total
@@ -1,6 +1,5 @@
-from typing import List, Tuple
+from typing import Iterator, List, NamedTuple, Tuple, Union
 import ctypes
-from pathlib import Path
 
 from . import models
 from .native_lib import library_path
@@ -11,6 +10,13 @@ from .native_lib import library_path
 # parse_basic_protocol_frames.
 MAX_BASIC_FRAME = 8192
 
+# Outbound payloads are bytes-native end to end (send_command → transport →
+# GATT/RFCOMM write); ``list[int]`` is still accepted as a compatibility shim.
+BytesLike = Union[bytes, bytearray, memoryview]
+Payload = Union[bytes, bytearray, memoryview, List[int]]
+
+_IOS_LE_HEADER_BYTES = bytes(models.IOS_LE_MESSAGE_HEADER)
+
 # Dynamically load native C shared library for fast payload escaping/framing if available
 lib = None
 try:
@@ -33,6 +39,21 @@ try:
         ]
         lib.encode_ios_le_payload.restype = ctypes.c_int
 
+        # Optional: a dylib built before the batch framer existed lacks it, and
+        # frame_8b_transfer then frames chunk by chunk.
+        if hasattr(lib, "encode_8b_data_batch"):
+            lib.encode_8b_data_batch.argtypes = [
+                ctypes.POINTER(ctypes.c_ubyte),  # const unsigned char* blob
+                ctypes.c_int,                    # int blob_len
+                ctypes.c_int,                    # int chunk_size
+                ctypes.c_int,                    # int ios_le
+                ctypes.c_int,                    # int escape
+                ctypes.POINTER(ctypes.c_ubyte),  # unsigned char* out
+                ctypes.c_int,                    # int out_size
+                ctypes.POINTER(ctypes.c_int),    # int* offsets
+            ]
+            lib.encode_8b_data_batch.restype = ctypes.c_int
+
 except Exception:
     pass
 
@@ -62,69 +83,87 @@ def get_checksum(data_bytes: list) -> str:
     return int2hexlittle(sum_val)
 
 
-def encode_basic_payload(payload_bytes: list, escape: bool = False) -> bytes:
+def as_payload_bytes(payload: Payload) -> BytesLike:
+    """Return ``payload`` as a bytes-like object.
+
+    bytes / bytearray / memoryview pass straight through (no copy); a
+    ``list[int]`` is the legacy shim and is packed into ``bytes`` exactly once,
+    here, instead of being walked int-by-int further down the stack.
+    """
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return payload
+    return bytes(payload)
+
+
+def command_payload(command: int, args: Payload | None = None) -> Payload:
+    """``[command] + args`` for the send path.
+
+    A bytes-like ``args`` (the 0x8B streamer, hot update) yields ``bytes`` with a
+    single copy; a list ``args`` keeps the historical list payload so existing
+    list-based callers and fakes see exactly what they always did.
+    """
+    if args is None:
+        return [command]
+    if isinstance(args, (bytes, bytearray, memoryview)):
+        return bytes((command,)) + args
+    return [command] + args
+
+
+def _native_encode(fn, data: BytesLike, arg: int, out_size: int) -> bytes | None:
+    """Run one of the C framers over ``data``. The input is a single memcpy into
+    a ctypes array and the result is read back with ``string_at`` — slicing the
+    ctypes array (``out_buf[:n]``) would build a list of ints per frame."""
+    n = len(data)
+    out_buf = (ctypes.c_ubyte * out_size)()
+    in_buf = (ctypes.c_ubyte * n).from_buffer_copy(data)
+    written = fn(in_buf, n, arg, out_buf)
+    if written > 0:
+        return ctypes.string_at(out_buf, written)
+    return None
+
+
+def _escape_bytes(data: BytesLike) -> bytes:
+    """Basic-protocol escaping as three C-level ``bytes.replace`` passes. The
+    escape prefix (0x03) must be rewritten FIRST so the prefixes introduced by
+    the 0x01/0x02 passes aren't themselves re-escaped."""
+    return (
+        bytes(data)
+        .replace(bytes((models.ESCAPE_BYTE_3,)), bytes(models.ESCAPE_SEQUENCE_3))
+        .replace(bytes((models.ESCAPE_BYTE_1,)), bytes(models.ESCAPE_SEQUENCE_1))
+        .replace(bytes((models.ESCAPE_BYTE_2,)), bytes(models.ESCAPE_SEQUENCE_2))
+    )
+
+
+def encode_basic_payload(payload_bytes: Payload, escape: bool = False) -> bytes:
+    data = as_payload_bytes(payload_bytes)
     if lib is not None:
         try:
-            payload_data = bytes(payload_bytes)
-            n = len(payload_data)
-            out_size = 2 * n + 6
-            out_buf = (ctypes.c_ubyte * out_size)()
-            in_buf = (ctypes.c_ubyte * n).from_buffer_copy(payload_data)
-            
-            written = lib.encode_basic_payload(in_buf, n, 1 if escape else 0, out_buf)
-            if written > 0:
-                return bytes(out_buf[:written])
+            framed = _native_encode(lib.encode_basic_payload, data,
+                                    1 if escape else 0, 2 * len(data) + 6)
+            if framed is not None:
+                return framed
         except Exception:
             pass
 
-    n = len(payload_bytes)
-    max_size = 6 + (2 * n if escape else n)
-    buf = bytearray(max_size)
-    mv = memoryview(buf)
-    
-    mv[0] = models.MESSAGE_START_BYTE
-    
-    idx = 3
-    if escape:
-        esc1, esc2, esc3 = models.ESCAPE_BYTE_1, models.ESCAPE_BYTE_2, models.ESCAPE_BYTE_3
-        # bytes(), not list — assigning a list to a memoryview slice raises
-        # TypeError (the C path normally masks this; see test_framing_both_impls).
-        seq1 = bytes(models.ESCAPE_SEQUENCE_1)
-        seq2 = bytes(models.ESCAPE_SEQUENCE_2)
-        seq3 = bytes(models.ESCAPE_SEQUENCE_3)
-        for b in payload_bytes:
-            if b == esc1:
-                mv[idx:idx+2] = seq1
-                idx += 2
-            elif b == esc2:
-                mv[idx:idx+2] = seq2
-                idx += 2
-            elif b == esc3:
-                mv[idx:idx+2] = seq3
-                idx += 2
-            else:
-                mv[idx] = b
-                idx += 1
-    else:
-        mv[idx:idx+n] = bytes(payload_bytes)
-        idx += n
-        
-    working_payload_len = idx - 3
-    length_value = working_payload_len + models.MESSAGE_CHECKSUM_LENGTH
-    
-    mv[1] = length_value & 0xFF
-    mv[2] = (length_value >> 8) & 0xFF
-    
-    checksum = sum(mv[1:idx]) & 0xFFFF
-    
-    mv[idx] = checksum & 0xFF
-    mv[idx+1] = (checksum >> 8) & 0xFF
-    mv[idx+2] = models.MESSAGE_END_BYTE
-    
-    return bytes(mv[:idx+3])
-
-
-def encode_ios_le_payload(payload_bytes: list, packet_number: int = 0x00000000) -> bytes:
+    body = _escape_bytes(data) if escape else data
+    length_value = len(body) + models.MESSAGE_CHECKSUM_LENGTH
+    buf = bytearray(len(body) + 6)
+    buf[0] = models.MESSAGE_START_BYTE
+    buf[1] = length_value & 0xFF
+    buf[2] = (length_value >> 8) & 0xFF
+    idx = 3 + len(body)
+    buf[3:idx] = body
+
+    checksum = (buf[1] + buf[2] + sum(body)) & 0xFFFF
+
+    buf[idx] = checksum & 0xFF
+    buf[idx+1] = (checksum >> 8) & 0xFF
+    buf[idx+2] = models.MESSAGE_END_BYTE
+
+    return bytes(buf)
+
+
+def encode_ios_le_payload(payload_bytes: Payload, packet_number: int = 0x00000000) -> bytes:
     """
     Encode a command in the official Divoom iOS-LE protocol format.
 
@@ -137,52 +176,134 @@ def encode_ios_le_payload(payload_bytes: list, packet_number: int = 0x00000000)
         [checksum_lo, checksum_hi]                (sum of bytes 4..end-3, little-endian)
         [0x02]                                    (end marker)
     """
-    if not payload_bytes:
+    if not len(payload_bytes):
         raise ValueError("payload_bytes must contain at least the command id")
 
+    data = as_payload_bytes(payload_bytes)
     if lib is not None:
         try:
-            payload_data = bytes(payload_bytes)
-            n = len(payload_data)
-            out_size = n + 10
-            out_buf = (ctypes.c_ubyte * out_size)()
-            in_buf = (ctypes.c_ubyte * n).from_buffer_copy(payload_data)
-            
-            written = lib.encode_ios_le_payload(in_buf, n, packet_number, out_buf)
-            if written > 0:
-                return bytes(out_buf[:written])
+            framed = _native_encode(lib.encode_ios_le_payload, data,
+                                    packet_number, len(data) + 10)
+            if framed is not None:
+                return framed
         except Exception:
             pass
 
-    n = len(payload_bytes)
+    n = len(data)
     total_len = n + 10
     buf = bytearray(total_len)
-    mv = memoryview(buf)
-    
-    mv[0:4] = bytes(models.IOS_LE_MESSAGE_HEADER)  # bytes(), not list (memoryview slice)
-    
+
+    buf[0:4] = _IOS_LE_HEADER_BYTES
+
     length_field = total_len - 7
-    mv[4] = length_field & 0xFF
-    mv[5] = (length_field >> 8) & 0xFF
-    
-    packet_number_byte = packet_number & 0xFF
-    mv[6] = packet_number_byte
-    
-    command_identifier = payload_bytes[0]
-    mv[7] = command_identifier
-    
-    if n > 1:
-        mv[8:8+n-1] = bytes(payload_bytes[1:])
-        
-    checksum = sum(mv[4:n+7]) & 0xFFFF
-    
+    buf[4] = length_field & 0xFF
+    buf[5] = (length_field >> 8) & 0xFF
+
+    # Only the low byte of the packet number is transmitted. The command id and
+    # its data are contiguous in `data`, so they land at 7.. in one slice copy.
+    buf[6] = packet_number & 0xFF
+    buf[7:7+n] = data
+
+    checksum = sum(memoryview(buf)[4:n+7]) & 0xFFFF
+
     idx = n + 7
-    mv[idx] = checksum & 0xFF
-    mv[idx+1] = (checksum >> 8) & 0xFF
-    mv[idx+2] = models.MESSAGE_END_BYTE
-    
-    return bytes(mv)
+    buf[idx] = checksum & 0xFF
+    buf[idx+1] = (checksum >> 8) & 0xFF
+    buf[idx+2] = models.MESSAGE_END_BYTE
 
+    return bytes(buf)
+
+
+
+# Largest chunk the native batch framer accepts (BATCH_MAX_CHUNK in compact.c).
+_BATCH_MAX_CHUNK = 4096
+# [cmd][control][file_size:4][offset_id:2] ahead of each SendingData chunk.
+_8B_DATA_HEADER_SIZE = 8
+
+
+class WireFraming(NamedTuple):
+    """How a transport frames outbound packets, so callers can pre-frame a
+    whole transfer (`frame_8b_transfer`) and hand it the finished bytes."""
+    ios_le: bool = False
+    escape: bool = False
+
+
+def frame_command(command: int, args: Payload | None, wire: WireFraming) -> bytes:
+    """``command`` + ``args`` framed exactly as a transport with ``wire``
+    framing puts it on the wire, for ``send_frame`` / ``send_frames``."""
+    payload = command_payload(command, args)
+    if wire.ios_le:
+        return encode_ios_le_payload(payload)
+    return encode_basic_payload(payload, escape=wire.escape)
+
+
+class FramedBatch:
+    """Fully framed packets packed back to back in one buffer.
+
+    ``offsets`` has ``len(batch) + 1`` entries; packet ``i`` is
+    ``buffer[offsets[i]:offsets[i + 1]]`` and `frame` returns it as a
+    zero-copy memoryview, so re-sending a packet is just another slice.
+    """
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, buffer: bytes, offsets: Tuple[int, ...]) -> None:
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def frame(self, index: int) -> memoryview:
+        return memoryview(self.buffer)[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        return (self.frame(i) for i in range(len(self)))
+
+
+def frame_8b_transfer(blob: BytesLike, chunk_size: int = 256,
+                      wire: WireFraming = WireFraming()) -> FramedBatch:
+    """Pre-frame every 0x8B SendingData packet for ``blob`` in one pass.
+
+    Packet ``i`` is exactly what ``send_command(0x8B, _phase_data(len(blob), i,
+    chunk_i))`` would put on the wire under ``wire`` framing, so the streamer
+    (and its retransmit server) writes slices instead of re-encoding per chunk.
+    """
+    data = bytes(blob)
+    file_size = len(data)
+    if file_size <= 0 or chunk_size <= 0:
+        raise ValueError("frame_8b_transfer needs a non-empty blob and a positive chunk size")
+    count = -(-file_size // chunk_size)
+    if lib is not None and hasattr(lib, "encode_8b_data_batch") and chunk_size <= _BATCH_MAX_CHUNK:
+        try:
+            per_frame = (_8B_DATA_HEADER_SIZE + chunk_size) + 10 if wire.ios_le \
+                else 2 * (_8B_DATA_HEADER_SIZE + chunk_size) + 6
+            out_size = count * per_frame
+            out_buf = (ctypes.c_ubyte * out_size)()
+            offsets = (ctypes.c_int * (count + 1))()
+            in_buf = (ctypes.c_ubyte * file_size).from_buffer_copy(data)
+            written = lib.encode_8b_data_batch(in_buf, file_size, chunk_size,
+                                               1 if wire.ios_le else 0,
+                                               1 if wire.escape else 0,
+                                               out_buf, out_size, offsets)
+            if written > 0:
+                return FramedBatch(ctypes.string_at(out_buf, written), tuple(offsets))
+        except Exception:
+            pass
+
+    head = bytes((models.COMMANDS["app new send gif cmd"], models.ANSGC_CONTROL_SENDING_DATA)) \
+        + file_size.to_bytes(4, "little")
+    view = memoryview(data)
+    out = bytearray()
+    offsets_list = [0]
+    for index in range(count):
+        start = index * chunk_size
+        payload = head + index.to_bytes(2, "little") + view[start:start + chunk_size]
+        if wire.ios_le:
+            out += encode_ios_le_payload(payload)
+        else:
+            out += encode_basic_payload(payload, escape=wire.escape)
+        offsets_list.append(len(out))
+    return FramedBatch(bytes(out), tuple(offsets_list))
 
 
 def parse_ios_le_notification(data: bytes) -> dict | None:
@@ -0,0 +1,70 @@
+"""A long-lived, per-event-loop aiohttp session.
+
+``LanTransport.post`` used to build a fresh ``aiohttp.ClientSession`` for every
+command, so each brightness tweak paid for a TCP handshake plus session and
+connector construction. `PooledSession` keeps one session (and its keep-alive
+connection pool) per owner and hands it out on demand.
+
+aiohttp sessions are bound to the event loop that created them, and this
+library runs on several (the daemon's device loop, one per test, a GUI worker).
+A request from a different loop therefore gets a new session. The old one is
+closed on its own loop if that loop is still running, else dropped with it.
+``close()`` releases the pool; the next request transparently opens a new
+one.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger("divoom_lib.http_session")
+
+
+class PooledSession:
+    """Lazily created aiohttp session, rebuilt when the running loop changes.
+
+    ``factory`` builds the session (called on the loop that will use it), so
+    the owner decides connector limits, keep-alive and default timeouts.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._session: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.created = 0
+
+    def get(self) -> Any:
+        """The session for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        session = self._session
+        if session is not None and self._loop is loop and not getattr(session, "closed", False):
+            return session
+        if session is not None and self._loop is not loop:
+            self._abandon(session, self._loop)
+        self._session = self._factory()
+        self._loop = loop
+        self.created += 1
+        return self._session
+
+    async def close(self) -> None:
+        session, loop = self._session, self._loop
+        self._session = self._loop = None
+        if session is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+        else:
+            self._abandon(session, loop)
+
+    @staticmethod
+    def _abandon(session: Any, loop: asyncio.AbstractEventLoop | None) -> None:
+        if loop is None or loop.is_closed():
+            return
+        try:
+            if loop is asyncio.get_running_loop():
+                loop.create_task(session.close())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+        except RuntimeError as e:  # loop shut down between the checks
+            logger.debug("could not close abandoned aiohttp session: %s", e)
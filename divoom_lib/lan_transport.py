@@ -29,9 +29,12 @@ try:
 except ImportError:
     _AIOHTTP_AVAILABLE = False
 
+from divoom_lib.http_session import PooledSession
 from divoom_lib.transport import Transport, via
 from divoom_lib.lan_transport_photo import LanPhotoMixin
 from divoom_lib.lan_transport_extras import LanExtrasMixin
+from divoom_lib.lan_transport_batch import LanBatchMixin
+from divoom_lib.lan_transport_gif import LanGifMixin
 
 
 class LanTransportError(Exception):
@@ -61,7 +64,7 @@ def _validate_lan_response(status: int, text: str, command: str) -> dict:
     return result
 
 
-class LanTransport(LanPhotoMixin, LanExtrasMixin):
+class LanTransport(LanPhotoMixin, LanExtrasMixin, LanBatchMixin, LanGifMixin):
     """
     Sends commands to a WiFi-enabled Divoom device via its local HTTP API.
 
@@ -85,6 +88,10 @@ class LanTransport(LanPhotoMixin, LanExtrasMixin):
     PORT = 9000
     PATH = "/divoom_api"
     TIMEOUT = 5.0  # seconds
+    # Keep-alive pool: the device's embedded HTTP server handles few sockets,
+    # and drops idle ones, so keep the pool small and recycle idle connections.
+    LIMIT_PER_HOST = 4
+    KEEPALIVE_S = 5.0
 
     def __init__(
         self,
@@ -96,6 +103,21 @@ class LanTransport(LanPhotoMixin, LanExtrasMixin):
         self.local_token = local_token
         self.logger = logger or logging.getLogger("divoom.lan")
         self._base_url = f"http://{device_ip}:{self.PORT}{self.PATH}"
+        # One keep-alive session per transport (per event loop), instead of a
+        # new ClientSession + TCP handshake per command. Closed by close().
+        self._http = PooledSession(self._new_session)
+
+    def _new_session(self) -> "aiohttp.ClientSession":
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=self.LIMIT_PER_HOST,
+                                           keepalive_timeout=self.KEEPALIVE_S),
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session (``Divoom.disconnect`` calls this).
+        The transport stays usable; the next command opens a new session."""
+        await self._http.close()
 
     # ── Low-level POST ────────────────────────────────────────────────────────
 
@@ -129,28 +151,24 @@ class LanTransport(LanPhotoMixin, LanExtrasMixin):
             body.update(extra)
 
         self.logger.debug(f"[LAN ] POST {self._base_url} → {command} {extra or ''}")
+        self._screen_touched(command)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self._base_url,
-                    json=body,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
-                ) as resp:
-                    status = resp.status
-                    text = await resp.text()
+            status, text = await self._send(body)
         except aiohttp.ClientConnectorError as e:
+            self.mark_reachable(False)
             raise LanTransportError(
                 f"Cannot reach device at {self.device_ip}:{self.PORT}. "
                 f"Check that the device is on the same Wi-Fi network. ({e})"
             ) from e
         except asyncio.TimeoutError:
+            self.mark_reachable(False)
             raise LanTransportError(
                 f"Device at {self.device_ip} did not respond within {self.TIMEOUT}s."
             )
         except Exception as e:
             raise LanTransportError(f"LAN request failed: {e}") from e
+        self.mark_reachable(True)
 
         # Validate OUTSIDE the network try so an honest-failure raise here isn't
         # re-wrapped as "LAN request failed" by the broad except above.
@@ -158,21 +176,35 @@ class LanTransport(LanPhotoMixin, LanExtrasMixin):
         self.logger.debug(f"[LAN ] ← {result}")
         return result
 
+    async def _send(self, body: dict[str, Any]) -> tuple[int, str]:
+        """POST ``body`` on the pooled session. A keep-alive connection the
+        device already closed fails as ServerDisconnectedError before any
+        response; that one is retried once on a fresh connection."""
+        retry = True
+        while True:
+            try:
+                async with self._http.get().post(
+                    self._base_url,
+                    json=body,
+                    timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+                ) as resp:
+                    return resp.status, await resp.text()
+            except aiohttp.ServerDisconnectedError:
+                if not retry:
+                    raise
+                retry = False
+                self.logger.debug("[LAN ] stale keep-alive connection to %s; retrying", self.device_ip)
+
     # ── Connection probe ──────────────────────────────────────────────────────
 
     async def probe(self) -> bool:
         """
-        Check whether the device is reachable on the LAN.
+        Check whether the device is reachable on the LAN; refreshes `is_reachable`.
 
         Transport:  LAN
 
         Returns:
             True if the device responded, False otherwise.
-
-        Usage::
-
-            if await lan.probe():
-                print("Device reachable on LAN")
         """
         try:
             # Channel/GetIndex is a safe, read-only probe command
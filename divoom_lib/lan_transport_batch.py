@@ -0,0 +1,97 @@
+"""
+lan_transport_batch.py — ``Draw/CommandList`` batching for LanTransport.
+
+The device's local API accepts one envelope carrying many commands::
+
+    POST {"Command": "Draw/CommandList", "LocalToken": 0,
+          "CommandList": [{"Command": "Channel/SetBrightness", "Brightness": 80},
+                          {"Command": "Channel/SetIndex", "SelectIndex": 3}]}
+
+so a multi-setting "scene" change costs one HTTP round trip instead of one
+per setting. Two entry points, both mixed into LanTransport:
+
+    async with lan.batch() as scene:      # record with the usual methods
+        await scene.set_brightness(80)
+        await scene.set_channel(3)
+    scene.results                          # one result dict per command
+
+    await lan.post_batch([("Channel/SetBrightness", {"Brightness": 80}),
+                          ("Channel/SetIndex", {"SelectIndex": 3})])
+
+The device answers the envelope with a single ``error_code``; ``post()``
+validates it (a rejected batch raises LanTransportError for all of it) and
+each command's result is a copy of that answer. Reads (``*/Get*``) can't be
+batched because their payloads don't come back per command; recording one
+raises ValueError. A batch of one is sent as a plain command.
+"""
+
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Iterable
+
+from divoom_lib.transport import Transport, via
+
+BATCH_COMMAND = "Draw/CommandList"
+
+BatchCommand = tuple[str, "dict[str, Any] | None"]
+
+
+def _check_batchable(command: str) -> None:
+    if command.rpartition("/")[2].startswith("Get"):
+        raise ValueError(f"{command} is a read; its reply can't be split out of a {BATCH_COMMAND}")
+
+
+class LanBatch:
+    """Commands recorded for one ``Draw/CommandList`` POST.
+
+    Exposes LanTransport's LAN command methods; calling one records its
+    command here instead of sending it. ``results`` is filled when the
+    ``lan.batch()`` block exits.
+    """
+
+    def __init__(self, lan: Any) -> None:
+        self._lan = lan
+        self.commands: list[BatchCommand] = []
+        self.results: list[dict] | None = None
+
+    async def post(self, command: str, extra: dict[str, Any] | None = None) -> None:
+        """Record ``command`` (the wrappers' ``self.post`` lands here)."""
+        _check_batchable(command)
+        self.commands.append((command, dict(extra) if extra else None))
+
+    def __getattr__(self, name: str):
+        method = getattr(type(self._lan), name, None)
+        if name == "post_batch" or getattr(method, "transport", None) is not Transport.LAN:
+            raise AttributeError(f"{type(self._lan).__name__}.{name} can't be batched")
+        return partial(method, self)
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+
+class LanBatchMixin:
+    """``batch()`` / ``post_batch()`` mixed into LanTransport — relies on the
+    host class's ``self.post()``."""
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[LanBatch]:
+        """Record commands in the block, then send them as one POST on exit
+        (nothing is sent if the block raises). Transport: LAN."""
+        scene = LanBatch(self)
+        yield scene
+        scene.results = await self.post_batch(scene.commands)
+
+    @via(Transport.LAN)
+    async def post_batch(self, commands: Iterable[BatchCommand]) -> list[dict]:
+        """Send ``(command, extra)`` pairs in one ``Draw/CommandList`` POST and
+        return one result dict per command, in order. Transport: LAN."""
+        commands = list(commands)
+        if not commands:
+            return []
+        for command, _extra in commands:
+            _check_batchable(command)
+        if len(commands) == 1:
+            return [await self.post(*commands[0])]
+        envelope = [{"Command": command, **(extra or {})} for command, extra in commands]
+        result = await self.post(BATCH_COMMAND, {"CommandList": envelope})
+        return [dict(result) for _ in commands]
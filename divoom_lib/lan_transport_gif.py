@@ -0,0 +1,143 @@
+"""
+lan_transport_gif.py — ``Draw/SendHttpGif`` animation streaming for
+LanTransport.
+
+WiFi devices take images and animations straight over the local API, one
+POST per frame::
+
+    {"Command": "Draw/SendHttpGif", "PicNum": 12, "PicWidth": 64,
+     "PicOffset": 3, "PicID": 7, "PicSpeed": 100, "PicData": "<base64 RGB>"}
+
+``PicData`` is the frame's raw RGB (``PicWidth`` x ``PicWidth`` x 3 bytes, row
+major, the ``process_image`` layout) in base64. ``PicID`` names one
+animation: frames with the same id are assembled by ``PicOffset`` until
+``PicNum`` have arrived. The device keeps its own counter
+(``Draw/GetHttpGifId``), wants a fresh, increasing id per animation, and is
+known to misbehave once the counter runs long, so the id is reset
+(``Draw/ResetHttpGifId``) every ``HTTP_GIF_ID_LIMIT`` animations.
+
+Frames are streamed as pipelined POSTs: frame 0 goes first on its own (it
+opens the PicID on the device), then the rest are in flight at most
+``window`` at a time over the transport's pooled keep-alive session. One
+animation streams at a time per transport. Any failed POST raises
+LanTransportError. With a ``sync`` (`wall_sync.SlotSync`) the last frame,
+which completes the PicID and starts playback, waits for ``sync.hold()``.
+
+A POST that can't reach the device (connect error or timeout) marks the
+transport unreachable for ``UNREACHABLE_BACKOFF_S``: ``Display.show_image``
+and `DeviceGroup` then go straight to Bluetooth instead of paying the
+timeout on every push. Any answered POST, e.g. ``probe()``, clears it.
+"""
+
+import asyncio
+import base64
+import time
+from typing import Any, Sequence
+
+from divoom_lib.transport import Transport, via
+
+HTTP_GIF_SIZE = 64          # Pixoo 64 native grid; the API also takes 16 and 32
+HTTP_GIF_MAX_FRAMES = 59    # the device rejects PicNum >= 60
+HTTP_GIF_ID_LIMIT = 32
+HTTP_GIF_WINDOW = 4         # matches LanTransport.LIMIT_PER_HOST
+UNREACHABLE_BACKOFF_S = 60.0
+
+Frame = tuple[bytes, int, int, int]  # (rgb, width, height, duration_ms)
+
+
+def encode_http_gif_frame(rgb: bytes, size: int) -> str:
+    """One ``size`` x ``size`` RGB frame as ``PicData`` (base64)."""
+    if len(rgb) != size * size * 3:
+        raise ValueError(f"frame is {len(rgb)} bytes, expected {size}x{size} RGB")
+    return base64.b64encode(rgb).decode("ascii")
+
+
+class LanGifMixin:
+    """``send_http_gif`` mixed into LanTransport — relies on the host
+    class's ``self.post()``."""
+
+    HTTP_GIF_SIZE = HTTP_GIF_SIZE
+    # The owning connection's `PushState` (Divoom links it). Every POST that
+    # may change the screen — anything but a read or a non-visual setter —
+    # drops its skip-if-unchanged digest, as BLE's DISPLAY_CHANGING_COMMANDS do.
+    push_state: Any = None
+    SCREEN_SAFE_COMMANDS = frozenset({"Channel/SetBrightness", "Channel/SetProduceTime"})
+    UNREACHABLE_BACKOFF_S = UNREACHABLE_BACKOFF_S
+    _unreachable_until = 0.0
+
+    @property
+    def is_reachable(self) -> bool:
+        """False while a recent unreachable POST holds LAN pushes off."""
+        return time.monotonic() >= self._unreachable_until
+
+    def mark_reachable(self, ok: bool) -> None:
+        self._unreachable_until = 0.0 if ok else time.monotonic() + self.UNREACHABLE_BACKOFF_S
+
+    def _screen_touched(self, command: str) -> None:
+        state = self.push_state
+        if state is None or command in self.SCREEN_SAFE_COMMANDS:
+            return
+        if not command.rpartition("/")[2].startswith("Get"):
+            state.invalidate()
+
+    async def _next_pic_id(self) -> int:
+        pic_id = getattr(self, "_pic_id", None)
+        if pic_id is None:
+            pic_id = int((await self.post("Draw/GetHttpGifId")).get("PicId", 0))
+        pic_id += 1
+        if pic_id > HTTP_GIF_ID_LIMIT:
+            await self.post("Draw/ResetHttpGifId")
+            pic_id = 1
+        self._pic_id = pic_id
+        return pic_id
+
+    @via(Transport.LAN)
+    async def send_http_gif(self, frames: Sequence[Frame], size: int = HTTP_GIF_SIZE,
+                            window: int = HTTP_GIF_WINDOW, sync=None) -> dict[str, Any]:
+        """Stream ``frames`` (``process_image(..., size=size)`` output) as one
+        animation. Returns ``{"pic_id", "frames", "elapsed_s"}``. Transport: LAN.
+
+        Usage::
+
+            frames, *_ = process_image("nyan.gif", size=64)
+            await lan.send_http_gif(frames)
+        """
+        if len(frames) > HTTP_GIF_MAX_FRAMES:
+            self.logger.warning("[LAN ] SendHttpGif takes %d frames; dropping the last %d",
+                                HTTP_GIF_MAX_FRAMES, len(frames) - HTTP_GIF_MAX_FRAMES)
+        frames = list(frames[:HTTP_GIF_MAX_FRAMES])
+        if not frames:
+            raise ValueError("send_http_gif needs at least one frame")
+        lock = getattr(self, "_gif_lock", None)
+        if lock is None:
+            lock = self._gif_lock = asyncio.Lock()
+        async with lock:
+            started = time.monotonic()
+            pic_id = await self._next_pic_id()
+            bodies = [{
+                "PicNum": len(frames), "PicWidth": size, "PicOffset": offset,
+                "PicID": pic_id, "PicSpeed": int(duration),
+                "PicData": encode_http_gif_frame(rgb, size),
+            } for offset, (rgb, _w, _h, duration) in enumerate(frames)]
+            final = bodies.pop() if sync is not None else None
+            if bodies:
+                await self.post("Draw/SendHttpGif", bodies[0])
+            sem = asyncio.Semaphore(max(1, window))
+
+            async def send(body):
+                async with sem:
+                    await self.post("Draw/SendHttpGif", body)
+
+            tasks = [asyncio.ensure_future(send(body)) for body in bodies[1:]]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:  # one frame failed: don't leave the rest streaming
+                    task.cancel()
+                raise
+            if final is not None:
+                await sync.hold()
+                await self.post("Draw/SendHttpGif", final)
+                sync.committed()
+            return {"pic_id": pic_id, "frames": len(frames),
+                    "elapsed_s": round(time.monotonic() - started, 4)}
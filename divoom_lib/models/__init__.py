@@ -1,6 +1,6 @@
 # divoom_lib/models/__init__.py
 
-from .commands import COMMANDS
+from .commands import COMMANDS, COALESCABLE_COMMANDS
 from .config import DivoomConfig
 from .constants import *
 from .capabilities import (
@@ -17,6 +17,7 @@ from .device_slot import DeviceSlot
 
 __all__ = [
     "COMMANDS",
+    "COALESCABLE_COMMANDS",
     "DivoomConfig",
     
     # Constants
@@ -28,6 +29,8 @@ __all__ = [
     "FIXED_STRING_BYTE",
     "GENERIC_ACK_COMMAND_ID",
     "GENERIC_ACK_COMMANDS",
+    "DISPLAY_CHANGING_COMMANDS",
+    "INTERACTIVE_COMMANDS",
     "WORK_MODE_DESIGN",
     "WORK_MODE_EFFECTS",
     "WORK_MODE_VISUALIZATION",
@@ -122,3 +122,15 @@ COMMANDS = {
     "get sd play name": 0x06,
     "get work mode": 0x13,
 }
+
+# Idempotent absolute setters: a queued write that hasn't gone out yet may be
+# replaced by a newer one for the same key (last value wins; see
+# divoom_lib.command_coalescer). Value = how many leading arg bytes select a
+# sub-mode; writes only coalesce when those bytes match too.
+# "set light mode" is deliberately absent: every mode switches the shown
+# channel, so collapsing a queued write would reorder channel switches.
+COALESCABLE_COMMANDS = {
+    COMMANDS["set brightness"]: 0,
+    COMMANDS["set volume"]: 0,
+    COMMANDS["set gif speed"]: 0,
+}
@@ -15,6 +15,7 @@ class DivoomConfig:
         client: object | None = None,
         screensize: int | None = None,
         device_type: str | None = None,
+        adapter: str | None = None,
     ):
         self.mac = mac
         self.logger = logger
@@ -28,3 +29,15 @@ class DivoomConfig:
         self.client = client
         self.screensize = screensize
         self.device_type = device_type
+        # Host BLE adapter (BlueZ "hci0", "hci1", ...); None = the OS default.
+        self.adapter = adapter
+
+    @classmethod
+    def from_kwargs(cls, mac: str | None, logger: object | None, kwargs: dict) -> "DivoomConfig":
+        """The config `Divoom(mac=..., **kwargs)` builds when no config is given."""
+        names = ("write_characteristic_uuid", "notify_characteristic_uuid",
+                 "read_characteristic_uuid", "spp_characteristic_uuid", "escapePayload",
+                 "use_ios_le_protocol", "device_name", "client", "screensize",
+                 "device_type", "adapter")
+        return cls(mac=mac, logger=logger or kwargs.get("logger"),
+                   **{name: kwargs[name] for name in names if name in kwargs})
@@ -22,6 +22,27 @@ GENERIC_ACK_COMMANDS = [
     COMMANDS["get alarm time"],
 ]
 
+# Commands that change what the screen shows. Sending any of them drops the
+# connection's skip-if-unchanged digest (see divoom_lib.push_state).
+DISPLAY_CHANGING_COMMANDS = frozenset(COMMANDS[name] for name in (
+    "set light mode", "set work mode", "set design", "send hotctrl",
+    "set image", "set animation frame", "app new send gif cmd",
+    "app new user define", "app big64 user define", "set user gif",
+    "set rhythm gif", "app send eq gif", "set text content",
+    "drawing pad ctrl", "drawing mul pad enter", "drawing mul encode single pic",
+    "drawing mul encode pic", "drawing mul encode gif play",
+    "drawing encode movie play", "drawing mul encode movie play",
+    "sand paint ctrl", "pic scan ctrl", "set tool", "set game",
+))
+
+# Commands a person is waiting on (GUI sliders, game key presses). The
+# connection's command scheduler sends them ahead of normal and bulk traffic
+# (see divoom_lib.command_scheduler).
+INTERACTIVE_COMMANDS = frozenset(COMMANDS[name] for name in (
+    "set brightness", "set volume", "set game ctrl info",
+    "set game ctrl key up info", "send game shark",
+))
+
 # WORK MODES (from display.py)
 WORK_MODE_DESIGN = 0x05
 WORK_MODE_EFFECTS = 0x04
@@ -1,5 +1,5 @@
 """
-Divoom device image encoder — native dylib with pure-Python fallback.
+Divoom device image encoder — native dylib with NumPy / pure-Python fallback.
 
 The dylib (`divoom_lib/libdivoom_compact.dylib`) implements the palette
 encoder in C for ~10-50× faster animation push. The C output is
@@ -8,7 +8,9 @@ byte-identical to the pure-Python encoder in
 asserts this for ≥100 random inputs.
 
 If the dylib is missing, fails to load, or returns an error, the wrapper
-falls back to the pure-Python encoder. The two paths are kept
+falls back to the NumPy-vectorized encoder
+(`divoom_lib/utils/divoom_image_encode_np.py`) when NumPy is importable, else
+to the pure-Python encoder. The paths are kept
 completely independent — the Python side has no C-call-specific math.
 
 This is a *library* function: not just for cover art. Future callers:
@@ -42,6 +44,10 @@ from ..utils.divoom_image_encode_32 import (  # noqa: F401
     pre_frames as _py_pre_frames_32,
 )
 
+# Third backend: NumPy-vectorized and byte-identical. It replaces the pure-Python
+# loops as the fallback whenever NumPy is importable.
+from ..utils import divoom_image_encode_np as _np_encode
+
 _lib = None
 _lib_load_error: str | None = None
 
@@ -209,6 +215,24 @@ def _c_encode_static_image(rgb: bytes, w: int, h: int) -> bytes | None:
         return None
 
 
+def _fallback_encode_animation_frame(rgb: bytes, w: int, h: int, time_ms: int) -> bytes:
+    if _np_encode.AVAILABLE:
+        return _np_encode.encode_animation_frame(rgb, w, h, time_ms)
+    return _py_encode_animation_frame(rgb, w, h, time_ms)
+
+
+def _fallback_encode_static_image(rgb: bytes, w: int, h: int) -> bytes:
+    if _np_encode.AVAILABLE:
+        return _np_encode.encode_static_image(rgb, w, h)
+    return _py_encode_static_image(rgb, w, h)
+
+
+def _fallback_encode_animation(frames: List[Frame]) -> List[bytes]:
+    if _np_encode.AVAILABLE:
+        return _np_encode.encode_animation(frames)
+    return _py_encode_animation(frames)
+
+
 def encode_animation_frame(
     rgb: bytes, w: int, h: int, time_ms: int
 ) -> bytes:
@@ -224,7 +248,7 @@ def encode_animation_frame(
     result = _c_encode_animation_frame(rgb, w, h, time_ms)
     if result is not None:
         return result
-    return _py_encode_animation_frame(rgb, w, h, time_ms)
+    return _fallback_encode_animation_frame(rgb, w, h, time_ms)
 
 
 def encode_static_image(rgb: bytes, w: int, h: int) -> bytes:
@@ -237,7 +261,7 @@ def encode_static_image(rgb: bytes, w: int, h: int) -> bytes:
     result = _c_encode_static_image(rgb, w, h)
     if result is not None:
         return result
-    return _py_encode_static_image(rgb, w, h)
+    return _fallback_encode_static_image(rgb, w, h)
 
 
 def encode_animation(frames: List[Frame]) -> List[bytes]:
@@ -256,9 +280,8 @@ def encode_animation(frames: List[Frame]) -> List[bytes]:
         for (rgb, w, h, t) in frames:
             frame_bytes = _c_encode_animation_frame(rgb, w, h, t)
             if frame_bytes is None:
-                # Fall back to Python for this frame, then bail to
-                # the all-Python path for consistency.
-                return _py_encode_animation(frames)
+                # Bail to the all-fallback path for consistency.
+                return _fallback_encode_animation(frames)
             encoded_frames.append(frame_bytes)
         blob = b"".join(encoded_frames)
         packed = _c_encode_animation_packets(blob)
@@ -275,7 +298,7 @@ def encode_animation(frames: List[Frame]) -> List[bytes]:
                 packets.append(packed[offset : offset + packet_size])
                 offset += packet_size
             return packets
-    return _py_encode_animation(frames)
+    return _fallback_encode_animation(frames)
 
 
 # ── Round 4: 32x32 encoder + 0x8B 3-phase ─────────────────────────────
@@ -42,6 +42,12 @@
 #define IOS_LE_HEADER_BYTE_3 0x55
 #define IOS_LE_LENGTH_OFFSET 7
 
+// ── 0x8B SendingData Batch Constants ───────────────────────────────
+#define CMD_APP_NEW_SEND_GIF    0x8B
+#define ANSGC_SENDING_DATA      0x01
+#define ANSGC_DATA_HEADER_SIZE  8     // cmd + control + file_size:4 + offset_id:2
+#define BATCH_MAX_CHUNK         4096
+
 
 void compact_tiles(const unsigned char* frame_data, int frame_data_len, 
                    unsigned char* output_pixels, int row_count, int column_count) {
@@ -195,6 +201,42 @@ int encode_ios_le_payload(const unsigned char* payload, int payload_len, int pac
     return out_idx;
 }
 
+// Pre-frame every 0x8B SendingData packet of a transfer into one contiguous
+// buffer: chunk i is [0x8B][0x01][file_size:4 LE][i:2 LE][blob[i*chunk..]],
+// framed with encode_ios_le_payload (ios_le) or encode_basic_payload.
+// offsets receives n_chunks + 1 entries (frame i = out[offsets[i]..offsets[i+1])).
+// Returns the total byte count, or -1 on bad args / an undersized out buffer.
+int encode_8b_data_batch(const unsigned char* blob, int blob_len, int chunk_size,
+                         int ios_le, int escape, unsigned char* out, int out_size,
+                         int* offsets) {
+    if (blob_len <= 0 || chunk_size <= 0 || chunk_size > BATCH_MAX_CHUNK) return -1;
+
+    unsigned char payload[ANSGC_DATA_HEADER_SIZE + BATCH_MAX_CHUNK];
+    payload[0] = CMD_APP_NEW_SEND_GIF;
+    payload[1] = ANSGC_SENDING_DATA;
+    payload[2] = blob_len & 0xFF;
+    payload[3] = (blob_len >> 8) & 0xFF;
+    payload[4] = (blob_len >> 16) & 0xFF;
+    payload[5] = (blob_len >> 24) & 0xFF;
 
-
-
+    int out_idx = 0;
+    int index = 0;
+    for (int start = 0; start < blob_len; start += chunk_size, index++) {
+        int n = blob_len - start < chunk_size ? blob_len - start : chunk_size;
+        int payload_len = ANSGC_DATA_HEADER_SIZE + n;
+        // Worst case: every payload byte escaped, plus start/len/checksum/end.
+        int worst = ios_le ? payload_len + 10 : 2 * payload_len + 6;
+        if (out_idx + worst > out_size) return -1;
+
+        payload[6] = index & 0xFF;
+        payload[7] = (index >> 8) & 0xFF;
+        memcpy(payload + ANSGC_DATA_HEADER_SIZE, blob + start, n);
+
+        offsets[index] = out_idx;
+        out_idx += ios_le
+            ? encode_ios_le_payload(payload, payload_len, 0, out + out_idx)
+            : encode_basic_payload(payload, payload_len, escape, out + out_idx);
+    }
+    offsets[index] = out_idx;
+    return out_idx;
+}
@@ -0,0 +1,68 @@
+"""Per-connection record of the last image pushed, for skip-if-unchanged.
+
+Live jobs (sysmon, stocks, music cover art) re-render and re-push a frame on
+every tick, and most ticks produce exactly the pixels the device already
+shows — yet each push is a full 0x8B handshake over BLE. `DivoomConnection`
+keeps one `PushState`; `Display.show_image` records the digest of every blob
+(or, over LAN, every frame list) it successfully pushes and short-circuits
+when the next one is identical.
+
+The digest is only trustworthy while nothing else has touched the screen, so
+it is dropped (`invalidate`) when the connection connects or disconnects and
+whenever a command in `models.DISPLAY_CHANGING_COMMANDS` (channel switches,
+other image/animation/text pushes) goes out, or the LAN transport posts a
+screen-changing command (`LanGifMixin.SCREEN_SAFE_COMMANDS`). ``epoch`` counts those
+events, so a caller that caches its own "the screen shows X" state (the
+wall's `update_canvas` tiles) can tell that the screen was touched since.
+"""
+from __future__ import annotations
+
+import hashlib
+
+
+class PushState:
+    """Digest of the last successfully pushed blob, plus push counters."""
+
+    def __init__(self) -> None:
+        self.last_digest: bytes | None = None
+        self.pushed = 0
+        self.suppressed = 0
+        self.invalidations = 0
+        self.epoch = 0  # bumped on every invalidate, even with nothing recorded
+
+    @staticmethod
+    def digest(blob: bytes) -> bytes:
+        return hashlib.blake2b(blob, digest_size=16).digest()
+
+    @staticmethod
+    def digest_frames(frames: list) -> bytes:
+        """Digest of ``(rgb, w, h, duration_ms)`` frames, for pushes that
+        stream raw frames instead of a blob (LAN ``Draw/SendHttpGif``)."""
+        h = hashlib.blake2b(b"frames", digest_size=16)
+        for rgb, w, height, duration in frames:
+            h.update(f"{w}x{height}:{duration}:".encode())
+            h.update(rgb)
+        return h.digest()
+
+    def is_current(self, digest: bytes) -> bool:
+        """True if ``digest`` is what the device is known to be showing."""
+        return self.last_digest is not None and self.last_digest == digest
+
+    def record(self, digest: bytes) -> None:
+        """A push of ``digest`` completed successfully."""
+        self.last_digest = digest
+        self.pushed += 1
+
+    def invalidate(self) -> None:
+        """Forget the last push (the screen may no longer show it)."""
+        self.epoch += 1
+        if self.last_digest is not None:
+            self.last_digest = None
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "pushed": self.pushed,
+            "suppressed": self.suppressed,
+            "invalidations": self.invalidations,
+        }
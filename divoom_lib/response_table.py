@@ -0,0 +1,87 @@
+"""Per-command response correlation: command id -> waiting futures.
+
+Request/response reads used to share one ``_expected_response_command``
+scalar and one ``notification_queue`` that every read drained first, so a
+whole device could only have a single read in flight (``_response_lock``).
+A `ResponseTable` instead holds a FIFO of futures per command id; the
+transport's notification handler hands each inbound frame to `deliver`
+before anything else sees it, so reads for different command ids can be
+outstanding at the same time.
+
+What `deliver` leaves alone keeps the old routing: frames for commands in a
+transport's ``_listen_commands`` set (device-driven protocols: hot update,
+0x8B retransmit requests) always go to ``notification_queue``, and so does
+anything no future is waiting for. A generic 0x33 ACK for a pending read of
+a `models.GENERIC_ACK_COMMANDS` command is consumed without resolving it —
+the real data response follows, exactly as ``wait_for_response`` treats it.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+from . import models
+
+
+class ResponseTable:
+    """Futures awaiting a response, keyed by command id, oldest first."""
+
+    def __init__(self) -> None:
+        self._waiting: dict[int, deque[asyncio.Future]] = {}
+
+    def expect(self, command_id: int) -> asyncio.Future:
+        """Register interest in the next ``command_id`` frame (before sending)."""
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(command_id, deque()).append(fut)
+        return fut
+
+    def discard(self, command_id: int, fut: asyncio.Future) -> None:
+        waiters = self._waiting.get(command_id)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(fut)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiting[command_id]
+
+    def is_waiting(self, command_id: int) -> bool:
+        return any(not f.done() for f in self._waiting.get(command_id, ()))
+
+    def deliver(self, command_id: int | None, payload: bytes) -> bool:
+        """Hand an inbound frame to the oldest waiter for ``command_id``.
+        True if the frame was consumed (resolved a read, or was the generic
+        ACK of a pending read)."""
+        waiters = self._waiting.get(command_id)
+        while waiters:
+            fut = waiters.popleft()
+            if not fut.done():
+                fut.set_result(payload)
+                if not waiters:
+                    del self._waiting[command_id]
+                return True
+        if waiters is not None:
+            del self._waiting[command_id]  # only stale (timed-out) futures left
+        if command_id == models.GENERIC_ACK_COMMAND_ID:
+            return any(self.is_waiting(c) for c in models.GENERIC_ACK_COMMANDS)
+        return False
+
+    async def request(self, command_id: int, send: Callable[[], Awaitable[object]],
+                      timeout: float) -> bytes | None:
+        """Register, ``send()``, then wait up to ``timeout`` for the response.
+        None on timeout or when ``send()`` reports failure (returns False)."""
+        fut = self.expect(command_id)
+        try:
+            if await send() is False:
+                return None
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.discard(command_id, fut)
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for q in self._waiting.values() for f in q if not f.done())
@@ -1,6 +1,8 @@
 import logging
 from typing import Protocol, runtime_checkable
 
+from .framing import Payload
+
 
 @runtime_checkable
 class CommandSender(Protocol):
@@ -16,7 +18,7 @@ class CommandSender(Protocol):
     @property
     def is_connected(self) -> bool: ...
 
-    async def send_command(self, command: int | str, args: list | None = None, write_with_response: bool = False) -> bool: ...
+    async def send_command(self, command: int | str, args: Payload | None = None, write_with_response: bool = False) -> bool: ...
 
     async def send_command_and_wait_for_response(self, command: int | str, args: list | None = None, timeout: int = 10) -> bytes | None: ...
 
@@ -3,6 +3,8 @@
 import logging
 from typing import Protocol, runtime_checkable, Optional, Any
 
+from .framing import Payload
+
 @runtime_checkable
 class DeviceTransport(Protocol):
     """ Authoritative interface representing Divoom connection & transport layers. """
@@ -23,12 +25,12 @@ class DeviceTransport(Protocol):
         ...
 
     async def send_command(
-        self, command: int | str, args: list | None = None, write_with_response: bool = False
+        self, command: int | str, args: Payload | None = None, write_with_response: bool = False
     ) -> bool:
-        """ Format and send command to the device. """
+        """ Format and send command to the device (bytes-like or list args). """
         ...
 
-    async def send_payload(self, payload_bytes: list, max_retries: int = 3, **kwargs) -> bool:
+    async def send_payload(self, payload_bytes: Payload, max_retries: int = 3, **kwargs) -> bool:
         """ Sends a framed command payload. """
         ...
 
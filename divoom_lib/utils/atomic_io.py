@@ -24,13 +24,22 @@ def atomic_write_text(path, text: str, *, encoding: str = "utf-8",
     ``mode`` is an optional octal permission (e.g. ``0o600``) applied to the file
     before it is moved into place — use it for credential/token files.
     """
+    _atomic_replace(path, lambda fd: os.fdopen(fd, "w", encoding=encoding), text, mode)
+
+
+def atomic_write_bytes(path, data: bytes, *, mode: int | None = None) -> None:
+    """Binary counterpart of :func:`atomic_write_text` (cached device blobs)."""
+    _atomic_replace(path, lambda fd: os.fdopen(fd, "wb"), data, mode)
+
+
+def _atomic_replace(path, open_fd, payload, mode: int | None) -> None:
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.",
                                suffix=".tmp")
     try:
-        with os.fdopen(fd, "w", encoding=encoding) as f:
-            f.write(text)
+        with open_fd(fd) as f:
+            f.write(payload)
             f.flush()
             os.fsync(f.fileno())
         if mode is not None:
@@ -0,0 +1,225 @@
+"""Content-addressed cache of encoded 0x8B animation blobs.
+
+`Display.show_image` used to decode, resize, quantize and encode the source
+file on every push, even when playlists, wall re-pushes and live jobs sent the
+very same file seconds earlier. The encoded blob depends only on the file's
+bytes and a handful of push parameters, so it is cached under a key built from
+
+  - the SHA-256 of the file contents (not its path or mtime: a re-saved file
+    with identical bytes still hits, an edited file at the same path misses),
+  - the device screensize,
+  - `ENCODER_VERSION` (bump it whenever the on-wire encoding changes, so blobs
+    written by an older encoder are never replayed),
+  - the timing override and encode options (``time``, ``reuse_palette``).
+
+Two tiers:
+
+  - memory: an LRU of ``memory_entries`` blobs (`collections.OrderedDict`),
+  - disk: one ``<key>.bin`` per blob under ``cache_dir``, written atomically,
+    evicted oldest-access-first once the directory exceeds ``disk_max_bytes``.
+    The directory is scanned once for its size, which is then kept as a
+    running total (rescanned only when eviction runs). A disk hit is
+    promoted into memory.
+
+The disk tier defaults to ``~/.divoom-control/cache/blobs`` and can be moved
+with ``DIVOOM_BLOB_CACHE_DIR`` (an empty value disables it). `stats` exposes
+the hit/miss counters.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .atomic_io import atomic_write_bytes
+from .cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when any stage between the source file and the 0x8B blob changes its
+# output (process_image, divoom_quantize, the frame encoders).
+ENCODER_VERSION = 1
+
+DEFAULT_BLOB_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, "blobs")
+DEFAULT_MEMORY_ENTRIES = 64
+DEFAULT_DISK_MAX_BYTES = 32 * 1024 * 1024
+
+_BLOB_SUFFIX = ".bin"
+
+
+class BlobCache:
+    """Two-tier (memory LRU + size-capped disk) store of encoded blobs."""
+
+    def __init__(self, cache_dir: str | os.PathLike | None = None,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()  # Display encodes in worker threads
+        self._disk_lock = threading.Lock()  # disk writes don't block memory hits
+        self._disk_bytes: int | None = None  # running total; None until scanned
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for_file(file, screensize: int, time: int | None = None,
+                     reuse_palette: bool = False) -> str | None:
+        """Cache key for pushing ``file``; None if the file can't be read."""
+        try:
+            with open(file, "rb") as fh:
+                digest = hashlib.sha256(fh.read())
+        except OSError:
+            return None
+        params = f"v{ENCODER_VERSION}-s{int(screensize)}-t{time}-r{int(bool(reuse_palette))}"
+        return hashlib.sha256(f"{digest.hexdigest()}:{params}".encode()).hexdigest()
+
+    @staticmethod
+    def key_for_frames(frames, screensize: int, reuse_palette: bool = False) -> str:
+        """Cache key for pushing already-decoded `process_image` frames."""
+        digest = hashlib.sha256()
+        for rgb, width, height, duration in frames:
+            digest.update(f"{width}x{height}@{duration}:".encode())
+            digest.update(rgb)
+        params = f"v{ENCODER_VERSION}-s{int(screensize)}-f-r{int(bool(reuse_palette))}"
+        return hashlib.sha256(f"{digest.hexdigest()}:{params}".encode()).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached blob for ``key`` (memory first, then disk)."""
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return blob
+        blob = self._disk_get(key)
+        if blob is not None:
+            self.disk_hits += 1
+            self._remember(key, blob)
+            return blob
+        self.misses += 1
+        return None
+
+    def put(self, key: str, blob: bytes) -> None:
+        """Store ``blob`` in both tiers; disk errors are logged, never raised."""
+        blob = bytes(blob)
+        self._remember(key, blob)
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        with self._disk_lock:
+            total = self._disk_total()
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            try:
+                atomic_write_bytes(path, blob)
+            except OSError as e:
+                logger.warning(f"blob cache: disk write failed: {e}")
+                return
+            self._disk_bytes = total - replaced + len(blob)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._evict_disk()
+
+    def clear(self) -> None:
+        """Drop both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+        if self.cache_dir is None:
+            return
+        with self._disk_lock:
+            if self.cache_dir.is_dir():
+                for p in self.cache_dir.glob(f"*{_BLOB_SUFFIX}"):
+                    try:
+                        p.unlink()
+                    except OSError:
+                        pass
+            self._disk_bytes = None
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus the current size of each tier."""
+        with self._disk_lock:
+            disk_bytes = self._disk_total()
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_bytes": disk_bytes,
+        }
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        with self._lock:
+            self._memory[key] = blob
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_BLOB_SUFFIX}"
+
+    def _disk_get(self, key: str) -> bytes | None:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            blob = path.read_bytes()
+            os.utime(path)  # mtime doubles as the last-access time for eviction
+        except OSError:
+            return None
+        return blob
+
+    def _disk_total(self) -> int:
+        """Bytes on the disk tier; the first call scans it. ``_disk_lock`` held."""
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _p, size, _t in self._disk_entries())
+        return self._disk_bytes
+
+    def _disk_entries(self) -> list:
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return []
+        entries = []
+        for p in self.cache_dir.glob(f"*{_BLOB_SUFFIX}"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((p, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict_disk(self) -> None:
+        entries = self._disk_entries()
+        total = sum(size for _p, size, _t in entries)
+        for path, size, _mtime in sorted(entries, key=lambda e: e[2]):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+
+_default_cache: BlobCache | None = None
+
+
+def default_blob_cache() -> BlobCache:
+    """Process-wide cache shared by every `Display` (so a wall's devices share
+    blobs too). The disk tier honours ``DIVOOM_BLOB_CACHE_DIR``."""
+    global _default_cache
+    if _default_cache is None:
+        cache_dir = os.environ.get("DIVOOM_BLOB_CACHE_DIR", DEFAULT_BLOB_CACHE_DIR)
+        _default_cache = BlobCache(cache_dir or None)
+    return _default_cache
@@ -184,8 +184,13 @@ def encode_static_image(rgb_bytes: bytes, w: int, h: int) -> bytes:
         bytes ready to be sent as the payload of a 0x44 command.
     """
     palette, pixels, nb_bits = build_palette_and_pixels(rgb_bytes, w, h)
-    color_data = encode_palette(palette)
-    pixel_data = encode_pixels(pixels, nb_bits)
+    return _static_image_body(encode_palette(palette), encode_pixels(pixels, nb_bits),
+                              len(palette))
+
+
+def _static_image_body(color_data: bytes, pixel_data: bytes, num_colors: int) -> bytes:
+    """Wrap encoded palette + pixel data in the 0x44 header. Shared by every
+    encoder backend so the header bytes can't drift between them."""
     # LLLL = 1 (AA) + 2 (LLLL) + 3 (000000) + 1 (NN) + 3N (colors) + p (pixels)
     # = 7 + 3N + p. Per RomRider reference: `int2hexlittle((('AA0000000000'
     #   + stringWithoutHeader).length) / 2)` where stringWithoutHeader =
@@ -199,7 +204,7 @@ def encode_static_image(rgb_bytes: bytes, w: int, h: int) -> bytes:
             f"(e.g. 16x16/32x32) before encoding."
         )
     # NN is u8; 256 colors is encoded as 0 per the device's protocol.
-    nn = len(palette) if len(palette) < 256 else 0
+    nn = num_colors if num_colors < 256 else 0
     header = bytes([0xAA]) + _u16_le(llll) + bytes([0x00, 0x00, 0x00, nn])
     return header + color_data + pixel_data
 
@@ -232,8 +237,18 @@ def encode_animation_frame(
         and chunked into 0x49 packets.
     """
     palette, pixels, nb_bits = build_palette_and_pixels(rgb_bytes, w, h)
-    color_data = encode_palette(palette)
-    pixel_data = encode_pixels(pixels, nb_bits)
+    return _animation_frame_body(encode_palette(palette), encode_pixels(pixels, nb_bits),
+                                 len(palette), time_ms)
+
+
+def _animation_frame_body(color_data: bytes, pixel_data: bytes, num_colors: int,
+                          time_ms: int, reuse_palette: bool = False) -> bytes:
+    """Wrap encoded palette + pixel data in the per-frame header (see
+    `encode_animation_frame`). Shared by every encoder backend.
+
+    ``reuse_palette`` writes RR=0x01: ``color_data`` then holds only the
+    ``num_colors`` entries appended to the running palette, and NN is that
+    count as-is (0 means "no new colors", not 256)."""
     # Per reference: `int2hexlittle((stringWithoutHeader.length + 6) / 2)`
     # where stringWithoutHeader = TTTT + RR + NN + COLOR + PIXEL
     # (4 + 3N + p bytes; 2 hex chars each → 8 + 6N + 2p hex chars;
@@ -249,12 +264,12 @@ def encode_animation_frame(
     # Frame time is a u16 (TTTT); clamp to avoid 'int too big to convert'.
     t = max(0, min(0xFFFF, int(time_ms)))
     # NN is u8; 256 colors is encoded as 0 per the device's protocol.
-    nn = len(palette) if len(palette) < 256 else 0
+    nn = num_colors if num_colors < 256 else 0
     header = (
         bytes([0xAA])
         + _u16_le(llll)
         + _u16_le(t)
-        + bytes([0x00, nn])  # RR=0 (reset palette), NN
+        + bytes([0x01 if reuse_palette else 0x00, nn])  # RR (reset/append palette), NN
     )
     return header + color_data + pixel_data
 
@@ -315,7 +330,11 @@ def _py_encode_animation(frames: List[Frame]) -> List[bytes]:
     encoded_frames = [
         encode_animation_frame(rgb, w, h, t) for (rgb, w, h, t) in frames
     ]
-    blob = b"".join(encoded_frames)
+    return _packetize_animation(b"".join(encoded_frames))
+
+
+def _packetize_animation(blob: bytes) -> List[bytes]:
+    """Split a concatenated frame blob into 0x49 packet payloads."""
     total_len = len(blob) & 0xFFFF  # protocol u16 limit
     packets: List[bytes] = []
     packet_num = 0
@@ -0,0 +1,84 @@
+"""Cross-frame palette reuse for animation blobs (RR=0x01 append frames).
+
+The per-frame body (`divoom_image_encode.encode_animation_frame`) normally
+resets the palette every frame (RR=0x00) and repeats every color. The device
+also understands *append* frames — the format its own hot-channel files use,
+decoded by `media_decoder.decode_hot_file_format`:
+
+    AA LLLL TTTT 01 NN [NN new colors] [pixels]
+
+``flag`` 1 appends ``NN`` colors to the running palette (NN is a plain count,
+0 = nothing new) and the pixels index the *cumulative* palette at
+``(palette_size - 1).bit_length()`` bits each — omitted entirely while the
+palette holds a single color.
+
+`encode_animation_blob` keeps that running palette across the animation and,
+for every frame, emits whichever of the reset form and the append form is
+smaller. GIFs that keep re-using the same colors then carry their palette once.
+A frame falls back to a reset when its colors would push the running palette
+past 256, or when reindexing against the larger palette costs more pixel bits
+than the repeated colors save.
+"""
+from __future__ import annotations
+
+import math
+from typing import List
+
+from . import divoom_image_encode as _py
+from . import divoom_image_encode_np as _np_encode
+from .divoom_image_encode import Frame, _animation_frame_body
+
+_MAX_COLORS = 256
+
+
+def _palette_and_pixels(rgb: bytes, w: int, h: int) -> tuple[bytes, bytes, int]:
+    """Frame-local (first-seen) palette as RGB bytes, pixel indices as bytes."""
+    if _np_encode.AVAILABLE:
+        color_data, pixels, nb_bits = _np_encode.build_palette_and_pixels(rgb, w, h)
+        return color_data, pixels.tobytes(), nb_bits
+    palette, pixels, nb_bits = _py.build_palette_and_pixels(rgb, w, h)
+    return _py.encode_palette(palette), bytes(pixels), nb_bits
+
+
+def _pack(pixels: bytes, nb_bits: int) -> bytes:
+    if _np_encode.AVAILABLE:
+        return _np_encode.encode_pixels(_np_encode.np.frombuffer(pixels, dtype=_np_encode.np.uint8),
+                                        nb_bits)
+    return _py.encode_pixels(pixels, nb_bits)
+
+
+def _pixel_bytes(num_pixels: int, palette_size: int, minimum_bits: int) -> int:
+    bits = max(minimum_bits, (palette_size - 1).bit_length())
+    return math.ceil(num_pixels * bits / 8)
+
+
+def encode_animation_blob(frames: List[Frame]) -> bytes:
+    """Encode ``frames`` as one animation blob, reusing the palette across frames.
+
+    Decodes to the same pixels as concatenating `encode_animation_frame` for
+    every frame; the first frame (and any frame where it is smaller) is a
+    full reset frame, byte-identical to `encode_animation_frame`.
+    """
+    out = bytearray()
+    running: dict[bytes, int] = {}
+    for (rgb, w, h, t) in frames:
+        color_data, pixels, nb_bits = _palette_and_pixels(rgb, w, h)
+        colors = [color_data[i:i + 3] for i in range(0, len(color_data), 3)]
+        new = [c for c in colors if c not in running]
+        cumulative = len(running) + len(new)
+        full_size = len(color_data) + _pixel_bytes(len(pixels), len(colors), 1)
+        use_append = bool(running) and cumulative <= _MAX_COLORS and \
+            3 * len(new) + _pixel_bytes(len(pixels), cumulative, 0) < full_size
+        if not use_append:
+            running = {c: i for i, c in enumerate(colors)}
+            out += _animation_frame_body(color_data, _pack(pixels, nb_bits), len(colors), t)
+            continue
+        for c in new:
+            running[c] = len(running)
+        if cumulative == 1:
+            pixel_data = b""  # single-color palette: the device omits the pixel map
+        else:
+            table = bytes([running[c] for c in colors]) + bytes(_MAX_COLORS - len(colors))
+            pixel_data = _pack(pixels.translate(table), (cumulative - 1).bit_length())
+        out += _animation_frame_body(b"".join(new), pixel_data, len(new), t, reuse_palette=True)
+    return bytes(out)
@@ -0,0 +1,117 @@
+"""NumPy-vectorized backend for the Divoom palette encoder.
+
+Byte-identical to the pure-Python encoder in `divoom_image_encode` (and the C
+encoder in `divoom_lib.native.image_encoder`); only the two hot loops change:
+
+  1. Palette build: pixels are packed into 24-bit ``0xRRGGBB`` keys and
+     deduplicated with ``np.unique(..., return_index=True, return_inverse=True)``.
+     ``np.unique`` sorts, so the palette is re-ranked by each colour's first
+     occurrence to keep the protocol's *first-seen* order.
+  2. Bit packing: each index is expanded to ``nb_bits`` LSB-first bits and
+     ``np.packbits(bitorder="little")`` packs them continuously across byte
+     boundaries — the same stream `encode_pixels` builds one index at a time.
+
+The per-call overhead is a handful of NumPy dispatches, so this pays off for
+large frames (64×64, 160×140) and long animations rather than a single 16×16.
+NumPy is optional: `AVAILABLE` is False without it and callers fall back to
+the other backends.
+"""
+from __future__ import annotations
+
+from typing import List, Tuple
+
+try:
+    import numpy as np
+    AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+    AVAILABLE = False
+
+from .divoom_image_encode import (
+    Frame,
+    _animation_frame_body,
+    _packetize_animation,
+    _static_image_body,
+)
+
+_MAX_COLORS = 256
+
+
+def build_palette_and_pixels(rgb_bytes: bytes, w: int, h: int) -> Tuple[bytes, "np.ndarray", int]:
+    """Vectorized `divoom_image_encode.build_palette_and_pixels`.
+
+    Returns:
+        (color_data, pixels, nbBits):
+          color_data: the palette already encoded as ``RGB`` bytes,
+                      first-seen order (what `encode_palette` returns).
+          pixels:     uint8 array of palette indices, length w*h.
+          nbBits:     bits per pixel, ceil(log2(num_colors)), minimum 1.
+
+    Raises:
+        ValueError: on a size mismatch or more than 256 unique colors (same
+        messages as the pure-Python encoder).
+    """
+    if len(rgb_bytes) != w * h * 3:
+        raise ValueError(
+            f"rgb_bytes length {len(rgb_bytes)} != {w}*{h}*3 = {w*h*3}"
+        )
+    if w * h == 0:
+        return b"", np.zeros(0, dtype=np.uint8), 1
+    rgb = np.frombuffer(rgb_bytes, dtype=np.uint8).reshape(-1, 3).astype(np.uint32)
+    keys = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")  # sorted-unique slot -> first-seen rank
+    if len(uniq) > _MAX_COLORS:
+        raise ValueError(
+            f"image has more than 256 unique colors; the device "
+            f"protocol supports at most 256 (at pixel offset {int(first[order[_MAX_COLORS]])})"
+        )
+    rank = np.empty(len(uniq), dtype=np.uint8)
+    rank[order] = np.arange(len(uniq), dtype=np.uint8)
+    pixels = rank[inverse.ravel()]
+    palette = uniq[order]
+    color_data = np.stack(
+        [(palette >> 16) & 0xFF, (palette >> 8) & 0xFF, palette & 0xFF], axis=1
+    ).astype(np.uint8).tobytes()
+    nb_bits = max(1, (len(uniq) - 1).bit_length())
+    return color_data, pixels, nb_bits
+
+
+def encode_pixels(pixels: "np.ndarray", nb_bits: int) -> bytes:
+    """Vectorized `divoom_image_encode.encode_pixels` for a uint8 index array."""
+    if nb_bits < 1 or nb_bits > 8:
+        raise ValueError(f"nb_bits must be in [1, 8], got {nb_bits}")
+    pixels = np.asarray(pixels, dtype=np.uint8)
+    if nb_bits < 8 and pixels.size and int(pixels.max()) >> nb_bits:
+        raise ValueError(
+            f"pixel index {int(pixels.max())} doesn't fit in {nb_bits} bits "
+            f"(max value {(1 << nb_bits) - 1})"
+        )
+    if nb_bits == 8:
+        return pixels.tobytes()
+    shifts = np.arange(nb_bits, dtype=np.uint8)
+    bits = (pixels[:, None] >> shifts) & 1
+    return np.packbits(bits.ravel(), bitorder="little").tobytes()
+
+
+def encode_static_image(rgb_bytes: bytes, w: int, h: int) -> bytes:
+    """Vectorized `divoom_image_encode.encode_static_image` (0x44 body)."""
+    color_data, pixels, nb_bits = build_palette_and_pixels(rgb_bytes, w, h)
+    return _static_image_body(color_data, encode_pixels(pixels, nb_bits),
+                              len(color_data) // 3)
+
+
+def encode_animation_frame(rgb_bytes: bytes, w: int, h: int, time_ms: int) -> bytes:
+    """Vectorized `divoom_image_encode.encode_animation_frame` (one frame body)."""
+    color_data, pixels, nb_bits = build_palette_and_pixels(rgb_bytes, w, h)
+    return _animation_frame_body(color_data, encode_pixels(pixels, nb_bits),
+                                 len(color_data) // 3, time_ms)
+
+
+def encode_animation(frames: List[Frame]) -> List[bytes]:
+    """Vectorized `divoom_image_encode._py_encode_animation` (0x49 packets)."""
+    if not frames:
+        return []
+    return _packetize_animation(b"".join(
+        encode_animation_frame(rgb, w, h, t) for (rgb, w, h, t) in frames
+    ))
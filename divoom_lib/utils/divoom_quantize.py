@@ -0,0 +1,210 @@
+"""Color reduction stage in front of the Divoom palette encoder.
+
+`build_palette_and_pixels` refuses images with more than 256 unique colors
+(the wire palette count is one byte), and the pixel map costs
+``nb_bits = ceil(log2(num_colors))`` bits per pixel, so the palette size
+directly sets the payload size: 256 -> 8 bits, 64 -> 6, 16 -> 4. Every bit
+saved is one eighth fewer 256-byte SendingData chunks over BLE.
+
+`reduce_colors` runs a vectorized, variance-based median cut over each frame's
+unique colors (or over all frames at once with ``global_palette=True``) and
+picks the smallest power-of-two palette whose PSNR against the source stays
+at or above ``min_psnr``. Power-of-two sizes only: 40 colors cost the same
+6 bits as 64, so the sizes in between would give up quality for nothing.
+
+Frames that already fit in ``max_colors`` pass through unchanged (the encoder
+is lossless for them) unless ``minimize=True`` asks for the smaller palette
+anyway. NumPy is optional; without it frames over ``max_colors`` go through
+PIL's median cut at ``max_colors`` with no palette-size search.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from . import divoom_image_encode_np as _np_encode
+from .divoom_image_encode import Frame
+
+np = _np_encode.np
+
+MAX_COLORS = 256
+# ~30 dB is where a 16x16/32x32 photo still reads as the source at LED scale;
+# flat pixel art hits its exact color count long before the threshold binds.
+DEFAULT_MIN_PSNR = 30.0
+
+
+def count_colors(rgb_bytes: bytes) -> int:
+    """Number of unique RGB colors in a packed ``RGB`` byte string."""
+    if _np_encode.AVAILABLE:
+        return len(np.unique(_keys(rgb_bytes)))
+    return len({rgb_bytes[i:i + 3] for i in range(0, len(rgb_bytes), 3)})
+
+
+def psnr(a: bytes, b: bytes) -> float:
+    """Peak signal-to-noise ratio (dB) between two equal-length RGB buffers."""
+    if len(a) != len(b):
+        raise ValueError(f"buffer lengths differ: {len(a)} != {len(b)}")
+    if _np_encode.AVAILABLE:
+        diff = np.frombuffer(a, np.uint8).astype(np.int32) - np.frombuffer(b, np.uint8)
+        sse = float(np.dot(diff, diff))
+    else:
+        sse = float(sum((x - y) * (x - y) for x, y in zip(a, b)))
+    return _psnr_from_sse(sse, len(a))
+
+
+def reduce_colors(
+    frames: List[Frame],
+    max_colors: int = MAX_COLORS,
+    min_psnr: float = DEFAULT_MIN_PSNR,
+    global_palette: bool = False,
+    minimize: bool = False,
+) -> List[Frame]:
+    """Quantize ``frames`` so each encodes with at most ``max_colors`` colors.
+
+    Args:
+        frames: ``(rgb_bytes, w, h, time_ms)`` tuples, as `process_image` returns.
+        max_colors: hard palette cap, 2..256.
+        min_psnr: quality floor (dB) for the palette-size search; the search
+            stops at the first power of two that reaches it, else uses
+            ``max_colors``.
+        global_palette: derive one palette from all frames together, so every
+            frame shares it (pairs with the cross-frame palette reuse in
+            `divoom_image_encode_delta`, where later frames then cost no
+            palette bytes at all).
+        minimize: also shrink frames that already fit in ``max_colors``.
+
+    Returns:
+        New frame list; frames that need no reduction are returned as-is.
+    """
+    if not 2 <= max_colors <= MAX_COLORS:
+        raise ValueError(f"max_colors must be in [2, {MAX_COLORS}], got {max_colors}")
+    if not frames:
+        return []
+    if not _np_encode.AVAILABLE:
+        return [_pil_reduce(f, max_colors) for f in frames]
+    groups = [list(frames)] if global_palette else [[f] for f in frames]
+    out: List[Frame] = []
+    for group in groups:
+        rgbs = _reduce_group([rgb for rgb, _w, _h, _t in group],
+                             max_colors, min_psnr, minimize)
+        if rgbs is None:
+            out.extend(group)
+        else:
+            out.extend((rgb, w, h, t) for rgb, (_, w, h, t) in zip(rgbs, group))
+    return out
+
+
+def _keys(rgb_bytes: bytes) -> "np.ndarray":
+    rgb = np.frombuffer(rgb_bytes, dtype=np.uint8).reshape(-1, 3).astype(np.uint32)
+    return (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+
+
+def _psnr_from_sse(sse: float, num_samples: int) -> float:
+    if sse == 0 or num_samples == 0:
+        return math.inf
+    return 10 * math.log10(255 * 255 * num_samples / sse)
+
+
+def _reduce_group(rgbs: List[bytes], max_colors: int, min_psnr: float,
+                  minimize: bool) -> Optional[List[bytes]]:
+    """Reduced RGB buffers for one palette group, or None to keep the input."""
+    keys = np.concatenate([_keys(rgb) for rgb in rgbs])
+    uniq, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    n = len(uniq)
+    if n <= max_colors and not minimize:
+        return None
+    # Candidate sizes, smallest first; the last one always satisfies the cap.
+    sizes = [k for k in (1 << b for b in range(1, 9)) if k < min(n, max_colors)]
+    sizes.append(min(n, max_colors))
+    if sizes[-1] == n:  # the lossless palette needs no search past this point
+        sizes = sizes[:-1]
+    colors = np.stack([(uniq >> 16) & 0xFF, (uniq >> 8) & 0xFF, uniq & 0xFF],
+                      axis=1).astype(np.float64)
+    mapped = None
+    for size, labels in _median_cut(colors, counts.astype(np.float64), sizes):
+        mapped = _box_means(colors, counts, labels, size)[labels]
+        err = mapped.astype(np.float64) - colors
+        sse = float(np.dot(counts, (err * err).sum(axis=1)))
+        if _psnr_from_sse(sse, 3 * len(keys)) >= min_psnr:
+            break
+    else:
+        if n <= max_colors:  # no smaller palette is good enough: stay lossless
+            return None
+    flat = mapped[inverse.ravel()].tobytes()
+    out, off = [], 0
+    for rgb in rgbs:
+        out.append(flat[off:off + len(rgb)])
+        off += len(rgb)
+    return out
+
+
+def _box_means(colors: "np.ndarray", counts: "np.ndarray", labels: "np.ndarray",
+               size: int) -> "np.ndarray":
+    weight = np.bincount(labels, weights=counts, minlength=size)
+    sums = np.stack([np.bincount(labels, weights=counts * colors[:, c], minlength=size)
+                     for c in range(3)], axis=1)
+    return np.rint(sums / np.maximum(weight, 1)[:, None]).astype(np.uint8)
+
+
+def _box_sse(colors: "np.ndarray", weights: "np.ndarray") -> Tuple[float, int]:
+    """Weighted SSE of a box about its mean, and the channel with most spread."""
+    mean = weights @ colors / weights.sum()
+    per_channel = weights @ ((colors - mean) ** 2)
+    return float(per_channel.sum()), int(np.argmax(per_channel))
+
+
+def _best_cut(values: "np.ndarray", weights: "np.ndarray") -> int:
+    """Cut index (1..n-1) into sorted ``values`` minimizing the two halves' SSE."""
+    w = np.cumsum(weights)[:-1]
+    s1 = np.cumsum(weights * values)[:-1]
+    s2 = np.cumsum(weights * values * values)[:-1]
+    total_w, total_s1, total_s2 = weights.sum(), (weights * values).sum(), \
+        (weights * values * values).sum()
+    left = s2 - s1 * s1 / w
+    right = (total_s2 - s2) - (total_s1 - s1) ** 2 / (total_w - w)
+    return int(np.argmin(left + right)) + 1
+
+
+def _median_cut(colors: "np.ndarray", weights: "np.ndarray", sizes: List[int]):
+    """Split the color set greedily, yielding ``(size, labels)`` at each size.
+
+    The box with the largest weighted SSE is cut along its widest channel at
+    the point minimizing the halves' SSE (a variance-based median cut, which
+    keeps tight color clusters whole). The split sequence never depends on the target size,
+    so one pass serves the whole power-of-two search.
+    """
+    boxes: list = []
+    tie = 0
+
+    def push(idx):
+        nonlocal tie
+        sse, axis = _box_sse(colors[idx], weights[idx])
+        heapq.heappush(boxes, (-sse, tie, idx, axis))
+        tie += 1
+
+    push(np.arange(len(colors)))
+    for size in sizes:
+        while len(boxes) < size and boxes[0][0] < 0:
+            _neg_sse, _tie, idx, axis = heapq.heappop(boxes)
+            idx = idx[np.argsort(colors[idx, axis], kind="stable")]
+            cut = _best_cut(colors[idx, axis], weights[idx])
+            push(idx[:cut])
+            push(idx[cut:])
+        labels = np.empty(len(colors), dtype=np.intp)
+        for label, (_s, _t, idx, _a) in enumerate(boxes):
+            labels[idx] = label
+        yield len(boxes), labels
+
+
+def _pil_reduce(frame: Frame, max_colors: int) -> Frame:
+    rgb, w, h, t = frame
+    if count_colors(rgb) <= max_colors:
+        return frame
+    img = Image.frombytes("RGB", (w, h), rgb)
+    method = getattr(getattr(Image, "Quantize", Image), "MEDIANCUT", 0)
+    quantized = img.quantize(colors=max_colors, method=method,
+                             dither=getattr(getattr(Image, "Dither", Image), "NONE", 0))
+    return quantized.convert("RGB").tobytes(), w, h, t
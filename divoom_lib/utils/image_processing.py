@@ -79,3 +79,14 @@ def process_image(file, time: int | None = None, size: int | None = None):
         frames.append((rgb, out_w, out_h, _clamp_ms(default_duration_ms)))
 
     return frames, len(frames), out_w, out_h
+
+
+def fit_frame(frame: Frame, size: int) -> Frame:
+    """Rescale one `process_image` frame to the ``size`` x ``size`` grid
+    (NEAREST, like `process_image`); returned as-is when it already fits."""
+    rgb, width, height, duration = frame
+    if (width, height) == (size, size):
+        return frame
+    img = Image.frombytes("RGB", (width, height), rgb)
+    img = img.resize((size, size), Image.Resampling.NEAREST)
+    return (img.tobytes(), size, size, duration)
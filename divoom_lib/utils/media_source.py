@@ -15,6 +15,7 @@ from pathlib import Path
 from PIL import Image, ImageDraw
 
 from divoom_lib.fonts import get_small_font
+from divoom_lib.utils.divoom_quantize import reduce_colors
 from divoom_lib.utils.media_source_feishin import get_feishin_playing_track
 
 logger = logging.getLogger(__name__)
@@ -171,12 +172,13 @@ def render_and_downsample_artwork(artwork_url: str, size: int = 16) -> Path | No
             # 3. Post-downscale sharpening
             sharpened_img = resized_img.filter(ImageFilter.SHARPEN)
             
-            # 4. Quantize to adaptive 64-color palette with dithering for retro pixel-art look
-            dither_val = Image.Dither.FLOYDSTEINBERG if hasattr(Image, 'Dither') else 1
-            quantized_img = sharpened_img.quantize(colors=64, dither=dither_val)
-            
-            # 5. Convert back to RGB for device/display compatibility
-            final_img = quantized_img.convert("RGB")
+            # 4. Reduce to the smallest power-of-two palette that still reads as
+            #    the cover (at most 64 colors): fewer bits per pixel on the wire.
+            (rgb, _w, _h, _t), = reduce_colors(
+                [(sharpened_img.convert("RGB").tobytes(), size, size, 0)],
+                max_colors=64, minimize=True,
+            )
+            final_img = Image.frombytes("RGB", (size, size), rgb)
             final_img.save(out_path)
             return out_path
     except Exception as e:
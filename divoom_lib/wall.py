@@ -6,13 +6,15 @@ Splits images/animations into quadrants and streams them in parallel to multiple
 
 import asyncio
 import logging
-import tempfile
 from pathlib import Path
-from PIL import Image, ImageSequence
 from typing import List, Dict, Any
 
 from divoom_lib.divoom import Divoom
 from divoom_lib.models import DeviceSlot
+from divoom_lib.wall_cache import WallCache, slot_key
+from divoom_lib.wall_canvas import WallCanvasMixin
+from divoom_lib.wall_split import file_digest, split_asset
+from divoom_lib.wall_sync import CommitBarrier
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +42,7 @@ def wall_resolution(panel_resolution: int, grid_cols: int, grid_rows: int) -> tu
         raise ValueError(f"grid must be at least 1×1; got {grid_cols}×{grid_rows}")
     return (panel_resolution * grid_cols, panel_resolution * grid_rows)
 
-class DivoomWall:
+class DivoomWall(WallCanvasMixin):
     """
     Coordinates multiple Divoom screens arranged in a 2D grid to act as a single unified display.
     
@@ -61,19 +63,28 @@ class DivoomWall:
         await wall.show_image("large_animation.gif")
         await wall.disconnect()
     """
-    def __init__(self, device_configs: List[Dict[str, Any]], custom_logger: logging.Logger | None = None) -> None:
+    def __init__(self, device_configs: List[Dict[str, Any]], custom_logger: logging.Logger | None = None,
+                 adapters: List[str] | None = None, preview_cache: bool = True) -> None:
         """
         Initializes the DivoomWall coordinator.
         
         Args:
             device_configs (list): Configuration for each screen in the display wall.
                                    Format: [{"mac": str, "x": int, "y": int, "size": int}]
+            adapters (list): Optional BlueZ adapters to shard screens across (ble_adapters).
+            preview_cache (bool): Keep slot splits and previews in ``cache_wall``
+                                  (a bounded `WallCache`; ``last_previews`` is
+                                  kept in memory either way).
         """
+        from divoom_lib.ble_adapters import AdapterPool
         self.logger = custom_logger or logger
+        self.adapters = AdapterPool(adapters) if adapters else None
         self.device_configs = device_configs
         self.devices: List[DeviceSlot] = []
         self.last_previews: Dict[str, bytes] = {}
+        self.preview_cache = preview_cache
         self.connect_results: Dict[str, Any] = {}   # P3: {mac: ConnectResult}
+        self.push_result: Dict[str, Any] = {}       # last show_image: ok + commit skew
         
         # Calculate composite bounding box
         self.is_free_form = any("width" in config for config in self.device_configs)
@@ -125,11 +136,14 @@ class DivoomWall:
             
         import json
         import hashlib
-        config_str = json.dumps(self.device_configs, sort_keys=True)
+        # Layout only: cache keys carry no MAC, so swapping a panel keeps the cache.
+        geometry = [{k: v for k, v in c.items() if k != "mac"} for c in self.device_configs]
+        config_str = json.dumps(geometry, sort_keys=True)
         config_hash = hashlib.sha256(config_str.encode("utf-8")).hexdigest()
         
         cache_dir = Path.home() / ".config" / "divoom-control" / "cache_wall"
         cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = cache_dir
         geom_file = cache_dir / "last_geometry.txt"
         
         geometry_changed = False
@@ -155,6 +169,7 @@ class DivoomWall:
                 geom_file.write_text(config_hash)
             except Exception:
                 pass
+        self.cache = WallCache(cache_dir) if preview_cache else None
 
         self.logger.info(f"Initialized DivoomWall (composite canvas size: {self.total_width}x{self.total_height} pixels)")
 
@@ -173,7 +188,7 @@ class DivoomWall:
         self.logger.info("Connecting to all Divoom display wall devices...")
         items = [(slot.device.mac, slot.device) for slot in self.devices]
         results = await connect_devices(
-            items, concurrency=WALL_CONNECT_CONCURRENCY,
+            items, concurrency=WALL_CONNECT_CONCURRENCY, adapters=self.adapters,
             attempts=2, attempt_timeout=8.0,
         )
         self.connect_results = results
@@ -203,6 +218,8 @@ class DivoomWall:
             if isinstance(res, Exception):
                 self.logger.warning("wall slot %s disconnect failed: %s",
                                     getattr(slot.device, "mac", "?"), res)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.close)  # persist the LRU order
         self.logger.info("All display wall devices disconnected.")
 
     @property
@@ -218,125 +235,50 @@ class DivoomWall:
             getattr(s.device, "is_alive", getattr(s.device, "is_connected", False))
             for s in self.devices)
 
-    async def show_image(self, file_path: str, time: int | None = None) -> bool:
+    async def show_image(self, file_path: str, time: int | None = None, sync: bool = True) -> bool:
         """
         Splits and displays a static image or animation on the unified display wall.
         Resizes the source image/GIF to the wall's composite resolution, cuts it into quadrants,
         and pushes each quadrant to the corresponding BLE screen.
+
+        The split runs in a worker thread (`wall_split.split_asset`) so the
+        decode/resize/crop never stalls the loop servicing every panel's
+        notifications, and each panel gets its frames in memory — nothing is
+        re-read from disk. With ``preview_cache`` each slot's split is looked
+        up in (and stored to) ``self.cache`` by content hash and slot geometry;
+        a push whose slots all hit skips the split.
+
+        With ``sync`` (the default) the push is two-phase (`wall_sync`): every
+        panel uploads all but its final packet, then a `CommitBarrier`
+        releases the final packets together so animations start in phase.
+        ``self.push_result`` records the per-slot commit skew.
         """
         if not Path(file_path).exists():
             self.logger.error(f"Image path not found: {file_path}")
             return False
-            
+
         self.logger.info(f"Processing asset {file_path!r} for display wall...")
-        
-        # Resolve cache directory under ~/.config/divoom-control/cache_wall
-        cache_dir = Path.home() / ".config" / "divoom-control" / "cache_wall"
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        import hashlib
-        try:
-            with open(file_path, "rb") as f:
-                file_bytes = f.read()
-            file_hash = hashlib.sha256(file_bytes).hexdigest()[:16]
-        except Exception:
-            file_hash = hashlib.sha256(str(file_path).encode("utf-8")).hexdigest()[:16]
-            
-        main_img = Image.open(file_path)
-        is_ani = hasattr(main_img, 'is_animated') and main_img.is_animated
-        
+        self._forget_tiles()  # update_canvas: the panels stop showing its canvas
+        boxes = [self._slot_box(slot) for slot in self.devices]
+        parts = await asyncio.to_thread(self._split_cached, file_path, boxes, time)
+
         # Pair each task with its slot so result accounting can't drift out of
         # alignment with self.devices when a slot is skipped (see skipped_slots).
         display_tasks: list = []   # list of (slot, coro)
         skipped_slots: list = []   # slots that produced no push (counted as failures)
-
-        # Perf: the full-canvas resize depends only on (source, total_w, total_h)
-        # — it is IDENTICAL for every slot; only the per-slot crop differs. Compute
-        # it ONCE, lazily, on the first cache miss (so the all-cached fast path
-        # still does zero resizes). Without this, an N-device wall LIVE job — whose
-        # content changes every tick, so the byte-hash cache misses every tick —
-        # re-decoded+resized the whole canvas N times per tick (for a GIF: N × all
-        # frames).
-        resized_static = None          # PIL.Image for the static path
-        resized_frames: list | None = None  # list[PIL.Image] for the animated path
-
-        for slot in self.devices:
-            divoom = slot.device
-            x = slot.x
-            y = slot.y
-            size = slot.size
-            width = slot.width
-            height = slot.height
-            
-            if self.is_free_form:
-                left = x - self.min_x
-                upper = y - self.min_y
-                right = left + width
-                lower = upper + height
-            else:
-                left = x * size
-                upper = y * size
-                right = left + size
-                lower = upper + size
-            
-            mac_clean = divoom.mac.replace(":", "_").replace("-", "_")
-            ext = ".gif" if is_ani else ".png"
-            cached_file_path = cache_dir / f"{file_hash}_{width}x{height}_{left}_{upper}_{right}_{lower}_{size}_{mac_clean}{ext}"
-            temp_path_str = str(cached_file_path)
-            
-            if cached_file_path.exists():
-                self.logger.info(f"Using cached wall split: {cached_file_path}")
-            else:
-                self.logger.info(f"Cropping slots bounding box: Left={left}, Upper={upper}, Right={right}, Lower={lower}")
-                if is_ani:
-                    # Resize every source frame to the full canvas ONCE (shared
-                    # across slots); per slot we only crop (and, free-form, resize
-                    # the crop to the panel).
-                    if resized_frames is None:
-                        resized_frames = [
-                            f.resize((self.total_width, self.total_height), Image.NEAREST)
-                            for f in ImageSequence.Iterator(main_img)
-                        ]
-                    frames = []
-                    for resized_frame in resized_frames:
-                        cropped_frame = resized_frame.crop((left, upper, right, lower))
-                        if self.is_free_form:
-                            cropped_frame = cropped_frame.resize((size, size), Image.NEAREST)
-                        frames.append(cropped_frame)
-
-                    if not frames:
-                        # A truncated/corrupt GIF can report is_animated yet yield zero
-                        # frames — frames[0] would IndexError and abort the WHOLE wall
-                        # update (this loop isn't per-slot isolated). Skip this slot,
-                        # but record it as a FAILURE: the screen got nothing, so the
-                        # wall must NOT report overall success for it (and dropping
-                        # the task silently would also misalign result indexing).
-                        self.logger.warning("wall slot %s: animated source yielded 0 frames; skipping",
-                                            getattr(divoom, "mac", "?"))
-                        skipped_slots.append(slot)
-                        continue
-                    frames[0].save(
-                        cached_file_path,
-                        save_all=True,
-                        append_images=frames[1:],
-                        duration=main_img.info.get('duration', 100),
-                        loop=main_img.info.get('loop', 0)
-                    )
-                else:
-                    if resized_static is None:
-                        resized_static = main_img.resize(
-                            (self.total_width, self.total_height), Image.NEAREST)
-                    cropped_img = resized_static.crop((left, upper, right, lower))
-                    if self.is_free_form:
-                        cropped_img = cropped_img.resize((size, size), Image.NEAREST)
-                    cropped_img.save(cached_file_path)
-            
-            try:
-                self.last_previews[slot.device.mac] = Path(temp_path_str).read_bytes()
-            except Exception as ex:
-                self.logger.warning(f"Failed to cache preview bytes for {slot.device.mac}: {ex}")
-                
-            display_tasks.append((slot, self._push_slot(divoom, temp_path_str, time)))
+        barrier = CommitBarrier(sum(part is not None for part in parts)) if sync else None
+        for slot, part in zip(self.devices, parts):
+            if part is None:
+                # A truncated/corrupt GIF can report is_animated yet yield zero
+                # frames. Skip this slot, but record it as a FAILURE: the screen
+                # got nothing, so the wall must NOT report overall success for it.
+                self.logger.warning("wall slot %s: animated source yielded 0 frames; skipping",
+                                    getattr(slot.device, "mac", "?"))
+                skipped_slots.append(slot)
+                continue
+            self.last_previews[slot.device.mac] = part.preview or b""
+            slot_sync = barrier.slot(slot.device.mac) if barrier is not None else None
+            display_tasks.append((slot, self._push_slot(slot.device, part.frames, time, slot_sync)))
 
         # Execute all BLE streams concurrently
         self.logger.info(f"Streaming splits concurrently to {len(display_tasks)} screens...")
@@ -353,24 +295,78 @@ class DivoomWall:
                 self.logger.error(f"Failed to display slot ({slot.x}, {slot.y}) on device {slot.device.mac}")
                 all_ok = False
 
+        self.push_result = {"ok": all_ok, **(barrier.result() if barrier is not None else {})}
+        if barrier is not None:
+            self.logger.info(f"Wall commit skew: {self.push_result['skew_s']}s")
         return all_ok
-            
-    async def _push_slot(self, divoom, path: str, time: int | None) -> bool:
+
+    def _slot_box(self, slot: DeviceSlot) -> tuple[int, int, int, int]:
+        """``slot``'s (left, upper, right, lower) on the composite canvas."""
+        if self.is_free_form:
+            left = slot.x - self.min_x
+            upper = slot.y - self.min_y
+            return (left, upper, left + slot.width, upper + slot.height)
+        left = slot.x * slot.size
+        upper = slot.y * slot.size
+        return (left, upper, left + slot.size, upper + slot.size)
+
+    def _split_cached(self, file_path: str, boxes: list, time: int | None) -> list:
+        """Per-slot `SlotSplit` (None: no frames), from ``self.cache`` where it
+        hits; only the missing slots are split. Blocking: runs in a worker."""
+        sizes = [slot.size for slot in self.devices]
+        cache = self.cache
+        if cache is None:
+            return split_asset(file_path, (self.total_width, self.total_height), boxes,
+                               sizes, self.is_free_form, time, True).slots
+        content = file_digest(file_path)
+        canvas = (self.total_width, self.total_height)
+        keys = [slot_key(content, canvas, box, size, self.is_free_form, time)
+                for box, size in zip(boxes, sizes)]
+        parts = [cache.get(key) for key in keys]
+        missing = [i for i, part in enumerate(parts) if part is None]
+        if missing:
+            split = split_asset(file_path, canvas,
+                                [boxes[i] for i in missing], [sizes[i] for i in missing],
+                                self.is_free_form, time, True)
+            for i, part in zip(missing, split.slots):
+                parts[i] = part
+                if part is not None:
+                    cache.put(keys[i], part)
+        cache.flush()
+        return parts
+
+    async def _push_slot(self, divoom, frames: list, time: int | None, sync=None) -> bool:
         """BLE Hardening P3 self-heal: revive a dropped slot via Phase 1's
         bounded reconnect BEFORE pushing, so one screen's transient drop doesn't
         freeze its content while the rest keep updating. A genuinely dead slot
-        raises (captured per-slot by ``show_image``'s ``return_exceptions``)."""
+        raises (captured per-slot by ``show_image``'s ``return_exceptions``).
+        Whatever happens, the slot leaves the commit barrier on the way out."""
+        try:
+            return await self._stream_slot(divoom, frames, time, sync)
+        finally:
+            if sync is not None:
+                sync.leave()
+
+    async def _stream_slot(self, divoom, frames: list, time: int | None, sync) -> bool:
         alive = getattr(divoom, "is_alive", getattr(divoom, "is_connected", False))
         if not alive:
             from divoom_lib.ble_connection import ensure_connected, BleConnectionError
             self.logger.warning("Wall slot %s not alive — reconnecting before push", divoom.mac)
+            if self.adapters is not None:
+                divoom.adapter = self.adapters.rebalance(divoom.mac)
             res = await ensure_connected(divoom, attempts=2, attempt_timeout=8.0)
             if not res.ok:
                 raise BleConnectionError(res)
-        return await divoom.display.show_image(path, time=time)
+        if self.adapters is None:
+            return await divoom.display.show_image(frames, time=time, sync=sync)
+        async with self.adapters.streaming(divoom.mac) as lease:
+            if sync is not None:
+                sync.lease = lease  # turns, lends and resumes the stream slot
+            return await divoom.display.show_image(frames, time=time, sync=sync)
 
     async def set_light(self, color: str, brightness: int = 100) -> bool:
         """Sets a unified solid light color across all screens in the wall."""
+        self._forget_tiles()
         self.logger.info(f"Setting solid light {color} across all screens...")
         tasks = []
         for slot in self.devices:
@@ -383,6 +379,7 @@ class DivoomWall:
 
     async def show_clock(self, clock: int = 0) -> bool:
         """Displays clock style on all screens in the wall."""
+        self._forget_tiles()
         self.logger.info(f"Displaying clock style {clock} across all screens...")
         tasks = []
         for slot in self.devices:
@@ -395,6 +392,7 @@ class DivoomWall:
 
     async def show_effects(self, number: int = 0) -> bool:
         """Displays VJ effect style on all screens in the wall."""
+        self._forget_tiles()
         self.logger.info(f"Displaying VJ effect {number} across all screens...")
         tasks = []
         for slot in self.devices:
@@ -407,6 +405,7 @@ class DivoomWall:
 
     async def show_visualization(self, number: int = 0) -> bool:
         """Displays visualization EQ style on all screens in the wall."""
+        self._forget_tiles()
         self.logger.info(f"Displaying visualization EQ {number} across all screens...")
         tasks = []
         for slot in self.devices:
@@ -441,6 +440,7 @@ class DivoomWall:
 
     async def switch_channel(self, channel: str) -> bool:
         """Switches all screens in the wall to the same channel."""
+        self._forget_tiles()
         self.logger.info(f"Switching all screens to channel {channel}...")
         tasks = []
         for slot in self.devices:
@@ -457,6 +457,7 @@ class DivoomWall:
             LPWA_CONTROL_SPEED, LPWA_CONTROL_EFFECTS, LPWA_CONTROL_CONTENT,
         )
         self.logger.info(f"Pushing text {text!r} across all screens...")
+        self._forget_tiles()
 
         async def _push(divoom, size: int) -> bool:
             t = divoom.text
@@ -0,0 +1,252 @@
+"""
+wall_cache.py — Bounded, indexed cache of wall slot splits (``cache_wall``).
+
+`DivoomWall.show_image` used to drop one PNG/GIF per slot into
+``~/.config/divoom-control/cache_wall`` named after the panel's MAC, find
+hits with a ``Path.exists`` per slot and never delete anything, so a LIVE
+wall job filled the disk. `WallCache` replaces that with:
+
+  - a key of (source content hash, frame timing, slot geometry) — the
+    composite canvas size, free-form flag, crop box and panel size, not the
+    MAC, so swapping a panel keeps its slot's entries while a differently
+    shaped wall sharing the directory never reads them,
+  - one ``<key>.slot`` file per entry holding the slot's frames (the
+    `process_image` layout) and its preview, so a hit skips the split too,
+  - an ``index.json`` listing entries least-recently-used first, with a byte
+    budget (``max_bytes``) and an entry budget (``max_entries``) enforced by
+    LRU eviction on every `put`,
+  - atomic writes (``utils.atomic_io``) for entries and the index, and
+    hit/miss/eviction counters (`stats`).
+
+The index is written by `flush`, once per wall split rather than per entry,
+and only when entries were added or removed; a hit merely reorders the LRU,
+which is written at most every ``ORDER_FLUSH_S`` and on `close`. Several
+caches may share one directory (two walls, two processes): `flush` merges
+the entries another instance indexed since, and on load entry files missing
+from the index are adopted as least recently used rather than deleted, so
+one cache never discards another's entries except by LRU eviction.
+
+A missing or corrupt index is rebuilt from the entry files (oldest mtime
+first). Disk errors are logged, never raised: the cache must not fail a push.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from divoom_lib.utils.atomic_io import atomic_write_bytes, atomic_write_text
+from divoom_lib.wall_split import SlotSplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 512
+ORDER_FLUSH_S = 60.0
+
+_SUFFIX = ".slot"
+
+
+def slot_key(content_hash: str, canvas: tuple[int, int], box: tuple, size: int,
+             free_form: bool, time: int | None) -> str:
+    """Cache key of one slot's split: content + timing + geometry, no MAC.
+
+    The crop is taken after resizing the source to ``canvas``, so the same
+    box on a differently sized (or free-form) wall holds other pixels.
+    """
+    width, height = canvas
+    left, upper, right, lower = box
+    raw = (f"{content_hash}:t{time}:c{int(width)}x{int(height)}:f{int(bool(free_form))}:"
+           f"{left},{upper},{right},{lower}:s{int(size)}")
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _pack(part: SlotSplit) -> bytes:
+    preview = part.preview or b""
+    header = {"frames": [[w, h, d, len(rgb)] for rgb, w, h, d in part.frames],
+              "preview": len(preview)}
+    body = bytearray(json.dumps(header).encode("utf-8") + b"\n")
+    for rgb, *_rest in part.frames:
+        body += rgb
+    return bytes(body + preview)
+
+
+def _unpack(data: bytes) -> SlotSplit:
+    head, _, body = data.partition(b"\n")
+    header = json.loads(head)
+    frames, pos = [], 0
+    for w, h, d, n in header["frames"]:
+        frames.append((body[pos:pos + n], w, h, d))
+        pos += n
+    if len(body) - pos != header["preview"]:
+        raise ValueError("truncated wall cache entry")
+    return SlotSplit(frames, body[pos:] or None)
+
+
+class WallCache:
+    """LRU-bounded store of `SlotSplit` entries under ``cache_dir``."""
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._index: OrderedDict[str, int] = OrderedDict()  # key -> bytes, LRU first
+        self._dirty = False       # entries added or removed since the last flush
+        self._reordered = False   # only the LRU order changed
+        self._flushed_at = 0.0
+        self._dropped: set[str] = set()  # removed here; not to be merged back
+        self._lock = threading.RLock()  # the wall splits in worker threads
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def get(self, key: str) -> SlotSplit | None:
+        """The cached split for ``key``, or None (a bad entry is dropped)."""
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> SlotSplit | None:
+        if key not in self._index:
+            self.misses += 1
+            return None
+        try:
+            part = _unpack(self._path(key).read_bytes())
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"wall cache: dropping unreadable entry {key}: {e}")
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._index.move_to_end(key)
+        self._reordered = True
+        self.hits += 1
+        return part
+
+    def put(self, key: str, part: SlotSplit) -> None:
+        """Store ``part`` and evict least-recently-used entries over budget;
+        the index is written by the next `flush`."""
+        with self._lock:
+            self._put(key, part)
+
+    def _put(self, key: str, part: SlotSplit) -> None:
+        try:
+            data = _pack(part)
+            atomic_write_bytes(self._path(key), data)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"wall cache: write failed: {e}")
+            return
+        self._index[key] = len(data)
+        self._index.move_to_end(key)
+        self._dropped.discard(key)
+        self._evict()
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Persist the index if entries changed since the last flush (or only
+        the LRU order did, ``ORDER_FLUSH_S`` ago or more)."""
+        with self._lock:
+            if self._dirty or (self._reordered
+                               and time.monotonic() - self._flushed_at >= ORDER_FLUSH_S):
+                self._write_index()
+
+    def close(self) -> None:
+        """Persist any pending change, the LRU order included."""
+        with self._lock:
+            if self._dirty or self._reordered:
+                self._write_index()
+
+    def _write_index(self) -> None:
+        self._merge_disk_index()
+        self._evict()
+        try:
+            atomic_write_text(self.cache_dir / INDEX_NAME,
+                              json.dumps({"entries": list(self._index.items())}))
+        except OSError as e:
+            logger.warning(f"wall cache: index write failed: {e}")
+            return
+        self._dirty = self._reordered = False
+        self._dropped.clear()
+        self._flushed_at = time.monotonic()
+
+    def _merge_disk_index(self) -> None:
+        """Adopt entries another cache on this directory indexed since our
+        load, as least recently used; ones we dropped stay dropped."""
+        try:
+            entries = json.loads((self.cache_dir / INDEX_NAME).read_text())["entries"]
+            theirs = [(key, int(size)) for key, size in entries
+                      if key not in self._index and key not in self._dropped]
+        except (KeyError, OSError, ValueError, TypeError):
+            return
+        adopted = [(key, size) for key, size in theirs if self._path(key).exists()]
+        if adopted:
+            self._index = OrderedDict(adopted + list(self._index.items()))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._index),
+            "bytes": sum(self._index.values()),
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_SUFFIX}"
+
+    def _evict(self) -> None:
+        total = sum(self._index.values())
+        while self._index and (total > self.max_bytes or len(self._index) > self.max_entries):
+            key, size = next(iter(self._index.items()))
+            self._drop(key)
+            total -= size
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        self._index.pop(key, None)
+        self._dropped.add(key)
+        self._dirty = True
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _load(self) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            files = {p.name: p for p in self.cache_dir.iterdir() if p.is_file()}
+        except OSError as e:
+            logger.warning(f"wall cache: {self.cache_dir} unusable: {e}")
+            return
+        try:
+            entries = json.loads(files[INDEX_NAME].read_text())["entries"]
+            indexed = {f"{key}{_SUFFIX}" for key, _size in entries}
+            # Written by another cache whose index flush is still to come.
+            entries = self._rebuild({n: p for n, p in files.items()
+                                     if n not in indexed}) + entries
+        except (KeyError, OSError, ValueError, TypeError):
+            entries = self._rebuild(files)
+        for key, size in entries:
+            if f"{key}{_SUFFIX}" in files:
+                self._index[key] = int(size)
+        self._dirty = True
+        self.flush()
+
+    @staticmethod
+    def _rebuild(files: dict) -> list:
+        found = []
+        for name, path in files.items():
+            if name.endswith(_SUFFIX):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name[:-len(_SUFFIX)], st.st_size))
+        return [(key, size) for _mtime, key, size in sorted(found)]
@@ -0,0 +1,116 @@
+"""
+wall_canvas.py — Tile-diff live canvas updates for DivoomWall.
+
+Dashboards redraw the whole wall canvas every tick, usually changing one or
+two panels. ``show_image`` re-splits and re-streams every slot regardless;
+`WallCanvasMixin.update_canvas` instead:
+
+  - takes the rendered canvas (a PIL image, or any array PIL's ``fromarray``
+    accepts, e.g. an ``HxWx3`` uint8 NumPy array) and, in a worker thread,
+    crops each slot's tile at its panel grid, exactly as ``show_image``
+    splits a static image,
+  - compares each tile's digest with the last one successfully pushed to
+    that slot and streams only the tiles that changed, concurrently and
+    through the same self-healing, barrier-committed ``_push_slot`` path,
+  - returns per-tick stats: tiles pushed / skipped / failed and
+    ``bytes_saved``, the raw RGB bytes of the skipped tiles that were never
+    re-encoded nor streamed.
+
+A failed tile keeps its old digest, so the next tick retries it. Each
+digest is stored with its device's `PushState.epoch`, which moves whenever
+anything else touches that screen (channel switch, another push, reconnect
+or self-heal), so that slot re-pushes. The wall's own display-changing
+methods (``show_image``, ``show_clock``, ...) and ``force=True`` forget all
+digests outright, which also covers devices without a ``push_state``.
+"""
+
+import asyncio
+import hashlib
+import time as clock
+from typing import Any
+
+from PIL import Image
+
+from divoom_lib.push_state import PushState
+from divoom_lib.wall_sync import CommitBarrier
+
+
+def _screen_epoch(divoom) -> int | None:
+    """``divoom``'s `PushState.epoch`, or None if it doesn't track one."""
+    state = getattr(divoom, "push_state", None)
+    return state.epoch if isinstance(state, PushState) else None
+
+
+class WallCanvasMixin:
+    """``update_canvas`` mixed into DivoomWall — relies on the host class's
+    ``devices``, ``_slot_box``, ``_push_slot`` and canvas
+    geometry."""
+
+    def _forget_tiles(self) -> None:
+        """The panels stop showing the last canvas: re-push every tile."""
+        self._tile_digests = {}
+
+    def _canvas_tiles(self, canvas: Any) -> list[tuple[bytes, str]]:
+        """``(rgb, digest)`` per slot. Blocking: runs in a worker."""
+        img = canvas if isinstance(canvas, Image.Image) else Image.fromarray(canvas)
+        img = img.convert("RGB")
+        if img.size != (self.total_width, self.total_height):
+            img = img.resize((self.total_width, self.total_height), Image.NEAREST)
+        tiles = []
+        for slot in self.devices:
+            tile = img.crop(self._slot_box(slot))
+            if tile.size != (slot.size, slot.size):
+                tile = tile.resize((slot.size, slot.size), Image.NEAREST)
+            rgb = tile.tobytes()
+            tiles.append((rgb, hashlib.blake2b(rgb, digest_size=16).hexdigest()))
+        return tiles
+
+    async def update_canvas(self, canvas: Any, time: int | None = None,
+                            force: bool = False, sync: bool = True) -> dict[str, Any]:
+        """Push the slots whose tile of ``canvas`` changed since the last
+        tick; returns that tick's stats (also kept as ``self.canvas_stats``,
+        alongside running totals in ``self.canvas_totals``)."""
+        started = clock.monotonic()
+        digests = getattr(self, "_tile_digests", None)
+        if digests is None or force:
+            digests = self._tile_digests = {}
+        tiles = await asyncio.to_thread(self._canvas_tiles, canvas)
+        changed, skipped = [], []
+        for slot, (rgb, digest) in zip(self.devices, tiles):
+            if digests.get(slot.device.mac) == (digest, _screen_epoch(slot.device)):
+                skipped.append(rgb)
+            else:
+                changed.append((slot, rgb, digest))
+
+        barrier = CommitBarrier(len(changed)) if sync else None
+        pushes = []
+        for slot, rgb, _digest in changed:
+            frames = [(rgb, slot.size, slot.size, 1000 if time is None else int(time))]
+            slot_sync = barrier.slot(slot.device.mac) if barrier is not None else None
+            pushes.append(self._push_slot(slot.device, frames, time, slot_sync))
+        results = await asyncio.gather(*pushes, return_exceptions=True)
+
+        failed = 0
+        for (slot, _rgb, digest), res in zip(changed, results):
+            if res is True:  # the epoch after our own push, which moves it too
+                digests[slot.device.mac] = (digest, _screen_epoch(slot.device))
+            else:
+                failed += 1
+                self.logger.error(f"update_canvas: slot ({slot.x}, {slot.y}) on "
+                                  f"{slot.device.mac} failed: {res}")
+        stats = {
+            "tiles": len(tiles),
+            "pushed": len(changed) - failed,
+            "skipped": len(skipped),
+            "failed": failed,
+            "bytes_saved": sum(len(rgb) for rgb in skipped),
+            "elapsed_s": round(clock.monotonic() - started, 4),
+        }
+        if barrier is not None and changed:
+            stats["skew_s"] = barrier.result()["skew_s"]
+        totals = getattr(self, "canvas_totals", None) or {"ticks": 0}
+        totals["ticks"] += 1
+        for key in ("pushed", "skipped", "failed", "bytes_saved"):
+            totals[key] = totals.get(key, 0) + stats[key]
+        self.canvas_stats, self.canvas_totals = stats, totals
+        return stats
@@ -0,0 +1,104 @@
+"""
+wall_split.py — Off-loop, in-memory split of a wall asset into panel frames.
+
+`DivoomWall.show_image` used to decode, resize and crop the source on the
+event loop, write every slot to a PNG/GIF under ``cache_wall`` and hand each
+panel that path, so every ``display.show_image`` re-opened and re-decoded the
+wall's own temp file. `split_asset` does the whole split in one synchronous
+pass meant for a worker thread (``asyncio.to_thread``):
+
+  - the source is decoded once and every frame resized to the composite
+    canvas once (shared by all slots),
+  - each slot gets its frames in the `process_image` layout
+    (``(rgb, size, size, duration_ms)``) at its panel grid, ready for
+    ``display.show_image`` to encode directly,
+  - preview bytes (PNG, or GIF for animations) are rendered only when asked
+    for; writing them to disk is the caller's (optional) business.
+"""
+
+import hashlib
+import io
+from dataclasses import dataclass
+
+from PIL import Image, ImageSequence
+
+from divoom_lib.utils.image_processing import _MAX_FRAME_MS
+
+Box = tuple[int, int, int, int]  # (left, upper, right, lower) on the canvas
+
+
+@dataclass
+class SlotSplit:
+    """One slot's share of a wall asset."""
+    frames: list
+    preview: bytes | None = None
+
+
+@dataclass
+class WallSplit:
+    """Result of `split_asset`: ``slots`` is aligned with the boxes passed in;
+    an entry is None when the source yielded no frames for that slot."""
+    is_animated: bool
+    slots: list
+
+
+def file_digest(path: str) -> str:
+    """Short content hash of ``path`` (falls back to hashing the path)."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError:
+        return hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
+
+
+def _clamp_ms(ms) -> int:
+    return max(1, min(_MAX_FRAME_MS, int(ms)))
+
+
+def split_asset(path: str, canvas: tuple[int, int], boxes: list[Box], sizes: list[int],
+                free_form: bool, time: int | None = None,
+                previews: bool = False) -> WallSplit:
+    """Split ``path`` into per-slot frames. Blocking: run it in a worker.
+
+    ``boxes[i]`` is slot i's crop on the ``canvas``-sized composite;
+    free-form crops are scaled to ``sizes[i]`` square, grid crops already
+    are. ``time`` is the default frame duration, as for `process_image`.
+    """
+    default_ms = 1000 if time is None else int(time)
+    main_img = Image.open(path)
+    is_ani = bool(getattr(main_img, "is_animated", False))
+    loop = 0
+    if is_ani:
+        resized = [(f.resize(canvas, Image.NEAREST), f.info.get("duration") or default_ms)
+                   for f in ImageSequence.Iterator(main_img)]
+        if resized:
+            loop = main_img.info.get("loop", 0)
+    else:
+        resized = [(main_img.resize(canvas, Image.NEAREST), default_ms)]
+
+    slots: list = []
+    for box, size in zip(boxes, sizes):
+        crops = []
+        for canvas_frame, duration in resized:
+            crop = canvas_frame.crop(box)
+            if free_form:
+                crop = crop.resize((size, size), Image.NEAREST)
+            crops.append((crop, _clamp_ms(duration)))
+        if not crops:
+            slots.append(None)
+            continue
+        frames = [(crop.convert("RGB").tobytes(), size, size, duration)
+                  for crop, duration in crops]
+        slots.append(SlotSplit(frames, _preview(crops, is_ani, loop) if previews else None))
+    return WallSplit(is_ani, slots)
+
+
+def _preview(crops: list, is_ani: bool, loop: int) -> bytes:
+    buf = io.BytesIO()
+    first = crops[0][0]
+    if is_ani:
+        first.save(buf, format="GIF", save_all=True, append_images=[c for c, _ in crops[1:]],
+                   duration=[d for _, d in crops], loop=loop)
+    else:
+        first.save(buf, format="PNG")
+    return buf.getvalue()
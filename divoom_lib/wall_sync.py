@@ -0,0 +1,121 @@
+"""
+wall_sync.py — Two-phase, barrier-released commits for a wall push.
+
+A panel starts playing the moment the last piece of an upload lands: the
+final 0x8B SendingData chunk (the app never sends TerminateSending), the
+last 0x49 packet, or the last ``Draw/SendHttpGif`` frame. Pushed
+independently, panels finish their streams at different times and a wall
+animation starts out of phase. A synchronized push therefore runs in two
+phases:
+
+  1. upload: every slot streams all of its content except that final piece,
+     then waits at the `CommitBarrier` (``await sync.hold()``);
+  2. commit: once every slot has arrived the barrier opens and all slots
+     send their final piece at once (``sync.committed()`` right after).
+
+A slot that fails or has nothing to stream leaves the barrier instead
+(``sync.leave()``, idempotent) so it never blocks the rest.
+
+On a shared adapter (``sync.lease``, an `ble_adapters.StreamLease`) the
+uploads take turns packet by packet (``sync.turn()``), so a wall with more
+panels than stream slots reaches the barrier together instead of in waves
+whose first finishers stall. A parked slot lends its stream slot out and
+sends its final piece without it; ``sync.resume()`` takes it back only for
+follow-up traffic such as the 0x8B retransmit window. The hold is
+bounded by ``timeout``: the device abandons an upload that stalls too long,
+so a straggler costs the wall its sync, never its content.
+
+`CommitBarrier.result` reports the per-slot commit offsets from the first
+commit, and ``skew_s``, the spread between first and last — the number that
+decides whether a wall animation looks in phase.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+HOLD_TIMEOUT_S = 1.5  # under the device's ~2 s stalled-upload spinner
+
+
+class SlotSync:
+    """One slot's handle on a `CommitBarrier`; passed down as ``sync=``."""
+
+    def __init__(self, barrier: "CommitBarrier", key: str) -> None:
+        self._barrier = barrier
+        self.key = key
+        self.lease = None  # the adapter stream slot the upload holds, if any
+        self._arrived = False
+
+    async def turn(self) -> None:
+        """Between upload packets: let the other uploads on this adapter go."""
+        if self.lease is not None:
+            await self.lease.turn()
+
+    async def hold(self) -> None:
+        """Upload done: wait until every slot is ready (or the hold times out).
+        The stream slot stays lent out until `resume`."""
+        if self._arrived:
+            return
+        self._arrived = True
+        if self.lease is not None:
+            self.lease.lend()
+        await self._barrier._arrive()
+
+    async def resume(self) -> None:
+        """After the commit: take the stream slot back for follow-up traffic."""
+        if self.lease is not None:
+            await self.lease.reclaim()
+
+    def committed(self) -> None:
+        """The final piece went out: record this slot's commit time."""
+        self._barrier.commits[self.key] = time.monotonic()
+
+    def leave(self) -> None:
+        """This slot won't reach ``hold`` (failed or skipped); stop waiting on it."""
+        if not self._arrived:
+            self._arrived = True
+            self._barrier._depart()
+
+
+class CommitBarrier:
+    """Release every slot's final commit together; see the module docstring."""
+
+    def __init__(self, parties: int, timeout: float = HOLD_TIMEOUT_S) -> None:
+        self.timeout = timeout
+        self._pending = parties
+        self._released = asyncio.Event()
+        self.released_at: float | None = None
+        self.timed_out = False
+        self.commits: dict[str, float] = {}
+        if parties <= 0:
+            self._release()
+
+    def slot(self, key: str) -> SlotSync:
+        """A `SlotSync` for ``key``."""
+        return SlotSync(self, key)
+
+    async def _arrive(self) -> None:
+        self._depart()
+        try:
+            await asyncio.wait_for(self._released.wait(), self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            self._release()
+
+    def _depart(self) -> None:
+        self._pending -= 1
+        if self._pending <= 0:
+            self._release()
+
+    def _release(self) -> None:
+        if not self._released.is_set():
+            self.released_at = time.monotonic()
+            self._released.set()
+
+    def result(self) -> dict[str, Any]:
+        """``{"skew_s", "slots": {key: offset_s}, "timed_out"}``."""
+        if not self.commits:
+            return {"skew_s": None, "slots": {}, "timed_out": self.timed_out}
+        first = min(self.commits.values())
+        slots = {key: round(t - first, 4) for key, t in self.commits.items()}
+        return {"skew_s": max(slots.values()), "slots": slots, "timed_out": self.timed_out}
@@ -39,6 +39,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from divoom_lib.http_session import PooledSession
 from divoom_lib.models import WeatherType
 
 logger = logging.getLogger(__name__)
@@ -209,12 +210,11 @@ class WTTrInProvider:
                 f"aiohttp not available: {exc}"
             ) from exc
 
-        own_session = self._session is None
-        session = self._session or aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self._timeout_s)
-        )
+        session = self._session or _shared_session.get()
         try:
-            async with session.get(url, params=params) as resp:
+            async with session.get(
+                url, params=params, timeout=aiohttp.ClientTimeout(total=self._timeout_s)
+            ) as resp:
                 if resp.status != 200:
                     raise WeatherProviderError(
                         f"wttr.in returned HTTP {resp.status} for {loc!r}"
@@ -222,9 +222,6 @@ class WTTrInProvider:
                 data = await resp.json(content_type=None)
         except Exception as exc:  # network, timeout, decode, anything
             raise WeatherProviderError(f"wttr.in fetch failed: {exc}") from exc
-        finally:
-            if own_session:
-                await session.close()
 
         try:
             current = data["current_condition"][0]
@@ -256,6 +253,22 @@ class WTTrInProvider:
         )
 
 
+def _new_wttr_session():
+    import aiohttp
+
+    return aiohttp.ClientSession()
+
+
+# Providers built without a session (``get_weather`` makes one per call) share
+# this keep-alive session instead of opening and closing one per fetch.
+_shared_session = PooledSession(_new_wttr_session)
+
+
+async def close_shared_session() -> None:
+    """Close the session shared by session-less ``WTTrInProvider`` fetches."""
+    await _shared_session.close()
+
+
 class WeatherProviderError(RuntimeError):
     """Raised by a provider when the fetch fails. Callers should fall
     back to ``StubProvider`` (or surface a non-fatal warning in the UI)."""
@@ -6,8 +6,8 @@
 #   - divoom_lib/native_src/image_encode.c     (16x16 palette encoder for 0x44/0x49)
 #   - divoom_lib/native_src/image_encode_32.c  (32x32 encoder + 0x8B 3-phase chunker — Round 4)
 #
-# compact.c exports encode_basic_payload + encode_ios_le_payload used by
-# divoom_lib/framing.py.
+# compact.c exports encode_basic_payload + encode_ios_le_payload (and the
+# encode_8b_data_batch pre-framer) used by divoom_lib/framing.py.
 #
 # Cross-platform (R20): produces a .dylib on macOS and a .so on Linux. The
 # Python loaders resolve the right name via divoom_lib/native_lib.py.
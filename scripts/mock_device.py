@@ -53,7 +53,8 @@ class MockBleakClient:
         if char_specifier in self._notify_callbacks:
             del self._notify_callbacks[char_specifier]
 
-    async def write_gatt_char(self, char_specifier: str, data: bytes | bytearray, response: bool = False) -> None:
+    async def write_gatt_char(self, char_specifier: str, data: bytes | bytearray | memoryview, response: bool = False) -> None:
+        data = bytes(data)  # bleak accepts any buffer (the chunked writer sends memoryview slices)
         logger.info(f"Write to {char_specifier}: {data.hex()}")
         self.written.append((char_specifier, bytes(data)))
 
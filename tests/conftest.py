@@ -25,6 +25,14 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 from divoom_lib.native_lib import library_path as _native_library_path
+
+# Keep Display.show_image's encoded-blob cache memory-only under test: pushes
+# must not leave files in ~/.divoom-control/cache/blobs.
+os.environ.setdefault("DIVOOM_BLOB_CACHE_DIR", "")
+# Same for the learned BLE write-pacing profiles (divoom_lib.ble_pacing).
+os.environ.setdefault("DIVOOM_CONTROL_PACING", "")
+# ... and the saved BLE connection profiles (divoom_lib.ble_profile).
+os.environ.setdefault("DIVOOM_CONTROL_PROFILES", "")
 _DYLIB = _native_library_path()  # platform-aware (.dylib/.so/.dll)
 _BUILD_SCRIPT = _REPO_ROOT / "scripts" / "build_libdivoom.sh"
 _C_SOURCES = [
@@ -0,0 +1,74 @@
+"""
+Latency benchmark: pooled LanTransport session vs a session per command.
+
+Stands up a local aiohttp server shaped like the device's ``:9000/divoom_api``
+and times N sequential ``set_brightness`` commands two ways:
+  - fresh:  what ``LanTransport.post`` did before, one ``ClientSession`` (new
+            connector + TCP handshake) per command;
+  - pooled: ``LanTransport.post`` today, one keep-alive session per transport.
+
+Loopback hides most of the handshake cost a real Wi-Fi round trip pays, so
+the gap measured here is a floor. Run explicitly (not collected by default):
+
+    python -m pytest -q -s tests/perf_lan_session.py
+
+This is a regression alarm: it fails only if the pooled path stops beating
+the per-command session.
+"""
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from divoom_lib.lan_transport import LanTransport
+
+N_COMMANDS = 200
+
+
+async def _serve():
+    async def handle(request):
+        await request.read()
+        return web.json_response({"error_code": 0})
+
+    app = web.Application()
+    app.router.add_post("/divoom_api", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def _fresh_session_post(url: str) -> None:
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json={"Command": "Channel/SetBrightness", "Brightness": 50},
+                                timeout=aiohttp.ClientTimeout(total=5.0)) as resp:
+            await resp.text()
+
+
+async def test_perf_pooled_session_beats_a_session_per_command():
+    runner, port = await _serve()
+    lan = LanTransport(device_ip="127.0.0.1")
+    lan._base_url = url = f"http://127.0.0.1:{port}{LanTransport.PATH}"
+    fresh, pooled = [], []
+    try:
+        for _ in range(N_COMMANDS):
+            t0 = time.perf_counter()
+            await _fresh_session_post(url)
+            fresh.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            await lan.set_brightness(50)
+            pooled.append(time.perf_counter() - t0)
+    finally:
+        await lan.close()
+        await runner.cleanup()
+
+    def p95(xs):
+        return sorted(xs)[int(len(xs) * 0.95)]
+
+    f_med, p_med = statistics.median(fresh), statistics.median(pooled)
+    print(f"\n  {N_COMMANDS} commands: fresh median={f_med * 1e3:.2f}ms p95={p95(fresh) * 1e3:.2f}ms"
+          f" | pooled median={p_med * 1e3:.2f}ms p95={p95(pooled) * 1e3:.2f}ms"
+          f" | speedup={f_med / p_med:.1f}x")
+    assert p_med < f_med, "pooled LAN session is not faster than a session per command — REGRESSION"
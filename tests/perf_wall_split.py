@@ -0,0 +1,95 @@
+"""
+Event-loop stall benchmark: 3x3 animated wall push, split inline vs off-loop.
+
+A 96x96, 40-frame GIF is pushed to a 3x3 wall of 32x32 panels whose
+``display.show_image`` is a real `Display` over a fake communicator (so the
+per-panel quantize + 0x8B encode runs too). A heartbeat task ticks every
+millisecond; the worst gap between ticks is how long BLE notification
+handling would have been starved. Compared:
+  - inline:  `split_asset` called straight on the loop, panels re-encode on
+             the loop (what the wall did before, minus the temp-file trip),
+  - wall:    `DivoomWall.show_image` today (split and encodes in workers).
+
+Run explicitly (not collected by default):
+
+    python -m pytest -q -s tests/perf_wall_split.py
+
+Regression alarm: fails only if the off-loop push stalls the loop as long
+as the inline one.
+"""
+import asyncio
+import logging
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import wall as wall_mod
+from divoom_lib.display import Display
+from divoom_lib.utils.blob_cache import BlobCache
+from divoom_lib.wall import DivoomWall
+from divoom_lib.wall_split import split_asset
+
+N_FRAMES = 40
+
+
+def _display():
+    comm = MagicMock(lan=None, push_state=None, logger=logging.getLogger("perf_wall_split"))
+    comm.cfg.screensize = 32
+    comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+    display = Display(comm)
+    display.show_design = AsyncMock()
+    display.blob_cache = BlobCache()
+    return display
+
+
+async def _max_gap(coro) -> float:
+    gaps, done = [0.0], False
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    try:
+        await coro
+    finally:
+        done = True
+        await beat
+    return max(gaps)
+
+
+async def test_perf_wall_split_does_not_stall_the_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    frames = [Image.effect_noise((96, 96), 40 + i).convert("RGB") for i in range(N_FRAMES)]
+    gif = tmp_path / "noise.gif"
+    frames[0].save(gif, save_all=True, append_images=frames[1:], duration=50, loop=0)
+    configs = [{"mac": f"AA:00:00:00:00:{i:02X}", "x": i % 3, "y": i // 3, "size": 32}
+               for i in range(9)]
+    with patch.object(wall_mod, "Divoom", new_callable=MagicMock) as divoom:
+        divoom.side_effect = [MagicMock(mac=c["mac"], is_alive=True, display=_display())
+                              for c in configs]
+        wall = DivoomWall(configs, preview_cache=False)
+
+    async def inline():
+        boxes = [wall._slot_box(slot) for slot in wall.devices]
+        split = split_asset(str(gif), (96, 96), boxes, [32] * 9, False)
+        for slot, part in zip(wall.devices, split.slots):
+            slot.device.display._encode_blob(part.frames, None, 32, False)
+
+    for slot in wall.devices:
+        slot.device.display.blob_cache = BlobCache()
+    inline_gap = await _max_gap(inline())
+    for slot in wall.devices:
+        slot.device.display.blob_cache = BlobCache()
+    wall_gap = await _max_gap(wall.show_image(str(gif)))
+    print(f"\n  3x3 wall, {N_FRAMES} frames: inline max loop gap={inline_gap * 1e3:.1f}ms"
+          f" | off-loop max loop gap={wall_gap * 1e3:.1f}ms")
+    assert wall_gap < inline_gap, "wall split is stalling the event loop — REGRESSION"
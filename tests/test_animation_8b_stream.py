@@ -57,6 +57,20 @@ async def test_stream_phases_and_chunk_index_offsets():
     assert len(data_calls[2].args[1]) == 1 + 4 + 2 + 50
 
 
+@pytest.mark.asyncio
+async def test_stream_data_chunks_are_bytes_not_int_lists():
+    """Bytes-native pipeline: each SendingData chunk goes down as one bytes
+    payload built from a memoryview slice, never as a list of ints."""
+    anim, comm = _make_anim()
+    blob = bytes(range(256)) + bytes(10)
+    with patch("divoom_lib.display.animation.asyncio.sleep", new=AsyncMock()):
+        assert await anim.stream_animation_8b(blob) is True
+    data_calls = [c for c in comm.send_command.await_args_list
+                  if c.args[1][0] == ANSGC_CONTROL_SENDING_DATA]
+    assert all(isinstance(c.args[1], bytes) for c in data_calls)
+    assert b"".join(bytes(c.args[1][7:]) for c in data_calls) == blob
+
+
 @pytest.mark.asyncio
 async def test_stream_empty_blob_returns_false():
     anim, comm = _make_anim()
@@ -420,3 +434,22 @@ async def test_app_send_eq_gif_builds_expected_payload():
     assert cmd == COMMANDS["app send eq gif"]
     expected = [1] + list((10).to_bytes(2, byteorder='little')) + [2] + [9, 9]
     assert args == expected
+
+
+@pytest.mark.asyncio
+async def test_stream_writes_preframed_slices_and_resends_slice_on_retransmit():
+    """A transport exposing wire_framing gets the transfer pre-framed once
+    (framing.frame_8b_transfer); chunks and retransmits are slices of it."""
+    from divoom_lib import framing
+    anim, comm = _make_anim()
+    comm.wire_framing = framing.WireFraming()
+    comm.send_frame = AsyncMock(return_value=True)
+    blob = bytes(range(256)) * 2 + bytes(50)  # 3 chunks
+    comm.wait_for_response = AsyncMock(side_effect=[bytes([0]), bytes([2, 0]), bytes([1, 2, 0]), None])
+    with patch("divoom_lib.display.animation.asyncio.sleep", new=AsyncMock()):
+        assert await anim.stream_animation_8b(blob) is True
+    # START still goes through send_command; no SendingData does.
+    assert [c.args[1][0] for c in comm.send_command.await_args_list] == [ANSGC_CONTROL_START_SENDING]
+    batch = framing.frame_8b_transfer(blob, 256, comm.wire_framing)
+    sent = [bytes(c.args[0]) for c in comm.send_frame.await_args_list]
+    assert sent == [bytes(batch.frame(i)) for i in (0, 1, 2, 2)]
@@ -451,9 +451,11 @@ async def test_send_command_and_wait_for_response_success(divoom_base_instance,
     mock_bleak_client.is_connected = True
     expected_payload = b'\x11\x22\x33'
     
-    # Mock send_command to put a response in the queue
+    # Mock send_command to have the device answer through the notification handler
     async def mock_send_command(command, args, write_with_response):
-        await base.notification_queue.put({'command_id': command, 'payload': expected_payload})
+        from divoom_lib import framing
+        base.notification_handler(0, bytearray(framing.encode_basic_payload(
+            [command] + list(expected_payload), escape=False)))
         return True
     base.send_command = AsyncMock(side_effect=mock_send_command)
 
@@ -0,0 +1,162 @@
+"""BlueZ AcquireWrite / AcquireNotify fast path (divoom_lib.ble_acquire).
+
+The acquired characteristics are stood in for by ``SOCK_SEQPACKET``
+socketpairs: bulk packets inside a bulk transfer go out as MTU-sized
+datagrams instead of bleak writes, control traffic and writes that need a
+response stay on bleak, notifications are read from the fd, and anything
+that can't be acquired falls back to bleak.
+"""
+import asyncio
+import socket
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import ble_acquire, framing, models
+from divoom_lib.ble_acquire import AcquiredWriter
+
+MAC = "AA:BB:CC:DD:EE:11"
+WRITE = models.DivoomConfig().write_characteristic_uuid
+NOTIFY = models.DivoomConfig().notify_characteristic_uuid
+GET_VOLUME = models.COMMANDS["get volume"]
+
+
+class MockBleakClient:
+    def __init__(self):
+        self.is_connected = False
+        self.mtu_size = 23
+        self.writes = []
+        self.subscribed = []
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    async def start_notify(self, uuid, cb):
+        self.subscribed.append(uuid)
+
+    async def stop_notify(self, uuid):
+        self.subscribed.remove(uuid)
+
+    async def write_gatt_char(self, _uuid, data, response=False):
+        self.writes.append((bytes(data), response))
+
+
+class FakeBlueZ:
+    """Hands out one end of a datagram socketpair per acquire, like bluetoothd."""
+
+    def __init__(self, mtu=23, refuse=()):
+        self.mtu = mtu
+        self.refuse = set(refuse)
+        self.calls = []
+        self.peers = {}
+
+    async def __call__(self, client, uuid, member):
+        self.calls.append((uuid, member))
+        if member in self.refuse:
+            return None
+        ours, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        ours.setblocking(False)
+        peer.setblocking(False)
+        self.peers[member] = peer
+        return ours, self.mtu
+
+    def datagrams(self, member="AcquireWrite"):
+        out = []
+        while True:
+            try:
+                out.append(self.peers[member].recv(1024))
+            except BlockingIOError:
+                return out
+
+
+@pytest.fixture
+def pair():
+    ours, peer = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+    ours.setblocking(False)
+    yield ours, peer
+    ours.close()
+    peer.close()
+
+
+async def _connect(bluez):
+    d = Divoom(models.DivoomConfig(mac=MAC, device_name="MockDevice", client=MockBleakClient(),
+                                   use_ios_le_protocol=False))
+    t = d._conn._active_transport
+    t.fast_path = ble_acquire.FastPath(t, acquirer=bluez)
+    t.fast_path.enabled = True
+    await t.connect()
+    return d, t
+
+
+async def test_writer_splits_into_mtu_sized_datagrams_and_reports_a_closed_fd(pair):
+    ours, peer = pair
+    writer = AcquiredWriter(ours, mtu=23)
+    await writer.write(bytes(range(45)))
+    assert [peer.recv(1024) for _ in range(3)] == [bytes(range(20)), bytes(range(20, 40)),
+                                                   bytes(range(40, 45))]
+    assert AcquiredWriter(ours, mtu=600).payload_size == 512
+    peer.close()
+    with pytest.raises(ConnectionError):
+        for _ in range(1000):  # until the kernel notices the peer is gone
+            await writer.write(b"x")
+    assert writer.closed
+
+
+async def test_bulk_frames_use_the_write_fd_and_control_traffic_stays_on_bleak():
+    bluez = FakeBlueZ()
+    d, t = await _connect(bluez)
+    frame = framing.encode_basic_payload([0x8B] + [7] * 40)
+    assert await d.send_frame(frame) is True  # outside a bulk transfer: bleak
+    assert len(t.client.writes) == 1 and "AcquireWrite" not in bluez.peers
+
+    async with d._conn.bulk_transfer():
+        assert await d.send_frame(frame) is True
+        assert b"".join(bluez.datagrams()) == frame
+        assert await d.send_command("set brightness", [50]) is True  # no response: rides the fd
+        assert len(bluez.datagrams()) == 1
+        assert await d.send_command("set brightness", [60], write_with_response=True) is True
+        assert t.client.writes[-1][1] is True and t.fast_path.writer is None  # released first
+        assert await d.send_frame(frame) is True  # re-acquired lazily
+    assert t.fast_path.writer is None and t.fast_path.fd_writes == 3
+    assert [m for _, m in bluez.calls].count("AcquireWrite") == 2
+    assert len(t.client.writes) == 2
+
+
+async def test_notifications_are_read_from_the_acquired_fd():
+    bluez = FakeBlueZ()
+    d, t = await _connect(bluez)
+    assert t.client.subscribed == [] and t._notifications_started
+    device = bluez.peers["AcquireNotify"]
+
+    async def answer():
+        await asyncio.sleep(0.01)
+        device.send(framing.encode_basic_payload([GET_VOLUME, 0x0C]))
+
+    responder = asyncio.create_task(answer())
+    assert await t.send_command_and_wait_for_response(GET_VOLUME, timeout=1.0) == b"\x0c"
+    await responder
+    await t.disconnect()
+    assert t.fast_path.notifier is None and t.client.subscribed == []
+
+
+async def test_unsupported_characteristics_fall_back_to_bleak():
+    bluez = FakeBlueZ(refuse={"AcquireWrite", "AcquireNotify"})
+    d, t = await _connect(bluez)
+    assert t.client.subscribed == [NOTIFY]
+    frame = framing.encode_basic_payload([0x8B, 1])
+    async with d._conn.bulk_transfer():
+        assert await d.send_frame(frame) and await d.send_frame(frame)
+    assert [w for w, _ in t.client.writes] == [frame, frame]
+    assert [m for _, m in bluez.calls] == ["AcquireNotify", "AcquireWrite"]  # asked once
+
+
+async def test_disabled_by_default_and_acquire_needs_a_bluez_client(monkeypatch):
+    monkeypatch.delenv(ble_acquire.ENV_VAR, raising=False)
+    assert ble_acquire.enabled() is False
+    monkeypatch.setenv(ble_acquire.ENV_VAR, "1")
+    monkeypatch.setattr(ble_acquire.sys, "platform", "linux")
+    assert ble_acquire.enabled() is True
+    assert await ble_acquire.acquire(MockBleakClient(), WRITE, "AcquireWrite") is None
@@ -0,0 +1,140 @@
+"""Multi-adapter BLE sharding (divoom_lib.ble_adapters).
+
+Devices spread evenly over the pool's adapters and stay put while they work;
+connects and streams are bounded per adapter, handshakes on different
+adapters don't share the connect lock, and a dropped or failed device is
+rebalanced onto the least-loaded adapter.
+"""
+import asyncio
+
+import pytest
+
+from divoom_lib import ble_adapters
+from divoom_lib.ble_adapters import AdapterPool
+from divoom_lib.ble_connection import connect_devices
+from tests.support.fake_ble import FakeBleDevice
+
+
+class _SlowDevice(FakeBleDevice):
+    """Records how many handshakes run at once, overall and per adapter."""
+    active: dict = {}
+    peak: dict = {}
+
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.adapter = None
+        self.display = self
+
+    async def connect(self):
+        key = self.adapter
+        for k in (key, "all"):
+            _SlowDevice.active[k] = _SlowDevice.active.get(k, 0) + 1
+            _SlowDevice.peak[k] = max(_SlowDevice.peak.get(k, 0), _SlowDevice.active[k])
+        await asyncio.sleep(0.01)
+        for k in (key, "all"):
+            _SlowDevice.active[k] -= 1
+        await super().connect()
+
+    async def show_image(self, path, time=None, sync=None):
+        return await self.connect() is None
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    _SlowDevice.active, _SlowDevice.peak = {}, {}
+
+
+def test_available_adapters_reads_sysfs_on_linux(tmp_path, monkeypatch):
+    for name in ("hci10", "hci1", "hci0", "other"):
+        (tmp_path / name).mkdir()
+    monkeypatch.setattr(ble_adapters, "_SYSFS_BLUETOOTH", tmp_path)
+    monkeypatch.setattr(ble_adapters.sys, "platform", "linux")
+    assert ble_adapters.available_adapters() == ["hci0", "hci1", "hci10"]
+    monkeypatch.setattr(ble_adapters.sys, "platform", "darwin")
+    assert ble_adapters.available_adapters() == []
+
+
+def test_assignment_is_balanced_sticky_and_rebalances_on_drop():
+    pool = AdapterPool(["hci0", "hci1", "hci0"])
+    assert pool.adapters == ["hci0", "hci1"]
+    placed = [pool.assign(mac) for mac in ("a", "b", "c", "d")]
+    assert placed == ["hci0", "hci1", "hci0", "hci1"]
+    assert pool.assign("a") == "hci0"
+    pool.release("b")
+    assert pool.rebalance("a") == "hci1"  # hci1 now the emptier adapter
+    assert pool.rebalance("d") == "hci0"  # tie after freeing: move off hci1
+    assert pool.stats() == {"load": {"hci0": 2, "hci1": 1}, "rebalances": 2}
+    with pytest.raises(ValueError):
+        AdapterPool([])
+
+
+async def test_connects_shard_across_adapters_with_per_adapter_limits():
+    pool = AdapterPool(["hci0", "hci1"], connect_limit=2)
+    devices = [_SlowDevice() for _ in range(6)]
+    results = await connect_devices(list(enumerate(devices)), adapters=pool, attempts=1)
+    assert all(r.ok for r in results.values())
+    assert [d.adapter for d in devices] == ["hci0", "hci1"] * 3
+    # One handshake per adapter at a time, but the two adapters overlap.
+    assert _SlowDevice.peak["hci0"] == _SlowDevice.peak["hci1"] == 1
+    assert _SlowDevice.peak["all"] == 2
+
+
+async def test_streams_are_bounded_per_adapter():
+    pool = AdapterPool(["hci0", "hci1"], stream_limit=1)
+
+    devices = {key: _SlowDevice() for key in "abcd"}
+
+    async def upload(key, dev):
+        pool.place(key, dev)
+        async with pool.streaming(key):
+            await dev.show_image("x.png")
+
+    await asyncio.gather(*(upload(k, d) for k, d in devices.items()))
+    assert _SlowDevice.peak["hci0"] == _SlowDevice.peak["hci1"] == 1
+    assert _SlowDevice.peak["all"] == 2
+
+
+def test_divoom_passes_the_adapter_to_bleak():
+    from unittest.mock import patch
+    from divoom_lib.divoom import Divoom
+
+    with patch("divoom_lib.divoom.BleakClient") as bleak:
+        d = Divoom(mac="AA:BB:CC:DD:EE:08", adapter="hci1")
+        assert bleak.call_args.kwargs["adapter"] == "hci1"
+        Divoom(mac="AA:BB:CC:DD:EE:09")
+        assert "adapter" not in bleak.call_args.kwargs
+    d.adapter = "hci2"
+    assert d._conn._active_transport.adapter == "hci2" and d.adapter == "hci2"
+
+
+async def test_failed_connect_is_rebalanced_for_the_retry():
+    pool = AdapterPool(["hci0", "hci1", "hci2"])
+    ok = _SlowDevice()
+    bad = _SlowDevice(raise_on_connect=Exception("was not found"))
+    results = await connect_devices([("ok", ok), ("bad", bad)], adapters=pool,
+                                    attempts=1, sleep=lambda _s: asyncio.sleep(0))
+    assert results["ok"].ok and not results["bad"].ok
+    assert (ok.adapter, bad.adapter) == ("hci0", "hci2")  # off hci1, onto an empty one
+    assert pool.rebalances == 1
+
+
+async def test_wall_rebalances_a_dropped_slot(tmp_path):
+    from PIL import Image
+    from divoom_lib.models import DeviceSlot
+    from divoom_lib.wall import DivoomWall
+
+    img = tmp_path / "x.png"
+    Image.new("RGB", (48, 16), (10, 20, 30)).save(img)
+    configs = [{"mac": f"AA:{i}", "x": i, "y": 0, "size": 16} for i in range(3)]
+    wall = DivoomWall(configs, adapters=["hci0", "hci1"])
+    devices = [_SlowDevice() for _ in range(3)]
+    wall.devices = []
+    for i, dev in enumerate(devices):
+        dev.mac = f"AA:{i}"
+        wall.devices.append(DeviceSlot(device=dev, x=i, y=0, size=16))
+    await wall.connect()
+    assert [d.adapter for d in devices] == ["hci0", "hci1", "hci0"]
+    devices[0].drop()
+    assert await wall.show_image(str(img)) is True
+    assert devices[0].adapter == "hci1" and devices[0].is_connected
+    assert wall.adapters.stats() == {"load": {"hci0": 1, "hci1": 2}, "rebalances": 1}
@@ -0,0 +1,105 @@
+"""MTU-aware BLE write sizing (`BLETransport.write_chunk_size`).
+
+Long frames used to be cut at a fixed 200 bytes whatever the link negotiated,
+so a 0x8B data frame (256 data bytes + header) always took two paced writes.
+The write size now follows the ATT MTU bleak reports, falling back to the
+legacy 200 bytes while the MTU is unknown or still the 23-byte default.
+Short packets sent together (the 0x49 fallback) are packed several to a
+write, and iOS-LE frames respect a known MTU too.
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import framing, models
+from divoom_lib.ble_transport import BLETransport
+from divoom_lib.ble_write import pack_frames
+from divoom_lib.display.animation import send_animation_packets
+from divoom_lib.utils.divoom_image_encode import encode_animation
+
+
+@pytest.fixture
+def divoom():
+    d = Divoom(models.DivoomConfig(mac="AA:BB:CC:DD:EE:02", device_name="MockDevice",
+                                   use_ios_le_protocol=False))
+    d.client = AsyncMock()
+    d.client.is_connected = True
+    d.client.write_gatt_char = AsyncMock()
+    d.pacing.write_gap_s = 0.0
+    return d
+
+
+@pytest.mark.parametrize("mtu, expected", [
+    (None, models.DEFAULT_CHUNK_SIZE),
+    (23, models.DEFAULT_CHUNK_SIZE),      # pre-exchange default: unknown
+    (185, 182),                           # iOS-typical MTU: smaller than legacy
+    (247, 244),
+    (517, BLETransport.MAX_WRITE_CHUNK_SIZE),
+    ("517", models.DEFAULT_CHUNK_SIZE),   # not an int: ignored
+])
+def test_chunk_size_follows_negotiated_mtu(divoom, mtu, expected):
+    divoom.client.mtu_size = mtu
+    assert divoom._conn.write_chunk_size == expected
+    assert divoom.transport_status["ble_chunk_size"] == expected
+
+
+async def test_whole_8b_frame_goes_out_in_one_write_on_a_large_mtu(divoom):
+    frame = framing.frame_8b_transfer(bytes(range(256)), wire=divoom.wire_framing).frame(0)
+    assert len(frame) > models.DEFAULT_CHUNK_SIZE
+    divoom.client.mtu_size = 23
+    assert await divoom.send_frame(frame) is True
+    assert divoom.client.write_gatt_char.await_count == 2
+    divoom.client.write_gatt_char.reset_mock()
+    divoom.client.mtu_size = 517
+    assert await divoom.send_frame(frame) is True
+    assert divoom.client.write_gatt_char.await_count == 1
+    assert bytes(divoom.client.write_gatt_char.await_args.args[1]) == bytes(frame)
+
+
+async def test_small_mtu_splits_into_write_sized_chunks(divoom):
+    divoom.client.mtu_size = 103
+    assert await divoom.send_command("set brightness", [0x01] * 250) is True
+    sizes = [len(c.args[1]) for c in divoom.client.write_gatt_char.await_args_list]
+    assert len(sizes) > 2 and max(sizes) == 100
+
+
+def test_pack_frames_keeps_frames_whole():
+    frames = [b"a" * 120, b"b" * 120, b"c" * 120, b"d" * 300, b"e" * 10]
+    packs = pack_frames(frames, 250)
+    assert [len(p) for p in packs] == [240, 120, 300, 10]
+    assert b"".join(packs) == b"".join(frames)
+
+
+async def test_0x49_fallback_packs_packets_per_write(divoom):
+    rgb = bytes((i * 37 + c * 11) % 256 for i in range(16 * 16) for c in range(3))
+    packets = encode_animation([(rgb, 16, 16, 100)] * 3)
+    command = models.COMMANDS["set animation frame"]
+    wire = [framing.frame_command(command, bytes(p), divoom.wire_framing) for p in packets]
+    assert len(packets) >= 4 and max(map(len, wire)) < 250
+
+    divoom.client.mtu_size = 517
+    sync = AsyncMock(committed=lambda: None)
+    assert await send_animation_packets(divoom, packets, sync) is True
+    writes = [bytes(c.args[1]) for c in divoom.client.write_gatt_char.await_args_list]
+    assert len(writes) < len(packets) and all(len(w) <= 509 for w in writes)
+    assert b"".join(writes) == b"".join(wire)
+    assert writes[-1] == wire[-1]  # the playback-starting packet is held alone
+    sync.hold.assert_awaited_once()
+
+
+async def test_ios_le_frames_follow_a_known_mtu():
+    d = Divoom(models.DivoomConfig(mac="AA:BB:CC:DD:EE:03", device_name="MockDevice",
+                                   use_ios_le_protocol=True))
+    d.client = AsyncMock()
+    d.client.is_connected = True
+    d.client.write_gatt_char = AsyncMock()
+    d.pacing.write_gap_s = 0.0
+    d.client.mtu_size = None
+    assert await d.send_command("set brightness", [0x01] * 250) is True
+    assert d.client.write_gatt_char.await_count == 1  # unknown MTU: whole, as before
+    d.client.write_gatt_char.reset_mock()
+    d.client.mtu_size = 103
+    assert await d.send_command("set brightness", [0x01] * 250) is True
+    sizes = [len(c.args[1]) for c in d.client.write_gatt_char.await_args_list]
+    assert len(sizes) == 3 and max(sizes) == 100
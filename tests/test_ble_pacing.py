@@ -0,0 +1,185 @@
+"""Adaptive BLE write pacing (divoom_lib.ble_pacing).
+
+A fresh tuner must reproduce the legacy fixed pacing exactly (50 ms gap,
+write-with-response, 10 ms per 0x8B chunk); from there it may only speed up
+on clean traffic, must back off on trouble, and always stays within bounds.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from divoom_lib import ble_pacing, models
+from divoom_lib.ble_pacing import PacingStore, PacingTuner
+from divoom_lib.display.animation import Animation
+from divoom_lib.divoom import Divoom
+
+MAC = "AA:BB:CC:DD:EE:01"
+
+
+def test_fresh_tuner_reproduces_legacy_pacing():
+    t = PacingTuner(MAC)
+    assert (t.write_gap_s, t.stream_delay_s, t.stream_write_with_response) == (0.05, 0.01, True)
+
+
+def _clean_writes(t, rounds=1, latency_s=0.002):
+    for _ in range(rounds * ble_pacing.CLEAN_WRITES_TO_SPEED_UP):
+        t.observe_write(latency_s, True)
+
+
+def test_clean_writes_speed_up_one_step_below_the_stream_proven_floor():
+    t = PacingTuner(MAC)
+    _clean_writes(t)
+    assert t.write_gap_s == pytest.approx(0.05 * ble_pacing.SPEED_UP)
+    assert t.stream_delay_s == pytest.approx(0.005)
+    _clean_writes(t, 100)  # plain writes alone prove nothing
+    assert t.write_gap_s == pytest.approx(0.05 * ble_pacing.SPEED_UP)
+    assert t.latency_ms == pytest.approx(2.0)
+    for _ in range(100):  # each clean stream proves the gap it ran at
+        t.observe_stream(0, True)
+        _clean_writes(t)
+    assert t.write_gap_s == ble_pacing.MIN_WRITE_GAP_S
+    assert t.stream_delay_s == 0.0
+
+
+def test_retransmits_raise_the_floor_and_slow_writes_do_not_speed_up():
+    t = PacingTuner(MAC)
+    for _ in range(4):
+        t.observe_stream(0, True)
+        _clean_writes(t)
+    t.observe_stream(2, True)
+    assert t.gap_floor_s == t.write_gap_s and t.write_gap_s > 0.03
+    slow = PacingTuner(MAC)
+    _clean_writes(slow)
+    for _ in range(ble_pacing.CLEAN_WRITES_TO_SPEED_UP - 1):
+        slow.observe_write(0.002, True)
+    slow.observe_write(0.05, True)  # queueing: restarts the clean count
+    assert slow.write_gap_s == pytest.approx(0.05 * ble_pacing.SPEED_UP)
+
+
+def test_failures_back_off_up_to_the_ceiling():
+    t = PacingTuner(MAC)
+    t.observe_write(0.01, False)
+    assert t.write_gap_s == pytest.approx(0.10) and t.failures == 1
+    for _ in range(5):
+        t.observe_write(0.01, False)
+    assert t.write_gap_s == ble_pacing.MAX_WRITE_GAP_S
+    assert t.stream_delay_s == ble_pacing.MAX_STREAM_DELAY_S
+
+
+def test_failure_resets_the_clean_streak():
+    t = PacingTuner(MAC)
+    for _ in range(ble_pacing.CLEAN_WRITES_TO_SPEED_UP - 1):
+        t.observe_write(0.002, True)
+    t.observe_write(0.002, False)
+    gap = t.write_gap_s
+    t.observe_write(0.002, True)
+    assert t.write_gap_s == gap
+
+
+def test_response_mode_drops_after_clean_streams_and_pins_on_retransmits():
+    t = PacingTuner(MAC)
+    for _ in range(ble_pacing.CLEAN_STREAMS_TO_DROP_RESPONSE):
+        t.observe_stream(0, True)
+    assert t.stream_write_with_response is False
+    t.observe_stream(3, True)
+    assert t.stream_write_with_response is True and t.response_pinned
+    assert t.retransmits == 3
+    for _ in range(5):
+        t.observe_stream(0, True)
+    assert t.stream_write_with_response is True
+
+
+def test_profile_persists_per_mac_case_insensitively(tmp_path):
+    path = tmp_path / "pacing.json"
+    t = PacingTuner(MAC, PacingStore(path))
+    t.observe_write(0.01, False)
+    t.observe_stream(0, True)
+    saved = json.loads(path.read_text())
+    assert saved[MAC.lower()]["write_gap_s"] == pytest.approx(0.10)
+    again = PacingTuner(MAC.upper(), PacingStore(path))
+    assert again.profile() == t.profile()
+    assert PacingTuner("11:22:33:44:55:66", PacingStore(path)).write_gap_s == 0.05
+
+
+def test_saved_profile_is_clamped_and_corrupt_files_are_ignored(tmp_path, caplog):
+    path = tmp_path / "pacing.json"
+    path.write_text(json.dumps({MAC: {"write_gap_s": 0.0, "gap_floor_s": 0.0, "stream_delay_s": 9,
+                                      "stream_write_with_response": False}}))
+    t = PacingTuner(MAC, PacingStore(path))
+    assert (t.write_gap_s, t.stream_delay_s) == \
+        (ble_pacing.MIN_WRITE_GAP_S, ble_pacing.MAX_STREAM_DELAY_S)
+    path.write_text("{not json")
+    with caplog.at_level(logging.WARNING):
+        assert PacingTuner(MAC, PacingStore(path)).write_gap_s == 0.05
+    assert "corrupt" in caplog.text
+
+
+def test_profile_saved_by_the_unbounded_speed_up_recovers(tmp_path):
+    path = tmp_path / "pacing.json"
+    path.write_text(json.dumps({MAC: {"write_gap_s": 0.005, "stream_delay_s": 0.0,
+                                      "stream_write_with_response": True}}))
+    t = PacingTuner(MAC, PacingStore(path))
+    assert t.gap_floor_s == 0.05
+    assert t.write_gap_s == pytest.approx(0.05 * ble_pacing.SPEED_UP)
+
+
+async def test_stream_saves_are_debounced_into_a_worker(monkeypatch):
+    monkeypatch.setattr(ble_pacing, "SAVE_DELAY_S", 0.05)
+    store = MagicMock(get=MagicMock(return_value=None))
+    writers = []
+    store.put = MagicMock(side_effect=lambda *a: writers.append(threading.current_thread()))
+    t = PacingTuner(MAC, store)
+    for _ in range(3):
+        t.observe_stream(0, True)
+    assert store.put.call_count == 0
+    await asyncio.sleep(0.2)
+    assert store.put.call_count == 1
+    assert writers[0] is not threading.main_thread()
+    assert store.put.call_args.args[1]["streams"] == 3
+
+
+def test_default_store_location_and_opt_out(monkeypatch, tmp_path):
+    monkeypatch.setattr(ble_pacing, "_default_store", None)
+    monkeypatch.setenv("DIVOOM_CONTROL_PACING", "")
+    assert ble_pacing.default_store() is None
+    monkeypatch.setenv("DIVOOM_CONTROL_PACING", str(tmp_path / "p.json"))
+    assert ble_pacing.default_store().path == tmp_path / "p.json"
+    monkeypatch.setattr(ble_pacing, "_default_store", None)
+    monkeypatch.delenv("DIVOOM_CONTROL_PACING")
+    assert ble_pacing.default_store().path == \
+        models.REGISTRY_PATH.parent / "pacing.json"
+
+
+async def test_ble_writes_use_and_feed_the_tuner():
+    divoom = Divoom(models.DivoomConfig(mac=MAC, device_name="MockDevice",
+                                        use_ios_le_protocol=False))
+    divoom.client = AsyncMock()
+    divoom.client.is_connected = True
+    times = []
+    divoom.client.write_gatt_char = AsyncMock(side_effect=lambda *a, **k: times.append(time.time()))
+    pacing = divoom.pacing
+    pacing.write_gap_s = 0.1
+    await divoom.send_command("set brightness", [50])
+    await divoom.send_command("set brightness", [60])
+    assert times[1] - times[0] >= 0.09
+    assert pacing.writes == 2 and pacing.failures == 0
+
+
+async def test_stream_uses_learned_response_mode_and_reports_outcome():
+    comm = MagicMock()
+    comm.lan = None
+    comm.use_spp = False
+    comm.send_command = AsyncMock(return_value=True)
+    comm.wait_for_response = AsyncMock(return_value=None)
+    comm.pacing = PacingTuner(MAC)
+    comm.pacing.stream_write_with_response = False
+    with patch("divoom_lib.display.animation.asyncio.sleep", new=AsyncMock()):
+        assert await Animation(comm).stream_animation_8b(bytes(600)) is True
+    data = [c for c in comm.send_command.await_args_list if c.args[1][0] == 0x01]
+    assert data and all(c.kwargs["write_with_response"] is False for c in data)
+    assert comm.pacing.streams == 1 and comm.pacing.retransmits == 0
@@ -142,7 +142,7 @@ class _PushDevice(FakeBleDevice):
         outer = self
 
         class _Display:
-            async def show_image(self, path, time=None):
+            async def show_image(self, path, time=None, sync=None):
                 outer.pushes += 1
                 return True
         self.display = _Display()
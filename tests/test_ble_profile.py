@@ -0,0 +1,126 @@
+"""Persistent BLE connection profiles (divoom_lib.ble_profile).
+
+A first connect settles and autoprobes the framing, then saves what worked;
+the next connect to the same MAC applies it and verifies it with one 0x46
+read. A profile that no longer answers falls back to characteristic
+discovery + autoprobe and is rewritten.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import ble_probe, ble_profile, framing, models
+from divoom_lib.ble_profile import ProfileStore
+
+MAC = "AA:BB:CC:DD:EE:07"
+WRITE = models.DivoomConfig().write_characteristic_uuid
+NOTIFY = models.DivoomConfig().notify_characteristic_uuid
+ALT_NOTIFY = "49535343-aca3-481c-91ec-d85e28a60318"
+
+
+class MockBleakClient:
+    """Answers 0x46 only in its own framing, on its own notify characteristic."""
+
+    def __init__(self, ios_le=False, notify_uuid=NOTIFY):
+        self.ios_le = ios_le
+        self.notify_uuid = notify_uuid
+        self.is_connected = False
+        self.mtu_size = 247
+        self.writes = []
+        self._callbacks = {}
+        chars = [SimpleNamespace(uuid=WRITE, properties=["write"]),
+                 SimpleNamespace(uuid=notify_uuid, properties=["notify", "read"])]
+        self.services = [SimpleNamespace(characteristics=chars)]
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def start_notify(self, uuid, cb):
+        self._callbacks[uuid] = cb
+
+    async def stop_notify(self, uuid):
+        self._callbacks.pop(uuid, None)
+
+    async def write_gatt_char(self, _uuid, data, response=False):
+        self.writes.append(bytes(data))
+        query = (framing.encode_ios_le_payload([0x46]) if self.ios_le
+                 else framing.encode_basic_payload([0x46], escape=False))
+        cb = self._callbacks.get(self.notify_uuid)
+        if bytes(data) == bytes(query) and cb is not None:
+            reply = [0x46] + [0x01] * 10
+            cb(0, bytearray(framing.encode_ios_le_payload(reply) if self.ios_le
+                            else framing.encode_basic_payload(reply, escape=False)))
+
+
+@pytest.fixture(autouse=True)
+def fast_probe(monkeypatch):
+    monkeypatch.setattr(ble_profile, "SETTLE_S", 0.2)
+    monkeypatch.setattr(ble_profile, "VERIFY_TIMEOUT", 0.2)
+    monkeypatch.setattr(ble_probe, "_PROBE_TIMEOUT", 0.2)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(tmp_path / "profiles.json")
+
+
+async def _connect(store, client, **cfg):
+    d = Divoom(models.DivoomConfig(mac=MAC, device_name="MockDevice", client=client, **cfg))
+    t = d._conn._active_transport
+    t.profile_store = store
+    await t.connect()
+    return t
+
+
+async def test_first_connect_probes_then_the_saved_profile_skips_the_probe(store):
+    first = await _connect(store, MockBleakClient())
+    assert first.connect_report["source"] == "probed"
+    assert len(first.client.writes) == 2  # iOS-LE probe unanswered, then Basic
+    saved = json.loads(store.path.read_text())[MAC.lower()]
+    assert (saved["use_ios_le_protocol"], saved["mtu"], saved["chunk_size"]) == (False, 247, 244)
+
+    second = await _connect(ProfileStore(store.path), MockBleakClient())
+    assert second.connect_report["source"] == "profile"
+    assert second.use_ios_le_protocol is False
+    assert len(second.client.writes) == 1
+    # settle + two probe windows vs one answered read
+    assert first.connect_report["connect_ms"] >= 400
+    assert second.connect_report["connect_ms"] < 200
+    assert second._divoom.transport_status["ble_connect"] == second.connect_report
+
+
+async def test_stale_profile_rediscovers_and_is_rewritten(store):
+    await _connect(store, MockBleakClient(ios_le=True))
+    moved = MockBleakClient(ios_le=False, notify_uuid=ALT_NOTIFY)  # firmware update
+    t = await _connect(store, moved)
+    assert t.connect_report["source"] == "rediscovered"
+    assert (t.NOTIFY_CHARACTERISTIC_UUID, t.use_ios_le_protocol) == (ALT_NOTIFY, False)
+    assert NOTIFY not in moved._callbacks
+    saved = store.get(MAC)
+    assert (saved["notify_uuid"], saved["use_ios_le_protocol"]) == (ALT_NOTIFY, False)
+    assert (await _connect(store, MockBleakClient(notify_uuid=ALT_NOTIFY))
+            ).connect_report["source"] == "profile"
+
+
+async def test_pinned_framing_and_other_configs_ignore_the_profile(store):
+    await _connect(store, MockBleakClient())
+    pinned = await _connect(store, MockBleakClient(), use_ios_le_protocol=False)
+    assert pinned.connect_report["source"] == "known" and pinned.client.writes == []
+    other = await _connect(store, MockBleakClient(), read_characteristic_uuid=NOTIFY.upper())
+    assert other.connect_report["source"] == "probed"
+
+
+async def test_unanswered_probe_is_not_persisted(store):
+    silent = MockBleakClient(notify_uuid=ALT_NOTIFY)  # replies go nowhere we listen
+    silent.services = []
+    t = await _connect(store, silent)
+    assert t.connect_report["source"] == "default"
+    assert store.get(MAC) is None
+
+
+def test_malformed_or_old_entries_are_ignored():
+    assert ble_profile.ConnectionProfile.from_dict({"version": 0}) is None
+    assert ble_profile.ConnectionProfile.from_dict(
+        {"version": ble_profile.PROFILE_VERSION, "write_uuid": "w"}) is None
@@ -394,3 +394,29 @@ def test_send_basic_protocol_payload_chunk_error_stops_and_flags_broken(monkeypa
     assert ok is False
     assert call_count["n"] == 2                 # stopped after the failing chunk
     assert t._connection_likely_broken is True
+
+
+# ── send_frame(): pre-framed 0x8B packets skip the encoder ──
+
+def test_send_frame_writes_preframed_packet_unchanged(monkeypatch):
+    from divoom_lib import framing
+    t = _transport(monkeypatch)
+    t.client.is_connected = True
+    t._connection_likely_broken = False
+    t.use_ios_le_protocol = False
+    write_calls = []
+
+    async def fake_write(_uuid, chunk, response=False):
+        write_calls.append(bytes(chunk))
+
+    t.client.write_gatt_char = fake_write
+    monkeypatch.setattr("divoom_lib.ble_transport.asyncio.sleep", AsyncMock())
+    monkeypatch.setattr(framing, "encode_basic_payload",
+                        MagicMock(side_effect=AssertionError("re-encoded")))
+
+    assert t.wire_framing == framing.WireFraming(ios_le=False, escape=t.escapePayload)
+    frame = b"\x01\x05\x00\x8b\x01\x91\x00\x02"
+    ok = _run(t.send_frame(memoryview(frame), write_with_response=True))
+
+    assert ok is True
+    assert write_calls == [frame]
@@ -0,0 +1,150 @@
+"""Content-addressed cache of encoded 0x8B blobs (divoom_lib.utils.blob_cache)
+and its use by `Display.show_image`: a repeated push must skip decode, resize
+and encode entirely and stream the identical blob.
+"""
+import logging
+import os
+import shutil
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from divoom_lib import display as display_mod
+from divoom_lib.display import Display
+from divoom_lib.utils import blob_cache
+from divoom_lib.utils.blob_cache import BlobCache
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "a.png"
+    Image.new("RGB", (16, 16), (10, 200, 30)).save(path)
+    return path
+
+
+def test_key_tracks_content_and_push_parameters(image, tmp_path):
+    key = BlobCache.key_for_file(image, 16)
+    copy = tmp_path / "copy.png"
+    shutil.copy(image, copy)
+    assert BlobCache.key_for_file(copy, 16) == key  # content, not path
+    assert len({key,
+                BlobCache.key_for_file(image, 32),
+                BlobCache.key_for_file(image, 16, time=200),
+                BlobCache.key_for_file(image, 16, reuse_palette=True)}) == 4
+    Image.new("RGB", (16, 16), (0, 0, 0)).save(copy)
+    assert BlobCache.key_for_file(copy, 16) != key
+    assert BlobCache.key_for_file(tmp_path / "missing.png", 16) is None
+
+
+def test_encoder_version_is_part_of_the_key(image, monkeypatch):
+    key = BlobCache.key_for_file(image, 16)
+    monkeypatch.setattr(blob_cache, "ENCODER_VERSION", blob_cache.ENCODER_VERSION + 1)
+    assert BlobCache.key_for_file(image, 16) != key
+
+
+def test_memory_lru_evicts_least_recently_used_and_counts():
+    cache = BlobCache(memory_entries=2)
+    cache.put("a", b"A")
+    cache.put("b", b"B")
+    assert cache.get("a") == b"A"  # a is now most recent
+    cache.put("c", b"C")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"A" and cache.get("c") == b"C"
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["memory_entries"]) == (3, 1, 2)
+    assert stats["hit_rate"] == 0.75
+
+
+def test_disk_tier_survives_a_new_instance_and_promotes(tmp_path):
+    BlobCache(tmp_path).put("k", b"\xAA" * 10)
+    cache = BlobCache(tmp_path)
+    assert cache.get("k") == b"\xAA" * 10
+    assert cache.get("k") == b"\xAA" * 10
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["disk_bytes"]) == (1, 1, 10)
+
+
+def test_disk_cap_evicts_oldest_access_first(tmp_path):
+    cache = BlobCache(tmp_path, memory_entries=1, disk_max_bytes=25)
+    cache.put("old", b"x" * 10)
+    cache.put("mid", b"y" * 10)
+    os.utime(tmp_path / "old.bin", (1, 1))
+    os.utime(tmp_path / "mid.bin", (2, 2))
+    cache.put("new", b"z" * 10)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mid.bin", "new.bin"]
+
+
+def test_disk_size_is_scanned_once_then_kept_as_a_running_total(tmp_path):
+    BlobCache(tmp_path).put("seed", b"s" * 5)
+    cache = BlobCache(tmp_path, disk_max_bytes=40)
+    with patch.object(cache, "_disk_entries", wraps=cache._disk_entries) as scan:
+        for key in "abc":
+            cache.put(key, b"x" * 10)
+        cache.put("a", b"x" * 8)  # a rewrite replaces its old size
+        assert cache.stats()["disk_bytes"] == 33
+        assert scan.call_count == 1
+        cache.put("d", b"x" * 10)  # over budget: the eviction rescans
+        assert scan.call_count == 2
+    assert cache.stats()["disk_bytes"] == sum(p.stat().st_size for p in tmp_path.iterdir())
+    assert cache.stats()["disk_bytes"] <= 40
+
+
+def test_disk_write_failure_is_logged_not_raised(tmp_path, monkeypatch, caplog):
+    def boom(*_a, **_k):
+        raise OSError("disk full")
+    monkeypatch.setattr(blob_cache, "atomic_write_bytes", boom)
+    cache = BlobCache(tmp_path)
+    with caplog.at_level(logging.WARNING):
+        cache.put("k", b"v")
+    assert cache.get("k") == b"v"
+    assert "disk full" in caplog.text
+
+
+def test_clear_drops_both_tiers(tmp_path):
+    cache = BlobCache(tmp_path)
+    cache.put("k", b"v")
+    cache.clear()
+    assert cache.get("k") is None
+    assert list(tmp_path.iterdir()) == []
+    assert cache.stats()["disk_bytes"] == 0
+
+
+def _display():
+    comm = MagicMock()
+    comm.lan = None
+    comm.logger = logging.getLogger("test_blob_cache")
+    comm.cfg.screensize = 16
+    comm.send_command = AsyncMock(return_value=True)
+    comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+    d = Display(comm)
+    d.blob_cache = BlobCache()
+    return d, comm.animation.stream_animation_8b
+
+
+async def test_show_image_repeat_push_skips_decode_and_encode(image):
+    d, stream = _display()
+    with patch.object(display_mod, "process_image", wraps=display_mod.process_image) as proc:
+        assert await d.show_image(str(image)) is True
+        assert await d.show_image(str(image)) is True
+    assert proc.call_count == 1
+    first, second = (c.args[0] for c in stream.await_args_list)
+    assert first == second and len(first) > 0
+    assert d.blob_cache.stats()["hits"] == 1
+
+
+async def test_show_image_cache_hit_still_falls_back_to_0x49(image):
+    d, stream = _display()
+    await d.show_image(str(image))
+    stream.return_value = False
+    assert await d.show_image(str(image)) is True
+    assert d.communicator.send_command.await_args_list[-1].args[0] == "set animation frame"
+
+
+async def test_show_image_with_cache_disabled_encodes_every_time(image):
+    d, _stream = _display()
+    d.blob_cache = None
+    with patch.object(display_mod, "process_image", wraps=display_mod.process_image) as proc:
+        await d.show_image(str(image))
+        await d.show_image(str(image))
+    assert proc.call_count == 2
@@ -0,0 +1,113 @@
+"""asyncio RFCOMM socket SPP backend (divoom_lib.bt_spp_socket).
+
+Runs the transport over a ``socketpair`` stand-in for the kernel RFCOMM
+socket: inbound bytes split anywhere are framed by the shared parser without
+a thread hop, replies resolve correlated reads, writes go out framed, and a
+closed peer is reported as a dead link.
+"""
+import asyncio
+import socket
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import bt_spp_socket, framing, models
+from divoom_lib.bt_spp_socket import BTSppSocketTransport
+from divoom_lib.bt_spp_transport import BtSppTransportError
+
+GET_VOLUME = models.COMMANDS["get volume"]
+
+
+@pytest.fixture
+def pair():
+    ours, device = socket.socketpair()
+    ours.setblocking(False)
+    device.setblocking(False)
+    yield ours, device
+    ours.close()
+    device.close()
+
+
+async def _transport(ours):
+    seen = []
+
+    async def connector(address, channel):
+        seen.append((address, channel))
+        return ours
+
+    t = BTSppSocketTransport("11-22-33-44-55-66", device_kind="timoo", connector=connector)
+    await t.connect()
+    assert seen == [("11:22:33:44:55:66", 2)]
+    return t
+
+
+async def test_split_frames_are_parsed_on_the_loop(pair):
+    ours, device = pair
+    t = await _transport(ours)
+    loop = asyncio.get_running_loop()
+    stream = (framing.encode_basic_payload([0x46, 1, 2, 3])
+              + framing.encode_ios_le_payload([0x09, 7], packet_number=5))
+    for i in range(0, len(stream), 3):  # byte soup: frames straddle every read
+        await loop.sock_sendall(device, stream[i:i + 3])
+        await asyncio.sleep(0)
+    first = await t.read_notification(timeout=1.0)
+    second = await t.read_notification(timeout=1.0)
+    assert (first.command_id, first.payload, first.framing) == (0x46, b"\x01\x02\x03", "basic")
+    assert (second.command_id, second.payload, second.packet_number) == (0x09, b"\x07", 5)
+    await t.disconnect()
+    assert not t.is_connected
+
+
+async def test_request_response_round_trip(pair):
+    ours, device = pair
+    t = await _transport(ours)
+    loop = asyncio.get_running_loop()
+
+    async def fake_device():
+        query = await loop.sock_recv(device, 64)
+        assert bytes(query) == framing.encode_basic_payload([GET_VOLUME])
+        await loop.sock_sendall(device, framing.encode_basic_payload([GET_VOLUME, 0x0C]))
+
+    responder = asyncio.create_task(fake_device())
+    assert await t.send_command_and_wait_for_response(GET_VOLUME, timeout=1.0) == b"\x0c"
+    await responder
+    assert t.notification_queue.empty()
+    await t.disconnect()
+
+
+async def test_closed_peer_marks_the_link_dead(pair):
+    ours, device = pair
+    t = await _transport(ours)
+    assert t.is_alive
+    device.close()
+    await asyncio.wait_for(t._rx_task, 1.0)
+    assert not t.is_connected and not t.is_alive
+    assert await t.send_payload([0x46], max_retries=1) is False
+    await t.disconnect()
+
+
+async def test_connect_failures_raise_transport_errors():
+    async def refused(address, channel):
+        raise ConnectionRefusedError("host is down")
+
+    with pytest.raises(BtSppTransportError, match="host is down"):
+        await BTSppSocketTransport("11:22:33:44:55:66", connector=refused).connect()
+
+    async def hang(address, channel):
+        await asyncio.sleep(10)
+
+    t = BTSppSocketTransport("11:22:33:44:55:66", connector=hang)
+    t.OPEN_TIMEOUT_S = 0.01
+    with pytest.raises(BtSppTransportError, match="timed out"):
+        await t.connect()
+
+
+async def test_connection_routes_classic_devices_to_the_socket_backend(monkeypatch):
+    monkeypatch.setattr(bt_spp_socket, "available", lambda: True)
+    monkeypatch.setattr(BTSppSocketTransport, "connect", AsyncMock())
+    with patch("divoom_lib.divoom.BleakClient"):
+        d = Divoom(mac="11:22:33:44:55:66", device_name="Timoo-audio", use_ios_le_protocol=False)
+    await d.connect()
+    assert isinstance(d._conn._active_transport, BTSppSocketTransport)
+    assert d._conn.use_spp
@@ -0,0 +1,122 @@
+"""Last-value-wins coalescing of idempotent setters (divoom_lib.command_coalescer).
+
+A burst of queued brightness/volume writes must collapse to the newest value,
+with every caller resolving once that value is on the air; non-idempotent
+commands, channel switches included, must never be merged or reordered.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import models
+from divoom_lib.command_coalescer import WriteCoalescer, coalesce_key
+
+BRIGHTNESS = models.COMMANDS["set brightness"]
+LIGHT_MODE = models.COMMANDS["set light mode"]
+
+
+def test_keys_cover_only_declared_commands_and_sub_modes():
+    assert coalesce_key(BRIGHTNESS, [10]) == coalesce_key(BRIGHTNESS, [90])
+    assert coalesce_key(LIGHT_MODE, [0x01, 1, 2]) is None  # switches the channel
+    assert coalesce_key(models.COMMANDS["set design"], [1]) is None
+
+
+async def test_queued_value_is_replaced_and_all_callers_get_the_result():
+    c = WriteCoalescer()
+    gate = asyncio.Event()
+    written = []
+
+    async def send(take):
+        await gate.wait()  # the write slot is busy
+        written.append(take())
+        return True
+
+    key = coalesce_key(BRIGHTNESS, [1])
+    callers = [asyncio.create_task(c.submit(key, [v], send)) for v in (10, 20, 30)]
+    await asyncio.sleep(0)
+    gate.set()
+    assert await asyncio.gather(*callers) == [True, True, True]
+    assert written == [[30]]
+    assert c.stats() == {"submitted": 3, "coalesced": 2, "queued": 0}
+
+
+async def test_value_after_the_write_claimed_the_slot_queues_a_new_write():
+    c = WriteCoalescer()
+    in_flight = asyncio.Event()
+    finish = asyncio.Event()
+    written = []
+
+    async def send(take):
+        written.append(take())
+        in_flight.set()
+        await finish.wait()
+        return True
+
+    key = coalesce_key(BRIGHTNESS, [1])
+    first = asyncio.create_task(c.submit(key, [10], send))
+    await in_flight.wait()
+    second = asyncio.create_task(c.submit(key, [20], send))
+    await asyncio.sleep(0)
+    finish.set()
+    await asyncio.gather(first, second)
+    assert written == [[10], [20]]
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_write():
+    c = WriteCoalescer()
+    gate = asyncio.Event()
+
+    async def send(take):
+        await gate.wait()
+        return take() == [20]
+
+    key = coalesce_key(BRIGHTNESS, [1])
+    first = asyncio.create_task(c.submit(key, [10], send))
+    second = asyncio.create_task(c.submit(key, [20], send))
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+    assert await second is True
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_slider_burst_on_a_connection_writes_only_the_last_value():
+    d = Divoom(models.DivoomConfig(mac="AA:BB:CC:DD:EE:04", device_name="MockDevice",
+                                   use_ios_le_protocol=False))
+    d.client = AsyncMock()
+    d.client.is_connected = True
+    d.pacing.write_gap_s = 0.0
+    written = []
+
+    async def write(_uuid, data, response=False):
+        written.append(bytes(data))
+        await asyncio.sleep(0.01)
+    d.client.write_gatt_char = AsyncMock(side_effect=write)
+    results = await asyncio.gather(*(d.send_command("set brightness", [v]) for v in range(1, 11)),
+                                   d.send_command("set design", [1]))
+    assert all(results)
+    brightness = [w for w in written if w[3:4] == bytes([BRIGHTNESS])]
+    assert len(brightness) == 1 and brightness[0][4] == 10
+    assert len(written) == 2
+    assert d._conn.coalescer.stats()["coalesced"] == 9
+
+
+async def test_interleaved_channel_switches_keep_their_order():
+    d = Divoom(models.DivoomConfig(mac="AA:BB:CC:DD:EE:05", device_name="MockDevice",
+                                   use_ios_le_protocol=False))
+    d.client = AsyncMock()
+    d.client.is_connected = True
+    d.pacing.write_gap_s = 0.0
+    written = []
+
+    async def write(_uuid, data, response=False):
+        written.append(bytes(data))
+        await asyncio.sleep(0.01)  # the write slot stays busy while the others queue
+    d.client.write_gatt_char = AsyncMock(side_effect=write)
+    calls = ([0x00, 1], [0x01, 2], [0x00, 3])  # clock, light, clock
+    assert all(await asyncio.gather(*(d.send_command("set light mode", a) for a in calls)))
+    modes = [list(w[4:6]) for w in written if w[3:4] == bytes([LIGHT_MODE])]
+    assert modes == [list(a) for a in calls]  # the device ends on the clock
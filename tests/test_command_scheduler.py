@@ -0,0 +1,142 @@
+"""Priority scheduling of device writes (divoom_lib.command_scheduler).
+
+The connection's write slot goes to interactive commands first, then normal,
+then bulk; a registered bulk transfer (the 0x8B stream) is preempted between
+packets, and queueing delay is reported per priority.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import models
+from divoom_lib.command_scheduler import CommandScheduler, Priority, priority_for
+from divoom_lib.display.animation import Animation
+
+
+async def _hold(scheduler, priority, order, label, release=None):
+    async with scheduler.slot(priority):
+        order.append(label)
+        if release is not None:
+            await release.wait()
+
+
+async def test_slot_goes_to_highest_priority_then_fifo():
+    s = CommandScheduler()
+    order = []
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(s, Priority.NORMAL, order, "holder", gate))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(_hold(s, p, order, label)) for p, label in (
+        (Priority.BULK, "bulk1"), (Priority.NORMAL, "normal"),
+        (Priority.BULK, "bulk2"), (Priority.INTERACTIVE, "interactive"))]
+    await asyncio.sleep(0)
+    assert s.queued == 4
+    gate.set()
+    await asyncio.gather(holder, *waiters)
+    assert order == ["holder", "interactive", "normal", "bulk1", "bulk2"]
+    stats = s.stats()
+    assert stats["bulk"]["count"] == 2 and stats["interactive"]["count"] == 1
+    assert stats["normal"]["count"] == 2 and stats["queued"] == 0
+
+
+def test_priority_resolution():
+    assert priority_for(models.COMMANDS["set brightness"]) is Priority.INTERACTIVE
+    assert priority_for(models.COMMANDS["set light mode"]) is Priority.NORMAL
+    assert priority_for(models.COMMANDS["set brightness"], Priority.BULK) is Priority.BULK
+
+
+async def test_bulk_context_sets_task_priority_and_counts_preemptions():
+    s = CommandScheduler()
+    async with s.bulk():
+        assert s.bulk_active == 1
+        assert priority_for(models.COMMANDS["set brightness"]) is Priority.BULK
+        async with s.slot(Priority.INTERACTIVE):
+            pass
+    assert priority_for(None) is Priority.NORMAL
+    assert s.bulk_active == 0 and s.preemptions == 1
+
+
+async def test_cancelled_waiter_does_not_wedge_the_slot():
+    s = CommandScheduler()
+    order = []
+    gate = asyncio.Event()
+    holder = asyncio.create_task(_hold(s, Priority.NORMAL, order, "holder", gate))
+    await asyncio.sleep(0)
+    doomed = asyncio.create_task(_hold(s, Priority.INTERACTIVE, order, "doomed"))
+    after = asyncio.create_task(_hold(s, Priority.BULK, order, "after"))
+    await asyncio.sleep(0)
+    doomed.cancel()
+    gate.set()
+    await asyncio.gather(holder, after)
+    assert order == ["holder", "after"]
+    async with s.slot():
+        async with s.slot():  # re-entrant within a task
+            pass
+
+
+@pytest.fixture
+def divoom():
+    d = Divoom(models.DivoomConfig(mac="AA:BB:CC:DD:EE:03", device_name="MockDevice",
+                                   use_ios_le_protocol=False))
+    d.client = AsyncMock()
+    d.client.is_connected = True
+    d.pacing.write_gap_s = 0.0
+    return d
+
+
+async def test_interactive_command_jumps_queued_bulk_packets(divoom):
+    written = []
+
+    async def write(_uuid, data, response=False):
+        written.append(bytes(data))
+        await asyncio.sleep(0.005)
+    divoom.client.write_gatt_char = AsyncMock(side_effect=write)
+    frames = [bytes([0x01, i, 0x02]) for i in range(8)]
+
+    async def bulk_sender(chunk):
+        async with divoom.bulk_transfer():
+            for f in chunk:
+                await divoom.send_frame(f)
+
+    # Two bulk senders keep the slot contended, like pipelined chunk writes.
+    bulk = [asyncio.create_task(bulk_sender(frames[:4])),
+            asyncio.create_task(bulk_sender(frames[4:]))]
+    await asyncio.sleep(0.007)
+    assert await divoom.send_command("set brightness", [42]) is True
+    await asyncio.gather(*bulk)
+    brightness = next(i for i, w in enumerate(written) if w not in frames)
+    assert brightness <= 3  # not after all 8 queued bulk packets
+    stats = divoom.scheduler.stats()
+    assert stats["interactive"]["count"] == 1 and stats["preemptions"] == 1
+    assert stats["bulk"]["count"] == 8
+
+
+async def test_scalar_path_response_waits_are_held_until_the_bulk_transfer_ends(divoom):
+    divoom._conn._active_transport.responses = None  # no correlation table
+    events = []
+    divoom._conn._divoom.send_command = AsyncMock(side_effect=lambda *a, **k: events.append("query"))
+    divoom._conn._divoom._wait_for_response = AsyncMock(return_value=b"\x01")
+    async with divoom.bulk_transfer():
+        query = asyncio.create_task(divoom.send_command_and_wait_for_response("get light mode"))
+        await asyncio.sleep(0.01)
+        events.append("bulk done")
+    assert await query == b"\x01"
+    assert events == ["bulk done", "query"]
+
+
+async def test_8b_stream_registers_as_bulk():
+    scheduler = CommandScheduler()
+    comm = MagicMock()
+    comm.lan = None
+    comm.use_spp = True
+    comm.scheduler = scheduler
+    comm.bulk_transfer = scheduler.bulk
+    seen = []
+    comm.send_command = AsyncMock(side_effect=lambda *a, **k: seen.append(
+        (scheduler.bulk_active, priority_for(None))) or True)
+    with patch("divoom_lib.display.animation.asyncio.sleep", new=AsyncMock()):
+        assert await Animation(comm).stream_animation_8b(bytes(600)) is True
+    assert seen and set(seen) == {(1, Priority.BULK)}
+    assert scheduler.bulk_active == 0
@@ -546,9 +546,12 @@ def test_disconnect_public_delegates(monkeypatch):
 
 
 # ── send_command_and_wait_for_response(): string command + contention log ──
+# These cover the legacy drain/scalar/lock path, taken when the transport has
+# no `responses` correlation table (see test_response_table.py for the other).
 
 def test_send_command_and_wait_for_response_resolves_string_command(monkeypatch):
     conn = _make_conn(monkeypatch)
+    conn._active_transport.responses = None
     name, cmd_id = next(iter(models.COMMANDS.items()))
 
     class _FakeDivoomSend:
@@ -570,6 +573,7 @@ def test_send_command_and_wait_for_response_drains_stale_notification_queue(monk
     """Stale frames left in the notification_queue from a prior exchange must
     be drained before the new wait is set up."""
     conn = _make_conn(monkeypatch)
+    conn._active_transport.responses = None
 
     class _FakeDivoomSend:
         async def send_command(self, command, args, write_with_response=False):
@@ -590,6 +594,7 @@ def test_send_command_and_wait_for_response_drains_stale_notification_queue(monk
 
 def test_send_command_and_wait_for_response_logs_when_lock_contended(monkeypatch, caplog):
     conn = _make_conn(monkeypatch)
+    conn._active_transport.responses = None
 
     class _SlowDivoom:
         async def send_command(self, command, args, write_with_response=False):
@@ -0,0 +1,100 @@
+"""Encode-once fan-out to a device group (divoom_lib.device_group).
+
+Same-size members share one decode + encode and stream the identical blob,
+a LAN member gets its own ``Draw/SendHttpGif`` frames, pushes respect the
+concurrency limit, and one failing device is reported without failing the
+others — for ``show_image`` and the broadcast setters alike.
+"""
+import asyncio
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import device_group as group_mod
+from divoom_lib import display as display_mod
+from divoom_lib.device_group import DeviceGroup
+from divoom_lib.display import Display
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "a.png"
+    Image.new("RGB", (64, 64), (10, 200, 30)).save(path)
+    return str(path)
+
+
+def _member(mac, size=16, lan=None):
+    comm = MagicMock()
+    comm.lan = lan
+    comm.push_state = None
+    comm.logger = logging.getLogger("test_device_group")
+    comm.cfg.screensize = size
+    comm.send_command = AsyncMock(return_value=True)
+    comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+    display = Display(comm)
+    display.blob_cache = None  # prove the group, not the cache, dedups the encode
+    return SimpleNamespace(mac=mac, display=display, lan=lan, comm=comm)
+
+
+async def test_encodes_once_per_class_and_streams_the_same_blob(image):
+    lan = MagicMock(HTTP_GIF_SIZE=64)
+    lan.send_http_gif = AsyncMock(return_value={"frames": 1, "elapsed_s": 0.0})
+    members = [_member(f"AA:0{i}") for i in range(3)]
+    members += [_member("BB:01", size=32), _member("CC:01", lan=lan)]
+    group = DeviceGroup(members)
+    with patch.object(display_mod, "process_image", wraps=display_mod.process_image) as ble, \
+            patch.object(group_mod, "process_image", wraps=group_mod.process_image) as wifi:
+        results = await group.show_image(image)
+    assert results == {m.mac: True for m in members}
+    assert sorted(c.kwargs["size"] for c in ble.call_args_list) == [16, 32]
+    assert [c.kwargs["size"] for c in wifi.call_args_list] == [64]
+
+    blobs = [m.comm.animation.stream_animation_8b.await_args.args[0] for m in members[:4]]
+    assert blobs[0] == blobs[1] == blobs[2] != blobs[3]
+    frames = lan.send_http_gif.await_args.args[0]
+    assert (frames[0][1], frames[0][2]) == (64, 64)
+    assert group.push_result["classes"] == {
+        "ble:16": ["AA:00", "AA:01", "AA:02"], "ble:32": ["BB:01"], "lan:64": ["CC:01"]}
+
+
+async def test_concurrency_limit_and_per_device_failures(image):
+    in_flight, peak = 0, 0
+
+    async def push(*_a, **_k):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return True
+
+    members = [_member(f"AA:0{i}") for i in range(5)]
+    for m in members:
+        m.display.show_image = AsyncMock(side_effect=push)
+    members[3].display.show_image = AsyncMock(side_effect=RuntimeError("link lost"))
+    group = DeviceGroup(members, concurrency=2)
+    results = await group.show_image(image)
+    assert peak == 2
+    assert [mac for mac, ok in results.items() if not ok] == ["AA:03"]
+    assert group.push_result["ok"] is False
+    assert group.push_result["errors"] == {"AA:03": "link lost"}
+    with pytest.raises(ValueError):
+        DeviceGroup(members, concurrency=0)
+
+
+async def test_broadcast_setters_report_per_device():
+    lan = MagicMock(set_brightness=AsyncMock(return_value={"error_code": 0}))
+    wifi = SimpleNamespace(mac="CC:01", lan=lan, device=MagicMock(), display=MagicMock())
+    ble = SimpleNamespace(mac="AA:01", lan=None, device=MagicMock(), display=MagicMock())
+    ble.device.set_brightness = AsyncMock(return_value=True)
+    group = DeviceGroup([wifi, ble])
+    assert await group.set_brightness(40) == {"CC:01": True, "AA:01": True}
+    wifi.device.set_brightness.assert_not_called()
+
+    wifi.display.switch_channel = AsyncMock(return_value=True)
+    ble.display.switch_channel = AsyncMock(side_effect=TimeoutError)
+    assert await group.switch_channel("clock") == {"CC:01": True, "AA:01": False}
@@ -419,6 +419,7 @@ async def test_send_command_success(mock_divoom_instance):
 async def test_send_command_and_wait_for_response_success(mock_divoom_instance):
     """Test send_command_and_wait_for_response method success."""
     divoom = mock_divoom_instance
+    divoom._conn._active_transport.responses = None  # scalar-path wait
     divoom.send_command = AsyncMock(return_value=True)
     divoom._wait_for_response = AsyncMock(return_value=b'response')
 
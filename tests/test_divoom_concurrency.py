@@ -24,9 +24,10 @@ async def test_divoom_write_lock_serializes_calls():
         
     divoom.client.write_gatt_char.side_effect = slow_write
     
-    # Launch two concurrent sends
+    # Launch two concurrent sends (different commands: two queued writes of
+    # the same setter would coalesce into one, see command_coalescer.py)
     task1 = asyncio.create_task(divoom.send_command("set brightness", [50]))
-    task2 = asyncio.create_task(divoom.send_command("set brightness", [80]))
+    task2 = asyncio.create_task(divoom.send_command("set volume", [8]))
     
     await asyncio.gather(task1, task2)
     
@@ -0,0 +1,81 @@
+"""Cross-frame palette reuse (divoom_lib.utils.divoom_image_encode_delta).
+
+The append frames (RR=0x01) are checked against the device-format decoder we
+already trust for hot-channel files, `media_decoder.decode_hot_file_format`:
+every blob must decode back to exactly the source frames.
+"""
+import random
+
+import pytest
+
+from divoom_lib.display.animation_8b import _build_animation_blob
+from divoom_lib.media_decoder import decode_hot_file_format
+from divoom_lib.utils import divoom_image_encode as py
+from divoom_lib.utils import divoom_image_encode_delta as delta
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(delta._np_encode, "AVAILABLE", False)
+    elif not delta._np_encode.AVAILABLE:
+        pytest.skip("numpy not installed")
+    return request.param
+
+
+def _gif_like(n_frames: int, seed: int = 0) -> list:
+    """16x16 frames drawn from a slowly growing shared color set."""
+    rng = random.Random(seed)
+    colors = [bytes((rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+              for _ in range(64)]
+    return [(b"".join(rng.choice(colors[:24 + 3 * i]) for _ in range(256)), 16, 16, 100 + i)
+            for i in range(n_frames)]
+
+
+def _frames_by_flag(blob: bytes) -> list:
+    flags, off = [], 0
+    while off < len(blob):
+        flags.append(blob[off + 5])
+        off += blob[off + 1] | (blob[off + 2] << 8)
+    return flags
+
+
+def test_round_trips_through_hot_file_decoder_and_is_smaller(backend):
+    frames = _gif_like(12)
+    blob = delta.encode_animation_blob(frames)
+    assert decode_hot_file_format(blob, max_frames=100) == [(rgb, t) for rgb, _, _, t in frames]
+    full = b"".join(py.encode_animation_frame(*f) for f in frames)
+    assert len(blob) < len(full)
+    flags = _frames_by_flag(blob)
+    assert flags[0] == 0 and 1 in flags
+
+
+def test_first_frame_is_the_standard_reset_frame(backend):
+    frames = _gif_like(3)
+    first = py.encode_animation_frame(*frames[0])
+    assert delta.encode_animation_blob(frames)[:len(first)] == first
+
+
+def test_palette_overflow_forces_a_reset_frame(backend):
+    a = b"".join(bytes((i, 0, 0)) for i in range(200)) + bytes(3 * 56)
+    b = b"".join(bytes((0, i, 1)) for i in range(200)) + bytes(3 * 56)
+    frames = [(a, 16, 16, 10), (b, 16, 16, 10)]
+    blob = delta.encode_animation_blob(frames)
+    assert _frames_by_flag(blob) == [0, 0]
+    assert decode_hot_file_format(blob) == [(a, 10), (b, 10)]
+
+
+def test_repeated_single_color_frame_omits_pixel_map(backend):
+    red = bytes((255, 0, 0)) * 256
+    blob = delta.encode_animation_blob([(red, 16, 16, 50), (red, 16, 16, 50)])
+    first_len = blob[1] | (blob[2] << 8)
+    second = blob[first_len:]
+    assert second == bytes([0xAA, 7, 0, 50, 0, 1, 0])  # append nothing, no pixels
+    assert decode_hot_file_format(blob) == [(red, 50), (red, 50)]
+
+
+def test_build_animation_blob_is_opt_in():
+    frames = _gif_like(4)
+    assert _build_animation_blob(frames) == \
+        b"".join(py.encode_animation_frame(*f) for f in frames)
+    assert _build_animation_blob(frames, reuse_palette=True) == delta.encode_animation_blob(frames)
@@ -0,0 +1,71 @@
+"""Byte-identity of the NumPy-vectorized encoder backend
+(divoom_lib.utils.divoom_image_encode_np) against the pure-Python encoder.
+
+`test_encoder_both_impls.py` already checks the NumPy backend decodes back to
+the source image; these pin the exact bytes on the large frames the backend
+exists for (64x64, 160x140), first-seen palette order, every bit width, and
+the >256-color error.
+"""
+import random
+
+import pytest
+
+from divoom_lib.utils import divoom_image_encode as py
+
+np_encode = pytest.importorskip("divoom_lib.utils.divoom_image_encode_np")
+if not np_encode.AVAILABLE:
+    pytest.skip("numpy not installed", allow_module_level=True)
+
+
+def _random_rgb(w: int, h: int, num_colors: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    palette = [(rng.randrange(256), rng.randrange(256), rng.randrange(256))
+               for _ in range(num_colors)]
+    return bytes(b for _ in range(w * h) for b in palette[rng.randrange(num_colors)])
+
+
+@pytest.mark.parametrize("w,h,num_colors", [
+    (1, 1, 1), (7, 3, 3), (16, 16, 4), (16, 16, 256),
+    (64, 64, 64), (64, 64, 256), (160, 140, 5), (160, 140, 200),
+])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_frames_byte_identical_to_python(w, h, num_colors, seed):
+    rgb = _random_rgb(w, h, num_colors, seed)
+    assert np_encode.encode_animation_frame(rgb, w, h, 250) == \
+           py.encode_animation_frame(rgb, w, h, 250)
+    assert np_encode.encode_static_image(rgb, w, h) == py.encode_static_image(rgb, w, h)
+
+
+def test_palette_keeps_first_seen_order():
+    # blue, red, green: sorted-key order would be blue, green, red
+    rgb = bytes([0, 0, 255, 255, 0, 0, 0, 255, 0, 255, 0, 0])
+    color_data, pixels, nb_bits = np_encode.build_palette_and_pixels(rgb, 4, 1)
+    assert color_data == bytes([0, 0, 255, 255, 0, 0, 0, 255, 0])
+    assert list(pixels) == [0, 1, 2, 1]
+    assert nb_bits == 2
+
+
+@pytest.mark.parametrize("nb_bits", range(1, 9))
+def test_bit_packing_matches_python_for_every_width(nb_bits):
+    rng = random.Random(nb_bits)
+    pixels = [rng.randrange(1 << nb_bits) for _ in range(101)]  # odd count: partial tail byte
+    assert np_encode.encode_pixels(pixels, nb_bits) == py.encode_pixels(pixels, nb_bits)
+
+
+def test_index_too_wide_for_bit_width_raises():
+    with pytest.raises(ValueError):
+        np_encode.encode_pixels([0, 4], 2)
+
+
+def test_more_than_256_colors_raises_like_python():
+    rgb = bytes(b for i in range(300) for b in (i & 0xFF, i >> 8, 7))
+    with pytest.raises(ValueError) as py_err:
+        py.build_palette_and_pixels(rgb, 300, 1)
+    with pytest.raises(ValueError) as np_err:
+        np_encode.build_palette_and_pixels(rgb, 300, 1)
+    assert str(np_err.value) == str(py_err.value)
+
+
+def test_animation_packets_identical_to_python():
+    frames = [(_random_rgb(32, 32, 40, seed=i), 32, 32, 100) for i in range(5)]
+    assert np_encode.encode_animation(frames) == py._py_encode_animation(frames)
@@ -0,0 +1,110 @@
+"""Color reduction in front of the encoder (divoom_lib.utils.divoom_quantize).
+
+Pins the contract the encoder relies on (output always fits the palette cap,
+small images pass through untouched) and the palette-size search: the chosen
+size is the smallest power of two that meets the PSNR floor.
+"""
+import logging
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from PIL import Image
+
+from divoom_lib.display import Display
+from divoom_lib.utils import divoom_image_encode as py
+from divoom_lib.utils import divoom_quantize as q
+
+
+@pytest.fixture(autouse=True)
+def _needs_numpy():
+    if not q._np_encode.AVAILABLE:
+        pytest.skip("numpy not installed")
+
+
+def _gradient(w: int, h: int) -> bytes:
+    return bytes(v for y in range(h) for x in range(w) for v in (x * 4, y * 4, (x + y) * 2))
+
+
+def _clustered(w: int, h: int, centers: int, seed: int = 0) -> bytes:
+    """``centers`` well-separated colors, each jittered by +-2 per channel."""
+    rng = random.Random(seed)
+    base = [(rng.randrange(8, 248), rng.randrange(8, 248), rng.randrange(8, 248))
+            for _ in range(centers)]
+    return bytes(min(255, max(0, c + rng.randint(-2, 2)))
+                 for _ in range(w * h) for c in rng.choice(base))
+
+
+def test_frames_within_the_cap_pass_through_untouched():
+    frame = (_clustered(16, 16, 4), 16, 16, 100)
+    assert q.reduce_colors([frame])[0] is frame
+
+
+def test_over_256_colors_becomes_encodable():
+    rgb = _gradient(64, 64)
+    assert q.count_colors(rgb) > 256
+    with pytest.raises(ValueError):
+        py.encode_animation_frame(rgb, 64, 64, 100)
+    ((out, w, h, t),) = q.reduce_colors([(rgb, 64, 64, 100)])
+    assert (w, h, t) == (64, 64, 100) and len(out) == len(rgb)
+    assert q.count_colors(out) <= 256
+    assert q.psnr(rgb, out) >= q.DEFAULT_MIN_PSNR
+    py.encode_animation_frame(out, 64, 64, 100)
+
+
+def test_picks_smallest_power_of_two_meeting_the_floor():
+    rgb = _clustered(32, 32, 4)  # hundreds of colors, but four real ones
+    assert q.count_colors(rgb) > 256
+    ((out, *_),) = q.reduce_colors([(rgb, 32, 32, 1)])
+    assert q.count_colors(out) == 4
+    # A floor nothing smaller can reach falls back to the cap.
+    ((strict, *_),) = q.reduce_colors([(rgb, 32, 32, 1)], min_psnr=99.0)
+    assert q.count_colors(strict) == 256
+
+
+def test_minimize_shrinks_frames_already_under_the_cap():
+    rgb = _clustered(16, 16, 8)
+    assert 8 < q.count_colors(rgb) <= 256
+    ((out, *_),) = q.reduce_colors([(rgb, 16, 16, 1)], minimize=True)
+    assert q.count_colors(out) <= 8
+    assert len(py.encode_animation_frame(out, 16, 16, 1)) < \
+        len(py.encode_animation_frame(rgb, 16, 16, 1))
+
+
+def test_minimize_stays_lossless_when_no_smaller_palette_qualifies():
+    frame = (_clustered(16, 16, 40), 16, 16, 1)
+    assert q.reduce_colors([frame], minimize=True, min_psnr=99.0)[0] is frame
+
+
+def test_global_palette_is_shared_by_all_frames():
+    frames = [(_clustered(32, 32, 6, seed=s), 32, 32, 50) for s in range(3)]
+    per_frame = q.reduce_colors(frames)
+    shared = q.reduce_colors(frames, global_palette=True)
+    assert q.count_colors(b"".join(f[0] for f in shared)) <= 256
+    assert q.count_colors(b"".join(f[0] for f in shared)) < \
+        q.count_colors(b"".join(f[0] for f in per_frame))
+
+
+@pytest.mark.parametrize("bad", [0, 1, 257])
+def test_max_colors_out_of_range_raises(bad):
+    with pytest.raises(ValueError):
+        q.reduce_colors([(_gradient(4, 4), 4, 4, 1)], max_colors=bad)
+
+
+def test_without_numpy_falls_back_to_pil_median_cut(monkeypatch):
+    monkeypatch.setattr(q._np_encode, "AVAILABLE", False)
+    ((out, *_),) = q.reduce_colors([(_gradient(32, 32), 32, 32, 1)])
+    assert q.count_colors(out) <= 256
+
+
+async def test_show_image_encodes_photo_on_32x32_device(tmp_path):
+    path = tmp_path / "photo.png"
+    Image.frombytes("RGB", (32, 32), _gradient(32, 32)).save(path)
+    comm = MagicMock()
+    comm.lan = None
+    comm.logger = logging.getLogger("test_divoom_quantize")
+    comm.cfg.screensize = 32
+    comm.send_command = AsyncMock(return_value=True)
+    comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+    assert await Display(comm).show_image(str(path)) is True
+    comm.animation.stream_animation_8b.assert_awaited_once()
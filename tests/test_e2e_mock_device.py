@@ -274,3 +274,32 @@ async def test_watchface_roundtrip_script_e2e(monkeypatch):
     assert success is True
 
 
+
+
+@pytest.mark.asyncio
+async def test_show_image_reuse_palette_streams_decodable_append_frames():
+    """Cross-frame palette reuse end to end: the 0x8B SendingData chunks the
+    mock device receives reassemble into a blob that the hot-file decoder
+    turns back into the GIF's frames, with RR=0x01 append frames in it."""
+    from PIL import Image
+    from divoom_lib.media_decoder import decode_hot_file_format
+    p = Path("/tmp/e2e_reuse_palette.gif")
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+    imgs = []
+    for i in range(3):
+        img = Image.new("RGB", (16, 16), colors[0])
+        for x in range(16):
+            img.putpixel((x, i), colors[1 + (x + i) % 3])
+        imgs.append(img)
+    imgs[0].save(p, save_all=True, append_images=imgs[1:], duration=100, loop=0)
+    dev, mock = await _connected_divoom()
+    assert await dev.display.show_image(str(p), reuse_palette=True) is True
+    full = b"".join(data for _char, data in mock.written)
+    msgs, _ = framing.parse_basic_protocol_frames(bytearray(full))
+    gif_cmd = models.COMMANDS["app new send gif cmd"]
+    data = sorted((int.from_bytes(bytes(m["payload"][5:7]), "little"), bytes(m["payload"][7:]))
+                  for m in msgs if m["command_id"] == gif_cmd and m["payload"][0] == 0x01)
+    blob = b"".join(chunk for _idx, chunk in data)
+    decoded = decode_hot_file_format(blob)
+    assert [rgb for rgb, _t in decoded] == [img.tobytes() for img in imgs]
+    assert blob[5] == 0x00 and 0x01 in blob[blob[1] | (blob[2] << 8):][5:6]
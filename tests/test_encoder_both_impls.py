@@ -1,5 +1,5 @@
-"""Anti-drift correctness suite: run the SAME encoder tests against BOTH the
-pure-Python encoder and the native C encoder.
+"""Anti-drift correctness suite: run the SAME encoder tests against the
+pure-Python encoder, the native C encoder and the NumPy-vectorized encoder.
 
 Why this exists: the earlier native parity test only asserted ``C == Python``.
 When the byte-spanning bit-packing bug existed in *both* implementations they
@@ -16,6 +16,7 @@ from types import SimpleNamespace
 import pytest
 
 from divoom_lib.utils import divoom_image_encode as py
+from divoom_lib.utils import divoom_image_encode_np as vec
 from divoom_lib.native import image_encoder as c
 
 
@@ -31,13 +32,20 @@ _IMPLS = {
         static=c.encode_static_image,
         multiframe=c.encode_animation,
     ),
+    "numpy": SimpleNamespace(
+        frame=vec.encode_animation_frame,
+        static=vec.encode_static_image,
+        multiframe=vec.encode_animation,
+    ),
 }
 
 
-@pytest.fixture(params=["python", "c"])
+@pytest.fixture(params=["python", "c", "numpy"])
 def impl(request):
     if request.param == "c" and not c.is_native_available():
         pytest.skip("native dylib not built — run scripts/build_libdivoom.sh")
+    if request.param == "numpy" and not vec.AVAILABLE:
+        pytest.skip("numpy not installed")
     return _IMPLS[request.param]
 
 
@@ -0,0 +1,121 @@
+"""Incremental RX parser (`divoom_lib.frame_parser.FrameParser`).
+
+The parser replaces per-frame ``del buf[:n]`` compaction on the BLE basic and
+SPP receive paths, so these pin the behaviour the transports rely on: frames
+come out identical to the stateless reference parsers however the stream is
+chunked, corrupt prefixes resync, and between feeds the buffer holds exactly
+the unconsumed tail.
+"""
+import pytest
+
+from divoom_lib import framing
+from divoom_lib import models
+from divoom_lib.frame_parser import (
+    FRAMING_BASIC,
+    FRAMING_IOS_LE,
+    FrameParser,
+    RxFrame,
+)
+
+
+def _basic(payload):
+    return bytes(framing.encode_basic_payload(payload, escape=False))
+
+
+def _ios(payload, packet_number=0):
+    return bytes(framing.encode_ios_le_payload(payload, packet_number=packet_number))
+
+
+def _feed_all(parser, stream, step):
+    out = []
+    for i in range(0, len(stream), step):
+        out.extend(parser.feed(stream[i:i + step]))
+    return out
+
+
+@pytest.mark.parametrize("step", [1, 3, 7, 64, 10_000])
+def test_basic_stream_matches_reference_parser_at_any_chunking(step):
+    stream = b"".join(_basic([0x40 + i, i, 0x01, 0x02, 0x03]) for i in range(20))
+    ref, rest = framing.parse_basic_protocol_frames(bytearray(stream))
+    assert rest == bytearray()
+    parser = FrameParser(ios_le=False)
+    got = _feed_all(parser, stream, step)
+    assert [(f.command_id, bytes(f.payload)) for f in got] == \
+           [(m["command_id"], bytes(m["payload"])) for m in ref]
+    assert all(f.framing == FRAMING_BASIC for f in got)
+    assert parser.buffer == bytearray()
+
+
+@pytest.mark.parametrize("step", [1, 5, 10_000])
+def test_mixed_ios_le_and_basic_stream(step):
+    stream = _ios([0x8B, 1, 2, 3], packet_number=7) + _basic([0x46, 9]) + _ios([0x31])
+    got = _feed_all(FrameParser(keep_raw=True), stream, step)
+    assert [(f.framing, f.command_id, f.payload) for f in got] == [
+        (FRAMING_IOS_LE, 0x8B, b"\x01\x02\x03"),
+        (FRAMING_BASIC, 0x46, b"\x09"),
+        (FRAMING_IOS_LE, 0x31, b""),
+    ]
+    assert got[0].packet_number == 7
+    assert got[0].raw == _ios([0x8B, 1, 2, 3], packet_number=7)
+
+
+def test_partial_frame_is_parked_in_buffer_between_feeds():
+    frame = _basic([0x45, 1, 2])
+    parser = FrameParser(ios_le=False)
+    assert parser.feed(frame[:4]) == []
+    assert parser.buffer == bytearray(frame[:4])
+    assert [f.command_id for f in parser.feed(frame[4:])] == [0x45]
+    assert parser.buffer == bytearray()
+
+
+def test_shared_buffer_is_compacted_in_place():
+    """Transports hand their own bytearray in and keep reading it afterwards."""
+    buf = bytearray()
+    parser = FrameParser(buf, ios_le=False)
+    frame = _basic([0x45, 1])
+    parser.feed(frame + frame[:2])
+    assert parser.buffer is buf
+    assert buf == bytearray(frame[:2])
+
+
+def test_garbage_and_corrupt_length_resync():
+    good = _basic([0x44, 0x55])
+    bogus_len = bytes([models.MESSAGE_START_BYTE, 0xFF, 0xFF, 0xAA, 0xAA, 0xAA, 0xAA])
+    got = FrameParser(ios_le=False).feed(b"\x99\x98" + bogus_len + good)
+    assert [(f.command_id, f.payload) for f in got] == [(0x44, b"\x55")]
+
+
+def test_bad_checksum_frame_is_consumed_not_stalled():
+    bad = bytearray(_basic([0x45, 1, 2]))
+    bad[-2] ^= 0xFF
+    got = FrameParser(ios_le=False).feed(bytes(bad) + _basic([0x46]))
+    assert [f.command_id for f in got] == [0x46]
+
+
+def test_ios_le_corrupt_length_resyncs():
+    hdr = bytes(models.IOS_LE_HEADER) + b"\xFF\xFF" + b"\x00" * 8
+    got = FrameParser().feed(hdr + _ios([0x8B, 4]))
+    assert [(f.command_id, f.payload) for f in got] == [(0x8B, b"\x04")]
+
+
+def test_basic_only_mode_ignores_ios_le_header():
+    got = FrameParser(ios_le=False).feed(_ios([0x8B, 1]))
+    assert all(f.framing == FRAMING_BASIC for f in got)
+
+
+def test_ack_pattern_reports_acked_command():
+    ack = _basic([models.ACK_PATTERN_BYTE_1, 0x45, models.ACK_PATTERN_BYTE_3, 7])
+    ref, _ = framing.parse_basic_protocol_frames(bytearray(ack))
+    (got,) = FrameParser(ios_le=False).feed(ack)
+    assert (got.command_id, bytes(got.payload)) == \
+           (ref[0]["command_id"], bytes(ref[0]["payload"]))
+
+
+def test_rxframe_reads_like_the_legacy_dict():
+    f = RxFrame(0x45, b"\x01", FRAMING_BASIC)
+    assert f["command_id"] == 0x45
+    assert f.get("payload") == b"\x01"
+    assert f.get("missing", "dflt") == "dflt"
+    with pytest.raises(KeyError):
+        f["missing"]
+    assert f == RxFrame(0x45, b"\x01", FRAMING_BASIC)
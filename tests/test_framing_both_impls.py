@@ -109,3 +109,55 @@ def test_ios_le_round_trips(fram, payload, packet_number):
     assert parsed["command_id"] == payload[0]
     assert list(parsed["payload"]) == payload[1:]
     assert parsed["packet_number"] == (packet_number & 0xFF)
+
+
+@pytest.mark.parametrize("payload", _PAYLOADS)
+@pytest.mark.parametrize("wrap", [bytes, bytearray, lambda p: memoryview(bytes(p))])
+def test_bytes_like_payload_frames_identically_to_list(fram, payload, wrap):
+    """Bytes-native send path: a bytes/bytearray/memoryview payload must frame
+    byte-for-byte like the legacy list[int] form, for both protocols."""
+    for escape in (False, True):
+        assert fram.encode_basic_payload(wrap(payload), escape=escape) == \
+               fram.encode_basic_payload(payload, escape=escape)
+    assert fram.encode_ios_le_payload(wrap(payload), packet_number=7) == \
+           fram.encode_ios_le_payload(payload, packet_number=7)
+
+
+def test_ios_le_rejects_empty_bytes_payload(fram):
+    with pytest.raises(ValueError):
+        fram.encode_ios_le_payload(b"")
+
+
+def test_command_payload_keeps_list_shim_and_packs_bytes():
+    """list args keep the historical list payload; bytes-like args become one
+    bytes object (no per-byte int list on the 0x8B hot path)."""
+    assert framing.command_payload(0x45) == [0x45]
+    assert framing.command_payload(0x45, [1, 2]) == [0x45, 1, 2]
+    out = framing.command_payload(0x8B, memoryview(b"\x01\x02\x03")[1:])
+    assert isinstance(out, bytes) and out == b"\x8b\x02\x03"
+
+
+@pytest.mark.parametrize("wire", [framing.WireFraming(),
+                                  framing.WireFraming(escape=True),
+                                  framing.WireFraming(ios_le=True)])
+@pytest.mark.parametrize("size", [1, 255, 256, 257, 1000])
+def test_8b_batch_matches_per_chunk_framing(fram, wire, size):
+    """frame_8b_transfer packet i == framing send_command(0x8B, SendingData i)
+    would produce; the offset table tiles the buffer exactly."""
+    blob = bytes((i * 7 + 1) % 256 for i in range(size))  # includes 0x01/0x02/0x03
+    batch = fram.frame_8b_transfer(blob, 256, wire)
+    assert len(batch) == -(-size // 256)
+    assert batch.offsets[0] == 0 and batch.offsets[-1] == len(batch.buffer)
+    for i, packet in enumerate(batch):
+        payload = (bytes((models.COMMANDS["app new send gif cmd"],
+                          models.ANSGC_CONTROL_SENDING_DATA))
+                   + size.to_bytes(4, "little") + i.to_bytes(2, "little")
+                   + blob[i * 256:(i + 1) * 256])
+        expected = fram.encode_ios_le_payload(payload) if wire.ios_le \
+            else fram.encode_basic_payload(payload, escape=wire.escape)
+        assert bytes(packet) == expected
+
+
+def test_8b_batch_rejects_empty_blob(fram):
+    with pytest.raises(ValueError):
+        fram.frame_8b_transfer(b"")
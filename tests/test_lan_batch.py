@@ -0,0 +1,96 @@
+"""Draw/CommandList batching (divoom_lib.lan_transport_batch).
+
+Setters recorded in ``lan.batch()`` or passed to ``post_batch`` go out as one
+``Draw/CommandList`` POST and come back as one result per command; reads are
+refused, a failed block sends nothing, and a rejected envelope fails the
+whole batch.
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp import web
+
+from divoom_lib.lan_transport import LanTransport, LanTransportError
+
+
+def _lan():
+    lan = LanTransport(device_ip="10.0.0.5")
+    lan.post = AsyncMock(return_value={"error_code": 0})
+    return lan
+
+
+async def test_scene_is_one_command_list_post():
+    lan = _lan()
+    async with lan.batch() as scene:
+        await scene.set_brightness(80)
+        await scene.set_channel(3)
+        await scene.set_clock(182)
+        await scene.set_ambient_light(50, 255, 0, 0)
+        await scene.on_off_screen(1)
+        assert len(scene) == 5 and lan.post.await_count == 0
+    lan.post.assert_awaited_once_with("Draw/CommandList", {"CommandList": [
+        {"Command": "Channel/SetBrightness", "Brightness": 80},
+        {"Command": "Channel/SetIndex", "SelectIndex": 3},
+        {"Command": "Channel/SetClockSelectId", "ClockId": 182},
+        {"Command": "Channel/SetAmbientLight", "Brightness": 50, "Color": "#FF0000", "Power": 1},
+        {"Command": "Channel/OnOffScreen", "OnOff": 1},
+    ]})
+    assert scene.results == [{"error_code": 0}] * 5
+    assert scene.results[0] is not scene.results[1]
+
+
+async def test_post_batch_edge_cases():
+    lan = _lan()
+    assert await lan.post_batch([]) == [] and lan.post.await_count == 0
+    assert await lan.post_batch([("Channel/SetIndex", {"SelectIndex": 2})]) == [{"error_code": 0}]
+    lan.post.assert_awaited_once_with("Channel/SetIndex", {"SelectIndex": 2})  # no envelope
+    with pytest.raises(ValueError, match="read"):
+        await lan.post_batch([("Channel/SetIndex", {"SelectIndex": 2}), ("Channel/GetIndex", None)])
+
+
+async def test_reads_and_failed_blocks_send_nothing():
+    lan = _lan()
+    with pytest.raises(ValueError):
+        async with lan.batch() as scene:
+            await scene.set_brightness(10)
+            await scene.get_channel()
+    with pytest.raises(AttributeError):
+        async with lan.batch() as scene:
+            scene.probe
+    assert lan.post.await_count == 0
+
+
+async def test_one_round_trip_against_a_local_device():
+    posts = []
+
+    async def handle(request):
+        posts.append(await request.json())
+        return web.json_response({"error_code": 0})
+
+    app = web.Application()
+    app.router.add_post("/divoom_api", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    lan = LanTransport(device_ip="127.0.0.1", local_token=7)
+    lan._base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/divoom_api"
+    try:
+        async with lan.batch() as scene:
+            await scene.set_brightness(80)
+            await scene.set_channel(2)
+        assert [p["Command"] for p in posts] == ["Draw/CommandList"]
+        assert posts[0]["LocalToken"] == 7 and len(posts[0]["CommandList"]) == 2
+    finally:
+        await lan.close()
+        await runner.cleanup()
+
+
+async def test_rejected_envelope_fails_the_whole_batch():
+    lan = LanTransport(device_ip="10.0.0.5")
+    lan.post = AsyncMock(side_effect=LanTransportError("device rejected Draw/CommandList: error_code=1"))
+    with pytest.raises(LanTransportError, match="Draw/CommandList"):
+        async with lan.batch() as scene:
+            await scene.set_brightness(80)
+            await scene.set_channel(2)
+    assert scene.results is None
@@ -0,0 +1,171 @@
+"""LAN animation streaming over Draw/SendHttpGif (divoom_lib.lan_transport_gif).
+
+A local aiohttp server plays a Pixoo 64: it hands out PicIDs, assembles
+frames by PicID/PicOffset, and records how many frame POSTs were in flight
+at once. Checked: frames decode back to the source pixels, the PicID
+advances and resets, the in-flight window is respected, ``Display.show_image``
+prefers LAN (decoding off the event loop and skipping unchanged frames until
+the screen changes), and an unreachable device falls back to Bluetooth,
+skipping LAN until the backoff ends or a probe answers.
+"""
+import asyncio
+import base64
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import display as display_mod
+from divoom_lib import lan_transport_gif
+from divoom_lib.display import Display
+from divoom_lib.lan_transport import LanTransport
+from divoom_lib.utils.image_processing import process_image
+
+
+class FakePixoo:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.pic_id = 5
+        self.gifs = {}
+        self.in_flight = self.peak = 0
+        self.commands = []
+
+    async def handle(self, request):
+        body = await request.json()
+        cmd = body["Command"]
+        self.commands.append(cmd)
+        if cmd == "Draw/GetHttpGifId":
+            return web.json_response({"error_code": 0, "PicId": self.pic_id})
+        if cmd == "Draw/ResetHttpGifId":
+            self.pic_id = 1
+            return web.json_response({"error_code": 0})
+        if cmd != "Draw/SendHttpGif":
+            return web.json_response({"error_code": 0})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        gif = self.gifs.setdefault(body["PicID"], {})
+        if body["PicOffset"] and 0 not in gif:
+            return web.json_response({"error_code": 1})  # frame 0 opens the PicID
+        gif[body["PicOffset"]] = (base64.b64decode(body["PicData"]), body["PicSpeed"],
+                                  body["PicNum"], body["PicWidth"])
+        return web.json_response({"error_code": 0})
+
+
+@pytest.fixture
+async def pixoo():
+    server = FakePixoo()
+    app = web.Application()
+    app.router.add_post("/divoom_api", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    server.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/divoom_api"
+    yield server
+    await runner.cleanup()
+
+
+def _lan(server):
+    lan = LanTransport(device_ip="127.0.0.1")
+    lan._base_url = server.url
+    return lan
+
+
+@pytest.fixture
+def gif(tmp_path):
+    path = tmp_path / "anim.gif"
+    frames = [Image.new("RGB", (16, 16), (i * 20, 255 - i * 20, 7)) for i in range(10)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=80, loop=0)
+    return str(path)
+
+
+async def test_frames_are_streamed_windowed_and_decode_to_the_source(pixoo, gif):
+    frames, *_ = process_image(gif, size=64)
+    lan = _lan(pixoo)
+    sent = await lan.send_http_gif(frames, window=3)
+    assert (sent["pic_id"], sent["frames"]) == (6, 10)
+    got = pixoo.gifs[6]
+    assert sorted(got) == list(range(10))
+    assert [got[i][0] for i in range(10)] == [rgb for rgb, *_ in frames]
+    assert {got[i][1:] for i in range(10)} == {(80, 10, 64)}
+    assert pixoo.peak == 3  # pipelined, but never past the window
+    await lan.close()
+
+
+async def test_pic_id_advances_then_resets(pixoo, monkeypatch):
+    monkeypatch.setattr(lan_transport_gif, "HTTP_GIF_ID_LIMIT", 7)
+    frame = [(bytes(64 * 64 * 3), 64, 64, 100)]
+    lan = _lan(pixoo)
+    ids = [(await lan.send_http_gif(frame))["pic_id"] for _ in range(3)]
+    assert ids == [6, 7, 1]
+    assert pixoo.commands.count("Draw/GetHttpGifId") == 1
+    assert pixoo.commands.count("Draw/ResetHttpGifId") == 1
+    with pytest.raises(ValueError):
+        await lan.send_http_gif([(bytes(10), 2, 2, 100)])
+    await lan.close()
+
+
+async def test_show_image_prefers_lan(pixoo, gif):
+    comm = MagicMock()
+    comm.lan = _lan(pixoo)
+    comm.push_state = None
+    display = Display(comm)
+    display.show_design = AsyncMock()
+    assert await display.show_image(gif) is True
+    assert len(pixoo.gifs) == 1 and len(next(iter(pixoo.gifs.values()))) == 10
+    display.show_design.assert_not_awaited()  # no Bluetooth traffic at all
+    await comm.lan.close()
+
+
+async def test_unreachable_lan_falls_back_to_bluetooth_until_a_probe_answers(pixoo, gif):
+    d = Divoom(mac="AA:BB:CC:DD:EE:13", lan_ip="127.0.0.1")
+    d.lan._base_url = "http://127.0.0.1:9/divoom_api"  # nothing listens on discard
+    display = Display(d)
+    display.blob_cache = None
+    display.show_design = AsyncMock()
+    display._push_blob = AsyncMock(return_value=True)
+    assert await display.show_image(gif) is True
+    display._push_blob.assert_awaited_once()
+    assert d.lan.is_reachable is False
+
+    with patch.object(d.lan, "send_http_gif", wraps=d.lan.send_http_gif) as lan_push:
+        assert await display.show_image(gif, force=True) is True  # straight to BLE
+        lan_push.assert_not_called()
+        assert display._push_blob.await_count == 2
+        d.lan._base_url = pixoo.url
+        assert await d.lan.probe() is True and d.lan.is_reachable
+        assert await display.show_image(gif, force=True) is True
+        lan_push.assert_awaited_once()
+    assert display._push_blob.await_count == 2 and len(pixoo.gifs) == 1
+    await d.lan.close()
+
+
+async def test_unchanged_lan_push_is_skipped_until_the_screen_changes(pixoo, gif):
+    d = Divoom(mac="AA:BB:CC:DD:EE:14", lan_ip="127.0.0.1")
+    d.lan._base_url = pixoo.url
+    d.display.show_design = AsyncMock()
+    decoded_on = []
+
+    def decode(*a, **k):
+        decoded_on.append(threading.current_thread())
+        return process_image(*a, **k)
+
+    with patch.object(display_mod, "process_image", side_effect=decode):
+        assert await d.display.show_image(gif) is True
+        assert await d.display.show_image(gif) is True
+        assert len(pixoo.gifs) == 1 and d.push_state.suppressed == 1
+        assert await d.display.show_image(gif, force=True) is True
+        assert len(pixoo.gifs) == 2
+        await d.lan.set_brightness(50)  # not a screen change
+        assert await d.display.show_image(gif) is True
+        assert len(pixoo.gifs) == 2
+        await d.lan.set_channel(3)  # the screen changed behind the digest
+        assert await d.display.show_image(gif) is True
+        assert len(pixoo.gifs) == 3
+    assert threading.main_thread() not in decoded_on
+    await d.lan.close()
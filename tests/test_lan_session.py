@@ -0,0 +1,112 @@
+"""Pooled keep-alive HTTP session for LanTransport (divoom_lib.http_session).
+
+Runs LanTransport against a local aiohttp server standing in for the
+device's ``:9000/divoom_api``: consecutive commands reuse one session and one
+TCP connection, a keep-alive socket the device dropped is retried once,
+``Divoom.disconnect`` closes the pool, and each event loop gets its own
+session.
+"""
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib.http_session import PooledSession
+from divoom_lib.lan_transport import LanTransport
+
+
+class FakePixoo:
+    """``POST /divoom_api`` answering error_code 0, counting TCP connections."""
+
+    def __init__(self):
+        self.connections = set()
+        self.commands = []
+        self.drop_next = False
+
+    async def handle(self, request):
+        body = await request.json()
+        self.commands.append(body["Command"])
+        if self.drop_next:  # close the socket without answering (idle timeout)
+            self.drop_next = False
+            request.transport.close()
+            return web.Response()
+        self.connections.add(id(request.transport))
+        return web.json_response({"error_code": 0})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/divoom_api", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+
+@pytest.fixture
+async def pixoo():
+    server = FakePixoo()
+    server.port = await server.start()
+    yield server
+    await server.runner.cleanup()
+
+
+def _lan(port):
+    lan = LanTransport(device_ip="127.0.0.1")
+    lan._base_url = f"http://127.0.0.1:{port}{LanTransport.PATH}"
+    return lan
+
+
+async def test_commands_share_one_session_and_connection(pixoo):
+    lan = _lan(pixoo.port)
+    for level in (10, 20, 30):
+        assert await lan.set_brightness(level) == {"error_code": 0}
+    assert await lan.set_channel(2) == {"error_code": 0}
+    assert lan._http.created == 1
+    assert len(pixoo.connections) == 1
+    await lan.close()
+    await lan.close()  # idempotent
+    await lan.get_channel()  # usable again after close
+    assert lan._http.created == 2
+    await lan.close()
+
+
+async def test_a_connection_the_device_dropped_is_retried_once(pixoo):
+    lan = _lan(pixoo.port)
+    await lan.set_brightness(10)
+    pixoo.drop_next = True
+    assert await lan.set_brightness(20) == {"error_code": 0}
+    assert pixoo.commands == ["Channel/SetBrightness"] * 3
+    await lan.close()
+
+
+async def test_divoom_disconnect_closes_the_lan_session(pixoo):
+    d = Divoom(mac="AA:BB:CC:DD:EE:12", lan_ip="127.0.0.1")
+    d.lan._base_url = _lan(pixoo.port)._base_url
+    await d.lan.set_brightness(40)
+    session = d.lan._http._session
+    await d.disconnect()
+    assert session.closed and d.lan._http._session is None
+
+
+def test_each_event_loop_gets_its_own_session():
+    made = []
+
+    class Session:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    pool = PooledSession(lambda: made.append(Session()) or made[-1])
+
+    async def use():
+        assert pool.get() is pool.get()
+        return pool.get()
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    assert first is not second and pool.created == 2
+    asyncio.run(pool.close())  # other loop's session: nothing to await here
+    assert pool._session is None
@@ -65,6 +65,10 @@ class _FakeConnectorError(Exception):
     connection_key/os_error pair to construct)."""
 
 
+class _FakeDisconnectedError(Exception):
+    """Stand-in for aiohttp.ServerDisconnectedError (a stale keep-alive socket)."""
+
+
 class _FakeResp:
     def __init__(self, status, text):
         self.status = status
@@ -106,6 +110,7 @@ def _fake_aiohttp(resp=None, raise_exc=None):
     fake.ClientSession.return_value = _FakeSession(resp=resp, raise_exc=raise_exc)
     fake.ClientTimeout = lambda **kw: kw
     fake.ClientConnectorError = _FakeConnectorError
+    fake.ServerDisconnectedError = _FakeDisconnectedError
     return fake
 
 
@@ -2,7 +2,7 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch, ANY
 from divoom_lib.protocol import DivoomProtocol
-from divoom_lib import models
+from divoom_lib import framing, models
 import logging
 
 @pytest.fixture
@@ -178,12 +178,17 @@ async def test_disconnect(mock_protocol_instance):
 async def test_send_command_and_wait_for_response(mock_protocol_instance):
     """Test send_command_and_wait_for_response."""
     protocol = mock_protocol_instance
-    with patch.object(protocol, 'send_command', new_callable=AsyncMock) as mock_send_command, \
+    # The reply is correlated by command id (response_table.py): delivered by
+    # the notification handler, not read back via _wait_for_response.
+    def reply(command, args, write_with_response):
+        protocol.notification_handler(0, bytearray(framing.encode_basic_payload(
+            [models.COMMANDS[command]] + list(b'test'), escape=False)))
+        return True
+    with patch.object(protocol, 'send_command', new_callable=AsyncMock, side_effect=reply) as mock_send_command, \
          patch.object(protocol, '_wait_for_response', new_callable=AsyncMock) as mock_wait_for_response:
-        mock_wait_for_response.return_value = b'test'
         response = await protocol.send_command_and_wait_for_response("set volume", [10])
         mock_send_command.assert_called_once_with("set volume", [10], write_with_response=True)
-        mock_wait_for_response.assert_called_once_with(models.COMMANDS["set volume"], 10)
+        mock_wait_for_response.assert_not_called()
         assert response == b'test'
 
 @pytest.mark.asyncio
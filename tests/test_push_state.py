@@ -0,0 +1,123 @@
+"""Skip-if-unchanged push suppression (divoom_lib.push_state).
+
+`Display.show_image` must skip a push whose encoded blob matches the last
+successful push on the same connection, push anyway with ``force``, and push
+again after anything that may have changed the screen: a reconnect, a
+disconnect, or a display-changing command on the connection.
+"""
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from PIL import Image
+
+import divoom_lib.divoom  # noqa: F401  - import first to resolve the import cycle
+from divoom_lib import models
+from divoom_lib.ble_transport import BLETransport
+from divoom_lib.connection import DivoomConnection
+from divoom_lib.display import Display
+from divoom_lib.push_state import PushState
+
+
+class _FakeClient:
+    is_connected = False
+
+
+class _FakeDivoom:
+    def __init__(self):
+        self.logger = logging.getLogger("test_push_state")
+        self._send_payload = AsyncMock(return_value=True)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    cfg = models.DivoomConfig(
+        mac="AA:BB:CC:DD:EE:FF", client=_FakeClient(),
+        write_characteristic_uuid="w", notify_characteristic_uuid="n",
+        read_characteristic_uuid="r",
+    )
+    monkeypatch.setattr(BLETransport, "connect", AsyncMock())
+    monkeypatch.setattr(BLETransport, "disconnect", AsyncMock())
+    return DivoomConnection(_FakeDivoom(), cfg)
+
+
+@pytest.fixture
+def display(conn):
+    comm = MagicMock()
+    comm.lan = None
+    comm.logger = logging.getLogger("test_push_state")
+    comm.cfg.screensize = 16
+    comm.push_state = conn.push_state
+    comm.send_command = AsyncMock(return_value=True)
+    comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+    return Display(comm)
+
+
+def _image(path, color):
+    Image.new("RGB", (16, 16), color).save(path)
+    return str(path)
+
+
+def test_push_state_records_and_invalidates():
+    state = PushState()
+    d = PushState.digest(b"blob")
+    assert not state.is_current(d)
+    state.record(d)
+    assert state.is_current(d) and not state.is_current(PushState.digest(b"other"))
+    state.invalidate()
+    state.invalidate()  # already clear: not counted twice
+    assert not state.is_current(d)
+    assert state.stats() == {"pushed": 1, "suppressed": 0, "invalidations": 1}
+
+
+async def test_identical_push_is_suppressed_including_channel_switch(display, tmp_path):
+    path = _image(tmp_path / "a.png", (1, 2, 3))
+    assert await display.show_image(path) is True
+    assert await display.show_image(path) is True
+    assert display.communicator.animation.stream_animation_8b.await_count == 1
+    assert display.communicator.send_command.await_count == 1  # one show_design
+    assert display.communicator.push_state.stats() == \
+        {"pushed": 1, "suppressed": 1, "invalidations": 0}
+
+
+async def test_changed_pixels_and_force_push_again(display, tmp_path):
+    path = _image(tmp_path / "a.png", (1, 2, 3))
+    await display.show_image(path)
+    await display.show_image(path, force=True)
+    _image(tmp_path / "a.png", (9, 9, 9))
+    await display.show_image(path)
+    assert display.communicator.animation.stream_animation_8b.await_count == 3
+
+
+async def test_failed_push_is_not_recorded(display, tmp_path):
+    path = _image(tmp_path / "a.png", (1, 2, 3))
+    display.communicator.animation.stream_animation_8b.return_value = False
+    display.communicator.send_command.return_value = False
+    assert await display.show_image(path) is False
+    assert display.communicator.push_state.last_digest is None
+
+
+async def test_reconnect_disconnect_and_channel_switch_invalidate(conn):
+    digest = PushState.digest(b"blob")
+    for event in (conn.connect, conn.disconnect,
+                  lambda: conn.send_command("set light mode", [0x00])):
+        conn.push_state.record(digest)
+        await event()
+        assert not conn.push_state.is_current(digest)
+    conn.push_state.record(digest)
+    await conn.send_command("set brightness", [50])
+    assert conn.push_state.is_current(digest)
+
+
+async def test_mock_communicator_without_push_state_never_suppresses(tmp_path):
+    comm = MagicMock()  # comm.push_state is a MagicMock, not a PushState
+    comm.lan = None
+    comm.logger = logging.getLogger("test_push_state")
+    comm.cfg.screensize = 16
+    comm.send_command = AsyncMock(return_value=True)
+    comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+    d = Display(comm)
+    path = _image(tmp_path / "a.png", (1, 2, 3))
+    await d.show_image(path)
+    await d.show_image(path)
+    assert comm.animation.stream_animation_8b.await_count == 2
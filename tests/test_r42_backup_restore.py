@@ -121,7 +121,8 @@ async def test_wall_split_cache(tmp_path, monkeypatch):
     cache_dir = tmp_path / ".config" / "divoom-control" / "cache_wall"
     assert cache_dir.exists()
 
-    # There should be exactly one png file in the cache directory
-    cached_files = list(cache_dir.glob("*.png"))
+    # Exactly one slot entry, keyed on content + geometry (no MAC in the name)
+    cached_files = list(cache_dir.glob("*.slot"))
     assert len(cached_files) == 1
-    assert cached_files[0].name.endswith("AA_BB_CC_DD_EE_FF.png")
+    assert "AA_BB" not in cached_files[0].name
+    assert (cache_dir / "index.json").exists()
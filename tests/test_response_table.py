@@ -0,0 +1,126 @@
+"""Per-command response correlation (divoom_lib.response_table).
+
+Reads for different command ids must be able to be in flight together, each
+resolved by its own reply, while the listen set (device-driven protocols),
+the generic 0x33 ACK and the notification_queue fallback keep working.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import framing, models
+from divoom_lib.bt_spp_transport import BTSppTransport
+from divoom_lib.response_table import ResponseTable
+
+GET_VOLUME = models.COMMANDS["get volume"]
+GET_LIGHT = models.COMMANDS["get light mode"]
+ACK = models.GENERIC_ACK_COMMAND_ID
+
+
+def _basic(cmd, payload):
+    return bytearray(framing.encode_basic_payload([cmd] + list(payload), escape=False))
+
+
+async def test_deliver_resolves_oldest_waiter_per_command():
+    t = ResponseTable()
+    a, b, c = t.expect(GET_VOLUME), t.expect(GET_VOLUME), t.expect(GET_LIGHT)
+    assert t.deliver(GET_LIGHT, b"L") and t.deliver(GET_VOLUME, b"1")
+    assert (a.result(), c.result(), b.done()) == (b"1", b"L", False)
+    assert t.pending == 1
+    t.discard(GET_VOLUME, b)
+    assert not t.deliver(GET_VOLUME, b"late") and t.pending == 0
+
+
+async def test_generic_ack_is_consumed_only_for_pending_generic_ack_reads():
+    t = ResponseTable()
+    assert not t.deliver(ACK, b"")
+    fut = t.expect(GET_LIGHT)  # 0x46 is answered by a 0x33 ACK, then the data
+    assert t.deliver(ACK, b"") and not fut.done()
+    assert t.deliver(GET_LIGHT, b"data") and fut.result() == b"data"
+
+
+async def test_request_times_out_and_fails_fast_on_send_failure():
+    t = ResponseTable()
+    assert await t.request(GET_VOLUME, AsyncMock(return_value=True), timeout=0.01) is None
+    send = AsyncMock(return_value=False)
+    assert await t.request(GET_VOLUME, send, timeout=5.0) is None
+    assert t.pending == 0
+
+
+@pytest.fixture
+def divoom():
+    d = Divoom(models.DivoomConfig(mac="AA:BB:CC:DD:EE:05", device_name="MockDevice",
+                                   use_ios_le_protocol=False))
+    d.client = AsyncMock()
+    d.client.is_connected = True
+    d.pacing.write_gap_s = 0.0
+    return d
+
+
+async def test_reads_for_different_commands_overlap(divoom):
+    sent = []
+
+    async def write(_uuid, data, response=False):
+        sent.append(bytes(data))
+    divoom.client.write_gatt_char = AsyncMock(side_effect=write)
+    volume = asyncio.create_task(divoom.send_command_and_wait_for_response(GET_VOLUME, timeout=1.0))
+    light = asyncio.create_task(divoom.send_command_and_wait_for_response(GET_LIGHT, timeout=1.0))
+    while len(sent) < 2:
+        await asyncio.sleep(0.001)  # both queries are on the air before any reply
+    divoom.notification_handler(0, _basic(GET_LIGHT, b"\x07" * 20))
+    divoom.notification_handler(0, _basic(GET_VOLUME, b"\x0a"))
+    assert await volume == b"\x0a"
+    assert await light == b"\x07" * 20
+    assert divoom.notification_queue.empty()
+
+
+async def test_listened_and_unrequested_frames_still_reach_the_queue(divoom):
+    table = divoom._conn._active_transport.responses
+    fut = table.expect(models.COMMANDS["app new send gif cmd"])
+    divoom._conn._listen_commands.add(models.COMMANDS["app new send gif cmd"])
+    divoom.notification_handler(0, _basic(models.COMMANDS["app new send gif cmd"], b"\x01\x02\x00"))
+    divoom.notification_handler(0, _basic(GET_LIGHT, b"\x05"))  # nobody asked
+    assert not fut.done()
+    queued = [divoom.notification_queue.get_nowait()["command_id"] for _ in range(2)]
+    assert queued == [models.COMMANDS["app new send gif cmd"], GET_LIGHT]
+
+
+async def test_ios_le_reply_resolves_the_waiter_without_the_scalar(divoom):
+    table = divoom._conn._active_transport.responses
+    fut = table.expect(GET_VOLUME)
+    divoom.notification_handler(0, bytearray(framing.encode_ios_le_payload([GET_VOLUME, 0x09])))
+    assert fut.result() == b"\x09"
+    assert divoom._expected_response_command is None
+
+
+async def test_spp_rx_loop_feeds_the_table():
+    t = BTSppTransport("AA:BB:CC:DD:EE:06")
+    assert t.responses is None  # no RX loop: waits use the notification queue
+    frames = [{"command_id": GET_VOLUME, "payload": b"\x03"},
+              {"command_id": GET_LIGHT, "payload": b"\x04"}]
+
+    async def read_notification(timeout=1.0):
+        if frames:
+            return frames.pop(0)
+        await asyncio.sleep(timeout)
+        raise asyncio.TimeoutError
+    t.read_notification = read_notification
+    with patch.object(BTSppTransport, "is_connected", new=property(lambda self: True)):
+        fut = t._responses.expect(GET_VOLUME)
+        t._rx_task = asyncio.create_task(t._rx_loop())
+        assert t.responses is t._responses
+        assert await asyncio.wait_for(fut, 1.0) == b"\x03"
+        assert (await asyncio.wait_for(t.notification_queue.get(), 1.0))["command_id"] == GET_LIGHT
+        t._rx_task.cancel()
+
+
+async def test_correlated_read_is_not_held_by_a_bulk_transfer(divoom):
+    async def write(_uuid, data, response=False):
+        if data[3] == GET_VOLUME:
+            divoom.notification_handler(0, _basic(GET_VOLUME, b"\x02"))
+    divoom.client.write_gatt_char = AsyncMock(side_effect=write)
+    async with divoom.bulk_transfer():
+        assert await asyncio.wait_for(
+            divoom.send_command_and_wait_for_response(GET_VOLUME, timeout=1.0), 0.5) == b"\x02"
@@ -9,6 +9,13 @@ import pytest
 from divoom_lib.divoom import Divoom
 from divoom_lib.exceptions import DeviceConnectionError
 
+
+@pytest.fixture(autouse=True)
+def _iobluetooth_backend(monkeypatch):
+    # These tests patch BTSppTransport; on a Linux host with kernel RFCOMM the
+    # router would pick the socket backend (bt_spp_socket) instead.
+    monkeypatch.setattr("divoom_lib.bt_spp_socket.available", lambda: False)
+
 @pytest.mark.asyncio
 async def test_spp_not_routed_for_unknown_protocol():
     """SPP routing does NOT fire when use_ios_le_protocol=None (unknown).
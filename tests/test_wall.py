@@ -67,7 +67,7 @@ class TestDivoomWall(unittest.IsolatedAsyncioTestCase):
             mc.disconnect.assert_called_once()
 
     @patch('divoom_lib.wall.Divoom', new_callable=MagicMock)
-    @patch('divoom_lib.wall.Image.open')
+    @patch('divoom_lib.wall_split.Image.open')
     async def test_wall_show_image(self, mock_image_open, mock_divoom_class):
         """Test DivoomWall splitting and cropping logic for show_image."""
         # Mock main image
@@ -113,8 +113,8 @@ class TestDivoomWall(unittest.IsolatedAsyncioTestCase):
                 mc.display.show_image.assert_called_once()
 
     @patch('divoom_lib.wall.Divoom', new_callable=MagicMock)
-    @patch('divoom_lib.wall.ImageSequence.Iterator')
-    @patch('divoom_lib.wall.Image.open')
+    @patch('divoom_lib.wall_split.ImageSequence.Iterator')
+    @patch('divoom_lib.wall_split.Image.open')
     async def test_wall_show_image_zero_frames_reports_failure(
         self, mock_image_open, mock_iter, mock_divoom_class
     ):
@@ -258,7 +258,7 @@ class TestDivoomWall(unittest.IsolatedAsyncioTestCase):
             mc.lan.set_brightness.assert_called_once_with(42)
 
     @patch('divoom_lib.wall.Divoom', new_callable=MagicMock)
-    @patch('divoom_lib.wall.Image.open')
+    @patch('divoom_lib.wall_split.Image.open')
     async def test_wall_show_image_partial_slot_failure(self, mock_image_open, mock_divoom_class):
         """A slot whose show_image returns False (not an exception) must flip
         all_ok to False (the `elif not res` branch)."""
@@ -346,7 +346,7 @@ class TestDivoomWallFreeForm(unittest.IsolatedAsyncioTestCase):
         ]
 
     @patch('divoom_lib.wall.Divoom', new_callable=MagicMock)
-    @patch('divoom_lib.wall.Image.open')
+    @patch('divoom_lib.wall_split.Image.open')
     async def test_free_form_static_image_crop_and_resize(self, mock_image_open, mock_divoom_class):
         mock_img = MagicMock(spec=Image.Image)
         mock_img.is_animated = False
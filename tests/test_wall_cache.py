@@ -0,0 +1,165 @@
+"""Bounded, indexed wall split cache (divoom_lib.wall_cache).
+
+Entries round-trip a slot's frames and preview, eviction is least-recently
+used under both the entry and the byte budget, the index survives a restart
+(and is rebuilt when corrupt) and is written once per flush, not for hits
+alone, caches sharing a directory keep each other's entries, and a wall
+re-push of the same content hits for every slot — even after a panel was
+swapped — without splitting again.
+"""
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import wall as wall_mod
+from divoom_lib import wall_cache as wall_cache_mod
+from divoom_lib.wall import DivoomWall
+from divoom_lib.wall_cache import WallCache, slot_key
+from divoom_lib.wall_split import SlotSplit
+
+
+def _part(n=1, fill=7, preview=b"\x89PNG"):
+    return SlotSplit([(bytes([fill]) * 768, 16, 16, 100 + i) for i in range(n)], preview)
+
+
+def test_entries_round_trip_and_lru_evicts_by_count(tmp_path):
+    cache = WallCache(tmp_path, max_entries=2)
+    cache.put("a", _part(2, 1))
+    cache.put("b", _part(1, 2, None))
+    assert cache.get("a") == _part(2, 1)  # a is now most recent
+    cache.put("c", _part())
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert sorted(p.stem for p in tmp_path.glob("*.slot")) == ["a", "c"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (2, 1, 1, 2)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_byte_budget_and_persistent_lru_order(tmp_path):
+    size = len(json.dumps({"frames": [[16, 16, 100, 768]], "preview": 4})) + 1 + 768 + 4
+    cache = WallCache(tmp_path, max_bytes=3 * size)
+    for key in "abc":
+        cache.put(key, _part())
+    cache.get("a")
+    cache.flush()
+    reopened = WallCache(tmp_path, max_bytes=3 * size)
+    reopened.put("d", _part())
+    assert reopened.stats()["evictions"] == 1 and reopened.get("b") is None
+    assert reopened.stats()["bytes"] == 3 * size
+
+
+def test_corrupt_index_is_rebuilt_and_bad_entries_dropped(tmp_path):
+    cache = WallCache(tmp_path)
+    cache.put("a", _part())
+    cache.put("b", _part())
+    (tmp_path / "index.json").write_text("{not json")
+    (tmp_path / "b.slot").write_bytes(b'{"frames": [[16, 16, 100, 768]], "preview": 0}\nshort')
+    rebuilt = WallCache(tmp_path)
+    assert rebuilt.get("a") == _part()
+    assert rebuilt.get("b") is None and not (tmp_path / "b.slot").exists()
+    assert json.loads((tmp_path / "index.json").read_text())["entries"][0][0] == "a"
+
+
+def test_index_is_written_per_flush_and_not_for_hits_alone(tmp_path):
+    cache = WallCache(tmp_path)
+    with patch.object(wall_cache_mod, "atomic_write_text") as write_index:
+        for key in "abc":
+            cache.put(key, _part())
+        assert write_index.call_count == 0
+        cache.flush()
+        assert write_index.call_count == 1
+        cache.get("a")
+        cache.flush()  # an LRU reorder alone waits for ORDER_FLUSH_S or close
+        assert write_index.call_count == 1
+        cache.close()
+        assert write_index.call_count == 2
+        assert [k for k, _ in json.loads(write_index.call_args.args[1])["entries"]] == \
+            ["b", "c", "a"]
+
+
+def test_caches_sharing_a_directory_keep_each_others_entries(tmp_path):
+    first, second = WallCache(tmp_path), WallCache(tmp_path)
+    first.put("a", _part(fill=1))
+    third = WallCache(tmp_path)  # loads before first flushed its index
+    assert (tmp_path / "a.slot").exists() and third.get("a") == _part(fill=1)
+    first.flush()
+    second.put("b", _part(fill=2))
+    second.flush()
+    entries = [k for k, _ in json.loads((tmp_path / "index.json").read_text())["entries"]]
+    assert sorted(entries) == ["a", "b"]
+    reopened = WallCache(tmp_path)
+    assert reopened.get("a") == _part(fill=1) and reopened.get("b") == _part(fill=2)
+
+
+def test_key_is_content_timing_and_geometry_only():
+    box = (0, 0, 16, 16)
+    key = slot_key("abc", (32, 16), box, 16, False, None)
+    assert len({key, slot_key("abd", (32, 16), box, 16, False, None),
+                slot_key("abc", (32, 16), (16, 0, 32, 16), 16, False, None),
+                slot_key("abc", (32, 16), box, 32, False, None),
+                slot_key("abc", (32, 16), box, 16, False, 200),
+                slot_key("abc", (32, 32), box, 16, False, None),
+                slot_key("abc", (32, 16), box, 16, True, None)}) == 7
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    path = tmp_path / "art.png"
+    Image.new("RGB", (32, 16), (9, 99, 199)).save(path)
+    return str(path)
+
+
+def _wall(macs, cols=2):
+    configs = [{"mac": mac, "x": i % cols, "y": i // cols, "size": 16}
+               for i, mac in enumerate(macs)]
+    with patch.object(wall_mod, "Divoom", new_callable=MagicMock) as divoom:
+        divoom.side_effect = [MagicMock(mac=mac, is_alive=True) for mac in macs]
+        return DivoomWall(configs)
+
+
+async def test_repush_and_swapped_panel_hit_without_splitting(home, monkeypatch):
+    wall = _wall(["AA:01", "AA:02"])
+    for slot in wall.devices:
+        slot.device.display.show_image = AsyncMock(return_value=True)
+    assert await wall.show_image(home, sync=False) is True
+    first = [s.device.display.show_image.call_args.args[0] for s in wall.devices]
+
+    def no_split(*_a, **_k):
+        raise AssertionError("cache hit must not split")
+
+    monkeypatch.setattr(wall_mod, "split_asset", no_split)
+    swapped = _wall(["AA:01", "BB:09"])
+    for slot in swapped.devices:
+        slot.device.display.show_image = AsyncMock(return_value=True)
+    assert await swapped.show_image(home, sync=False) is True
+    assert [s.device.display.show_image.call_args.args[0] for s in swapped.devices] == first
+    assert swapped.cache.stats()["hits"] == 2
+    assert swapped.last_previews["BB:09"].startswith(b"\x89PNG")
+
+
+async def test_walls_of_another_shape_never_share_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    path = tmp_path / "halves.png"
+    img = Image.new("RGB", (32, 32), (255, 0, 0))
+    img.paste((0, 0, 255), (0, 16, 32, 32))
+    img.save(path)
+    square_macs = ["BB:01", "BB:02", "BB:03", "BB:04"]
+    wide = _wall(["AA:01", "AA:02"])
+    _wall(square_macs)  # the geometry purge runs here, before the wide wall's push
+    for slot in wide.devices:
+        slot.device.display.show_image = AsyncMock(return_value=True)
+    assert await wide.show_image(str(path), sync=False) is True
+    square = _wall(square_macs)  # unchanged geometry: no purge, loads wide's index
+    for slot in square.devices:
+        slot.device.display.show_image = AsyncMock(return_value=True)
+    assert await square.show_image(str(path), sync=False) is True
+    wide_tl = wide.devices[0].device.display.show_image.call_args.args[0][0][0]
+    square_tl = square.devices[0].device.display.show_image.call_args.args[0][0][0]
+    assert wide_tl[-3:] == b"\x00\x00\xff"  # the 32x16 canvas squeezes blue into (0, 0)
+    assert square_tl[-3:] == b"\xff\x00\x00"
+    assert square.cache.stats()["hits"] == 0
@@ -0,0 +1,100 @@
+"""Tile-diff live canvas updates (divoom_lib.wall_canvas).
+
+A 2x2 wall of 16x16 panels redrawn tick by tick: only the panels whose tile
+changed are pushed (concurrently), the stats count skipped tiles and the
+bytes they saved, a failed tile is retried next tick, and a full
+``show_image``, any other wall display call, or anything that touches a
+panel's screen behind the wall's back makes the affected tiles re-push.
+"""
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import wall as wall_mod
+from divoom_lib.push_state import PushState
+from divoom_lib.wall import DivoomWall
+
+CONFIGS = [{"mac": f"AA:0{i}", "x": i % 2, "y": i // 2, "size": 16} for i in range(4)]
+
+
+@pytest.fixture
+def wall(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    with patch.object(wall_mod, "Divoom", new_callable=MagicMock) as divoom:
+        divoom.side_effect = [MagicMock(mac=c["mac"], is_alive=True) for c in CONFIGS]
+        wall = DivoomWall(CONFIGS)
+    for slot in wall.devices:
+        slot.device.display.show_image = AsyncMock(return_value=True)
+    return wall
+
+
+def _pushes(wall):
+    return [slot.device.display.show_image.await_count for slot in wall.devices]
+
+
+async def test_only_changed_tiles_are_pushed(wall):
+    canvas = np.zeros((32, 32, 3), dtype=np.uint8)
+    first = await wall.update_canvas(canvas)
+    assert (first["pushed"], first["skipped"], first["bytes_saved"]) == (4, 0, 0)
+
+    same = await wall.update_canvas(Image.fromarray(canvas))
+    assert (same["pushed"], same["skipped"], same["bytes_saved"]) == (0, 4, 4 * 16 * 16 * 3)
+    assert _pushes(wall) == [1, 1, 1, 1]
+
+    canvas[20:24, 18:22] = (255, 0, 0)  # inside the bottom-right tile only
+    tick = await wall.update_canvas(canvas, time=250)
+    assert (tick["pushed"], tick["skipped"]) == (1, 3)
+    assert _pushes(wall) == [1, 1, 1, 2]
+    frames = wall.devices[3].device.display.show_image.await_args.args[0]
+    rgb, w, h, duration = frames[0]
+    assert (w, h, duration) == (16, 16, 250)
+    assert rgb[(4 * 16 + 2) * 3:(4 * 16 + 2) * 3 + 3] == b"\xff\x00\x00"
+    assert wall.canvas_totals == {"ticks": 3, "pushed": 5, "skipped": 7, "failed": 0,
+                                  "bytes_saved": 7 * 768}
+
+
+async def test_failed_tile_is_retried_and_show_image_resets(wall, tmp_path):
+    wall.devices[1].device.display.show_image = AsyncMock(side_effect=[False, True, True, True])
+    canvas = np.full((32, 32, 3), 40, dtype=np.uint8)
+    assert (await wall.update_canvas(canvas))["failed"] == 1
+    retry = await wall.update_canvas(canvas)
+    assert (retry["pushed"], retry["skipped"], retry["failed"]) == (1, 3, 0)
+
+    png = tmp_path / "full.png"
+    Image.new("RGB", (32, 32), (1, 2, 3)).save(png)
+    assert await wall.show_image(str(png)) is True
+    assert (await wall.update_canvas(canvas))["pushed"] == 4
+
+
+async def test_changed_panels_push_concurrently(wall):
+    async def slow(*_a, **_k):
+        await asyncio.sleep(0.1)
+        return True
+
+    for slot in wall.devices:
+        slot.device.display.show_image = AsyncMock(side_effect=slow)
+    stats = await wall.update_canvas(np.zeros((32, 32, 3), dtype=np.uint8))
+    assert stats["pushed"] == 4 and stats["elapsed_s"] < 0.3
+    assert stats["skew_s"] is None  # the fakes never hold a final packet
+
+
+async def test_screen_changes_elsewhere_make_tiles_repush(wall):
+    canvas = np.zeros((32, 32, 3), dtype=np.uint8)
+    await wall.update_canvas(canvas)
+    for slot in wall.devices:
+        slot.device.display.show_clock = AsyncMock(return_value=True)
+    assert await wall.show_clock(0) is True
+    assert (await wall.update_canvas(canvas))["pushed"] == 4  # the dashboard comes back
+
+    for slot in wall.devices:
+        slot.device.push_state = PushState()
+    await wall.update_canvas(canvas, force=True)
+    wall.devices[2].device.push_state.invalidate()  # a reconnect / channel switch on one panel
+    tick = await wall.update_canvas(canvas)
+    assert (tick["pushed"], tick["skipped"]) == (1, 3)
+    assert _pushes(wall) == [3, 3, 4, 3]
@@ -107,11 +107,23 @@ def test_geometry_changed_when_hash_differs(mock_divoom, tmp_path, monkeypatch):
     survivor = cache_dir / "old_split.png"
     survivor.write_bytes(b"old")
 
-    # Different config (different mac) -> different hash -> purge triggers.
-    DivoomWall([{"mac": "BB:02", "x": 0, "y": 0, "size": 16}])
+    # Different layout (panel size) -> different hash -> purge triggers.
+    DivoomWall([{"mac": "AA:01", "x": 0, "y": 0, "size": 32}])
     assert not survivor.exists()
 
 
+@patch("divoom_lib.wall.Divoom", new_callable=MagicMock)
+def test_swapping_a_panel_keeps_the_cache(mock_divoom, tmp_path, monkeypatch):
+    """Cache keys carry no MAC, so the geometry hash ignores it too: replacing
+    a panel in the same layout must not purge the cache."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    DivoomWall([{"mac": "AA:01", "x": 0, "y": 0, "size": 16}])
+    survivor = _cache_dir(tmp_path) / "keep_me.png"
+    survivor.write_bytes(b"keep")
+    DivoomWall([{"mac": "BB:02", "x": 0, "y": 0, "size": 16}])
+    assert survivor.exists()
+
+
 @patch("divoom_lib.wall.Divoom", new_callable=MagicMock)
 def test_unreadable_geometry_file_treated_as_changed(mock_divoom, tmp_path, monkeypatch):
     """If last_geometry.txt exists but read_text() raises (corrupted / a
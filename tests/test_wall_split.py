@@ -0,0 +1,108 @@
+"""Off-loop, in-memory wall split (divoom_lib.wall_split) and the panel hand-off.
+
+A 2x2 wall of 16x16 panels is fed a real 32x32 GIF: every slot must get its
+quadrant as `process_image`-layout frames (pixels and durations intact), the
+split must run off the event loop, panels get frames rather than file paths,
+and ``cache_wall`` is only written when the preview cache is on. A panel's
+`Display.show_image` must encode those frames exactly as it would the file.
+"""
+import logging
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import wall as wall_mod
+from divoom_lib.display import Display
+from divoom_lib.utils.blob_cache import BlobCache
+from divoom_lib.utils.image_processing import process_image
+from divoom_lib.wall import DivoomWall
+from divoom_lib.wall_split import split_asset
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+CONFIGS = [{"mac": f"AA:BB:CC:DD:EE:0{i}", "x": i % 2, "y": i // 2, "size": 16} for i in range(4)]
+
+
+@pytest.fixture
+def gif(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    frames = []
+    for shift in range(3):
+        img = Image.new("RGB", (32, 32))
+        for q in range(4):
+            x, y = (q % 2) * 16, (q // 2) * 16
+            img.paste(COLORS[(q + shift) % 4], (x, y, x + 16, y + 16))
+        frames.append(img)
+    path = tmp_path / "quad.gif"
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=[70, 80, 90], loop=0)
+    return str(path)
+
+
+def _wall(**kw):
+    with patch.object(wall_mod, "Divoom", new_callable=MagicMock) as divoom:
+        panels = []
+        for cfg in CONFIGS:
+            panel = MagicMock(mac=cfg["mac"], is_alive=True)
+            panel.display.show_image = AsyncMock(return_value=True)
+            panels.append(panel)
+        divoom.side_effect = panels
+        return DivoomWall(CONFIGS, **kw), panels
+
+
+def test_split_asset_cuts_each_quadrant_with_its_durations(gif):
+    boxes = [(0, 0, 16, 16), (16, 0, 32, 16), (0, 16, 16, 32), (16, 16, 32, 32)]
+    split = split_asset(gif, (32, 32), boxes, [16] * 4, free_form=False, previews=True)
+    assert split.is_animated and len(split.slots) == 4
+    for q, part in enumerate(split.slots):
+        assert [(w, h, d) for _rgb, w, h, d in part.frames] == [(16, 16, 70), (16, 16, 80), (16, 16, 90)]
+        for shift, (rgb, *_rest) in enumerate(part.frames):
+            assert rgb == bytes(COLORS[(q + shift) % 4]) * 256
+        assert part.preview.startswith(b"GIF8")
+
+
+async def test_wall_splits_off_loop_and_hands_panels_frames(gif, monkeypatch):
+    wall, panels = _wall()
+    threads = []
+
+    def spy(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return split_asset(*args, **kwargs)
+
+    monkeypatch.setattr(wall_mod, "split_asset", spy)
+    assert await wall.show_image(gif, time=50) is True
+    assert threads and threads[0] != threading.get_ident()
+    for q, panel in enumerate(panels):
+        frames = panel.display.show_image.await_args.args[0]
+        assert isinstance(frames, list) and frames[0][0] == bytes(COLORS[q]) * 256
+        assert wall.last_previews[panel.mac].startswith(b"GIF8")
+    assert wall.cache.stats()["entries"] == 4
+
+
+async def test_preview_cache_off_leaves_cache_wall_alone(gif):
+    wall, _panels = _wall(preview_cache=False)
+    assert await wall.show_image(gif) is True
+    assert wall.cache is None
+    assert [p.name for p in wall.cache_dir.iterdir()] == ["last_geometry.txt"]
+    assert len(wall.last_previews) == 4
+
+
+async def test_display_encodes_frames_like_the_file(tmp_path):
+    path = tmp_path / "a.gif"
+    src = [Image.new("RGB", (16, 16), c) for c in COLORS]
+    src[0].save(path, save_all=True, append_images=src[1:], duration=120, loop=0)
+    frames, *_ = process_image(str(path), size=16)
+    blobs = []
+    for source in (str(path), frames):
+        comm = MagicMock(lan=None, push_state=None, logger=logging.getLogger("test_wall_split"))
+        comm.cfg.screensize = 16
+        comm.send_command = AsyncMock(return_value=True)
+        comm.animation.stream_animation_8b = AsyncMock(return_value=True)
+        display = Display(comm)
+        display.blob_cache = BlobCache()
+        assert await display.show_image(source) is True
+        blobs.append(comm.animation.stream_animation_8b.await_args.args[0])
+    assert blobs[0] == blobs[1]
+    assert BlobCache.key_for_frames(frames, 16) != BlobCache.key_for_frames(frames, 32)
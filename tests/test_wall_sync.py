@@ -0,0 +1,163 @@
+"""Two-phase, barrier-released wall commits (divoom_lib.wall_sync).
+
+Panels upload at different speeds; with the commit barrier their final
+packets go out together and ``push_result`` reports the (small) skew, while
+an unsynchronized push commits as each upload finishes. The streamers hold
+exactly the packet that starts playback; failed slots and adapter stream
+limits never stall the barrier; a straggler only costs the hold timeout.
+More panels than an adapter's stream slots upload interleaved and still
+commit together, each holding its slot only for the retransmit window.
+"""
+import asyncio
+import time as clock
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from divoom_lib.divoom import Divoom  # noqa: I001  - import first to resolve the import cycle
+from divoom_lib import wall as wall_mod
+from divoom_lib.display.animation import Animation
+from divoom_lib.lan_transport import LanTransport
+from divoom_lib.models import DeviceSlot
+from divoom_lib.wall import DivoomWall
+from divoom_lib.wall_sync import CommitBarrier
+
+
+class _Panel:
+    """A wall panel whose upload takes ``upload_s``; the final packet is instant."""
+
+    def __init__(self, mac, upload_s, fail=False):
+        self.mac, self.upload_s, self.fail = mac, upload_s, fail
+        self.is_alive = True
+        self.display = self
+        self.committed_at = None
+
+    async def show_image(self, frames, time=None, sync=None):
+        await asyncio.sleep(self.upload_s)
+        if self.fail:
+            raise RuntimeError("upload failed")
+        if sync is not None:
+            await sync.hold()
+        self.committed_at = clock.monotonic()
+        if sync is not None:
+            sync.committed()
+        return True
+
+
+@pytest.fixture
+def png(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    path = tmp_path / "x.png"
+    Image.new("RGB", (64, 16), (1, 2, 3)).save(path)
+    return str(path)
+
+
+def _wall(panels, **kw):
+    configs = [{"mac": p.mac, "x": i, "y": 0, "size": 16} for i, p in enumerate(panels)]
+    with patch.object(wall_mod, "Divoom", new_callable=MagicMock):
+        wall = DivoomWall(configs, preview_cache=False, **kw)
+    wall.devices = [DeviceSlot(device=p, x=i, y=0, size=16) for i, p in enumerate(panels)]
+    return wall
+
+
+async def test_barrier_aligns_commits_across_uneven_uploads(png):
+    panels = [_Panel(f"AA:{i}", s) for i, s in enumerate((0.0, 0.1, 0.2, 0.05))]
+    wall = _wall(panels)
+    assert await wall.show_image(png) is True
+    result = wall.push_result
+    assert result["ok"] is True and result["timed_out"] is False
+    assert set(result["slots"]) == {p.mac for p in panels}
+    assert result["skew_s"] < 0.05
+
+    assert await wall.show_image(png, sync=False) is True
+    spread = max(p.committed_at for p in panels) - min(p.committed_at for p in panels)
+    assert spread > 0.15 and "skew_s" not in wall.push_result
+
+
+async def test_failed_slot_leaves_and_adapter_limits_do_not_stall(png):
+    panels = [_Panel(f"AA:{i}", 0.02 * i, fail=(i == 1)) for i in range(5)]
+    wall = _wall(panels, adapters=["hci0"])  # 2 stream slots for 5 panels
+    assert await wall.show_image(png) is False
+    assert wall.push_result["timed_out"] is False
+    assert set(wall.push_result["slots"]) == {"AA:0", "AA:2", "AA:3", "AA:4"}
+
+
+class _StreamingPanel(_Panel):
+    """Uploads ``chunks`` packets taking turns on the adapter, then serves a
+    retransmit window with its stream slot taken back; records peak uploads."""
+
+    active = peak = 0
+
+    def __init__(self, mac, chunks, window_s):
+        super().__init__(mac, 0.0)
+        self.chunks, self.window_s = chunks, window_s
+
+    async def show_image(self, frames, time=None, sync=None):
+        for _ in range(self.chunks):
+            await sync.turn()
+            _StreamingPanel.active += 1
+            _StreamingPanel.peak = max(_StreamingPanel.peak, _StreamingPanel.active)
+            await asyncio.sleep(0.02)
+            _StreamingPanel.active -= 1
+        await sync.hold()
+        sync.committed()
+        await sync.resume()
+        await asyncio.sleep(self.window_s)
+        return True
+
+
+async def test_more_panels_than_stream_slots_commit_together(png):
+    # 6 panels on one adapter with 2 stream slots: uploaded in waves, the first
+    # pair would park for two uploads (1.6 s, past the hold timeout) and the
+    # retransmit windows would hand the commits out a pair at a time.
+    panels = [_StreamingPanel(f"AA:{i}", chunks=40, window_s=0.2) for i in range(6)]
+    wall = _wall(panels, adapters=["hci0"])
+    assert await wall.show_image(png) is True
+    result = wall.push_result
+    assert result["timed_out"] is False and len(result["slots"]) == 6
+    assert result["skew_s"] < 0.05
+    assert _StreamingPanel.peak == 2
+
+
+async def test_straggler_only_costs_the_hold_timeout():
+    barrier = CommitBarrier(2, timeout=0.05)
+    ready, straggler = barrier.slot("a"), barrier.slot("b")
+    started = clock.monotonic()
+    await ready.hold()
+    ready.committed()
+    assert 0.04 < clock.monotonic() - started < 0.5 and barrier.timed_out
+    straggler.leave()
+    assert barrier.result()["slots"] == {"a": 0.0}
+
+
+async def test_8b_stream_holds_only_the_final_chunk():
+    comm = MagicMock(lan=None, use_spp=False, logger=MagicMock())
+    comm.send_command = AsyncMock(return_value=True)
+    comm.wait_for_response = AsyncMock(return_value=None)
+    anim = Animation(comm)
+    sync = MagicMock(committed=MagicMock(), turn=AsyncMock(), resume=AsyncMock())
+    seen = []
+    sync.hold = AsyncMock(side_effect=lambda: seen.append(comm.send_command.await_count))
+    with patch("divoom_lib.display.animation.asyncio.sleep", new=AsyncMock()):
+        assert await anim.stream_animation_8b(bytes(600), sync=sync) is True
+    assert seen == [3]  # start + 2 of the 3 data chunks went before the hold
+    assert comm.send_command.await_count == 4
+    sync.committed.assert_called_once()
+    assert sync.turn.await_count == 2
+    sync.resume.assert_awaited_once()  # the retransmit window, after the commit
+
+
+async def test_http_gif_holds_only_the_last_frame():
+    lan = LanTransport(device_ip="10.0.0.5")
+    lan.post = AsyncMock(return_value={"error_code": 0, "PicId": 1})
+    sync = MagicMock(committed=MagicMock())
+    seen = []
+    sync.hold = AsyncMock(side_effect=lambda: seen.append(lan.post.await_count))
+    frames = [(bytes(16 * 16 * 3), 16, 16, 100)] * 4
+    await lan.send_http_gif(frames, size=16, sync=sync)
+    assert seen == [4]  # GetHttpGifId + frames 0-2
+    last = lan.post.await_args_list[-1].args[1]
+    assert last["PicOffset"] == 3
+    sync.committed.assert_called_once()